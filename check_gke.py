@@ -78,10 +78,10 @@ def check_imports():
         from backend.core.main_server import app
         print("✅ main_server.py import 성공")
         
-        from backend.core.websocket_server import ConnectionManager
-        print("✅ websocket_server.py import 성공")
+        from backend.core.connection_registry import ConnectionRegistry
+        print("✅ connection_registry.py import 성공")
         
-        from backend.core.server_manager import IntegratedServerManager
+        from backend.core.server_manager import UnifiedServerManager
         print("✅ server_manager.py import 성공")
         
         return True
@@ -101,8 +101,7 @@ def check_environment_variables():
     ]
     
     optional_envs = [
-        "WEBSOCKET_HOST",
-        "WEBSOCKET_PORT",
+        "WEB_CONCURRENCY",
         "CORS_ORIGINS"
     ]
     
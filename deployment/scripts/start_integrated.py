@@ -1,14 +1,13 @@
 #!/usr/bin/env python3
 """
 통합 서버 시작 스크립트
-- 메인 서버와 WebSocket 서버를 하나의 프로세스에서 실행
+- HTTP 와 WebSocket 을 단일 포트 앱으로 실행 (SO_REUSEPORT 멀티 워커)
 - 환경 설정 및 모델 다운로드
 - 프로세스 관리 및 모니터링
 """
 
 import os
 import sys
-import asyncio
 import signal
 import logging
 from pathlib import Path
@@ -110,66 +109,18 @@ def check_environment():
         else:
             logger.warning(f"⚠️ 디렉토리 없음: {dir_path}")
 
-def initialize_mediapipe():
-    """MediaPipe 분석기 초기화"""
+def run_integrated_server():
+    """통합 서버 실행 (단일 포트, SO_REUSEPORT 멀티 워커)"""
     try:
-        logger.info("🎭 MediaPipe 분석기 초기화 중...")
-        
-        # src 디렉토리를 Python 경로에 추가
-        src_path = Path(__file__).parent.parent.parent / "src"
-        sys.path.insert(0, str(src_path))
-        
-        from backend.services.analysis.mediapipe_analyzer import mediapipe_analyzer
-        
-        if mediapipe_analyzer.initialize():
-            logger.info("✅ MediaPipe 분석기 초기화 완료")
-        else:
-            logger.warning("⚠️ MediaPipe 분석기 초기화 실패")
-            
-    except ImportError as e:
-        logger.warning(f"⚠️ MediaPipe 분석기 모듈을 찾을 수 없습니다: {e}")
-    except Exception as e:
-        logger.error(f"❌ MediaPipe 분석기 초기화 오류: {e}")
-
-async def initialize_vector_service():
-    """벡터 서비스 초기화"""
-    try:
-        logger.info("🔗 벡터 서비스 초기화 중...")
-        
-        # src 디렉토리를 Python 경로에 추가
-        src_path = Path(__file__).parent.parent.parent / "src"
-        sys.path.insert(0, str(src_path))
-        
-        from backend.services.vector_service import vector_service
-        
-        if await vector_service.initialize():
-            logger.info("✅ 벡터 서비스 초기화 완료")
-        else:
-            logger.warning("⚠️ 벡터 서비스 초기화 실패")
-            
-    except ImportError as e:
-        logger.warning(f"⚠️ 벡터 서비스 모듈을 찾을 수 없습니다: {e}")
-    except Exception as e:
-        logger.error(f"❌ 벡터 서비스 초기화 오류: {e}")
-
-async def run_integrated_server():
-    """통합 서버 실행"""
-    try:
-        # src 디렉토리를 Python 경로에 추가
+        # src 디렉토리를 Python 경로에 추가 (spawn 워커도 상속)
         src_path = Path(__file__).parent.parent.parent / "src"
         sys.path.insert(0, str(src_path))
         
-        # 벡터 서비스 초기화 (선택적)
-        try:
-            await initialize_vector_service()
-        except Exception as e:
-            logger.warning(f"⚠️ 벡터 서비스 초기화 실패 (서버는 계속 실행됩니다): {e}")
-        
-        # 통합 서버 매니저 import 및 실행
-        from backend.core.server_manager import IntegratedServerManager
+        # 벡터 서비스/MongoDB 초기화는 각 워커의 startup 이벤트에서 수행
+        from backend.core.server_manager import UnifiedServerManager
         
-        manager = IntegratedServerManager()
-        await manager.run_servers()
+        manager = UnifiedServerManager()
+        manager.run()
         
     except ImportError as e:
         logger.error(f"❌ 서버 매니저 import 실패: {e}")
@@ -198,17 +149,14 @@ def main():
         # 모델 다운로드
         download_model_if_not_exists()
         
-        # MediaPipe 분석기 초기화
-        initialize_mediapipe()
-        
         # .env 파일 로드
         from dotenv import load_dotenv
         load_dotenv()
         
         logger.info("🎉 모든 준비 완료! 서버 시작...")
         
-        # 통합 서버 실행 (벡터 서비스 초기화 포함)
-        asyncio.run(run_integrated_server())
+        # 통합 서버 실행 (워커별로 MediaPipe/벡터 서비스 초기화)
+        run_integrated_server()
         
     except KeyboardInterrupt:
         logger.info("🛑 사용자에 의해 중단되었습니다.")
@@ -1,11 +1,19 @@
 import os
 import jwt
-import requests
+import hashlib
+from dataclasses import dataclass
 from typing import Optional, Dict, Any
-from fastapi import HTTPException, Depends
+from fastapi import HTTPException, Depends, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import logging
 
+from .jwt_verifier import jwt_verifier
+
+try:
+    from ..monitoring.tracing import span
+except ImportError:
+    from contextlib import nullcontext as span
+
 logger = logging.getLogger(__name__)
 
 # Supabase 설정
@@ -14,12 +22,12 @@ SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 
 # 환경변수 검증
 if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-    print("❌ [AUTH] Supabase 환경변수가 설정되지 않았습니다!")
-    print(f"   SUPABASE_URL: {SUPABASE_URL or '설정되지 않음'}")
-    print(f"   SUPABASE_ANON_KEY: {'설정됨' if SUPABASE_ANON_KEY else '설정되지 않음'}")
-    print("   환경변수를 설정하고 서버를 재시작하세요.")
+    logger.error("❌ [AUTH] Supabase 환경변수가 설정되지 않았습니다!")
+    logger.error(f"   SUPABASE_URL: {SUPABASE_URL or '설정되지 않음'}")
+    logger.error(f"   SUPABASE_ANON_KEY: {'설정됨' if SUPABASE_ANON_KEY else '설정되지 않음'}")
+    logger.error("   환경변수를 설정하고 서버를 재시작하세요.")
 else:
-    print(f"✅ [AUTH] Supabase 설정 확인됨: {SUPABASE_URL}")
+    logger.info(f"✅ [AUTH] Supabase 설정 확인됨: {SUPABASE_URL}")
 
 # JWT 설정
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key")
@@ -27,101 +35,25 @@ JWT_ALGORITHM = "HS256"
 
 # HTTP Bearer 토큰 스키마
 security = HTTPBearer()
+# 토큰이 없어도 통과 (익명 사용자 허용 엔드포인트용)
+optional_security = HTTPBearer(auto_error=False)
 
 class SupabaseAuth:
     """Supabase 인증 관리 클래스"""
     
     @staticmethod
     async def verify_supabase_token(token: str) -> Optional[Dict[str, Any]]:
-        """Supabase JWT 토큰 검증"""
-        print(f"🔍 [SUPABASE_AUTH] 토큰 검증 시작")
-        print(f"🔑 [SUPABASE_AUTH] 토큰 길이: {len(token)}")
-        print(f"🔑 [SUPABASE_AUTH] 토큰 시작: {token[:20]}...")
-        
+        """Supabase JWT 토큰 검증 (로컬 서명 검증 + 클레임 캐시, jwt_verifier 참고)"""
         try:
-            # Supabase JWT 토큰을 직접 디코딩 (서명 검증 없이)
-            import base64
-            import json
-            
-            # JWT 토큰 파트 분리
-            parts = token.split('.')
-            if len(parts) != 3:
-                print(f"❌ [SUPABASE_AUTH] 잘못된 JWT 형식")
-                return None
-            
-            # 페이로드 디코딩
-            payload_part = parts[1]
-            # 패딩 추가
-            padding = 4 - len(payload_part) % 4
-            if padding != 4:
-                payload_part += '=' * padding
-            
-            try:
-                payload_bytes = base64.urlsafe_b64decode(payload_part)
-                payload = json.loads(payload_bytes.decode('utf-8'))
-                
-                print(f"✅ [SUPABASE_AUTH] JWT 페이로드 디코딩 성공")
-                print(f"📋 [SUPABASE_AUTH] 페이로드: {payload}")
-                
-                # 사용자 정보 추출
-                user_data = {
-                    "id": payload.get("sub"),  # Supabase user ID
-                    "email": payload.get("email"),
-                    "role": payload.get("role", "authenticated"),
-                    "aud": payload.get("aud"),
-                    "exp": payload.get("exp"),
-                    "iat": payload.get("iat"),
-                    "app_metadata": payload.get("app_metadata", {}),
-                    "user_metadata": payload.get("user_metadata", {})
-                }
-                
-                print(f"✅ [SUPABASE_AUTH] 사용자 데이터 추출: {user_data.get('email', 'Unknown')}")
-                logger.info(f"✅ Supabase JWT 디코딩 성공: {user_data.get('email', 'Unknown')}")
-                return user_data
-                
-            except Exception as decode_error:
-                print(f"❌ [SUPABASE_AUTH] JWT 페이로드 디코딩 실패: {decode_error}")
-                
-                # API 검증으로 폴백
-                print(f"🔄 [SUPABASE_AUTH] API 검증으로 폴백 시도")
-                return await SupabaseAuth._verify_via_api(token)
-                
+            return await jwt_verifier.verify(token)
         except Exception as e:
-            print(f"❌ [SUPABASE_AUTH] 토큰 검증 오류: {e}")
             logger.error(f"❌ Supabase 토큰 검증 오류: {e}")
             return None
     
     @staticmethod
     async def _verify_via_api(token: str) -> Optional[Dict[str, Any]]:
-        """API를 통한 토큰 검증 (폴백)"""
-        if not SUPABASE_URL or not SUPABASE_ANON_KEY:
-            print(f"❌ [SUPABASE_AUTH] API 검증을 위한 환경변수 누락")
-            return None
-        
-        try:
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "apikey": SUPABASE_ANON_KEY,
-                "Content-Type": "application/json"
-            }
-            
-            response = requests.get(
-                f"{SUPABASE_URL}/auth/v1/user",
-                headers=headers,
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                user_data = response.json()
-                print(f"✅ [SUPABASE_AUTH] API 검증 성공: {user_data.get('email', 'Unknown')}")
-                return user_data
-            else:
-                print(f"⚠️ [SUPABASE_AUTH] API 검증 실패: {response.status_code}")
-                return None
-                
-        except Exception as e:
-            print(f"❌ [SUPABASE_AUTH] API 검증 오류: {e}")
-            return None
+        """API를 통한 토큰 검증 (풀링된 비동기 클라이언트)"""
+        return await jwt_verifier._verify_remote(token)
     
     @staticmethod
     def decode_jwt_token(token: str) -> Optional[Dict[str, Any]]:
@@ -132,45 +64,69 @@ class SupabaseAuth:
         except jwt.ExpiredSignatureError:
             logger.warning("⚠️ JWT 토큰 만료")
             return None
-        except jwt.JWTError as e:
+        except jwt.InvalidTokenError as e:
             logger.error(f"❌ JWT 토큰 디코딩 오류: {e}")
             return None
 
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> Dict[str, Any]:
     """현재 인증된 사용자 정보 반환"""
     token = credentials.credentials
-    print(f"🔍 [AUTH] 토큰 검증 시작 - token: {token[:20]}...")
-    
-            # 테스트용 토큰 우회 (개발 중에만 사용) - 비활성화
-        # if token == "test-token":
-        #     print("⚠️ [AUTH] 테스트 토큰 감지, 인증 우회")
-        #     return {
-        #         "id": "507f1f77bcf86cd799439011",  # 유효한 ObjectId 형식
-        #         "email": "test@example.com",
-        #         "role": "user"
-        #     }
     
-    # 실제 Supabase 토큰 검증
-    print("🔍 [AUTH] 실제 Supabase 토큰 검증 시작")
-    
-    # Supabase 토큰 검증
+    # Supabase 토큰 검증 (캐시 적중 시 네트워크/서명 연산 없음)
     user_data = await SupabaseAuth.verify_supabase_token(token)
     
     if not user_data:
-        print("❌ [AUTH] 토큰 검증 실패")
+        logger.warning("❌ [AUTH] 토큰 검증 실패")
         raise HTTPException(
             status_code=401,
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    print(f"✅ [AUTH] 토큰 검증 성공 - user_id: {user_data.get('id')}")
     return user_data
 
-async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
+@dataclass(frozen=True)
+class Identity:
+    """요청 사용자 식별 결과 (인증 사용자 또는 IP+User-Agent 기반 익명 사용자)"""
+    user_id: str
+    authenticated: bool
+    user: Optional[Dict[str, Any]] = None
+
+def anonymous_user_id(request: Request) -> str:
+    """인증 없는 요청의 임시 사용자 ID (클라이언트 IP + User-Agent 해시, ObjectId 길이)"""
+    client_ip = request.client.host if request.client else "unknown"
+    user_agent = request.headers.get("User-Agent", "unknown")
+    return hashlib.md5(f"{client_ip}:{user_agent}".encode()).hexdigest()[:24]
+
+async def get_identity(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> Identity:
+    """
+    선택적 인증 의존성 - 요청당 한 번만 해석 (FastAPI 의존성 캐시)
+    - 유효한 Bearer 토큰: 인증 사용자 (jwt_verifier 캐시 사용)
+    - 토큰 없음/검증 실패: 익명 사용자 ID
+    """
+    if credentials and credentials.credentials:
+        with span("auth"):
+            user_data = await SupabaseAuth.verify_supabase_token(credentials.credentials)
+        if user_data and user_data.get("id"):
+            return Identity(user_id=user_data["id"], authenticated=True, user=user_data)
+    return Identity(user_id=anonymous_user_id(request), authenticated=False)
+
+async def require_identity(identity: Identity = Depends(get_identity)) -> Identity:
+    """인증 필수 의존성 (get_identity 결과를 재사용)"""
+    if not identity.authenticated:
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return identity
+
+async def get_current_user_id(identity: Identity = Depends(require_identity)) -> str:
     """현재 인증된 사용자 ID 반환"""
-    user_data = await get_current_user(credentials)
-    return user_data.get("id")
+    return identity.user_id
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[int] = None) -> str:
     """JWT 액세스 토큰 생성"""
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Supabase JWT 검증기
+- 서명을 로컬에서 검증: 비대칭 키(RS/ES)는 JWKS, HS256 은 SUPABASE_JWT_SECRET
+- JWKS 는 메모리 캐시 + 백그라운드 주기 갱신 (모르는 kid 는 최소 간격을 두고 1회 즉시 갱신)
+- 검증된 클레임은 토큰 해시 기준 TTL+LRU 캐시 (만료 시각(exp)을 넘겨 캐시하지 않음)
+- 로컬 키가 전혀 없을 때만 /auth/v1/user 원격 검증 (풀링된 httpx.AsyncClient, 결과도 캐시)
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+import jwt
+
+logger = logging.getLogger(__name__)
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
+# HS256 서명 비밀키 (Supabase 대시보드 > JWT Secret)
+SUPABASE_JWT_SECRET = os.getenv("SUPABASE_JWT_SECRET")
+SUPABASE_JWKS_URL = os.getenv(
+    "SUPABASE_JWKS_URL",
+    f"{SUPABASE_URL.rstrip('/')}/auth/v1/.well-known/jwks.json" if SUPABASE_URL else ""
+)
+JWT_AUDIENCE = os.getenv("JWT_AUDIENCE", "authenticated")
+JWT_LEEWAY_SEC = int(os.getenv("JWT_LEEWAY_SEC", "30"))
+
+JWKS_REFRESH_SEC = float(os.getenv("JWKS_REFRESH_SEC", "600"))
+# 모르는 kid 로 인한 즉시 갱신 최소 간격 (위조 토큰으로 JWKS 요청 폭주 방지)
+JWKS_MIN_REFRESH_SEC = float(os.getenv("JWKS_MIN_REFRESH_SEC", "30"))
+
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+AUTH_CACHE_TTL_SEC = float(os.getenv("AUTH_CACHE_TTL_SEC", "300"))
+# 원격 검증 (auto: 로컬 키가 없을 때만 / true: 로컬 검증 불가 시 항상 / false: 사용 안 함)
+AUTH_REMOTE_VALIDATION = os.getenv("AUTH_REMOTE_VALIDATION", "auto").lower()
+AUTH_HTTP_TIMEOUT_SEC = float(os.getenv("AUTH_HTTP_TIMEOUT_SEC", "3.0"))
+
+_ASYMMETRIC_ALGORITHMS = {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512", "PS256", "EdDSA"}
+_HMAC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+
+
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def claims_to_user(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """JWT 클레임 -> 사용자 정보 (기존 응답 형식 유지)"""
+    return {
+        "id": payload.get("sub"),  # Supabase user ID
+        "email": payload.get("email"),
+        "role": payload.get("role", "authenticated"),
+        "aud": payload.get("aud"),
+        "exp": payload.get("exp"),
+        "iat": payload.get("iat"),
+        "app_metadata": payload.get("app_metadata", {}),
+        "user_metadata": payload.get("user_metadata", {})
+    }
+
+
+class ClaimsCache:
+    """토큰 해시 -> 사용자 정보 (TTL + LRU, 항목별 만료 = min(now+ttl, exp))"""
+
+    def __init__(self, max_entries: int = AUTH_CACHE_SIZE, ttl: float = AUTH_CACHE_TTL_SEC):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, user = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return user
+
+    def put(self, key: str, user: Dict[str, Any]):
+        expires_at = time.time() + self.ttl
+        exp = user.get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        if expires_at <= time.time():
+            return
+        self._entries[key] = (expires_at, user)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class JWKSCache:
+    """JWKS 키 캐시 (kid -> PyJWK)"""
+
+    def __init__(self, url: str = SUPABASE_JWKS_URL):
+        self.url = url
+        self.keys: Dict[str, jwt.PyJWK] = {}
+        self.fetched_at = 0.0
+        self.refreshes = 0
+        self.failures = 0
+        self._last_attempt = 0.0
+        self._refreshing: Optional[asyncio.Task] = None
+
+    async def refresh(self, client: httpx.AsyncClient) -> bool:
+        if not self.url:
+            return False
+        self._last_attempt = time.time()
+        try:
+            response = await client.get(self.url)
+            response.raise_for_status()
+            keys = {}
+            for jwk in response.json().get("keys", []):
+                try:
+                    keys[jwk.get("kid", "")] = jwt.PyJWK(jwk)
+                except Exception as e:
+                    logger.warning(f"⚠️ [JWKS] 지원하지 않는 키 건너뜀 ({jwk.get('kid')}): {e}")
+            self.keys = keys
+            self.fetched_at = time.time()
+            self.refreshes += 1
+            logger.info(f"🔑 [JWKS] 키 {len(keys)}개 갱신")
+            return True
+        except Exception as e:
+            self.failures += 1
+            logger.warning(f"⚠️ [JWKS] 갱신 실패: {e}")
+            return False
+
+    async def refresh_if_allowed(self, client: httpx.AsyncClient):
+        """모르는 kid - 최소 간격이 지났으면 한 번 갱신 (동시 요청은 같은 갱신을 기다림)"""
+        if self._refreshing is None:
+            if time.time() - self._last_attempt < JWKS_MIN_REFRESH_SEC:
+                return
+            self._refreshing = asyncio.create_task(self.refresh(client))
+        task = self._refreshing
+        try:
+            await asyncio.shield(task)
+        finally:
+            if task.done() and self._refreshing is task:
+                self._refreshing = None
+
+
+class JWTVerifier:
+    """로컬 서명 검증 + 클레임 캐시"""
+
+    def __init__(self,
+                 secret: Optional[str] = SUPABASE_JWT_SECRET,
+                 jwks_url: str = SUPABASE_JWKS_URL,
+                 audience: Optional[str] = JWT_AUDIENCE):
+        self.secret = secret
+        self.audience = audience or None
+        self.jwks = JWKSCache(jwks_url)
+        self.cache = ClaimsCache()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.verified = 0
+        self.rejected = 0
+        self.remote_checks = 0
+
+    # ---------- 수명 주기 ----------
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=AUTH_HTTP_TIMEOUT_SEC,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+        return self._client
+
+    async def start(self):
+        """JWKS 최초 로드 + 주기 갱신 태스크 시작"""
+        if self.jwks.url:
+            await self.jwks.refresh(self.client)
+            if self._refresh_task is None:
+                self._refresh_task = asyncio.create_task(self._refresh_loop())
+        logger.info(
+            f"🔐 [AUTH] JWT 검증기 시작 - HS secret: {'설정됨' if self.secret else '없음'}, "
+            f"JWKS 키: {len(self.jwks.keys)}개"
+        )
+
+    async def _refresh_loop(self):
+        while True:
+            # 실패 시에는 짧은 간격으로 재시도
+            delay = JWKS_REFRESH_SEC if self.jwks.keys else JWKS_MIN_REFRESH_SEC
+            await asyncio.sleep(delay)
+            await self.jwks.refresh(self.client)
+
+    async def stop(self):
+        if self._refresh_task:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    # ---------- 검증 ----------
+
+    @property
+    def has_local_keys(self) -> bool:
+        return bool(self.secret or self.jwks.keys)
+
+    def _decode(self, token: str, key: Any, algorithm: str) -> Dict[str, Any]:
+        return jwt.decode(
+            token,
+            key,
+            algorithms=[algorithm],
+            audience=self.audience,
+            leeway=JWT_LEEWAY_SEC,
+            options={"verify_aud": self.audience is not None, "require": ["exp", "sub"]}
+        )
+
+    async def _verify_locally(self, token: str) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """(로컬 검증 시도 여부, 클레임) - 키가 없어 시도조차 못 했으면 (False, None)"""
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.InvalidTokenError:
+            return True, None
+        algorithm = header.get("alg", "")
+
+        if algorithm in _HMAC_ALGORITHMS:
+            if not self.secret:
+                return False, None
+            key = self.secret
+        elif algorithm in _ASYMMETRIC_ALGORITHMS:
+            kid = header.get("kid", "")
+            jwk = self.jwks.keys.get(kid)
+            if jwk is None and self.jwks.url:
+                await self.jwks.refresh_if_allowed(self.client)
+                jwk = self.jwks.keys.get(kid)
+            if jwk is None:
+                return (bool(self.jwks.keys), None)
+            key = jwk.key
+        else:
+            # alg=none 등은 거부
+            return True, None
+
+        try:
+            return True, self._decode(token, key, algorithm)
+        except jwt.ExpiredSignatureError:
+            logger.info("⚠️ [AUTH] JWT 토큰 만료")
+            return True, None
+        except jwt.InvalidTokenError as e:
+            logger.warning(f"⚠️ [AUTH] JWT 검증 실패: {e}")
+            return True, None
+
+    async def _verify_remote(self, token: str) -> Optional[Dict[str, Any]]:
+        """Supabase /auth/v1/user 로 검증 (로컬 키가 없을 때만)"""
+        if not SUPABASE_URL or not SUPABASE_ANON_KEY:
+            return None
+        self.remote_checks += 1
+        try:
+            response = await self.client.get(
+                f"{SUPABASE_URL}/auth/v1/user",
+                headers={"Authorization": f"Bearer {token}", "apikey": SUPABASE_ANON_KEY}
+            )
+        except httpx.HTTPError as e:
+            logger.warning(f"⚠️ [AUTH] 원격 검증 오류: {e}")
+            return None
+        if response.status_code != 200:
+            return None
+        data = response.json()
+        # 원격 응답에는 exp 가 없으므로 토큰의 exp 를 (서명 검증 없이) 캐시 만료용으로만 사용
+        try:
+            exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        except jwt.InvalidTokenError:
+            exp = None
+        return {
+            "id": data.get("id"),
+            "email": data.get("email"),
+            "role": data.get("role", "authenticated"),
+            "aud": data.get("aud"),
+            "exp": exp,
+            "iat": None,
+            "app_metadata": data.get("app_metadata", {}),
+            "user_metadata": data.get("user_metadata", {})
+        }
+
+    def _remote_allowed(self) -> bool:
+        if AUTH_REMOTE_VALIDATION in ("false", "0", "no"):
+            return False
+        if AUTH_REMOTE_VALIDATION in ("true", "1", "yes"):
+            return True
+        return not self.has_local_keys
+
+    async def verify(self, token: str) -> Optional[Dict[str, Any]]:
+        """토큰 검증 -> 사용자 정보 (실패 시 None). 캐시 적중 시 해시 계산 + dict 조회만 수행"""
+        if not token:
+            return None
+        key = token_hash(token)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        attempted, payload = await self._verify_locally(token)
+        user = claims_to_user(payload) if payload else None
+        if user is None and not attempted and self._remote_allowed():
+            user = await self._verify_remote(token)
+
+        if user is None or not user.get("id"):
+            self.rejected += 1
+            return None
+        self.verified += 1
+        self.cache.put(key, user)
+        return user
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cache_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+            "verified": self.verified,
+            "rejected": self.rejected,
+            "remote_checks": self.remote_checks,
+            "jwks_keys": len(self.jwks.keys),
+            "jwks_refreshes": self.jwks.refreshes,
+            "jwks_failures": self.jwks.failures,
+            "hs_secret": bool(self.secret),
+        }
+
+
+# 전역 인스턴스
+jwt_verifier = JWTVerifier()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+랜드마크 기록 재생 하네스
+- 기록된 세션을 MediaPipeAnalyzer 에 최대 속도로 흘려보내 처리량/지연 분포 측정
+- 기준 분석기(이전 버전 파일)와의 점수 차이 비교
+
+사용 예:
+    cd src
+    python -m backend.benchmarks.landmark_replay /tmp/landmark_recordings/20250901-120000_abc
+    git show HEAD~1:src/backend/services/analysis/mediapipe_analyzer.py > /tmp/old_analyzer.py
+    python -m backend.benchmarks.landmark_replay <session_dir> --baseline-file /tmp/old_analyzer.py
+"""
+
+import sys
+import json
+import time
+import argparse
+import importlib.util
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from ..services.analysis.landmark_recorder import LandmarkRecording, array_to_landmarks
+from ..services.analysis.mediapipe_analyzer import MediaPipeAnalyzer
+
+
+def load_baseline_analyzer(path: str):
+    """다른 버전의 mediapipe_analyzer.py 파일에서 분석기 인스턴스를 생성합니다."""
+    spec = importlib.util.spec_from_file_location("baseline_mediapipe_analyzer", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.MediaPipeAnalyzer()
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    arr = np.asarray(values) * 1000.0
+    return {
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p90_ms": float(np.percentile(arr, 90)),
+        "p99_ms": float(np.percentile(arr, 99)),
+        "max_ms": float(arr.max()),
+        "mean_ms": float(arr.mean()),
+    }
+
+
+def replay(session_dir: str,
+           analyzer: MediaPipeAnalyzer,
+           baseline: Optional[Any] = None,
+           repeat: int = 1) -> Dict[str, Any]:
+    """기록을 재생하고 처리량/지연/점수 차이 리포트를 반환합니다."""
+    recording = LandmarkRecording(session_dir)
+    if not recording.segment_paths:
+        raise FileNotFoundError(f"세그먼트가 없습니다: {session_dir}")
+
+    latencies: List[float] = []
+    deltas: Dict[str, List[float]] = {}
+    frames = 0
+    batches = 0
+    failures = 0
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    for _ in range(repeat):
+        for batch in recording.iter_batches():
+            batches += 1
+            for _ts, face, pose in batch:
+                face_dicts = array_to_landmarks(face)
+                pose_dicts = array_to_landmarks(pose)
+
+                t0 = time.perf_counter()
+                result = analyzer.analyze_landmarks(face_dicts, pose_dicts)
+                latencies.append(time.perf_counter() - t0)
+                frames += 1
+
+                if result is None:
+                    failures += 1
+                    continue
+
+                if baseline is not None:
+                    base_result = baseline.analyze_landmarks(face_dicts, pose_dicts)
+                    if base_result is None:
+                        continue
+                    for key, value in result.scores.items():
+                        if key in base_result.scores:
+                            deltas.setdefault(key, []).append(float(value) - float(base_result.scores[key]))
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    report: Dict[str, Any] = {
+        "session_dir": session_dir,
+        "segments": len(recording.segment_paths),
+        "batches": batches,
+        "frames": frames,
+        "failures": failures,
+        "wall_seconds": wall,
+        "cpu_seconds": cpu,
+        # 기준 분석기를 함께 돌리면 벽시계 처리량에 포함되므로 지연 합계 기준 처리량도 제공
+        "throughput_fps": frames / wall if wall > 0 else 0.0,
+        "analyzer_fps": frames / sum(latencies) if latencies and sum(latencies) > 0 else 0.0,
+        "latency": _percentiles(latencies),
+    }
+
+    if baseline is not None:
+        report["score_deltas"] = {
+            key: {
+                "mean": float(np.mean(vals)),
+                "mean_abs": float(np.mean(np.abs(vals))),
+                "max_abs": float(np.max(np.abs(vals))),
+                "n": len(vals),
+            }
+            for key, vals in deltas.items()
+        }
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="랜드마크 기록 재생 벤치마크")
+    parser.add_argument("session_dir", help="LandmarkSessionRecorder 가 기록한 세션 디렉토리")
+    parser.add_argument("--baseline-file", help="비교할 이전 버전 mediapipe_analyzer.py 경로")
+    parser.add_argument("--repeat", type=int, default=1, help="재생 반복 횟수")
+    args = parser.parse_args(argv)
+
+    analyzer = MediaPipeAnalyzer()
+    baseline = load_baseline_analyzer(args.baseline_file) if args.baseline_file else None
+
+    report = replay(args.session_dir, analyzer, baseline=baseline, repeat=args.repeat)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+직렬화 벤치마크
+- 대표 페이로드(랜드마크 ack, 텔레메트리, 분석 결과, 표정 분석 응답)를
+  기존 방식(numpy 정규화 + json.dumps / pydantic 검증)과 공용 serialization 모듈로 비교
+- 메시지당 CPU 시간(µs), 초당 메시지 수, 초당 바이트 수 측정
+
+사용 예:
+    cd src
+    python -m backend.benchmarks.serialization_bench --iterations 20000
+"""
+
+import sys
+import json
+import time
+import argparse
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from ..common.serialization import dumps_text, ORJSON_AVAILABLE
+
+
+def _legacy_to_jsonable(x):
+    """기존 main_server._to_jsonable 과 동일한 변환"""
+    if isinstance(x, np.floating):
+        return float(x)
+    if isinstance(x, np.integer):
+        return int(x)
+    if isinstance(x, np.ndarray):
+        return x.tolist()
+    if isinstance(x, dict):
+        return {k: _legacy_to_jsonable(v) for k, v in x.items()}
+    if isinstance(x, list):
+        return [_legacy_to_jsonable(v) for v in x]
+    return x
+
+
+def _legacy_dumps(obj: Any) -> str:
+    return json.dumps(_legacy_to_jsonable(obj), ensure_ascii=False)
+
+
+def _payloads() -> Dict[str, Any]:
+    rng = np.random.default_rng(0)
+    scores = {k: np.float32(rng.random() * 100) for k in
+              ("concentration", "gaze", "blinking", "posture", "expression", "initiative")}
+    now = time.time()
+    return {
+        "landmark_ack": {
+            "ok": True,
+            "message": "랜드마크 데이터 수신 완료",
+            "frames_processed": 3,
+            "analysis_results": [],
+            "fps": 10,
+            "timestamp": now,
+            "server_time": now,
+        },
+        "telemetry": {
+            "ok": True,
+            "simulation_mode": True,
+            "message": "UI-only mode로 동작 중입니다.",
+            "data_source": "ui_only",
+            "debug_info": {"pipeline_mode": "ui_only", "camera_connected": False},
+            "pipeline_running": False,
+            "pipeline_interval": 1.0,
+            "active_connections": 120,
+            "debug_overlay": False,
+            "timestamp": now,
+        },
+        "analysis_results": {
+            "ok": True,
+            "frames_processed": 3,
+            "analysis_results": [
+                {
+                    "timestamp": now + i,
+                    "scores": dict(scores),
+                    "metrics": {
+                        "ear": np.float64(rng.random()),
+                        "head_pose": rng.random(3).astype(np.float32),
+                        "blink_count": np.int64(i),
+                    },
+                }
+                for i in range(3)
+            ],
+        },
+        "expression_response": {
+            "success": True,
+            "model_emotion": "happy",
+            "model_scores": {k: float(rng.random()) for k in
+                             ("happiness", "sadness", "anger", "surprise", "fear", "disgust", "neutral")},
+            "mediapipe_scores": {k: float(v) for k, v in scores.items()},
+            "score_differences": {"expression": 0.12, "concentration": 0.08},
+            "is_anomaly": False,
+            "anomaly_threshold": 0.3,
+            "feedback": {"emotion": "happy", "confidence": 0.82, "message": "좋아요"},
+            "processing_time": 0.021,
+            "error": None,
+        },
+    }
+
+
+def _measure(fn: Callable[[Any], Any], payload: Any, iterations: int) -> Dict[str, float]:
+    sizes = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(iterations):
+        out = fn(payload)
+        sizes += len(out.encode("utf-8")) if isinstance(out, str) else len(out)
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    return {
+        "cpu_us_per_msg": cpu / iterations * 1e6,
+        "msgs_per_sec": iterations / wall if wall > 0 else 0.0,
+        "bytes_per_sec": sizes / wall if wall > 0 else 0.0,
+        "bytes_per_msg": sizes / iterations,
+    }
+
+
+def run(iterations: int) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"orjson": ORJSON_AVAILABLE, "iterations": iterations, "payloads": {}}
+    payloads = _payloads()
+
+    for name, payload in payloads.items():
+        before = _measure(_legacy_dumps, payload, iterations)
+        after = _measure(dumps_text, payload, iterations)
+        report["payloads"][name] = {
+            "before": before,
+            "after": after,
+            "cpu_speedup": before["cpu_us_per_msg"] / after["cpu_us_per_msg"] if after["cpu_us_per_msg"] else None,
+        }
+
+    # 표정 분석 응답: pydantic 검증 + jsonable_encoder + json 과 직접 직렬화 비교
+    try:
+        from fastapi.encoders import jsonable_encoder
+        from ..core.main_server import ExpressionAnalysisResponse
+
+        payload = payloads["expression_response"]
+        before = _measure(
+            lambda p: json.dumps(jsonable_encoder(ExpressionAnalysisResponse(**p)), ensure_ascii=False),
+            payload, iterations
+        )
+        after = _measure(dumps_text, payload, iterations)
+        report["payloads"]["expression_response_validated"] = {
+            "before": before,
+            "after": after,
+            "cpu_speedup": before["cpu_us_per_msg"] / after["cpu_us_per_msg"] if after["cpu_us_per_msg"] else None,
+        }
+    except Exception as e:
+        report["expression_validation_skipped"] = str(e)
+
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="직렬화 벤치마크")
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.iterations), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+벡터 저장 처리량 벤치마크
+- 로컬 대역(stand-in)으로 OpenAI 임베딩 / Pinecone 인덱스 / MongoDB 컬렉션 지연을 흉내냄
+- 기존 방식: 텍스트마다 동기 embeddings.create + 단건 upsert + update_one (이벤트 루프 블로킹)
+- 새 방식: VectorService.store_text_with_embedding (병합 임베딩 + 배치 업서트 + bulk_write)
+- 처리량(텍스트/초), API 호출 수, 이벤트 루프 최대 지연 측정
+
+사용 예:
+    cd src
+    python -m backend.benchmarks.vector_ingest_bench --texts 500 --producers 50
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+DIMENSION = 1536
+
+
+class FakeEmbeddings:
+    """embeddings.create 대역 - 호출당 고정 지연 + 입력당 지연 (동기, 블로킹)"""
+
+    def __init__(self, base_ms: float, per_input_ms: float):
+        self.base = base_ms / 1000.0
+        self.per_input = per_input_ms / 1000.0
+        self.calls = 0
+        self.inputs = 0
+
+    def create(self, model: str, input: Any):
+        texts = input if isinstance(input, list) else [input]
+        self.calls += 1
+        self.inputs += len(texts)
+        time.sleep(self.base + self.per_input * len(texts))
+        return SimpleNamespace(data=[
+            SimpleNamespace(index=i, embedding=[random.random() for _ in range(DIMENSION)])
+            for i in range(len(texts))
+        ])
+
+
+class FakeIndex:
+    """Pinecone Index 대역"""
+
+    def __init__(self, base_ms: float, per_vector_ms: float):
+        self.base = base_ms / 1000.0
+        self.per_vector = per_vector_ms / 1000.0
+        self.calls = 0
+        self.vectors = 0
+
+    def upsert(self, vectors: List[Dict[str, Any]]):
+        self.calls += 1
+        self.vectors += len(vectors)
+        time.sleep(self.base + self.per_vector * len(vectors))
+        return {"upserted_count": len(vectors)}
+
+
+class FakeCollection:
+    """motor 컬렉션 대역 - 왕복 지연만 흉내냄"""
+
+    def __init__(self, rtt_ms: float):
+        self.rtt = rtt_ms / 1000.0
+        self.calls = 0
+        self.docs = 0
+
+    async def update_one(self, *args, **kwargs):
+        self.calls += 1
+        self.docs += 1
+        await asyncio.sleep(self.rtt)
+
+    async def bulk_write(self, requests, ordered: bool = True):
+        self.calls += 1
+        self.docs += len(requests)
+        await asyncio.sleep(self.rtt)
+
+
+class LoopLagProbe:
+    """이벤트 루프 지연 측정 (주기 태스크가 늦게 깨어난 정도)"""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, time.perf_counter() - start - self.interval)
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def _stand_ins(args) -> Dict[str, Any]:
+    return {
+        "embeddings": FakeEmbeddings(args.embed_base_ms, args.embed_per_input_ms),
+        "index": FakeIndex(args.upsert_base_ms, args.upsert_per_vector_ms),
+        "collection": FakeCollection(args.mongo_rtt_ms),
+    }
+
+
+async def _legacy_store(fakes: Dict[str, Any], text: str, content_id: str):
+    """기존 store_text_with_embedding 과 같은 호출 패턴"""
+    response = fakes["embeddings"].create(model="text-embedding-3-small", input=text)
+    embedding = response.data[0].embedding
+    fakes["index"].upsert(vectors=[{"id": f"user_message:{content_id}", "values": embedding, "metadata": {}}])
+    await fakes["collection"].update_one({"vector_id": content_id}, {"$set": {}}, upsert=True)
+
+
+def _new_service(fakes: Dict[str, Any]):
+    from ..services.vector_service import VectorService
+    from ..database.pinecone_client import PineconeClient
+
+    pinecone = PineconeClient()
+    pinecone.index = fakes["index"]
+    pinecone.is_initialized = True
+
+    service = VectorService()
+    service.openai_client = SimpleNamespace(embeddings=fakes["embeddings"])
+    service.backend = pinecone
+    service.db = SimpleNamespace(vector_embeddings=fakes["collection"])
+    service.is_initialized = True
+    return service
+
+
+async def _run_variant(name: str, args) -> Dict[str, Any]:
+    fakes = _stand_ins(args)
+    if name == "legacy":
+        async def store(text: str, content_id: str):
+            await _legacy_store(fakes, text, content_id)
+    else:
+        service = _new_service(fakes)
+
+        async def store(text: str, content_id: str):
+            await service.store_text_with_embedding(text, "user_message", content_id, {"session_id": "bench"})
+
+    per_producer = max(1, args.texts // args.producers)
+
+    async def producer(pid: int):
+        for i in range(per_producer):
+            await store(f"producer {pid} message {i}", f"{pid}-{i}")
+
+    probe = LoopLagProbe()
+    probe.start()
+    started = time.perf_counter()
+    await asyncio.gather(*(producer(p) for p in range(args.producers)))
+    elapsed = time.perf_counter() - started
+    await probe.stop()
+
+    total = per_producer * args.producers
+    return {
+        "texts": total,
+        "seconds": elapsed,
+        "texts_per_sec": total / elapsed if elapsed > 0 else 0.0,
+        "embedding_calls": fakes["embeddings"].calls,
+        "pinecone_upserts": fakes["index"].calls,
+        "mongo_writes": fakes["collection"].calls,
+        "max_loop_lag_ms": probe.max_lag * 1000.0,
+    }
+
+
+async def run(args) -> Dict[str, Any]:
+    report: Dict[str, Any] = {"config": vars(args)}
+    report["legacy"] = await _run_variant("legacy", args)
+    report["batched"] = await _run_variant("batched", args)
+    if report["legacy"]["texts_per_sec"]:
+        report["throughput_speedup"] = report["batched"]["texts_per_sec"] / report["legacy"]["texts_per_sec"]
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="벡터 저장 처리량 벤치마크 (로컬 대역)")
+    parser.add_argument("--texts", type=int, default=400, help="저장할 텍스트 수")
+    parser.add_argument("--producers", type=int, default=40, help="동시 생산자 수 (세션)")
+    parser.add_argument("--embed-base-ms", type=float, default=120.0, help="임베딩 호출당 지연")
+    parser.add_argument("--embed-per-input-ms", type=float, default=1.0, help="임베딩 입력당 추가 지연")
+    parser.add_argument("--upsert-base-ms", type=float, default=40.0, help="Pinecone 업서트 호출당 지연")
+    parser.add_argument("--upsert-per-vector-ms", type=float, default=0.2, help="업서트 벡터당 추가 지연")
+    parser.add_argument("--mongo-rtt-ms", type=float, default=5.0, help="MongoDB 왕복 지연")
+    args = parser.parse_args(argv)
+    print(json.dumps(asyncio.run(run(args)), ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
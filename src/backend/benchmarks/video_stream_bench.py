@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+비디오 스트리밍 동시 시청자 벤치마크
+- N명의 시청자가 같은 비디오를 전체 다운로드(full) 또는 무작위 탐색 Range 요청(seek)으로 반복 수신
+- --rate-kbps 로 시청자별 수신 속도를 제한하면 느린 재생 클라이언트 (서버 선읽기 버퍼가 쌓이는 상황) 재현
+- 전체 처리량, 첫 바이트 지연(TTFB) 분포, 상태 코드, 서버 RSS (/metrics 의 dys_process_resident_memory_bytes
+  또는 --pid 로 지정한 로컬 프로세스) 측정
+
+사용 예:
+    cd src
+    python -m backend.benchmarks.video_stream_bench --url http://localhost:8000 --viewers 200 --duration 30
+    python -m backend.benchmarks.video_stream_bench --mode seek --range-kb 512 --viewers 500
+    python -m backend.benchmarks.video_stream_bench --rate-kbps 2000 --viewers 300 --pid $(pgrep -f uvicorn | head -1)
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from typing import Dict, List, Any, Optional
+
+import httpx
+import numpy as np
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+RSS_METRIC = "dys_process_resident_memory_bytes"
+
+
+class StreamStats:
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self.failed = 0
+        self.statuses: Dict[int, int] = {}
+        self.ttfbs: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.rss_samples: List[float] = []
+
+    def error(self, e: Exception):
+        key = type(e).__name__
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    arr = np.asarray(values) * 1000.0
+    return {
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p90_ms": float(np.percentile(arr, 90)),
+        "p99_ms": float(np.percentile(arr, 99)),
+        "max_ms": float(arr.max()),
+    }
+
+
+async def _probe_size(client: httpx.AsyncClient, url: str) -> int:
+    """Range: bytes=0-0 응답의 Content-Range 로 전체 크기 확인"""
+    resp = await client.get(url, headers={"Range": "bytes=0-0"})
+    if resp.status_code == 206:
+        return int(resp.headers["content-range"].rsplit("/", 1)[-1])
+    return len(resp.content)
+
+
+async def _fetch(client: httpx.AsyncClient, url: str, stats: StreamStats,
+                 headers: Dict[str, str], rate_bps: float):
+    started = time.perf_counter()
+    first = None
+    received = 0
+    async with client.stream("GET", url, headers=headers) as resp:
+        stats.statuses[resp.status_code] = stats.statuses.get(resp.status_code, 0) + 1
+        async for chunk in resp.aiter_raw():
+            if first is None:
+                first = time.perf_counter() - started
+            received += len(chunk)
+            if rate_bps > 0:
+                # 재생 속도만큼만 소비 (목표 시각보다 앞서면 대기)
+                ahead = received / rate_bps - (time.perf_counter() - started)
+                if ahead > 0:
+                    await asyncio.sleep(ahead)
+    stats.requests += 1
+    stats.bytes += received
+    if first is not None:
+        stats.ttfbs.append(first)
+
+
+async def _viewer(client: httpx.AsyncClient, url: str, stats: StreamStats, mode: str,
+                  size: int, range_bytes: int, rate_bps: float, stop: asyncio.Event):
+    while not stop.is_set():
+        headers = {"Cache-Control": "no-cache"}
+        if mode == "seek" and size > range_bytes:
+            start = random.randrange(0, size - range_bytes)
+            headers["Range"] = f"bytes={start}-{start + range_bytes - 1}"
+        try:
+            await _fetch(client, url, stats, headers, rate_bps)
+        except Exception as e:
+            stats.failed += 1
+            stats.error(e)
+            await asyncio.sleep(0.1)
+
+
+def _parse_rss(text: str) -> Optional[float]:
+    """Prometheus 텍스트에서 워커 RSS 합계"""
+    total = None
+    for line in text.splitlines():
+        if line.startswith(RSS_METRIC):
+            try:
+                total = (total or 0.0) + float(line.rsplit(" ", 1)[-1])
+            except ValueError:
+                pass
+    return total
+
+
+async def _poll_rss(metrics_url: Optional[str], pid: Optional[int], stats: StreamStats, stop: asyncio.Event):
+    """서버 RSS 를 주기적으로 기록 (--pid 가 있으면 psutil, 아니면 /metrics)"""
+    process = psutil.Process(pid) if pid and PSUTIL_AVAILABLE else None
+    async with httpx.AsyncClient(timeout=5.0) as client:
+        while not stop.is_set():
+            try:
+                if process is not None:
+                    rss = float(process.memory_info().rss)
+                    for child in process.children(recursive=True):
+                        rss += child.memory_info().rss
+                    stats.rss_samples.append(rss)
+                elif metrics_url:
+                    rss = _parse_rss((await client.get(metrics_url)).text)
+                    if rss is not None:
+                        stats.rss_samples.append(rss)
+            except Exception:
+                pass
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=0.5)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def run_benchmark(base_url: str,
+                        path: str,
+                        viewers: int,
+                        duration: float,
+                        mode: str,
+                        range_kb: int,
+                        rate_kbps: float,
+                        metrics_url: Optional[str],
+                        pid: Optional[int]) -> Dict[str, Any]:
+    url = base_url.rstrip("/") + path
+    stats = StreamStats()
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=viewers, max_keepalive_connections=viewers)
+
+    async with httpx.AsyncClient(timeout=60.0, limits=limits) as client:
+        size = await _probe_size(client, url)
+        poller = asyncio.create_task(_poll_rss(metrics_url, pid, stats, stop))
+        # 시작 전 기준 RSS
+        await asyncio.sleep(0.6)
+        baseline = stats.rss_samples[-1] if stats.rss_samples else None
+
+        started = time.perf_counter()
+        tasks = [
+            asyncio.create_task(_viewer(client, url, stats, mode, size, range_kb * 1024, rate_kbps * 125.0, stop))
+            for _ in range(viewers)
+        ]
+        await asyncio.sleep(duration)
+        stop.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+        await poller
+
+    mb = 1024 * 1024
+    return {
+        "url": url,
+        "mode": mode,
+        "viewers": viewers,
+        "file_bytes": size,
+        "seconds": elapsed,
+        "requests": stats.requests,
+        "failed": stats.failed,
+        "statuses": stats.statuses,
+        "throughput_mb_s": stats.bytes / mb / elapsed if elapsed else 0.0,
+        "requests_per_sec": stats.requests / elapsed if elapsed else 0.0,
+        "ttfb": _percentiles(stats.ttfbs),
+        "server_rss_mb": {
+            "baseline": baseline / mb if baseline else None,
+            "peak": max(stats.rss_samples) / mb if stats.rss_samples else None,
+            "per_viewer_kb": (max(stats.rss_samples) - baseline) / 1024 / viewers
+            if stats.rss_samples and baseline else None,
+        },
+        "errors": stats.errors,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="비디오 스트리밍 동시 시청자 벤치마크")
+    parser.add_argument("--url", default="http://localhost:8000", help="서버 베이스 URL")
+    parser.add_argument("--path", default="/frontend/video/woman1_cafe.mp4", help="비디오 경로")
+    parser.add_argument("--viewers", type=int, default=100, help="동시 시청자 수")
+    parser.add_argument("--duration", type=float, default=20.0, help="측정 시간(초)")
+    parser.add_argument("--mode", choices=("full", "seek"), default="full",
+                        help="full = 전체 다운로드 반복, seek = 무작위 Range 요청")
+    parser.add_argument("--range-kb", type=int, default=256, help="seek 모드 요청당 범위 크기(KB)")
+    parser.add_argument("--rate-kbps", type=float, default=0.0, help="시청자별 수신 속도 제한 (0 = 무제한)")
+    parser.add_argument("--metrics-url", help="서버 메트릭 URL (기본: <url>/metrics)")
+    parser.add_argument("--pid", type=int, help="RSS 를 직접 측정할 로컬 서버 PID (psutil, 자식 워커 포함)")
+    args = parser.parse_args(argv)
+
+    metrics_url = args.metrics_url or args.url.rstrip("/") + "/metrics"
+    report = asyncio.run(run_benchmark(
+        args.url, args.path, args.viewers, args.duration, args.mode,
+        args.range_kb, args.rate_kbps, metrics_url, args.pid
+    ))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
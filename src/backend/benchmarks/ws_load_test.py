@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+WebSocket 연결 부하 테스트
+- /ws/landmarks 에 N개 연결을 램프업으로 열고 주기적으로 landmarks_batch 전송
+- 연결 성공/실패, 연결 수립 시간, 응답 왕복 지연 분포 측정
+- /api/ws/stats 를 반복 조회해 워커(pid)별 소켓 수 집계 (Pod 당 소켓 수)
+
+사용 예:
+    cd src
+    python -m backend.benchmarks.ws_load_test --url ws://localhost:8000 --connections 1000 --ramp 200
+    # 기존 이중 프로세스 구성과 비교 시 WebSocket 서버 포트 지정
+    python -m backend.benchmarks.ws_load_test --url ws://localhost:8001 --stats-url http://localhost:8001/health
+"""
+
+import sys
+import json
+import time
+import base64
+import asyncio
+import argparse
+from typing import Dict, List, Any, Optional
+
+import httpx
+import numpy as np
+import websockets
+
+
+def _make_batch(frames: int) -> str:
+    """468개 랜드마크 base64 프레임으로 구성된 배치 메시지"""
+    lm = base64.b64encode(np.random.rand(468 * 3).astype(np.float32).tobytes()).decode()
+    now = time.time()
+    return json.dumps({
+        "type": "landmarks_batch",
+        "fps": 10,
+        "ts": now,
+        "frames": [{"ts": now, "lm": lm} for _ in range(frames)]
+    })
+
+
+class LoadStats:
+    def __init__(self):
+        self.connected = 0
+        self.failed = 0
+        self.closed_early = 0
+        self.peak_open = 0
+        self.open = 0
+        self.connect_times: List[float] = []
+        self.rtts: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.worker_peaks: Dict[int, int] = {}
+
+    def error(self, e: Exception):
+        key = type(e).__name__
+        self.errors[key] = self.errors.get(key, 0) + 1
+
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {}
+    arr = np.asarray(values) * 1000.0
+    return {
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p90_ms": float(np.percentile(arr, 90)),
+        "p99_ms": float(np.percentile(arr, 99)),
+        "max_ms": float(arr.max()),
+    }
+
+
+async def _client(url: str, stats: LoadStats, payload: str, interval: float, stop: asyncio.Event):
+    t0 = time.perf_counter()
+    try:
+        ws = await websockets.connect(url, open_timeout=15, max_size=None)
+    except Exception as e:
+        stats.failed += 1
+        stats.error(e)
+        return
+
+    stats.connect_times.append(time.perf_counter() - t0)
+    stats.connected += 1
+    stats.open += 1
+    stats.peak_open = max(stats.peak_open, stats.open)
+
+    try:
+        while not stop.is_set():
+            sent = time.perf_counter()
+            await ws.send(payload)
+            await ws.recv()
+            stats.rtts.append(time.perf_counter() - sent)
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+    except Exception as e:
+        stats.closed_early += 1
+        stats.error(e)
+    finally:
+        stats.open -= 1
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+
+async def _poll_worker_stats(stats_url: str, stats: LoadStats, stop: asyncio.Event):
+    """연결 레지스트리 통계를 반복 조회해 워커별 최대 소켓 수를 기록합니다."""
+    # keep-alive 를 끄고 매번 새 연결을 열어야 SO_REUSEPORT 로 여러 워커에 분산됨
+    async with httpx.AsyncClient(timeout=5.0, headers={"Connection": "close"}) as client:
+        while not stop.is_set():
+            try:
+                resp = await client.get(stats_url)
+                data = resp.json()
+                data = data.get("websockets", data)
+                pid = int(data.get("pid", 0))
+                stats.worker_peaks[pid] = max(stats.worker_peaks.get(pid, 0), int(data.get("active", 0)))
+            except Exception:
+                pass
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=0.2)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def run_load_test(base_url: str,
+                        connections: int,
+                        ramp_per_sec: float,
+                        hold_seconds: float,
+                        interval: float,
+                        frames: int,
+                        stats_url: Optional[str]) -> Dict[str, Any]:
+    url = base_url.rstrip("/") + "/ws/landmarks"
+    payload = _make_batch(frames)
+    stats = LoadStats()
+    stop = asyncio.Event()
+
+    poller = asyncio.create_task(_poll_worker_stats(stats_url, stats, stop)) if stats_url else None
+
+    started = time.perf_counter()
+    tasks = []
+    delay = 1.0 / ramp_per_sec if ramp_per_sec > 0 else 0.0
+    for _ in range(connections):
+        tasks.append(asyncio.create_task(_client(url, stats, payload, interval, stop)))
+        if delay:
+            await asyncio.sleep(delay)
+    ramp_seconds = time.perf_counter() - started
+
+    await asyncio.sleep(hold_seconds)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if poller:
+        await poller
+
+    return {
+        "url": url,
+        "requested": connections,
+        "connected": stats.connected,
+        "failed": stats.failed,
+        "closed_early": stats.closed_early,
+        "peak_open": stats.peak_open,
+        "ramp_seconds": ramp_seconds,
+        "messages": len(stats.rtts),
+        "connect_time": _percentiles(stats.connect_times),
+        "rtt": _percentiles(stats.rtts),
+        "errors": stats.errors,
+        "worker_peak_sockets": stats.worker_peaks,
+        "workers_seen": len(stats.worker_peaks),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="WebSocket 연결 부하 테스트")
+    parser.add_argument("--url", default="ws://localhost:8000", help="WebSocket 베이스 URL")
+    parser.add_argument("--connections", type=int, default=200, help="동시 연결 수")
+    parser.add_argument("--ramp", type=float, default=100.0, help="초당 신규 연결 수 (0 = 즉시)")
+    parser.add_argument("--hold", type=float, default=30.0, help="모든 연결 유지 시간(초)")
+    parser.add_argument("--interval", type=float, default=1.0, help="연결당 배치 전송 주기(초)")
+    parser.add_argument("--frames", type=int, default=3, help="배치당 프레임 수")
+    parser.add_argument("--stats-url", help="연결 통계 URL (기본: <url>/api/ws/stats)")
+    args = parser.parse_args(argv)
+
+    stats_url = args.stats_url
+    if stats_url is None:
+        stats_url = args.url.replace("ws://", "http://").replace("wss://", "https://").rstrip("/") + "/api/ws/stats"
+
+    report = asyncio.run(run_load_test(
+        args.url, args.connections, args.ramp, args.hold, args.interval, args.frames, stats_url
+    ))
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
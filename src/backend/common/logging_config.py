@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+로깅 설정
+- JSON 출력 (python-json-logger, 미설치 시 텍스트), 모듈별 레벨 (LOG_LEVELS)
+- QueueHandler -> QueueListener: 요청 경로에서는 큐에 넣기만 하고 stdout 쓰기는 리스너 스레드에서
+  (큐가 가득 차면 기다리지 않고 버림 - 버린 개수는 다음 기록에 dropped 로 표시)
+- 같은 위치(모듈:줄)의 로그는 구간당 LOG_RATE_LIMIT 개까지만 (WARNING 미만) - 프레임 단위 로그 폭주 방지
+"""
+
+import os
+import sys
+import copy
+import time
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional, Tuple
+
+try:
+    from pythonjsonlogger import jsonlogger
+    JSON_LOGGER_AVAILABLE = True
+except ImportError:
+    JSON_LOGGER_AVAILABLE = False
+
+# 기본 레벨 / 모듈별 레벨 ("backend.core.main_server=DEBUG,uvicorn.access=WARNING")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# json | text
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# 같은 위치 로그의 구간당 최대 개수 (0 = 제한 없음)
+LOG_RATE_LIMIT = int(os.getenv("LOG_RATE_LIMIT", "20"))
+LOG_RATE_WINDOW_SEC = float(os.getenv("LOG_RATE_WINDOW_SEC", "10"))
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+JSON_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+_listener: Optional[QueueListener] = None
+_lock = threading.Lock()
+
+
+class RateLimitFilter(logging.Filter):
+    """위치(로거, 줄)별 고정 구간 카운터 - 초과분은 버리고 다음 구간 첫 기록에 suppressed 로 표시"""
+
+    def __init__(self, limit: int = LOG_RATE_LIMIT, window: float = LOG_RATE_WINDOW_SEC,
+                 min_exempt_level: int = logging.WARNING):
+        super().__init__()
+        self.limit = limit
+        self.window = window
+        self.min_exempt_level = min_exempt_level
+        # key -> [구간 시작, 구간 내 개수, 버린 개수]
+        self._windows: Dict[Tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.limit <= 0 or record.levelno >= self.min_exempt_level:
+            return True
+        key = (record.name, record.lineno)
+        now = time.monotonic()
+        state = self._windows.get(key)
+        if state is None or now - state[0] >= self.window:
+            suppressed = state[2] if state else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+        if state[1] >= self.limit:
+            state[2] += 1
+            return False
+        state[1] += 1
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """큐가 가득 차도 호출 스레드를 막지 않는 QueueHandler"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지 인자만 합치고 예외 스택은 exc_text 로 분리 (JSON 포맷터가 exc_info 필드로 출력)
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.dropped:
+            record.dropped = self.dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if getattr(record, "dropped", 0):
+            self.dropped = 0
+
+
+def _formatter() -> logging.Formatter:
+    if LOG_FORMAT == "json" and JSON_LOGGER_AVAILABLE:
+        return jsonlogger.JsonFormatter(
+            JSON_FORMAT,
+            rename_fields={"asctime": "timestamp", "levelname": "level", "name": "logger"},
+            json_ensure_ascii=False
+        )
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def _apply_module_levels(spec: str):
+    for item in spec.split(","):
+        name, sep, level = item.strip().partition("=")
+        if sep and name and level:
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+
+
+def setup_logging(level: str = LOG_LEVEL, module_levels: str = LOG_LEVELS) -> QueueListener:
+    """루트 로거를 큐 핸들러로 교체 (여러 번 호출해도 한 번만 설정)"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            return _listener
+
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(_formatter())
+
+        log_queue: queue.Queue = queue.Queue(maxsize=max(1, LOG_QUEUE_SIZE))
+        queue_handler = DroppingQueueHandler(log_queue)
+        queue_handler.addFilter(RateLimitFilter())
+
+        root = logging.getLogger()
+        # 다른 모듈의 basicConfig 로 붙은 동기 핸들러 제거
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+        _apply_module_levels(module_levels)
+
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """큐에 남은 로그를 모두 출력하고 리스너 종료"""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+공용 JSON 직렬화
+- orjson 기반 (numpy 배열/스칼라, datetime 네이티브 처리)
+- orjson 이 없으면 표준 json + numpy 변환 폴백
+- HTTP 기본 응답 클래스(FastJSONResponse)와 모든 WebSocket 송신 경로가 공유
+"""
+
+import json
+import datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any) -> Any:
+    """orjson/json 이 직접 처리하지 못하는 타입 변환 (ObjectId, 비연속 배열 등)"""
+    if NUMPY_AVAILABLE:
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.generic):
+            return obj.item()
+    if isinstance(obj, (datetime.datetime, datetime.date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode("utf-8", errors="replace")
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    return str(obj)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """객체를 UTF-8 JSON 바이트로 직렬화합니다."""
+    if ORJSON_AVAILABLE:
+        options = _ORJSON_OPTIONS | orjson.OPT_SORT_KEYS if sort_keys else _ORJSON_OPTIONS
+        return orjson.dumps(obj, default=_default, option=options)
+    return json.dumps(
+        obj, default=_default, ensure_ascii=False, separators=(",", ":"), sort_keys=sort_keys
+    ).encode("utf-8")
+
+
+def dumps_text(obj: Any, sort_keys: bool = False) -> str:
+    """WebSocket 텍스트 프레임용 JSON 문자열"""
+    return dumps(obj, sort_keys=sort_keys).decode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """JSON 문자열/바이트를 파싱합니다."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """FastAPI 기본 응답 클래스 - orjson 으로 렌더링"""
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+__all__ = ["dumps", "dumps_text", "loads", "FastJSONResponse", "ORJSON_AVAILABLE"]
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+WebSocket 연결 레지스트리
+- 단일 ASGI 앱의 모든 WebSocket 라우트가 공유하는 연결 관리자
+- 채널(landmarks / telemetry / analysis)별 연결 추적
+- 연결마다 제한된 송신 큐 + 전용 writer 태스크 (느린 클라이언트가 다른 연결을 막지 않음)
+- 워커 프로세스 단위 (SO_REUSEPORT 멀티 워커에서는 워커마다 하나)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Union
+
+from fastapi import WebSocket
+
+from ..common.serialization import dumps_text
+
+try:
+    from ..monitoring.monitoring import (
+        WEBSOCKET_CONNECTIONS, WEBSOCKET_MESSAGES, WEBSOCKET_SEND_QUEUE_DEPTH
+    )
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 연결당 송신 큐 크기 / 초과 정책 (drop_oldest | drop_newest | close)
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "64"))
+WS_OVERFLOW_POLICY = os.getenv("WS_OVERFLOW_POLICY", "drop_oldest").lower()
+# 단일 전송이 이 시간을 넘기면 느린 소비자로 보고 연결 종료
+WS_SEND_TIMEOUT_SEC = float(os.getenv("WS_SEND_TIMEOUT_SEC", "5.0"))
+
+Message = Union[str, bytes]
+
+
+@dataclass(eq=False)
+class ConnectionInfo:
+    """연결 하나의 메타데이터와 송신 큐"""
+    websocket: WebSocket
+    channel: str
+    client_host: Optional[str]
+    queue: asyncio.Queue
+    connected_at: float = field(default_factory=time.time)
+    writer: Optional[asyncio.Task] = None
+    sent: int = 0
+    dropped: int = 0
+    closed: bool = False
+
+
+class ConnectionRegistry:
+    """채널별 WebSocket 연결 레지스트리"""
+
+    def __init__(self,
+                 queue_size: int = WS_SEND_QUEUE_SIZE,
+                 overflow_policy: str = WS_OVERFLOW_POLICY,
+                 send_timeout: float = WS_SEND_TIMEOUT_SEC):
+        # 채널 -> {websocket: info}, dict 기반이라 등록/해제 모두 O(1)
+        self._channels: Dict[str, Dict[WebSocket, ConnectionInfo]] = {}
+        self.queue_size = max(1, queue_size)
+        self.overflow_policy = overflow_policy
+        self.send_timeout = send_timeout
+        self.total_accepted = 0
+        self.total_dropped = 0
+        self.slow_consumers_closed = 0
+
+    async def connect(self, websocket: WebSocket, channel: str) -> ConnectionInfo:
+        """연결을 수락하고 채널에 등록합니다."""
+        await websocket.accept()
+        return self.register(websocket, channel)
+
+    def register(self, websocket: WebSocket, channel: str) -> ConnectionInfo:
+        client_host = websocket.client.host if websocket.client else None
+        info = ConnectionInfo(
+            websocket=websocket,
+            channel=channel,
+            client_host=client_host,
+            queue=asyncio.Queue(maxsize=self.queue_size)
+        )
+        info.writer = asyncio.create_task(self._writer(info))
+        self._channels.setdefault(channel, {})[websocket] = info
+        self.total_accepted += 1
+        self._update_connection_gauge()
+        logger.info(f"🔗 WebSocket 연결 수락 [{channel}]: {client_host}")
+        return info
+
+    def disconnect(self, websocket: WebSocket, channel: str):
+        """채널에서 연결을 제거하고 writer 를 정리합니다 (중복 호출 안전)."""
+        info = self._channels.get(channel, {}).pop(websocket, None)
+        if info is None:
+            return
+        info.closed = True
+        if info.writer is not None and info.writer is not self._current_task():
+            try:
+                info.writer.cancel()
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힌 종료 경로 (시그널 핸들러)
+                pass
+        self._discard_queue(info)
+        self._update_connection_gauge()
+        logger.info(f"🔌 WebSocket 연결 종료 [{channel}]: {info.client_host}")
+
+    @staticmethod
+    def _current_task() -> Optional[asyncio.Task]:
+        try:
+            return asyncio.current_task()
+        except RuntimeError:
+            return None
+
+    # ---------- 송신 ----------
+
+    @staticmethod
+    def encode(message: Any) -> Message:
+        """dict/list 는 한 번만 JSON 으로 직렬화합니다 (orjson, numpy 네이티브)."""
+        if isinstance(message, (str, bytes)):
+            return message
+        return dumps_text(message)
+
+    def send(self, websocket: WebSocket, channel: str, message: Any) -> bool:
+        """
+        연결의 송신 큐에 메시지를 넣습니다 (O(1), 대기 없음).
+        연결이 없거나 초과 정책으로 닫혔으면 False 를 반환합니다.
+        """
+        info = self._channels.get(channel, {}).get(websocket)
+        if info is None or info.closed:
+            return False
+        return self._enqueue(info, self.encode(message))
+
+    def _enqueue(self, info: ConnectionInfo, payload: Message) -> bool:
+        try:
+            info.queue.put_nowait(payload)
+        except asyncio.QueueFull:
+            if self.overflow_policy == "close":
+                self._close_slow_consumer(info, "send queue overflow")
+                return False
+            self._record_drop(info)
+            if self.overflow_policy == "drop_newest":
+                return True
+            # drop_oldest: 가장 오래된 메시지를 버리고 최신 메시지 유지
+            info.queue.get_nowait()
+            self._queue_depth(info.channel, -1)
+            info.queue.put_nowait(payload)
+        self._queue_depth(info.channel, 1)
+        return True
+
+    async def _writer(self, info: ConnectionInfo):
+        """연결 전용 writer - 큐에서 꺼내 순서대로 전송"""
+        websocket = info.websocket
+        try:
+            while True:
+                payload = await info.queue.get()
+                self._queue_depth(info.channel, -1)
+                try:
+                    if isinstance(payload, bytes):
+                        await asyncio.wait_for(websocket.send_bytes(payload), timeout=self.send_timeout)
+                    else:
+                        await asyncio.wait_for(websocket.send_text(payload), timeout=self.send_timeout)
+                except asyncio.TimeoutError:
+                    self._close_slow_consumer(info, f"send timeout {self.send_timeout}s")
+                    return
+                info.sent += 1
+                if METRICS_AVAILABLE:
+                    WEBSOCKET_MESSAGES.labels(direction="outbound", type=info.channel).inc()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"WebSocket 전송 실패 [{info.channel}]: {e}")
+            self.disconnect(websocket, info.channel)
+
+    def _close_slow_consumer(self, info: ConnectionInfo, reason: str):
+        logger.warning(f"⚠️ 느린 WebSocket 소비자 연결 종료 [{info.channel}]: {info.client_host} ({reason})")
+        self.slow_consumers_closed += 1
+        self.disconnect(info.websocket, info.channel)
+        asyncio.create_task(self._safe_close(info.websocket, 1013, "Slow consumer"))
+
+    @staticmethod
+    async def _safe_close(websocket: WebSocket, code: int, reason: str):
+        try:
+            await websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+    async def broadcast(self, channel: str, message: Any) -> int:
+        """채널의 모든 연결에 한 번 인코딩한 메시지를 큐잉합니다. 큐잉된 연결 수를 반환."""
+        payload = self.encode(message)
+        delivered = 0
+        for info in list(self._channels.get(channel, {}).values()):
+            if self._enqueue(info, payload):
+                delivered += 1
+        return delivered
+
+    # ---------- 메트릭 ----------
+
+    def record_inbound(self, channel: str):
+        if METRICS_AVAILABLE:
+            WEBSOCKET_MESSAGES.labels(direction="inbound", type=channel).inc()
+
+    def _record_drop(self, info: ConnectionInfo):
+        info.dropped += 1
+        self.total_dropped += 1
+        if METRICS_AVAILABLE:
+            WEBSOCKET_MESSAGES.labels(direction="dropped", type=info.channel).inc()
+
+    def _queue_depth(self, channel: str, delta: int):
+        if METRICS_AVAILABLE:
+            WEBSOCKET_SEND_QUEUE_DEPTH.labels(channel=channel).inc(delta)
+
+    def _discard_queue(self, info: ConnectionInfo):
+        pending = info.queue.qsize()
+        if pending:
+            self._queue_depth(info.channel, -pending)
+            while not info.queue.empty():
+                info.queue.get_nowait()
+
+    def _update_connection_gauge(self):
+        if METRICS_AVAILABLE:
+            WEBSOCKET_CONNECTIONS.set(self.count())
+
+    # ---------- 조회 ----------
+
+    def connections(self, channel: str) -> List[WebSocket]:
+        return list(self._channels.get(channel, {}))
+
+    def count(self, channel: Optional[str] = None) -> int:
+        if channel is not None:
+            return len(self._channels.get(channel, {}))
+        return sum(len(conns) for conns in self._channels.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """워커별 연결/큐 현황 (헬스체크/부하 테스트용)"""
+        depths = [info.queue.qsize() for conns in self._channels.values() for info in conns.values()]
+        return {
+            "pid": os.getpid(),
+            "active": self.count(),
+            "total_accepted": self.total_accepted,
+            "channels": {name: len(conns) for name, conns in self._channels.items()},
+            "queued": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "dropped": self.total_dropped,
+            "slow_consumers_closed": self.slow_consumers_closed,
+            "overflow_policy": self.overflow_policy,
+        }
+
+    # ---------- 종료 ----------
+
+    async def close_all(self, code: int = 1000, reason: str = "Server shutdown"):
+        """서버 종료 시 모든 연결을 닫습니다."""
+        for channel, conns in list(self._channels.items()):
+            for websocket in list(conns):
+                self.disconnect(websocket, channel)
+                await self._safe_close(websocket, code, reason)
+
+    def clear(self):
+        for channel, conns in list(self._channels.items()):
+            for websocket in list(conns):
+                self.disconnect(websocket, channel)
+
+
+# 전역 레지스트리 인스턴스
+registry = ConnectionRegistry()
@@ -8,10 +8,16 @@ import os
 import sys
 import logging
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import asyncio
 import time
 
+from ..common.logging_config import setup_logging
+
+# JSON 구조화 로그 + 큐 리스너 (stdout 쓰기는 리스너 스레드에서) - 다른 모듈 import 전에 설정
+setup_logging()
+logger = logging.getLogger(__name__)
+
 # matplotlib 경고 해결을 위한 설정 디렉토리 설정
 import tempfile
 
@@ -19,9 +25,9 @@ import tempfile
 if not os.getenv('MPLCONFIGDIR'):
     matplotlib_config_dir = tempfile.mkdtemp(prefix='matplotlib_')
     os.environ['MPLCONFIGDIR'] = matplotlib_config_dir
-    print(f"📁 matplotlib 임시 디렉토리 생성: {matplotlib_config_dir}")
+    logger.debug(f"📁 matplotlib 임시 디렉토리 생성: {matplotlib_config_dir}")
 else:
-    print(f"📁 matplotlib 설정 디렉토리 사용: {os.getenv('MPLCONFIGDIR')}")
+    logger.debug(f"📁 matplotlib 설정 디렉토리 사용: {os.getenv('MPLCONFIGDIR')}")
 
 # 프로젝트 루트 경로 설정
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
@@ -30,7 +36,6 @@ sys.path.insert(0, str(BASE_DIR))
 # FastAPI 및 관련 라이브러리 import
 from fastapi import FastAPI, Request, HTTPException, WebSocket, WebSocketDisconnect, File, UploadFile, Depends
 from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse, FileResponse, Response
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, ValidationError
 import base64
@@ -43,32 +48,41 @@ import cv2
 
 # 로컬 모듈 import (선택적)
 try:
-    from ..database.database import get_database, init_database, create_chat_session_with_persona, get_user_sessions, get_session_messages, save_message, create_chat_session, get_user_by_email, supabase_uuid_to_objectid, users_collection, chat_sessions_collection, diagnose_database
+    from ..database.mongo_client import pool_settings as mongo_pool_settings
+    from ..database.database import get_database, init_database, create_chat_session_with_persona, get_user_sessions, get_session_info, get_session_persona, get_session_messages, get_session_messages_page, get_session_version, compact_message_page, save_message, append_messages, create_chat_session, get_user_by_email, supabase_uuid_to_objectid, users_collection, chat_sessions_collection, calibration_sessions_collection, diagnose_database
+    from bson import ObjectId
+    from ..services.write_behind import write_behind
     DATABASE_AVAILABLE = True
 except ImportError as e:
-    print(f"⚠️ 데이터베이스 모듈 로드 실패: {e}")
+    logger.warning(f"⚠️ 데이터베이스 모듈 로드 실패: {e}")
     DATABASE_AVAILABLE = False
 
 try:
     from ..services.vector_service import vector_service, VECTOR_SERVICE_AVAILABLE
     VECTOR_SERVICE_AVAILABLE = True
 except ImportError as e:
-    print(f"⚠️ 벡터 서비스 모듈 로드 실패: {e}")
+    logger.warning(f"⚠️ 벡터 서비스 모듈 로드 실패: {e}")
     VECTOR_SERVICE_AVAILABLE = False
 
 try:
     from ..monitoring.monitoring import monitoring, get_metrics, start_timer, record_request_metrics
+    from ..monitoring.tracing import MetricsMiddleware, span
+    from ..monitoring.system_sampler import system_sampler
+    from ..monitoring.blocking_detector import blocking_detector, BLOCKING_DETECTOR
     MONITORING_AVAILABLE = True
 except ImportError as e:
-    print(f"⚠️ 모니터링 모듈 로드 실패: {e}")
+    logger.warning(f"⚠️ 모니터링 모듈 로드 실패: {e}")
     MONITORING_AVAILABLE = False
+    # 모니터링 없이도 with span(...) 구문은 그대로 동작
+    from contextlib import nullcontext as span
 
 # 인증 모듈 import (선택적)
 try:
-    from ..auth.auth import get_current_user, get_current_user_id
+    from ..auth.auth import get_current_user, get_current_user_id, get_identity, anonymous_user_id
+    from ..auth.jwt_verifier import jwt_verifier
     AUTH_AVAILABLE = True
 except ImportError as e:
-    print(f"⚠️ 인증 모듈 로드 실패: {e}")
+    logger.warning(f"⚠️ 인증 모듈 로드 실패: {e}")
     AUTH_AVAILABLE = False
 
 
@@ -81,23 +95,23 @@ try:
     from ..services.analysis.expression_analyzer import expression_analyzer
     import cv2
     EXPRESSION_ANALYSIS_AVAILABLE = True
-    print("✅ 표정 분석 모듈 로드됨")
+    logger.info("✅ 표정 분석 모듈 로드됨")
 except ImportError as e:
-    print(f"⚠️ 표정 분석 모듈 로드 실패: {e}")
+    logger.warning(f"⚠️ 표정 분석 모듈 로드 실패: {e}")
     EXPRESSION_ANALYSIS_AVAILABLE = False
 
 # MediaPipe 분석 모듈 import
 try:
     from ..services.analysis.mediapipe_analyzer import mediapipe_analyzer
     MEDIAPIPE_ANALYSIS_AVAILABLE = True
-    print("✅ MediaPipe 분석 모듈 로드됨")
+    logger.info("✅ MediaPipe 분석 모듈 로드됨")
 except ImportError as e:
-    print(f"⚠️ MediaPipe 분석 모듈 로드 실패: {e}")
+    logger.warning(f"⚠️ MediaPipe 분석 모듈 로드 실패: {e}")
     MEDIAPIPE_ANALYSIS_AVAILABLE = False
 
 # 벡터 서비스 모듈 import (이미 위에서 import됨)
 VECTOR_SERVICE_AVAILABLE = True
-print("✅ 벡터 서비스 모듈 로드됨")
+logger.info("✅ 벡터 서비스 모듈 로드됨")
 
 # 벡터 서비스 초기화 (실패해도 전체 시스템에 영향 없음)
 async def initialize_vector_service():
@@ -106,13 +120,13 @@ async def initialize_vector_service():
         try:
             success = await vector_service.initialize()
             if success:
-                print("✅ 벡터 서비스 초기화 성공")
+                logger.info("✅ 벡터 서비스 초기화 성공")
             else:
-                print("⚠️ 벡터 서비스 초기화 실패 (선택적 기능)")
+                logger.warning("⚠️ 벡터 서비스 초기화 실패 (선택적 기능)")
         except Exception as e:
-            print(f"⚠️ 벡터 서비스 초기화 오류 (선택적 기능): {e}")
+            logger.warning(f"⚠️ 벡터 서비스 초기화 오류 (선택적 기능): {e}")
     else:
-        print("⚠️ 벡터 서비스 모듈 없음 (선택적 기능)")
+        logger.warning("⚠️ 벡터 서비스 모듈 없음 (선택적 기능)")
 
 # 음성 분석 모듈 import (지연 로딩으로 메모리 최적화)
 VOICE_ANALYSIS_AVAILABLE = True  # 활성화
@@ -128,10 +142,10 @@ def load_voice_models():
         from ..services.voice.voice_api import preload_voice_models, process_audio_simple
         VOICE_ANALYSIS_AVAILABLE = True
         _voice_models_loaded = True
-        print("✅ 음성 분석 모듈 지연 로딩 성공")
+        logger.info("✅ 음성 분석 모듈 지연 로딩 성공")
         return True
     except Exception as e:
-        print(f"⚠️ 음성 분석 모듈 지연 로딩 실패: {e}")
+        logger.warning(f"⚠️ 음성 분석 모듈 지연 로딩 실패: {e}")
         return False
 
 # TTS 모듈 import
@@ -139,36 +153,36 @@ try:
     import edge_tts
     import tempfile
     TTS_AVAILABLE = True
-    print("✅ Edge-TTS 모듈 로드 성공")
+    logger.info("✅ Edge-TTS 모듈 로드 성공")
 except ImportError as e:
-    print(f"⚠️ Edge-TTS 모듈 로드 실패: {e}")
+    logger.warning(f"⚠️ Edge-TTS 모듈 로드 실패: {e}")
     TTS_AVAILABLE = False
 
 # PyTorch CUDA 지원 상태 확인
 try:
     import torch
     cuda_available = torch.cuda.is_available()
-    print(f"🖥️ PyTorch CUDA 지원 상태: {cuda_available}")
+    logger.debug(f"🖥️ PyTorch CUDA 지원 상태: {cuda_available}")
     
     if cuda_available:
-        print(f"🎮 GPU 개수: {torch.cuda.device_count()}")
-        print(f"🎮 현재 GPU: {torch.cuda.current_device()}")
-        print(f"🎮 GPU 이름: {torch.cuda.get_device_name(0)}")
-        print(f"🎮 GPU 메모리: {torch.cuda.get_device_properties(0).total_memory / 1024**3:.1f} GB")
-        print(f"🎮 CUDA 버전: {torch.version.cuda}")
-        print(f"🎮 PyTorch 버전: {torch.__version__}")
+        logger.debug(f"🎮 GPU 개수: {torch.cuda.device_count()}")
+        logger.debug(f"🎮 현재 GPU: {torch.cuda.current_device()}")
+        logger.debug(f"🎮 GPU 이름: {torch.cuda.get_device_name(0)}")
+        logger.debug(f"🎮 GPU 메모리: {torch.cuda.get_device_properties(0).total_memory / 1024**3:.1f} GB")
+        logger.debug(f"🎮 CUDA 버전: {torch.version.cuda}")
+        logger.debug(f"🎮 PyTorch 버전: {torch.__version__}")
     else:
-        print("⚠️ CUDA가 지원되지 않는 환경입니다. CPU를 사용합니다.")
-        print(f"🎮 PyTorch 버전: {torch.__version__}")
+        logger.warning("⚠️ CUDA가 지원되지 않는 환경입니다. CPU를 사용합니다.")
+        logger.debug(f"🎮 PyTorch 버전: {torch.__version__}")
 except ImportError as e:
-    print(f"⚠️ PyTorch 모듈 로드 실패: {e}")
+    logger.warning(f"⚠️ PyTorch 모듈 로드 실패: {e}")
 
 # OpenAI API 설정
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 if OPENAI_API_KEY:
-    print("✅ OpenAI API 키 설정 완료")
+    logger.info("✅ OpenAI API 키 설정 완료")
 else:
-    print("⚠️ OpenAI API 키가 설정되지 않았습니다")
+    logger.warning("⚠️ OpenAI API 키가 설정되지 않았습니다")
 
 APP_NAME = os.getenv("APP_NAME", "vision-backend")
 PORT = int(os.getenv("PORT", "8000"))
@@ -207,17 +221,61 @@ class MessageResponse(BaseModel):
 BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent  # 프로젝트 루트로
 TEMPLATES_DIR = BASE_DIR / "src" / "backend" / "templates"
 
-app = FastAPI(title=APP_NAME)
+# 공용 orjson 직렬화 (numpy 네이티브) - 모든 HTTP 응답의 기본 클래스
+from ..common.serialization import FastJSONResponse
+from ..services.context_assembler import context_assembler
+from ..services.personas.persona_registry import persona_registry
+from ..services.personas.session_personas import session_personas
+from ..services.personas.prompt_protocol import compile_messages
+from .static_assets import AssetManifest
+
+app = FastAPI(title=APP_NAME, default_response_class=FastJSONResponse)
+
+# 정적 파일: 시작 시 만든 매니페스트(경로 → 파일/크기/ETag/압축본)로 서빙
+# 이름 있는 경로는 마운트보다 먼저 등록 (마운트가 같은 접두사를 가로채지 않도록)
+FRONTEND_DIR = BASE_DIR / "src" / "frontend"
+static_assets = AssetManifest(FRONTEND_DIR)
+
+@app.get("/frontend/video/{filename:path}")
+@app.get("/api/gke/frontend/video/{filename:path}")
+async def get_video(filename: str, request: Request):
+    """비디오 파일 서빙 (Range 지원)"""
+    return static_assets.response(request, f"assets/videos/{filename}", f"video/{filename}")
+
+@app.get("/frontend/img/{filename:path}")
+async def serve_frontend_image(filename: str, request: Request):
+    """frontend 이미지 파일 제공"""
+    return static_assets.response(request, f"assets/images/{filename}")
+
+@app.get("/studio/img/{filename}")
+async def serve_studio_image(filename: str, request: Request):
+    """studio 이미지 파일 제공"""
+    return static_assets.response(request, f"assets/images/{filename}")
+
+@app.get("/dys_logo.png")
+async def serve_dys_logo(request: Request):
+    """데연소 로고 파일 제공"""
+    return static_assets.response(request, "assets/images/dys_logo.png")
 
-# 정적 파일 서빙 설정
-app.mount("/frontend", StaticFiles(directory=str(BASE_DIR / "src" / "frontend")), name="frontend")
-app.mount("/api/gke/frontend", StaticFiles(directory=str(BASE_DIR / "src" / "frontend")), name="api_gke_frontend")
-app.mount("/dys_studio", StaticFiles(directory=str(BASE_DIR / "src" / "frontend")), name="dys_studio")
-app.mount("/dys_studio/pages", StaticFiles(directory=str(BASE_DIR / "src" / "frontend" / "pages")), name="dys_studio_pages")
-app.mount("/dys_studio/assets", StaticFiles(directory=str(BASE_DIR / "src" / "frontend" / "assets")), name="dys_studio_assets")
-app.mount("/dys_studio/popups", StaticFiles(directory=str(BASE_DIR / "src" / "frontend" / "assets" / "popups")), name="dys_studio_popups")
-app.mount("/assets", StaticFiles(directory=str(BASE_DIR / "src" / "frontend" / "assets")), name="assets")
-app.mount("/api/gke/assets", StaticFiles(directory=str(BASE_DIR / "src" / "frontend" / "assets")), name="api_gke_assets")
+@app.get("/frontend/studio_calibration")
+@app.get("/frontend/studio_calibration.html")
+@app.get("/dys_studio/studio_calibration")
+@app.get("/dys_studio/studio_calibration.html")
+@app.get("/api/gke/dys_studio/studio_calibration")
+@app.get("/api/gke/dys_studio/studio_calibration.html")
+async def studio_calibration_page(request: Request):
+    """Studio 캘리브레이션 페이지 제공 (기존 경로 / Vercel 프록시 호환)"""
+    return static_assets.response(request, "pages/studio_calibration.html")
+
+# 하위 경로 마운트를 상위 경로보다 먼저 (/dys_studio 가 /dys_studio/popups 를 가리지 않도록)
+app.mount("/dys_studio/pages", static_assets.mount("pages"), name="dys_studio_pages")
+app.mount("/dys_studio/assets", static_assets.mount("assets"), name="dys_studio_assets")
+app.mount("/dys_studio/popups", static_assets.mount("assets/popups"), name="dys_studio_popups")
+app.mount("/dys_studio", static_assets.mount(), name="dys_studio")
+app.mount("/frontend", static_assets.mount(), name="frontend")
+app.mount("/api/gke/frontend", static_assets.mount(), name="api_gke_frontend")
+app.mount("/assets", static_assets.mount("assets"), name="assets")
+app.mount("/api/gke/assets", static_assets.mount("assets"), name="api_gke_assets")
 
 # CORS 허용 도메인 설정 - 환경변수에서 가져오기
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
@@ -240,18 +298,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 경로 템플릿 기준 HTTP 메트릭 + 단계별 스팬 컨텍스트 (CORS 바깥에서 전체 요청 시간 측정)
+if MONITORING_AVAILABLE:
+    app.add_middleware(MetricsMiddleware)
+
 # FastAPI 이벤트 핸들러 추가
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 실행"""
-    print(f"🚀 {APP_NAME} 서버 시작됨 (포트: {PORT})")
-    print(f"📋 [STARTUP] MongoDB 연결 상태: {DATABASE_AVAILABLE}")
-    print(f"📋 [STARTUP] 서버 URL: http://0.0.0.0:{PORT}")
+    logger.info(f"🚀 {APP_NAME} 서버 시작됨 (포트: {PORT})")
+    logger.debug(f"📋 [STARTUP] MongoDB 연결 상태: {DATABASE_AVAILABLE}")
+    logger.debug(f"📋 [STARTUP] 서버 URL: http://0.0.0.0:{PORT}")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """서버 종료 시 실행"""
-    print("🛑 서버 종료 이벤트 수신 - 리소스 정리 중...")
+    logger.info("🛑 서버 종료 이벤트 수신 - 리소스 정리 중...")
     await cleanup_on_shutdown()
 
 
@@ -260,7 +322,6 @@ async def shutdown_event():
 # 전역 변수 초기화 (UI-only mode)
 _pipeline = None
 process_interval_sec = 1.0
-debug_overlay = False
 
 # 파이프라인 제거됨 - 클라이언트 측에서 모든 분석 처리
 
@@ -277,6 +338,17 @@ def health():
         "ok": True, 
         "service": APP_NAME,
         "DATABASE_AVAILABLE": DATABASE_AVAILABLE,
+        "websockets": ws_registry.stats(),
+        "write_behind": write_behind.stats() if DATABASE_AVAILABLE else None,
+        "mongo_pool": mongo_pool_settings() if DATABASE_AVAILABLE else None,
+        "context": context_assembler.stats(),
+        "personas": persona_registry.stats(),
+        "session_personas": session_personas.stats(),
+        "auth": jwt_verifier.stats() if AUTH_AVAILABLE else None,
+        "system_sampler": system_sampler.stats() if MONITORING_AVAILABLE else None,
+        "blocking": blocking_detector.stats() if MONITORING_AVAILABLE else None,
+        "calibration": {**calibration_service.stats(), "sessions": calibration_sessions.stats()} if CALIBRATION_AVAILABLE else None,
+        "static_assets": static_assets.stats(),
         "timestamp": time.time()
     }
 
@@ -284,102 +356,10 @@ def health():
 
 # /webcam 엔드포인트 제거됨 - 사용하지 않음
 
-@app.get("/frontend/video/{filename}")
-@app.get("/api/gke/frontend/video/{filename}")
-async def get_video(filename: str):
-    """비디오 파일 직접 서빙"""
-    import os
-    print(f"🔍 [VIDEO] 요청: {filename}")
-    
-    # 가능한 경로들
-    possible_paths = [
-        str(BASE_DIR / "src" / "frontend" / "assets" / "videos" / filename),
-        f"src/frontend/assets/videos/{filename}",
-        f"frontend/assets/videos/{filename}",
-        f"assets/videos/{filename}",
-        f"videos/{filename}",
-        f"/usr/src/app/src/frontend/assets/videos/{filename}",
-        f"/workspace/app/src/frontend/assets/videos/{filename}"
-    ]
-    
-    for i, file_path in enumerate(possible_paths, 1):
-        print(f"📁 [VIDEO] 시도 {i}: {file_path}")
-        if os.path.exists(file_path):
-            print(f"✅ [VIDEO] 파일 발견: {file_path}")
-            # 파일 크기 확인
-            file_size = os.path.getsize(file_path)
-            print(f"📊 [VIDEO] 파일 크기: {file_size} bytes")
-            
-            # 파일 확장자에 따른 MIME 타입 설정
-            if filename.endswith('.mp4'):
-                media_type = "video/mp4"
-            elif filename.endswith('.webm'):
-                media_type = "video/webm"
-            elif filename.endswith('.avi'):
-                media_type = "video/x-msvideo"
-            else:
-                media_type = "video/*"
-            
-            return FileResponse(file_path, media_type=media_type)
-    
-    print(f"❌ [VIDEO] 파일을 찾을 수 없음: {filename}")
-    print(f"📋 [VIDEO] 시도한 경로들: {possible_paths}")
-    return Response(status_code=404, content=f"Video {filename} not found")
-
 # 대시보드 엔드포인트 제거됨 - 사용하지 않음
 
 # 사용하지 않는 페이지 엔드포인트들 제거됨 (/app.js, /studio, /dys_studio)
 
-@app.get("/frontend/studio_calibration")
-def frontend_studio_calibration():
-    """Frontend Studio 캘리브레이션 페이지 제공"""
-    try:
-        return FileResponse(str(BASE_DIR / "src" / "frontend" / "pages" / "studio_calibration.html"), media_type="text/html")
-    except FileNotFoundError:
-        return Response(status_code=404, content="studio_calibration.html not found")
-
-@app.get("/frontend/studio_calibration.html")
-def frontend_studio_calibration_html():
-    """Frontend Studio 캘리브레이션 페이지 제공 (.html 확장자 포함)"""
-    try:
-        return FileResponse(str(BASE_DIR / "src" / "frontend" / "pages" / "studio_calibration.html"), media_type="text/html")
-    except FileNotFoundError:
-        return Response(status_code=404, content="studio_calibration.html not found")
-
-
-
-@app.get("/dys_studio/studio_calibration")
-def dys_studio_calibration():
-    """DYS Studio 캘리브레이션 페이지 제공 (기존 경로 호환성)"""
-    try:
-        return FileResponse(str(BASE_DIR / "src" / "frontend" / "pages" / "studio_calibration.html"), media_type="text/html")
-    except FileNotFoundError:
-        return Response(status_code=404, content="studio_calibration.html not found")
-
-@app.get("/dys_studio/studio_calibration.html")
-def dys_studio_calibration_html():
-    """DYS Studio 캘리브레이션 페이지 제공 (.html 확장자 포함, 기존 경로 호환성)"""
-    try:
-        return FileResponse(str(BASE_DIR / "src" / "frontend" / "pages" / "studio_calibration.html"), media_type="text/html")
-    except FileNotFoundError:
-        return Response(status_code=404, content="studio_calibration.html not found")
-
-@app.get("/api/gke/dys_studio/studio_calibration")
-def api_gke_dys_studio_calibration():
-    """API GKE DYS Studio 캘리브레이션 페이지 제공 (Vercel 프록시 호환성)"""
-    try:
-        return FileResponse(str(BASE_DIR / "src" / "frontend" / "pages" / "studio_calibration.html"), media_type="text/html")
-    except FileNotFoundError:
-        return Response(status_code=404, content="studio_calibration.html not found")
-
-@app.get("/api/gke/dys_studio/studio_calibration.html")
-def api_gke_dys_studio_calibration_html():
-    """API GKE DYS Studio 캘리브레이션 페이지 제공 (.html 확장자 포함, Vercel 프록시 호환성)"""
-    try:
-        return FileResponse(str(BASE_DIR / "src" / "frontend" / "pages" / "studio_calibration.html"), media_type="text/html")
-    except FileNotFoundError:
-        return Response(status_code=404, content="studio_calibration.html not found")
-
 @app.get("/runpod")
 def runpod_studio():
     """RunPod Studio iframe 페이지 제공"""
@@ -388,24 +368,6 @@ def runpod_studio():
     except FileNotFoundError:
         return Response(status_code=404, content="runpod_studio.html not found")
 
-@app.get("/studio/img/{filename}")
-def serve_studio_image(filename: str):
-    """studio 이미지 파일 제공"""
-    try:
-        return FileResponse(str(BASE_DIR / "src" / "frontend" / "assets" / "images" / filename), media_type="image/svg+xml" if filename.endswith('.svg') else "image/*")
-    except FileNotFoundError:
-        return Response(status_code=404, content=f"Image {filename} not found")
-
-
-
-@app.get("/dys_logo.png")
-def serve_dys_logo():
-    """데연소 로고 파일 제공"""
-    try:
-        return FileResponse(str(BASE_DIR / "src" / "frontend" / "assets" / "images" / "dys_logo.png"), media_type="image/png")
-    except FileNotFoundError:
-        return Response(status_code=404, content="dys_logo.png not found")
-
 @app.get("/api/runpod/config")
 def get_runpod_config():
     """RunPod 설정 정보 반환"""
@@ -438,8 +400,8 @@ def get_websocket_config():
             # GKE 환경 설정
             config = {
                 "protocol": "wss",
-                "host": "34.64.136.237",  # GKE WebSocket 서버 IP
-                "port": 8001,
+                "host": "34.64.136.237",  # GKE 서비스 IP (HTTP 와 같은 포트)
+                "port": 443,
                 "environment": "gke"
             }
         else:
@@ -447,7 +409,7 @@ def get_websocket_config():
             config = {
                 "protocol": "ws",
                 "host": "localhost",
-                "port": 8001,
+                "port": PORT,
                 "environment": "local"
             }
         
@@ -463,7 +425,7 @@ def get_websocket_config():
             "config": {
                 "protocol": "ws",
                 "host": "localhost",
-                "port": 8001,
+                "port": PORT,
                 "environment": "fallback"
             }
         }
@@ -510,11 +472,12 @@ def api_overlay():
 try:
     from ..models.calibration import CalibrationRequest, CalibrationResponse, CalibrationStatus
     from ..services.calibration_service import calibration_service
+    from ..services.calibration_session import calibration_sessions, FRAME_FIELDS as CALIBRATION_FRAME_FIELDS
     CALIBRATION_AVAILABLE = True
     SUPABASE_AVAILABLE = True
-    print("✅ 캘리브레이션 모듈 로드 성공")
+    logger.info("✅ 캘리브레이션 모듈 로드 성공")
 except ImportError as e:
-    print(f"⚠️ 캘리브레이션 모듈 로드 실패: {e}")
+    logger.warning(f"⚠️ 캘리브레이션 모듈 로드 실패: {e}")
     CALIBRATION_AVAILABLE = False
     SUPABASE_AVAILABLE = False
 
@@ -523,55 +486,30 @@ except ImportError as e:
 @app.post("/api/chat/sessions")
 async def create_session(
     session: ChatSession,
-    request: Request
+    request: Request,
+    identity: Any = Depends(get_identity) if AUTH_AVAILABLE else None
 ):
     """새 채팅 세션 생성"""
-    print(f"🔍 [CREATE_SESSION] 요청 받음 - session_name: {session.session_name}")
-    print(f"📋 [CREATE_SESSION] 요청 헤더: {dict(request.headers)}")
-    print(f"📋 [CREATE_SESSION] 요청 메서드: {request.method}")
-    print(f"📋 [CREATE_SESSION] 요청 URL: {request.url}")
-    
-    # 인증 토큰 확인 (선택적)
-    current_user_id = None
-    try:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-            from ..auth.auth import get_current_user
-            user_data = await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
-            current_user_id = user_data.get("id")
-            print(f"✅ [CREATE_SESSION] 인증 성공 - user_id: {current_user_id}")
-    except Exception as e:
-        print(f"⚠️ [CREATE_SESSION] 인증 실패: {e}")
-    
-    # 인증 실패 시 고유한 임시 사용자 ID 생성
-    if not current_user_id:
-        import uuid
-        import hashlib
-        # 클라이언트 IP와 User-Agent를 기반으로 고유 ID 생성
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("User-Agent", "unknown")
-        unique_string = f"{client_ip}:{user_agent}"
-        unique_hash = hashlib.md5(unique_string.encode()).hexdigest()[:24]  # MongoDB ObjectId 길이
-        current_user_id = unique_hash
-        print(f"⚠️ [CREATE_SESSION] 인증 없음, 고유 임시 사용자 ID 생성: {current_user_id}")
-        print(f"📋 [CREATE_SESSION] 클라이언트 정보: IP={client_ip}, UA={user_agent[:50]}...")
+    logger.debug(f"🔍 [CREATE_SESSION] 요청 받음 - session_name: {session.session_name}")
+    
+    # 인증 사용자 또는 IP+User-Agent 기반 임시 사용자 (공용 의존성에서 한 번만 해석)
+    current_user_id = identity.user_id if identity else anonymous_user_id(request)
+    logger.debug(f"📋 [CREATE_SESSION] user_id: {current_user_id} ({'인증' if identity and identity.authenticated else '익명'})")
     
     # MongoDB 연결 실패 시 임시 세션 ID 생성
     if not DATABASE_AVAILABLE:
-        print("⚠️ [CREATE_SESSION] MongoDB not available - 임시 세션 생성")
+        logger.warning("⚠️ [CREATE_SESSION] MongoDB not available - 임시 세션 생성")
         import uuid
         temp_session_id = str(uuid.uuid4())
-        print(f"✅ [CREATE_SESSION] 임시 세션 생성 성공: {temp_session_id}")
+        logger.debug(f"✅ [CREATE_SESSION] 임시 세션 생성 성공: {temp_session_id}")
         return {"ok": True, "session_id": temp_session_id}
     
     try:
-        print(f"🔄 [CREATE_SESSION] 세션 생성 시작...")
+        logger.debug(f"🔄 [CREATE_SESSION] 세션 생성 시작...")
         
-        # 새로운 페르소나 시스템에서 기본 페르소나 가져오기
-        from ..services.personas.persona_manager import get_persona_manager
-        manager = get_persona_manager()
-        active_persona = manager.get_active_persona()
+        # 페르소나 레지스트리에서 활성 페르소나 (메모리 조회)
+        active_persona = persona_registry.active()
+        active_persona = active_persona.info() if active_persona else None
         
         # 클라이언트에서 전송한 페르소나가 있으면 사용, 없으면 활성 페르소나 사용
         persona_name = session.persona_name or (active_persona["name"] if active_persona else "이서아")
@@ -580,29 +518,28 @@ async def create_session(
         session_name = session.session_name
         if persona_name:
             session_name = f"{persona_name}와의 데이트"
-            print(f"📝 [CREATE_SESSION] Persona 정보 포함: {persona_name}")
+            logger.debug(f"📝 [CREATE_SESSION] Persona 정보 포함: {persona_name}")
         
         # 클라이언트에서 전송한 user_id가 있으면 사용, 없으면 생성된 ID 사용
         final_user_id = session.user_id if session.user_id else current_user_id
         
-        print(f"🎭 [CREATE_SESSION] 사용할 페르소나: {persona_name}")
+        logger.debug(f"🎭 [CREATE_SESSION] 사용할 페르소나: {persona_name}")
         
         # 페르소나 정보를 포함하여 세션 생성
-        session_id = await create_chat_session_with_persona(
-            final_user_id, 
-            session_name,
-            {
-                "persona_name": persona_name,
-                "persona_age": session.persona_age or "28",
-                "persona_mbti": session.persona_mbti or "ENFP",
-                "persona_job": session.persona_job or "마케팅 담당자",
-                "persona_personality": session.persona_personality or "밝고 친근한",
-                "persona_image": session.persona_image or "woman1.webp"
-            }
-        )
+        persona_info = {
+            "persona_name": persona_name,
+            "persona_age": session.persona_age or "28",
+            "persona_mbti": session.persona_mbti or "ENFP",
+            "persona_job": session.persona_job or "마케팅 담당자",
+            "persona_personality": session.persona_personality or "밝고 친근한",
+            "persona_image": session.persona_image or "woman1.webp"
+        }
+        session_id = await create_chat_session_with_persona(final_user_id, session_name, persona_info)
         if session_id:
-            print(f"✅ [CREATE_SESSION] 세션 생성 성공: {session_id}")
-            print(f"👤 [CREATE_SESSION] 사용자 ID: {final_user_id}")
+            logger.debug(f"✅ [CREATE_SESSION] 세션 생성 성공: {session_id}")
+            # 첫 메시지에서 세션 조회 없이 페르소나를 쓰도록 바로 등록
+            session_personas.bind(session_id, persona_info)
+            logger.debug(f"👤 [CREATE_SESSION] 사용자 ID: {final_user_id}")
             
             # personaData를 응답에 포함
             personaData = {
@@ -622,10 +559,10 @@ async def create_session(
                 "personaData": personaData
             }
         else:
-            print("❌ [CREATE_SESSION] 세션 생성 실패")
+            logger.error("❌ [CREATE_SESSION] 세션 생성 실패")
             raise HTTPException(status_code=500, detail="Failed to create session")
     except Exception as e:
-        print(f"❌ [CREATE_SESSION] 오류 발생: {e}")
+        logger.error(f"❌ [CREATE_SESSION] 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/chat/sessions")
@@ -644,155 +581,100 @@ async def get_sessions(current_user_id: str = Depends(get_current_user_id) if DA
 async def get_messages(
     session_id: str,
     current_user_id: str = Depends(get_current_user_id) if DATABASE_AVAILABLE else None,
-    limit: int = 50
+    limit: int = 50,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    fields: Optional[str] = None,
+    format: str = "full"
 ):
-    """세션의 메시지 목록 조회"""
+    """
+    세션의 메시지 목록 조회 (키셋 페이지네이션)
+    - 기본: 가장 최근 limit 개 / before=<토큰>: 이전 페이지 / after=<토큰>: 이후 메시지
+    - fields: 쉼표 구분 필드 (role,content,timestamp,user_id,session_id)
+    - format=compact: columns + rows 배열 응답
+    """
     if not DATABASE_AVAILABLE:
-        print("⚠️ [GET_MESSAGES] MongoDB not available")
+        logger.warning("⚠️ [GET_MESSAGES] MongoDB not available")
         raise HTTPException(status_code=503, detail="MongoDB not available")
     
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
     try:
-        messages = await get_session_messages(session_id, limit)
-        return {"ok": True, "messages": messages}
+        page = await get_session_messages_page(session_id, limit=limit, before=before, after=after, fields=field_list)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        import traceback
-        print(f"❌ [GET_MESSAGES] 오류: {e}")
-        traceback.print_exc()
+        logger.error(f"❌ [GET_MESSAGES] 오류: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
+    
+    if format == "compact":
+        return {"ok": True, **compact_message_page(page, field_list)}
+    return {"ok": True, **page}
 
 @app.post("/api/chat/sessions/{session_id}/messages")
 async def send_message(
     session_id: str,
     message: ChatMessage,
-    request: Request
+    request: Request,
+    identity: Any = Depends(get_identity) if AUTH_AVAILABLE else None
 ):
     """새 메시지 전송"""
-    print(f"🔍 [SEND_MESSAGE] 요청 받음 - session_id: {session_id}")
-    print(f"📝 [SEND_MESSAGE] 메시지 내용: {message.content[:50]}...")
+    logger.debug(f"🔍 [SEND_MESSAGE] 요청 받음 - session_id: {session_id}")
+    logger.debug(f"📝 [SEND_MESSAGE] 메시지 내용: {message.content[:50]}...")
     
     # session_id가 null이거나 유효하지 않은 경우 처리
     if not session_id or session_id == "null":
-        print("❌ [SEND_MESSAGE] 유효하지 않은 session_id")
-        print(f"📋 [SEND_MESSAGE] session_id 값: '{session_id}'")
-        print(f"📋 [SEND_MESSAGE] session_id 타입: {type(session_id)}")
-        print(f"📋 [SEND_MESSAGE] session_id 길이: {len(str(session_id)) if session_id else 0}")
+        logger.error("❌ [SEND_MESSAGE] 유효하지 않은 session_id")
+        logger.debug(f"📋 [SEND_MESSAGE] session_id 값: '{session_id}'")
+        logger.debug(f"📋 [SEND_MESSAGE] session_id 타입: {type(session_id)}")
+        logger.debug(f"📋 [SEND_MESSAGE] session_id 길이: {len(str(session_id)) if session_id else 0}")
         raise HTTPException(status_code=400, detail="Invalid session_id")
     
-    # 인증 토큰 확인 (선택적)
-    current_user_id = None
-    try:
-        auth_header = request.headers.get("Authorization")
-        if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
-            from ..auth.auth import get_current_user
-            user_data = await get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
-            current_user_id = user_data.get("id")
-            print(f"✅ [SEND_MESSAGE] 인증 성공 - user_id: {current_user_id}")
-    except Exception as e:
-        print(f"⚠️ [SEND_MESSAGE] 인증 실패: {e}")
-    
-    # 인증 실패 시 고유한 임시 사용자 ID 생성
-    if not current_user_id:
-        import uuid
-        import hashlib
-        # 클라이언트 IP와 User-Agent를 기반으로 고유 ID 생성
-        client_ip = request.client.host if request.client else "unknown"
-        user_agent = request.headers.get("User-Agent", "unknown")
-        unique_string = f"{client_ip}:{user_agent}"
-        unique_hash = hashlib.md5(unique_string.encode()).hexdigest()[:24]  # MongoDB ObjectId 길이
-        current_user_id = unique_hash
-        print(f"⚠️ [SEND_MESSAGE] 인증 없음, 고유 임시 사용자 ID 생성: {current_user_id}")
-        print(f"📋 [SEND_MESSAGE] 클라이언트 정보: IP={client_ip}, UA={user_agent[:50]}...")
+    # 인증 사용자 또는 IP+User-Agent 기반 임시 사용자 (공용 의존성에서 한 번만 해석)
+    current_user_id = identity.user_id if identity else anonymous_user_id(request)
     
     # MongoDB 사용 불가 시 명시적 에러 반환
     if not DATABASE_AVAILABLE:
-        print("⚠️ [SEND_MESSAGE] MongoDB not available")
+        logger.warning("⚠️ [SEND_MESSAGE] MongoDB not available")
         raise HTTPException(status_code=503, detail="MongoDB not available")
     
     try:
-        # 사용자 메시지 저장
-        print(f"🔄 [SEND_MESSAGE] 사용자 메시지 저장 시작...")
-        
         # 클라이언트에서 전송한 user_id가 있으면 사용, 없으면 생성된 ID 사용
         final_user_id = message.user_id if message.user_id else current_user_id
-        print(f"📋 [SEND_MESSAGE] 최종 user_id: {final_user_id}")
+        logger.debug(f"📋 [SEND_MESSAGE] 최종 user_id: {final_user_id}")
         
-        try:
-            message_id = await save_message(
-                final_user_id, 
-                session_id, 
-                message.role, 
-                message.content
-            )
-            
-            if not message_id:
-                print("❌ [SEND_MESSAGE] 사용자 메시지 저장 실패 - message_id가 None")
-                raise HTTPException(status_code=500, detail="Failed to save message")
-        except Exception as save_error:
-            print(f"❌ [SEND_MESSAGE] 메시지 저장 중 예외 발생: {save_error}")
-            import traceback
-            traceback.print_exc()
-            raise HTTPException(status_code=500, detail=f"Message save error: {str(save_error)}")
-        
-        print(f"✅ [SEND_MESSAGE] 사용자 메시지 저장 성공: {message_id}")
-        
-        # Vector DB에 사용자 메시지 저장
-        if VECTOR_SERVICE_AVAILABLE and vector_service.is_initialized:
-            try:
-                print(f"💾 [SEND_MESSAGE] Vector DB에 사용자 메시지 저장 중...")
-                vector_success = await vector_service.store_text_with_embedding(
-                    text=message.content,
-                    content_type="user_message",
-                    content_id=message_id,
-                    metadata={
-                        "session_id": session_id,
-                        "user_id": final_user_id,
-                        "role": "user"
-                    }
-                )
-                if vector_success:
-                    print(f"✅ [SEND_MESSAGE] Vector DB 사용자 메시지 저장 성공")
-                else:
-                    print(f"⚠️ [SEND_MESSAGE] Vector DB 사용자 메시지 저장 실패")
-            except Exception as vector_error:
-                print(f"❌ [SEND_MESSAGE] Vector DB 사용자 메시지 저장 오류: {vector_error}")
+        # 메시지 ID를 미리 생성 - 저장은 응답 반환 후 write-behind 큐가 처리
+        message_id = str(ObjectId())
+        user_timestamp = datetime.utcnow()
+        user_turn = _message_payload(message.role, message.content, message_id, user_timestamp)
         
         # OpenAI GPT-4o-mini로 AI 응답 생성
-        print(f"🤖 [SEND_MESSAGE] GPT 호출 시작 - 메시지: {message.content[:50]}...")
-        ai_response = await generate_ai_response(message.content, session_id)
-        print(f"🤖 [SEND_MESSAGE] AI 응답 생성 완료: {ai_response[:50]}...")
-        
-        # AI 응답 저장
-        print(f"🔄 [SEND_MESSAGE] AI 응답 저장 시작...")
-        ai_message_id = await save_message(
-            final_user_id,
-            session_id,
-            "assistant",
-            ai_response
-        )
-        
-        print(f"✅ [SEND_MESSAGE] AI 응답 저장 성공: {ai_message_id}")
-        
-        # Vector DB에 AI 응답 저장
+        logger.debug(f"🤖 [SEND_MESSAGE] GPT 호출 시작 - 메시지: {message.content[:50]}...")
+        try:
+            ai_response = await generate_ai_response(message.content, session_id, message_id=message_id)
+        except Exception:
+            # 응답 생성이 실패해도 사용자 메시지는 저장
+            _enqueue_message_write(session_id, final_user_id, [user_turn])
+            raise
+        logger.debug(f"🤖 [SEND_MESSAGE] AI 응답 생성 완료: {ai_response[:50]}...")
+        
+        ai_message_id = str(ObjectId())
+        # 세션 기억에 즉시 반영 (DB 저장 완료를 기다리지 않음)
+        ai_timestamp = datetime.utcnow()
+        context_assembler.record(session_id, message.role, message.content, message_id, user_timestamp)
+        context_assembler.record(session_id, "assistant", ai_response, ai_message_id, ai_timestamp)
+        # 사용자 메시지 + AI 응답을 한 작업으로 저장 (insert_many 1회 + 세션 갱신 1회)
+        _enqueue_message_write(session_id, final_user_id, [
+            user_turn,
+            _message_payload("assistant", ai_response, ai_message_id, ai_timestamp),
+        ])
+        logger.debug(f"📥 [SEND_MESSAGE] 메시지 저장 예약: {message_id}, {ai_message_id}")
+        
+        # Vector DB 저장 (임베딩 + Pinecone) 도 응답 경로 밖에서 처리
         if VECTOR_SERVICE_AVAILABLE and vector_service.is_initialized:
-            try:
-                print(f"💾 [SEND_MESSAGE] Vector DB에 AI 응답 저장 중...")
-                vector_success = await vector_service.store_text_with_embedding(
-                    text=ai_response,
-                    content_type="ai_response",
-                    content_id=ai_message_id,
-                    metadata={
-                        "session_id": session_id,
-                        "user_id": final_user_id,
-                        "role": "assistant"
-                    }
-                )
-                if vector_success:
-                    print(f"✅ [SEND_MESSAGE] Vector DB AI 응답 저장 성공")
-                else:
-                    print(f"⚠️ [SEND_MESSAGE] Vector DB AI 응답 저장 실패")
-            except Exception as vector_error:
-                print(f"❌ [SEND_MESSAGE] Vector DB AI 응답 저장 오류: {vector_error}")
+            _enqueue_vector_write(session_id, final_user_id, "user", "user_message",
+                                  message.content, message_id)
+            _enqueue_vector_write(session_id, final_user_id, "assistant", "ai_response",
+                                  ai_response, ai_message_id)
         
         result = {
             "ok": True,
@@ -801,38 +683,123 @@ async def send_message(
             "ai_response": ai_response
         }
         
-        print(f"🎉 [SEND_MESSAGE] 전체 처리 완료: {result}")
+        logger.debug(f"🎉 [SEND_MESSAGE] 전체 처리 완료: {result}")
         return result
         
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ [SEND_MESSAGE] 오류 발생: {e}")
+        logger.error(f"❌ [SEND_MESSAGE] 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# ====== 채팅 메시지 write-behind 영속화 ======
+def _message_payload(role: str, content: str, message_id: str, timestamp: datetime) -> Dict[str, Any]:
+    return {"role": role, "content": content, "message_id": message_id, "timestamp": timestamp.isoformat()}
+
+def _enqueue_message_write(session_id: str, user_id: str, messages: List[Dict[str, Any]]):
+    """메시지 저장을 write-behind 큐에 넣습니다 (큐 미시작 시 백그라운드 태스크로 직접 저장)."""
+    payload = {
+        "user_id": user_id,
+        "session_id": session_id,
+        "messages": messages,
+    }
+    if write_behind.started:
+        write_behind.enqueue("chat_message", session_id, payload)
+    else:
+        asyncio.create_task(_persist_message_batch([payload]))
+
+def _enqueue_vector_write(session_id: str, user_id: str, role: str, content_type: str,
+                          text: str, content_id: str):
+    payload = {
+        "text": text,
+        "content_type": content_type,
+        "content_id": content_id,
+        "metadata": {"session_id": session_id, "user_id": user_id, "role": role},
+        "created_at": datetime.now().isoformat(),
+    }
+    if write_behind.started:
+        write_behind.enqueue("vector_embedding", session_id, payload)
+    elif VECTOR_SERVICE_AVAILABLE and vector_service.is_initialized:
+        # 큐 없이 직접 저장 (재시도할 곳이 없으므로 초기화된 경우에만)
+        asyncio.create_task(_persist_vector_batch([payload]))
+
+async def _persist_message_batch(payloads):
+    """
+    write-behind 핸들러: 같은 세션의 연속 작업을 사용자별로 모아 append_messages 한 번에 저장
+    (실패 시 예외 → 재시도, 이미 저장된 ID 는 건너뜀)
+    """
+    grouped: Dict[tuple, List[Dict[str, Any]]] = {}
+    for payload in payloads:
+        # 이전 형식(메시지 1개 = 작업 1개) 저널 재생 호환
+        messages = payload.get("messages") or [payload]
+        grouped.setdefault((payload["user_id"], payload["session_id"]), []).extend(
+            {
+                "role": message["role"],
+                "content": message["content"],
+                "message_id": message["message_id"],
+                "timestamp": datetime.fromisoformat(message["timestamp"]),
+            }
+            for message in messages
+        )
+    for (user_id, session_id), messages in grouped.items():
+        await append_messages(user_id, session_id, messages)
+
+async def _persist_vector_batch(payloads):
+    """write-behind 핸들러: 벡터 배치 저장 (임베딩 1회 + Pinecone/Mongo 배치, created_at 고정으로 재시도해도 같은 벡터 ID)"""
+    if not VECTOR_SERVICE_AVAILABLE:
+        # 벡터 모듈 자체가 없으면 저장할 곳이 없음 - 완료 처리
+        return
+    if not vector_service.is_initialized:
+        # 초기화 전/재초기화 중 - 실패로 처리해 재시도 (계속 실패하면 dead-letter)
+        raise RuntimeError("vector service not initialized")
+    expected = sum(1 for payload in payloads if payload.get("text", "").strip())
+    stored = await vector_service.store_texts_with_embeddings(payloads)
+    if stored < expected:
+        raise RuntimeError(f"vector store failed: {stored}/{expected} stored")
+
+# ====== 대화 컨텍스트 소스 ======
+async def _load_recent_messages(session_id: str, limit: int):
+    """세션 기억 하이드레이션 - 가장 최근 limit 개 메시지 (시간순)"""
+    with span("db"):
+        return await get_session_messages(session_id, limit=limit, latest=True)
+
+async def _session_version(session_id: str):
+    """세션 기억 동기화 - 다른 워커가 저장한 턴이 있는지 확인용"""
+    with span("db"):
+        return await get_session_version(session_id)
+
+async def _retrieve_related_turns(query: str, session_id: str, top_k: int):
+    """현재 메시지와 관련된 같은 세션의 과거 대화 검색"""
+    if not (VECTOR_SERVICE_AVAILABLE and vector_service.is_initialized):
+        return []
+    with span("embed"):
+        return await vector_service.search_similar_texts(query_text=query, top_k=top_k, session_id=session_id)
+
 # ====== 테스트용 엔드포인트 ======
 @app.post("/api/chat/test/create-session")
 async def create_test_session():
     """테스트용 세션 생성 (인증 없음)"""
-    print("🔍 [TEST_CREATE_SESSION] 테스트 세션 생성 요청")
+    logger.debug("🔍 [TEST_CREATE_SESSION] 테스트 세션 생성 요청")
     
     if not DATABASE_AVAILABLE:
-        print("❌ [TEST_CREATE_SESSION] MongoDB not available")
+        logger.error("❌ [TEST_CREATE_SESSION] MongoDB not available")
         raise HTTPException(status_code=503, detail="MongoDB not available")
     
     try:
         test_user_id = "507f1f77bcf86cd799439011"  # 유효한 ObjectId 형식
         session_name = "테스트 대화"
         
-        print(f"🔄 [TEST_CREATE_SESSION] 세션 생성 시작...")
+        logger.debug(f"🔄 [TEST_CREATE_SESSION] 세션 생성 시작...")
         session_id = await create_chat_session(test_user_id, session_name)
         
         if session_id:
-            print(f"✅ [TEST_CREATE_SESSION] 세션 생성 성공: {session_id}")
+            logger.debug(f"✅ [TEST_CREATE_SESSION] 세션 생성 성공: {session_id}")
             return {"ok": True, "session_id": session_id}
         else:
-            print("❌ [TEST_CREATE_SESSION] 세션 생성 실패")
+            logger.error("❌ [TEST_CREATE_SESSION] 세션 생성 실패")
             raise HTTPException(status_code=500, detail="Failed to create session")
     except Exception as e:
-        print(f"❌ [TEST_CREATE_SESSION] 오류 발생: {e}")
+        logger.error(f"❌ [TEST_CREATE_SESSION] 오류 발생: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/auth/verify")
@@ -849,7 +816,7 @@ async def verify_auth(current_user_id: str = Depends(get_current_user_id) if DAT
             "message": "인증된 사용자"
         }
     except Exception as e:
-        print(f"❌ [AUTH_VERIFY] 오류: {e}")
+        logger.error(f"❌ [AUTH_VERIFY] 오류: {e}")
         return {"authenticated": False, "message": "인증 검증 실패"}
 
 @app.post("/api/auth/refresh")
@@ -862,7 +829,7 @@ async def refresh_token(current_user_id: str = Depends(get_current_user_id) if D
         # 토큰 갱신 로직 (필요시 구현)
         return {"ok": True, "message": "토큰이 유효합니다"}
     except Exception as e:
-        print(f"❌ [AUTH_REFRESH] 오류: {e}")
+        logger.error(f"❌ [AUTH_REFRESH] 오류: {e}")
         raise HTTPException(status_code=401, detail="토큰 갱신 실패")
 
 @app.get("/auth/verify")
@@ -879,7 +846,7 @@ async def verify_auth_legacy(current_user_id: str = Depends(get_current_user_id)
             "message": "인증된 사용자"
         }
     except Exception as e:
-        print(f"❌ [AUTH_VERIFY_LEGACY] 오류: {e}")
+        logger.error(f"❌ [AUTH_VERIFY_LEGACY] 오류: {e}")
         return {"authenticated": False, "message": "인증 검증 실패"}
 
 @app.post("/auth/verify")
@@ -896,43 +863,109 @@ async def verify_auth_legacy_post(current_user_id: str = Depends(get_current_use
             "message": "인증된 사용자"
         }
     except Exception as e:
-        print(f"❌ [AUTH_VERIFY_LEGACY_POST] 오류: {e}")
+        logger.error(f"❌ [AUTH_VERIFY_LEGACY_POST] 오류: {e}")
         return {"authenticated": False, "message": "인증 검증 실패"}
 
 # ====== 애플리케이션 시작 이벤트 ======
 @app.on_event("startup")
 async def startup_event():
     """애플리케이션 시작 시 실행"""
-    print("🚀 애플리케이션 시작 중...")
+    logger.info("🚀 애플리케이션 시작 중...")
     
     # MongoDB 초기화 (선택적)
+    db_success = False
     if DATABASE_AVAILABLE:
         try:
             db_success = await init_database()
             if not db_success:
-                print("⚠️ MongoDB 초기화 실패 - 일부 기능이 제한될 수 있습니다")
+                logger.warning("⚠️ MongoDB 초기화 실패 - 일부 기능이 제한될 수 있습니다")
             else:
-                print("✅ MongoDB 초기화 완료")
+                logger.info("✅ MongoDB 초기화 완료")
         except Exception as e:
-            print(f"⚠️ MongoDB 초기화 중 오류: {e}")
+            logger.warning(f"⚠️ MongoDB 초기화 중 오류: {e}")
     else:
-        print("⚠️ MongoDB 모듈 없음 - 채팅 기능이 제한됩니다")
+        logger.warning("⚠️ MongoDB 모듈 없음 - 채팅 기능이 제한됩니다")
+    
+    # 페르소나 레지스트리 로드 + 파일 변경 감시
+    try:
+        await asyncio.to_thread(persona_registry.reload)
+        persona_registry.start_watching()
+    except Exception as e:
+        logger.warning(f"⚠️ 페르소나 레지스트리 로드 중 오류: {e}")
+    
+    # 시스템 메트릭 백그라운드 샘플러 (/metrics 는 직렬화만)
+    if MONITORING_AVAILABLE:
+        try:
+            system_sampler.start()
+        except Exception as e:
+            logger.warning(f"⚠️ 시스템 메트릭 샘플러 시작 중 오류: {e}")
+    
+    # 캘리브레이션 세션: MongoDB 가 있으면 워커/Pod 간 공유 + 유휴 만료
+    if CALIBRATION_AVAILABLE:
+        if DATABASE_AVAILABLE and db_success:
+            calibration_sessions.configure(calibration_sessions_collection)
+        calibration_sessions.start()
+    
+    # 정적 자산 매니페스트 (해시/압축은 루프 밖에서)
+    try:
+        await asyncio.to_thread(static_assets.build)
+    except Exception as e:
+        logger.warning(f"⚠️ 정적 자산 매니페스트 생성 중 오류: {e}")
+    
+    # 이벤트 루프 블로킹 탐지 (진단 모드, BLOCKING_DETECTOR=true)
+    if MONITORING_AVAILABLE and BLOCKING_DETECTOR:
+        try:
+            blocking_detector.start()
+        except Exception as e:
+            logger.warning(f"⚠️ 루프 블로킹 탐지 시작 중 오류: {e}")
+    
+    # JWT 검증기 (JWKS 로드 + 주기 갱신)
+    if AUTH_AVAILABLE:
+        try:
+            await jwt_verifier.start()
+        except Exception as e:
+            logger.warning(f"⚠️ JWT 검증기 시작 중 오류: {e}")
+    
+    # 대화 컨텍스트 조립기 연결 (세션 기억 하이드레이션 + 벡터 검색)
+    if DATABASE_AVAILABLE:
+        context_assembler.configure(loader=_load_recent_messages, retriever=_retrieve_related_turns, probe=_session_version)
+        session_personas.configure(loader=get_session_persona)
+    
+    # 벡터 서비스 초기화 (멀티 워커에서는 워커 프로세스마다 수행, 저널 재생 전에)
+    if VECTOR_SERVICE_AVAILABLE and not vector_service.is_initialized:
+        try:
+            if await vector_service.initialize():
+                logger.info("✅ 벡터 서비스 초기화 완료")
+            else:
+                logger.warning("⚠️ 벡터 서비스 초기화 실패 (선택적 기능)")
+        except Exception as e:
+            logger.warning(f"⚠️ 벡터 서비스 초기화 오류 (선택적 기능): {e}")
+    
+    # 채팅 메시지/벡터 write-behind 큐 시작 (이전 프로세스의 미완료 작업 재생)
+    if DATABASE_AVAILABLE:
+        try:
+            write_behind.register("chat_message", _persist_message_batch)
+            write_behind.register("vector_embedding", _persist_vector_batch)
+            await write_behind.start()
+            logger.info(f"✅ write-behind 큐 시작 (저널: {write_behind.directory})")
+        except Exception as e:
+            logger.warning(f"⚠️ write-behind 큐 시작 실패 - 메시지를 직접 저장합니다: {e}")
     
     # 음성 분석 모델 로드 (백그라운드에서) - 첫 번째 성공 모델 채택
     global VOICE_ANALYSIS_AVAILABLE
     if VOICE_ANALYSIS_AVAILABLE:
         try:
-            print("🔄 음성 분석 모델 로딩 시작...")
+            logger.info("🔄 음성 분석 모델 로딩 시작...")
             from ..services.voice.voice_api import preload_models
             await asyncio.to_thread(preload_models)
-            print("✅ 음성 분석 모델 로딩 완료 - 첫 번째 성공 모델 채택")
+            logger.info("✅ 음성 분석 모델 로딩 완료 - 첫 번째 성공 모델 채택")
         except Exception as e:
-            print(f"⚠️ 음성 분석 모델 로딩 실패: {e}")
-            print("⚠️ 대안 STT 방법으로 fallback")
+            logger.warning(f"⚠️ 음성 분석 모델 로딩 실패: {e}")
+            logger.warning("⚠️ 대안 STT 방법으로 fallback")
             # 음성 분석 모듈은 비활성화하되 대안 STT는 사용 가능
             VOICE_ANALYSIS_AVAILABLE = False
     else:
-        print("⚠️ 음성 분석 모듈 비활성화됨 - 대안 STT 사용")
+        logger.warning("⚠️ 음성 분석 모듈 비활성화됨 - 대안 STT 사용")
         
     # 대안 STT 기능 확인 (첫 번째 성공 모델 채택)
     stt_available = False
@@ -941,164 +974,168 @@ async def startup_event():
     # 1. faster-whisper 확인 (libctranslate2 오류 방지)
     try:
         from faster_whisper import WhisperModel
-        print("✅ faster-whisper 모듈 확인됨")
+        logger.info("✅ faster-whisper 모듈 확인됨")
         stt_available = True
         stt_method = "faster-whisper"
     except ImportError as e:
-        print(f"❌ faster-whisper 모듈 없음: {e}")
+        logger.error(f"❌ faster-whisper 모듈 없음: {e}")
     except Exception as e:
         if "libctranslate2" in str(e).lower():
-            print("⚠️ libctranslate2 오류로 faster-whisper 비활성화")
+            logger.warning("⚠️ libctranslate2 오류로 faster-whisper 비활성화")
         else:
-            print(f"❌ faster-whisper 모듈 오류: {e}")
+            logger.error(f"❌ faster-whisper 모듈 오류: {e}")
     
     # 2. OpenAI Whisper API 확인 (faster-whisper 실패 시)
     if not stt_available:
         try:
             from openai import OpenAI
             if os.getenv('OPENAI_API_KEY'):
-                print("✅ OpenAI Whisper API 사용 가능")
+                logger.info("✅ OpenAI Whisper API 사용 가능")
                 stt_available = True
                 stt_method = "openai-whisper"
             else:
-                print("⚠️ OpenAI API 키가 설정되지 않음")
+                logger.warning("⚠️ OpenAI API 키가 설정되지 않음")
         except ImportError:
-            print("⚠️ OpenAI 라이브러리 미설치")
+            logger.warning("⚠️ OpenAI 라이브러리 미설치")
     
     # 3. Google Speech-to-Text API 확인 (이전 방법들 실패 시)
     if not stt_available:
         try:
             from google.cloud import speech
-            print("✅ Google Speech-to-Text API 사용 가능")
+            logger.info("✅ Google Speech-to-Text API 사용 가능")
             stt_available = True
             stt_method = "google-speech"
         except ImportError:
-            print("⚠️ Google Speech-to-Text API 미설치")
+            logger.warning("⚠️ Google Speech-to-Text API 미설치")
         except Exception as e:
-            print(f"⚠️ Google Speech-to-Text API 설정 실패: {e}")
+            logger.warning(f"⚠️ Google Speech-to-Text API 설정 실패: {e}")
     
     if stt_available:
-        print(f"✅ STT 기능 사용 가능: {stt_method}")
+        logger.info(f"✅ STT 기능 사용 가능: {stt_method}")
     else:
-        print("❌ 모든 STT 방법 실패 - 음성 인식 기능이 제한됩니다")
+        logger.error("❌ 모든 STT 방법 실패 - 음성 인식 기능이 제한됩니다")
     
     # MediaPipe 제거됨: 클라이언트 랜드마크 흐름만 유지
 
-# WebSocket 연결 관리 (websocket_server.py 통합)
-_active_websockets = set()
-
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-        print(f"🔗 WebSocket 연결 수락: {websocket.client.host}")
+# WebSocket 라우트 및 공유 연결 레지스트리 (websocket_server.py 통합, 단일 포트)
+from .connection_registry import registry as ws_registry
+from .ws_routes import router as ws_router
 
-    def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        print(f"🔌 WebSocket 연결 종료: {websocket.client.host}")
-
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
-
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except Exception as e:
-                print(f"브로드캐스트 실패: {e}")
-                if connection in self.active_connections:
-                    self.active_connections.remove(connection)
-
-# 전역 WebSocket 매니저 인스턴스
-ws_manager = ConnectionManager()
+app.include_router(ws_router)
 
 # 서버 종료 시 정리 함수
 async def cleanup_on_shutdown():
     """서버 종료 시 리소스 정리"""
-    global _pipeline, _active_websockets
-    print("\n🛑 서버 종료 중 - 리소스 정리...")
+    global _pipeline
+    logger.info("🛑 서버 종료 중 - 리소스 정리...")
     
     try:
         # WebSocket 연결 정리
-        if _active_websockets:
-            print(f"🔌 {len(_active_websockets)}개 WebSocket 연결 종료 중...")
-            for ws in list(_active_websockets):
-                try:
-                    if not ws.client_state.disconnected:
-                        await ws.close(code=1000, reason="Server shutdown")
-                except Exception as e:
-                    print(f"⚠️ WebSocket 종료 중 오류: {e}")
-            _active_websockets.clear()
-            print("✅ WebSocket 연결 정리 완료")
+        active_count = ws_registry.count()
+        if active_count:
+            logger.info(f"🔌 {active_count}개 WebSocket 연결 종료 중...")
+            await ws_registry.close_all(code=1000, reason="Server shutdown")
+            logger.info("✅ WebSocket 연결 정리 완료")
+    except Exception as e:
+        logger.warning(f"⚠️ WebSocket 정리 중 오류: {e}")
+    
+    try:
+        # 대기 중인 메시지/벡터 저장 마무리 (시간 초과분은 저널에 남아 재시작 시 재생)
+        if DATABASE_AVAILABLE and write_behind.started:
+            logger.info(f"💾 write-behind 대기 작업 {write_behind.pending()}개 처리 중...")
+            await write_behind.stop(timeout=float(os.getenv("WRITE_BEHIND_DRAIN_SEC", "10")))
+            logger.info("✅ write-behind 큐 정리 완료")
+    except Exception as e:
+        logger.warning(f"⚠️ write-behind 정리 중 오류: {e}")
+    
+    try:
+        await persona_registry.stop_watching()
+    except Exception as e:
+        logger.warning(f"⚠️ 페르소나 감시 정리 중 오류: {e}")
+    
+    try:
+        if AUTH_AVAILABLE:
+            await jwt_verifier.stop()
+    except Exception as e:
+        logger.warning(f"⚠️ JWT 검증기 정리 중 오류: {e}")
+    
+    try:
+        if CALIBRATION_AVAILABLE:
+            await calibration_sessions.stop()
+            await calibration_service.close()
+    except Exception as e:
+        logger.warning(f"⚠️ 캘리브레이션 클라이언트 정리 중 오류: {e}")
+    
+    try:
+        if MONITORING_AVAILABLE:
+            await system_sampler.stop()
+            blocking_detector.stop()
     except Exception as e:
-        print(f"⚠️ WebSocket 정리 중 오류: {e}")
+        logger.warning(f"⚠️ 시스템 메트릭 샘플러 정리 중 오류: {e}")
     
     try:
         # 파이프라인 정리
         if _pipeline:
             if hasattr(_pipeline, 'stop'):
                 _pipeline.stop()
-                print("✅ 파이프라인 정리 완료")
+                logger.info("✅ 파이프라인 정리 완료")
             if hasattr(_pipeline, 'cleanup'):
                 _pipeline.cleanup()
-                print("✅ 파이프라인 리소스 정리 완료")
+                logger.info("✅ 파이프라인 리소스 정리 완료")
     except Exception as e:
-        print(f"⚠️ 파이프라인 정리 중 오류: {e}")
+        logger.warning(f"⚠️ 파이프라인 정리 중 오류: {e}")
     
     try:
         # OpenCV 윈도우 정리
         import cv2
         cv2.destroyAllWindows()
-        print("✅ OpenCV 윈도우 정리 완료")
+        logger.info("✅ OpenCV 윈도우 정리 완료")
     except ImportError:
-        print("ℹ️ OpenCV 모듈이 없습니다 - 건너뜁니다")
+        logger.info("ℹ️ OpenCV 모듈이 없습니다 - 건너뜁니다")
     except Exception as e:
-        print(f"⚠️ OpenCV 정리 중 오류: {e}")
+        logger.warning(f"⚠️ OpenCV 정리 중 오류: {e}")
     
-    print("🎉 서버 종료 완료")
+    logger.info("🎉 서버 종료 완료")
 
 # 동기 버전 정리 함수 (시그널 핸들러용)
 def cleanup_on_shutdown_sync():
     """서버 종료 시 리소스 정리 (동기 버전)"""
-    global _pipeline, _active_websockets
-    print("\n🛑 서버 종료 중 - 리소스 정리...")
+    global _pipeline
+    logger.info("🛑 서버 종료 중 - 리소스 정리...")
     
     try:
         # WebSocket 연결 정리 (동기적으로)
-        if _active_websockets:
-            print(f"🔌 {len(_active_websockets)}개 WebSocket 연결 종료 중...")
-            _active_websockets.clear()
-            print("✅ WebSocket 연결 정리 완료")
+        active_count = ws_registry.count()
+        if active_count:
+            logger.info(f"🔌 {active_count}개 WebSocket 연결 종료 중...")
+            ws_registry.clear()
+            logger.info("✅ WebSocket 연결 정리 완료")
     except Exception as e:
-        print(f"⚠️ WebSocket 정리 중 오류: {e}")
+        logger.warning(f"⚠️ WebSocket 정리 중 오류: {e}")
     
     try:
         # 파이프라인 정리
         if _pipeline:
             if hasattr(_pipeline, 'stop'):
                 _pipeline.stop()
-                print("✅ 파이프라인 정리 완료")
+                logger.info("✅ 파이프라인 정리 완료")
             if hasattr(_pipeline, 'cleanup'):
                 _pipeline.cleanup()
-                print("✅ 파이프라인 리소스 정리 완료")
+                logger.info("✅ 파이프라인 리소스 정리 완료")
     except Exception as e:
-        print(f"⚠️ 파이프라인 정리 중 오류: {e}")
+        logger.warning(f"⚠️ 파이프라인 정리 중 오류: {e}")
     
     try:
         # OpenCV 윈도우 정리
         import cv2
         cv2.destroyAllWindows()
-        print("✅ OpenCV 윈도우 정리 완료")
+        logger.info("✅ OpenCV 윈도우 정리 완료")
     except ImportError:
-        print("ℹ️ OpenCV 모듈이 없습니다 - 건너뜁니다")
+        logger.info("ℹ️ OpenCV 모듈이 없습니다 - 건너뜁니다")
     except Exception as e:
-        print(f"⚠️ OpenCV 정리 중 오류: {e}")
+        logger.warning(f"⚠️ OpenCV 정리 중 오류: {e}")
     
-    print("🎉 서버 종료 완료")
+    logger.info("🎉 서버 종료 완료")
 
 if __name__ == "__main__":
     import uvicorn
@@ -1107,7 +1144,7 @@ if __name__ == "__main__":
     
     # 시그널 핸들러 등록
     def signal_handler(signum, frame):
-        print(f"\n📡 시그널 {signum} 수신 - 서버 종료 시작")
+        logger.info(f"📡 시그널 {signum} 수신 - 서버 종료 시작")
         cleanup_on_shutdown_sync()
         sys.exit(0)
     
@@ -1116,169 +1153,16 @@ if __name__ == "__main__":
     signal.signal(signal.SIGTERM, signal_handler)
     
     try:
-        print(f"🚀 서버 시작 중... (포트: {PORT})")
+        logger.info(f"🚀 서버 시작 중... (포트: {PORT})")
         uvicorn.run("server:app", host="0.0.0.0", port=PORT, log_level="info")
     except KeyboardInterrupt:
-        print("\n⌨️ KeyboardInterrupt 수신")
+        logger.info("⌨️ KeyboardInterrupt 수신")
         cleanup_on_shutdown_sync()
     except Exception as e:
-        print(f"\n❌ 서버 실행 중 오류: {e}")
+        logger.error(f"❌ 서버 실행 중 오류: {e}")
         cleanup_on_shutdown_sync()
         sys.exit(1)
 
-# ----------------------------------------
-# 텔레메트리 추출 유틸 (파이프라인 메서드/필드 이름이 달라도 최대한 대응)
-# ----------------------------------------
-def _to_jsonable(x):
-    """numpy 타입 등을 JSON 직렬화 가능하게 변환"""
-    import numpy as np
-    if isinstance(x, (np.floating,)):
-        return float(x)
-    if isinstance(x, (np.integer,)):
-        return int(x)
-    if isinstance(x, (np.ndarray,)):
-        return x.tolist()
-    return x
-
-def _normalize_dict(d: dict) -> dict:
-    return {k: _to_jsonable(v) for k, v in d.items()}
-
-def _get_telemetry() -> dict:
-    """
-    UI-only mode 텔레메트리 데이터 반환
-    """
-    return {
-        "ok": True,
-        "simulation_mode": True,
-        "message": "UI-only mode로 동작 중입니다.",
-        "data_source": "ui_only",
-        "debug_info": {
-            "pipeline_mode": "ui_only",
-            "camera_connected": False,
-            "reason": "UI 디자인 모드 - 실제 분석 비활성화"
-        },
-        "pipeline_running": False,
-        "pipeline_interval": 1.0,
-        "timestamp": time.time()
-    }
-
-def _ensure_pipeline_started():
-    """UI-only mode에서는 파이프라인 시작 불필요"""
-    pass
-
-def _current_interval() -> float:
-    """UI-only mode 전송 주기"""
-    return 2.0  # 2초마다 전송
-
-# ----------------------------------------
-# 실제 웹소켓 핸들러
-# ----------------------------------------
-@app.websocket("/ws/telemetry")
-async def ws_telemetry(ws: WebSocket):
-    await ws.accept()
-    print(f"🔗 WebSocket 연결 수락: {ws.client.host}")
-    
-    # 연결을 관리 세트에 추가
-    _active_websockets.add(ws)
-    _ensure_pipeline_started()
-
-    try:
-        while True:
-            d = _get_telemetry()
-
-            # 서버 전역 토글/메타 추가
-            d["debug_overlay"] = bool(debug_overlay)
-            d.setdefault("ok", True)
-            
-            # 타임스탬프 추가
-            d["timestamp"] = time.time()
-
-            await ws.send_json(d)
-            await asyncio.sleep(_current_interval())
-    except WebSocketDisconnect:
-        print(f"🔌 WebSocket 연결 종료: {ws.client.host}")
-    except Exception as e:
-        print(f"❌ WebSocket 오류: {e}")
-        # 예외 발생 시 잠깐 쉬고 재시도 루프 재가동
-        await asyncio.sleep(0.5)
-    finally:
-        # 연결을 관리 세트에서 제거
-        _active_websockets.discard(ws)
-
-@app.websocket("/ws/landmarks")
-async def ws_landmarks(ws: WebSocket):
-    """랜드마크 데이터를 위한 WebSocket 엔드포인트"""
-    await ws.accept()
-    print(f"🔗 랜드마크 WebSocket 연결 수락: {ws.client.host}")
-    
-    # 연결을 관리 세트에 추가
-    _active_websockets.add(ws)
-    
-    try:
-        while True:
-            # 클라이언트로부터 랜드마크 데이터 수신
-            data = await ws.receive_json()
-            
-            # 랜드마크 데이터 처리 (현재는 로그만 출력)
-            if data.get("type") == "landmarks_batch":
-                # 로그 빈도 조절 (과부하 방지)
-                frame_count = len(data.get('frames', []))
-                if frame_count > 0:
-                    # 첫 번째 프레임의 랜드마크 정보 확인
-                    first_frame = data.get('frames', [])[0] if data.get('frames') else None
-                    landmark_info = "없음"
-                    if first_frame and 'lm' in first_frame:
-                        # base64 디코딩하여 랜드마크 개수 확인
-                        import base64
-                        try:
-                            decoded_data = base64.b64decode(first_frame['lm'])
-                            # Float32Array로 변환 (3개 값씩 x, y, z)
-                            import struct
-                            float_count = len(decoded_data) // 4  # 4 bytes per float32
-                            landmark_count = float_count // 3  # 3개 값씩 (x, y, z)
-                            
-                            # 실제 MediaPipe FaceMesh는 468개 랜드마크
-                            expected_count = 468
-                            is_valid = landmark_count == expected_count
-                            
-                            landmark_info = f"{landmark_count}개 랜드마크 (예상: {expected_count}개, 유효: {'✅' if is_valid else '❌'})"
-                            
-                            # 첫 번째 랜드마크 값들 확인 (디버깅용)
-                            if float_count >= 6:
-                                values = struct.unpack('6f', decoded_data[:24])  # 첫 2개 랜드마크 (x,y,z) × 2
-                                landmark_info += f" | 첫 값들: {values[:3]}"
-                        except Exception as e:
-                            landmark_info = f"디코딩 오류: {e}"
-                    
-                    print(f"📊 랜드마크 배치 수신: {frame_count}개 프레임, {landmark_info}")
-                # 0개 프레임 로그는 제거
-                
-                # 여기에 랜드마크 데이터 처리 로직 추가 가능
-                # 예: 파이프라인에 전달, 분석 등
-                
-                # 응답 전송
-                await ws.send_json({
-                    "ok": True,
-                    "message": "랜드마크 데이터 수신 완료",
-                    "frames_processed": len(data.get('frames', [])),
-                    "timestamp": time.time()
-                })
-            else:
-                # 기타 메시지 처리
-                await ws.send_json({
-                    "ok": True,
-                    "message": "메시지 수신됨",
-                    "data": data
-                })
-                
-    except WebSocketDisconnect:
-        print(f"🔌 랜드마크 WebSocket 연결 종료: {ws.client.host}")
-    except Exception as e:
-        print(f"❌ 랜드마크 WebSocket 오류: {e}")
-    finally:
-        # 연결을 관리 세트에서 제거
-        _active_websockets.discard(ws)
-
 
 # ----------------------------------------
 # Studio Calibration API 엔드포인트
@@ -1306,7 +1190,7 @@ class UserCalibrationUpdateRequest(BaseModel):
 async def check_user_calibration(request: UserCheckRequest):
     """사용자 캘리브레이션 상태 확인 (사용자가 없으면 자동 생성)"""
     try:
-        print(f"🔍 [USER_CHECK] 요청 받음 - email: {request.email}")
+        logger.debug(f"🔍 [USER_CHECK] 요청 받음 - email: {request.email}")
         
         if DATABASE_AVAILABLE:
             try:
@@ -1314,7 +1198,7 @@ async def check_user_calibration(request: UserCheckRequest):
                 user = await get_user_by_email(request.email)
                 if user:
                     cam_calibration = user.get('cam_calibration', False)
-                    print(f"✅ [USER_CHECK] 사용자 발견 - cam_calibration: {cam_calibration}")
+                    logger.debug(f"✅ [USER_CHECK] 사용자 발견 - cam_calibration: {cam_calibration}")
                     return {
                         "has_calibration": cam_calibration,
                         "cam_calibration": cam_calibration,
@@ -1323,7 +1207,7 @@ async def check_user_calibration(request: UserCheckRequest):
                     }
                 else:
                     # 사용자가 없으면 자동 생성
-                    print(f"⚠️ [USER_CHECK] 사용자 없음 - 자동 생성 시작")
+                    logger.info(f"👤 [USER_CHECK] 사용자 없음 - 자동 생성 시작")
                     from ..database.database import create_user
                     from datetime import datetime
                     
@@ -1338,7 +1222,7 @@ async def check_user_calibration(request: UserCheckRequest):
                     try:
                         user_id = await create_user(new_user_data)
                         if user_id:
-                            print(f"✅ [USER_CHECK] 새 사용자 생성 완료: {user_id}")
+                            logger.debug(f"✅ [USER_CHECK] 새 사용자 생성 완료: {user_id}")
                             return {
                                 "has_calibration": False,
                                 "cam_calibration": False,
@@ -1346,24 +1230,22 @@ async def check_user_calibration(request: UserCheckRequest):
                                 "message": "새 사용자가 생성되었습니다"
                             }
                         else:
-                            print(f"❌ [USER_CHECK] 사용자 생성 실패 - user_id가 None")
+                            logger.error(f"❌ [USER_CHECK] 사용자 생성 실패 - user_id가 None")
                     except Exception as create_error:
-                        print(f"❌ [USER_CHECK] 사용자 생성 중 예외 발생: {create_error}")
-                        import traceback
-                        traceback.print_exc()
+                        logger.error(f"❌ [USER_CHECK] 사용자 생성 중 예외 발생: {create_error}", exc_info=True)
                         
             except Exception as db_error:
-                print(f"⚠️ [USER_CHECK] 데이터베이스 조회 실패: {db_error}")
+                logger.warning(f"⚠️ [USER_CHECK] 데이터베이스 조회 실패: {db_error}")
         
         # MongoDB가 없거나 사용자 생성에 실패한 경우
-        print(f"⚠️ [USER_CHECK] 사용자 정보 없음 - MongoDB: {DATABASE_AVAILABLE}")
+        logger.warning(f"⚠️ [USER_CHECK] 사용자 정보 없음 - MongoDB: {DATABASE_AVAILABLE}")
         return {
             "has_calibration": False,
             "cam_calibration": False,
             "message": "사용자 정보를 찾을 수 없습니다"
         }
     except Exception as e:
-        print(f"❌ [USER_CHECK] 오류 발생: {e}")
+        logger.error(f"❌ [USER_CHECK] 오류 발생: {e}")
         return {
             "has_calibration": False,
             "cam_calibration": False,
@@ -1394,14 +1276,14 @@ async def update_user_calibration_status(request: UserCalibrationUpdateRequest):
             )
             
             if update_result.modified_count > 0:
-                print(f"사용자 캘리브레이션 상태 업데이트 완료: {request.user_id} -> {request.cam_calibration}")
+                logger.info(f"사용자 캘리브레이션 상태 업데이트 완료: {request.user_id} -> {request.cam_calibration}")
                 return {
                     "success": True,
                     "message": "캘리브레이션 상태 업데이트 완료",
                     "cam_calibration": request.cam_calibration
                 }
             else:
-                print(f"사용자를 찾을 수 없음: {request.user_id}")
+                logger.warning(f"사용자를 찾을 수 없음: {request.user_id}")
                 return {
                     "success": False,
                     "message": "사용자를 찾을 수 없습니다"
@@ -1413,7 +1295,7 @@ async def update_user_calibration_status(request: UserCalibrationUpdateRequest):
             "message": "데이터베이스 연결이 불가능합니다"
         }
     except Exception as e:
-        print(f"사용자 캘리브레이션 상태 업데이트 오류: {e}")
+        logger.error(f"사용자 캘리브레이션 상태 업데이트 오류: {e}")
         return {
             "success": False,
             "message": f"업데이트 중 오류 발생: {str(e)}"
@@ -1455,7 +1337,7 @@ async def save_calibration(request: CalibrationRequest):
                         }
                     }
                 )
-                print(f"캘리브레이션 데이터 업데이트 완료: {request.user_id}")
+                logger.info(f"캘리브레이션 데이터 업데이트 완료: {request.user_id}")
             else:
                 # 새 캘리브레이션 데이터 저장
                 calibration_doc = {
@@ -1468,7 +1350,7 @@ async def save_calibration(request: CalibrationRequest):
                 }
                 
                 insert_result = await chat_sessions_collection.insert_one(calibration_doc)
-                print(f"캘리브레이션 데이터 저장 완료: {request.user_id}")
+                logger.info(f"캘리브레이션 데이터 저장 완료: {request.user_id}")
             
             return {
                 "success": True,
@@ -1481,7 +1363,7 @@ async def save_calibration(request: CalibrationRequest):
                 "message": "데이터베이스 연결이 불가능합니다"
             }
     except Exception as e:
-        print(f"캘리브레이션 저장 오류: {e}")
+        logger.error(f"캘리브레이션 저장 오류: {e}")
         return {
             "success": False,
             "message": f"저장 중 오류 발생: {str(e)}"
@@ -1501,14 +1383,14 @@ async def get_user_calibration(user_id: str):
             
             if calibration_doc and calibration_doc.get("calibration_data"):
                 calibration_data = calibration_doc["calibration_data"]
-                print(f"개인 캘리브레이션 데이터 조회 완료: {user_id}")
+                logger.debug(f"개인 캘리브레이션 데이터 조회 완료: {user_id}")
                 return {
                     "success": True,
                     "calibration_data": calibration_data,
                     "message": "개인 캘리브레이션 데이터 조회 완료"
                 }
             else:
-                print(f"개인 캘리브레이션 데이터 없음: {user_id}")
+                logger.warning(f"개인 캘리브레이션 데이터 없음: {user_id}")
                 return {
                     "success": False,
                     "message": "개인 캘리브레이션 데이터가 없습니다"
@@ -1519,7 +1401,7 @@ async def get_user_calibration(user_id: str):
                 "message": "데이터베이스 연결이 불가능합니다"
             }
     except Exception as e:
-        print(f"개인 캘리브레이션 데이터 조회 오류: {e}")
+        logger.error(f"개인 캘리브레이션 데이터 조회 오류: {e}")
         return {
             "success": False,
             "message": f"조회 중 오류 발생: {str(e)}"
@@ -1534,7 +1416,7 @@ async def chat_with_ai(request: Request):
         user_id = data.get("user_id", "unknown")
         session_id = data.get("session_id", "default")
         
-        print(f"🤖 [CHAT] 채팅 요청 받음 - 사용자: {user_id}, 세션: {session_id}")
+        logger.debug(f"🤖 [CHAT] 채팅 요청 받음 - 사용자: {user_id}, 세션: {session_id}")
         
         # 사용자 메시지 추출
         if not messages:
@@ -1560,19 +1442,19 @@ async def chat_with_ai(request: Request):
                 "message": "메시지 추출 실패"
             }
         
-        print(f"📝 [CHAT] 사용자 메시지: {last_message}")
+        logger.debug(f"📝 [CHAT] 사용자 메시지: {last_message}")
         
         # 실제 GPT 호출
         ai_response = await generate_ai_response(last_message, session_id)
         
-        print(f"✅ [CHAT] AI 응답 생성 완료: {ai_response}")
+        logger.debug(f"✅ [CHAT] AI 응답 생성 완료: {ai_response}")
         
         return {
             "response": ai_response,
             "message": "AI 응답 생성 완료"
         }
     except Exception as e:
-        print(f"❌ [CHAT] AI 채팅 오류: {e}")
+        logger.error(f"❌ [CHAT] AI 채팅 오류: {e}")
         return {
             "response": "죄송합니다. 현재 응답을 생성할 수 없습니다.",
             "message": f"오류 발생: {str(e)}"
@@ -1601,7 +1483,7 @@ async def analyze_feedback(request: Request):
         
         return feedback
     except Exception as e:
-        print(f"피드백 분석 오류: {e}")
+        logger.error(f"피드백 분석 오류: {e}")
         return {
             "likability": 0,
             "initiative": 0,
@@ -1632,7 +1514,7 @@ async def get_calibration_status(user_id: str):
             "status": status.dict()
         }
     except Exception as e:
-        print(f"❌ 캘리브레이션 상태 확인 실패: {e}")
+        logger.error(f"❌ 캘리브레이션 상태 확인 실패: {e}")
         return {
             "success": False,
             "message": f"캘리브레이션 상태 확인 중 오류 발생: {str(e)}"
@@ -1656,13 +1538,10 @@ async def update_user_calibration_status(request: Request):
             }
         
         # Supabase users 테이블 업데이트
-        if CALIBRATION_AVAILABLE and calibration_service.supabase_client:
-            response = calibration_service.supabase_client.table("users").update({
-                "cam_calibration": cam_calibration,
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("id", user_id).execute()
+        if CALIBRATION_AVAILABLE and calibration_service.available:
+            updated = await calibration_service.set_user_calibration_flag(user_id, cam_calibration, returning=True)
             
-            if response.data:
+            if updated:
                 return {
                     "success": True,
                     "message": "사용자 캘리브레이션 상태가 업데이트되었습니다.",
@@ -1680,7 +1559,7 @@ async def update_user_calibration_status(request: Request):
                 "message": "Supabase 연결이 불가능합니다."
             }
     except Exception as e:
-        print(f"❌ 사용자 캘리브레이션 상태 업데이트 실패: {e}")
+        logger.error(f"❌ 사용자 캘리브레이션 상태 업데이트 실패: {e}")
         return {
             "success": False,
             "message": f"사용자 상태 업데이트 중 오류 발생: {str(e)}"
@@ -1709,7 +1588,7 @@ async def get_calibration_data(user_id: str, profile_name: str = "default"):
                 "message": "캘리브레이션 데이터를 찾을 수 없습니다."
             }
     except Exception as e:
-        print(f"❌ 캘리브레이션 데이터 조회 실패: {e}")
+        logger.error(f"❌ 캘리브레이션 데이터 조회 실패: {e}")
         return {
             "success": False,
             "message": f"캘리브레이션 데이터 조회 중 오류 발생: {str(e)}"
@@ -1766,7 +1645,7 @@ async def save_supabase_calibration(request: SupabaseCalibrationRequest):
         
         if result.data:
             calibration_id = result.data[0]["id"]
-            print(f"Supabase 캘리브레이션 데이터 저장 완료: {request.user_id}, device_id: {request.device_id}")
+            logger.info(f"Supabase 캘리브레이션 데이터 저장 완료: {request.user_id}, device_id: {request.device_id}")
             
             # camera_calibration_active 테이블에 활성 매핑 추가
             active_data = {
@@ -1800,7 +1679,7 @@ async def save_supabase_calibration(request: SupabaseCalibrationRequest):
             }
             
     except Exception as e:
-        print(f"Supabase 캘리브레이션 저장 오류: {e}")
+        logger.error(f"Supabase 캘리브레이션 저장 오류: {e}")
         return {
             "success": False,
             "message": f"Supabase 저장 중 오류 발생: {str(e)}"
@@ -1829,7 +1708,7 @@ async def get_user_calibration_data(user_id: str, profile_name: str = "default")
                 "message": "캘리브레이션 데이터를 찾을 수 없습니다."
             }
     except Exception as e:
-        print(f"❌ 사용자 캘리브레이션 데이터 조회 실패: {e}")
+        logger.error(f"❌ 사용자 캘리브레이션 데이터 조회 실패: {e}")
         return {
             "success": False,
             "message": f"캘리브레이션 데이터 조회 중 오류 발생: {str(e)}"
@@ -1847,16 +1726,19 @@ async def start_calibration(request: CalibrationRequest):
         
         session_id = await calibration_service.start_calibration_session(
             request.user_id, 
-            duration_seconds=5
+            duration_seconds=5,
+            profile_name=request.profile_name or "default"
         )
         
         return {
             "success": True,
             "session_id": session_id,
+            # /api/calibration/collect 의 압축 프레임 배열 값 순서
+            "fields": list(CALIBRATION_FRAME_FIELDS),
             "message": "캘리브레이션 세션이 시작되었습니다. 5초간 자세를 유지해주세요."
         }
     except Exception as e:
-        print(f"❌ 캘리브레이션 세션 시작 실패: {e}")
+        logger.error(f"❌ 캘리브레이션 세션 시작 실패: {e}")
         return {
             "success": False,
             "message": f"캘리브레이션 세션 시작 중 오류 발생: {str(e)}"
@@ -1886,7 +1768,7 @@ async def process_calibration(request: Request):
         
         return response.dict()
     except Exception as e:
-        print(f"❌ 캘리브레이션 처리 실패: {e}")
+        logger.error(f"❌ 캘리브레이션 처리 실패: {e}")
         return {
             "success": False,
             "message": f"캘리브레이션 처리 중 오류 발생: {str(e)}"
@@ -1937,7 +1819,7 @@ async def save_calibration_data(request: Request):
                 "message": "캘리브레이션 데이터 저장에 실패했습니다."
             }
     except Exception as e:
-        print(f"❌ 캘리브레이션 데이터 저장 실패: {e}")
+        logger.error(f"❌ 캘리브레이션 데이터 저장 실패: {e}")
         return {
             "success": False,
             "message": f"캘리브레이션 데이터 저장 중 오류 발생: {str(e)}"
@@ -1955,7 +1837,8 @@ async def collect_calibration_frame(request: Request):
         
         data = await request.json()
         session_id = data.get("session_id")
-        frame_data = data.get("frame_data", {})
+        # frames: 압축 배열 목록 (여러 프레임 묶음), frame_data: 단일 프레임 (배열 또는 dict)
+        frame_data = {"frames": data["frames"]} if "frames" in data else data.get("frame_data", {})
         
         if not session_id:
             return {
@@ -1963,84 +1846,105 @@ async def collect_calibration_frame(request: Request):
                 "message": "session_id가 필요합니다."
             }
         
-        success = await calibration_service.collect_calibration_data(session_id, frame_data)
+        try:
+            frames = await calibration_service.collect_calibration_data(session_id, frame_data)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        success = frames is not None
         
         return {
             "success": success,
-            "message": "프레임 데이터가 수집되었습니다." if success else "프레임 데이터 수집에 실패했습니다."
+            "frames": frames,
+            "message": "프레임 데이터가 수집되었습니다." if success else "캘리브레이션 세션이 없거나 만료되었습니다."
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ 캘리브레이션 프레임 수집 실패: {e}")
+        logger.error(f"❌ 캘리브레이션 프레임 수집 실패: {e}")
         return {
             "success": False,
             "message": f"프레임 데이터 수집 중 오류 발생: {str(e)}"
         }
 
+@app.post("/api/calibration/finalize")
+async def finalize_calibration(request: Request):
+    """캘리브레이션 세션 완료 - 서버에서 집계한 통계로 CalibrationData 생성 및 저장"""
+    try:
+        if not CALIBRATION_AVAILABLE:
+            return {
+                "success": False,
+                "message": "캘리브레이션 모듈이 사용 불가능합니다."
+            }
+        
+        data = await request.json()
+        session_id = data.get("session_id")
+        if not session_id:
+            return {
+                "success": False,
+                "message": "session_id가 필요합니다."
+            }
+        
+        response = await calibration_service.finalize_calibration_session(session_id, save=data.get("save", True))
+        return response.dict()
+    except Exception as e:
+        logger.error(f"❌ 캘리브레이션 세션 완료 실패: {e}")
+        return {
+            "success": False,
+            "message": f"캘리브레이션 완료 중 오류 발생: {str(e)}"
+        }
+
 # ====== 페르소나 정보 로드 함수 ======
 
 async def load_persona_context(session_id: str) -> str:
-    """새로운 프로토콜 기반 페르소나 컨텍스트 로드"""
+    """새로운 프로토콜 기반 페르소나 컨텍스트 로드 (메모리 레지스트리)"""
     try:
-        # 새로운 페르소나 관리자 사용
-        from ..services.personas.persona_manager import get_persona_manager
-        from ..services.personas.prompt_protocol import read_system_text
-        
-        manager = get_persona_manager()
-        active_persona = manager.get_active_persona()
-        
-        if active_persona:
-            persona_id = active_persona["id"]
-            print(f"🎭 [PERSONA] 활성 페르소나: {active_persona['name']} ({persona_id})")
-            
-            # 시스템 텍스트 로드
-            system_text = read_system_text(persona_id)
-            print(f"✅ [PERSONA] 시스템 텍스트 로드 완료: {len(system_text)}자")
-            return system_text
-        else:
-            print(f"⚠️ [PERSONA] 활성 페르소나 없음 - 기본값 사용")
-            return "당신은 '이서아'입니다. 처음 뵙는 사람에게 정중하고 따뜻하게 대화하는 마케팅 담당자입니다."
-            
+        persona = persona_registry.active_or_default()
+        logger.debug(f"🎭 [PERSONA] 활성 페르소나: {persona.name} ({persona.id})")
+        return persona.system_text
     except Exception as e:
-        print(f"❌ [PERSONA] 페르소나 정보 로드 실패: {e}")
+        logger.error(f"❌ [PERSONA] 페르소나 정보 로드 실패: {e}")
         return "당신은 '이서아'입니다. 처음 뵙는 사람에게 정중하고 따뜻하게 대화하는 마케팅 담당자입니다."
 
 # ====== AI 응답 생성 함수 ======
 
-async def generate_ai_response(user_message: str, session_id: str) -> str:
-    """새로운 프로토콜 기반 AI 응답 생성"""
+async def generate_ai_response(user_message: str, session_id: str, message_id: Optional[str] = None) -> str:
+    """
+    새로운 프로토콜 기반 AI 응답 생성
+    - message_id 가 주어지면 (저장되는 채팅 세션) 세션 최근 대화 + 관련 과거 대화를 토큰 예산 안에서 포함
+    """
     try:
-        print(f"🤖 [AI_RESPONSE] 함수 시작 - 메시지: {user_message[:50]}...")
+        logger.debug(f"🤖 [AI_RESPONSE] 함수 시작 - 메시지: {user_message[:50]}...")
         
         if not OPENAI_API_KEY:
-            print("❌ [AI_RESPONSE] OpenAI API 키가 없음 - 오류 반환")
+            logger.error("❌ [AI_RESPONSE] OpenAI API 키가 없음 - 오류 반환")
             raise HTTPException(status_code=503, detail="OpenAI API key not configured")
         
-        print(f"✅ [AI_RESPONSE] OpenAI API 키 확인됨")
+        logger.debug(f"✅ [AI_RESPONSE] OpenAI API 키 확인됨")
         
-        # 새로운 프로토콜 시스템 사용
-        from ..services.personas.prompt_protocol import compile_messages, apply_style_constraints
-        from ..services.personas.persona_manager import get_persona_manager
+        # 세션에 바인딩된 페르소나 (세션당 1회 조회 후 캐시, 없으면 활성 페르소나)
+        with span("db"):
+            persona = await session_personas.resolve(session_id) if DATABASE_AVAILABLE \
+                else persona_registry.active_or_default()
+        persona_id = persona.id
         
-        # 활성 페르소나 가져오기
-        manager = get_persona_manager()
-        active_persona = manager.get_active_persona()
-        persona_id = active_persona["id"] if active_persona else "이서아"
-        
-        print(f"🤖 [AI_RESPONSE] OpenAI API 호출 시작...")
-        print(f"📝 [AI_RESPONSE] 사용자 메시지: {user_message}")
-        print(f"👤 [AI_RESPONSE] 세션 ID: {session_id}")
-        print(f"🎭 [AI_RESPONSE] 페르소나: {persona_id}")
+        logger.debug(f"🤖 [AI_RESPONSE] OpenAI API 호출 시작...")
+        logger.debug(f"📝 [AI_RESPONSE] 사용자 메시지: {user_message}")
+        logger.debug(f"👤 [AI_RESPONSE] 세션 ID: {session_id}")
+        logger.debug(f"🎭 [AI_RESPONSE] 페르소나: {persona_id}")
         
         # 메시지 컴파일
-        print(f"📝 [AI_RESPONSE] 메시지 컴파일 시작...")
-        messages = compile_messages(user_message, persona_id)
-        print(f"📝 [AI_RESPONSE] 메시지 컴파일 완료 - 메시지 수: {len(messages)}")
+        logger.debug(f"📝 [AI_RESPONSE] 메시지 컴파일 시작...")
+        history = None
+        if message_id and DATABASE_AVAILABLE:
+            history = await context_assembler.build_history(session_id, user_message, exclude_ids=[message_id])
+        messages = compile_messages(user_message, persona_id, history=history, persona=persona)
+        logger.debug(f"📝 [AI_RESPONSE] 메시지 컴파일 완료 - 메시지 수: {len(messages)}")
         
         # OpenAI API 호출
         from openai import OpenAI
         import os
         
-        print(f"🔗 [AI_RESPONSE] OpenAI 클라이언트 안전 초기화...")
+        logger.debug(f"🔗 [AI_RESPONSE] OpenAI 클라이언트 안전 초기화...")
         
         # OpenAI 클라이언트 생성 전 모든 proxy 환경변수 임시 제거
         original_env = {}
@@ -2055,36 +1959,37 @@ async def generate_ai_response(user_message: str, session_id: str) -> str:
                 api_key=OPENAI_API_KEY,
                 timeout=60.0
             )
-            print(f"✅ [AI_RESPONSE] OpenAI 클라이언트 안전 연결 완료")
+            logger.debug(f"✅ [AI_RESPONSE] OpenAI 클라이언트 안전 연결 완료")
             
         finally:
             # 환경변수 복원 (다른 시스템에 영향 방지)
             for var, value in original_env.items():
                 os.environ[var] = value
         
-        print(f"🚀 [AI_RESPONSE] OpenAI API 호출 시작...")
-        print(f"📋 [AI_RESPONSE] 요청 파라미터: model=gpt-4o-mini, max_tokens=80, temperature=0.8")
-        
-        response = await asyncio.to_thread(
-            client.chat.completions.create,
-            model="gpt-4o-mini",
-            messages=messages,
-            max_tokens=80,
-            temperature=0.8,
-            frequency_penalty=0.3,
-            presence_penalty=0.3
-        )
+        logger.debug(f"🚀 [AI_RESPONSE] OpenAI API 호출 시작...")
+        logger.debug(f"📋 [AI_RESPONSE] 요청 파라미터: model=gpt-4o-mini, max_tokens=80, temperature=0.8")
+        
+        with span("llm"):
+            response = await asyncio.to_thread(
+                client.chat.completions.create,
+                model="gpt-4o-mini",
+                messages=messages,
+                max_tokens=80,
+                temperature=0.8,
+                frequency_penalty=0.3,
+                presence_penalty=0.3
+            )
         
         ai_response = response.choices[0].message.content.strip()
-        print(f"✅ [AI_RESPONSE] OpenAI 응답 생성 완료: {len(ai_response)}자")
-        print(f"💬 [AI_RESPONSE] AI 응답: {ai_response}")
+        logger.debug(f"✅ [AI_RESPONSE] OpenAI 응답 생성 완료: {len(ai_response)}자")
+        logger.debug(f"💬 [AI_RESPONSE] AI 응답: {ai_response}")
         
         # TTS 최적화 제거 - 원본 AI 응답 그대로 반환
         return ai_response
         
     except Exception as e:
-        print(f"❌ [AI_RESPONSE] OpenAI API 호출 실패: {e}")
-        print(f"📋 [AI_RESPONSE] 상세 오류: {e}")
+        logger.error(f"❌ [AI_RESPONSE] OpenAI API 호출 실패: {e}")
+        logger.debug(f"📋 [AI_RESPONSE] 상세 오류: {e}")
         return "처음 뵙겠습니다."
 
 # ====== 음성 분석 API 엔드포인트 ======
@@ -2092,11 +1997,11 @@ async def generate_ai_response(user_message: str, session_id: str) -> str:
 @app.post("/api/voice/analyze")
 async def analyze_voice(audio: UploadFile = File(...)):
     """음성 파일을 텍스트로 변환 (faster-whisper 우선 사용)"""
-    print(f"🎤 [VOICE_ANALYZE] 음성 분석 요청 받음 - 파일명: {audio.filename}")
+    logger.debug(f"🎤 [VOICE_ANALYZE] 음성 분석 요청 받음 - 파일명: {audio.filename}")
     
     # 오디오 파일 읽기
     audio_data = await audio.read()
-    print(f"📊 [VOICE_ANALYZE] 오디오 데이터 크기: {len(audio_data)} bytes")
+    logger.debug(f"📊 [VOICE_ANALYZE] 오디오 데이터 크기: {len(audio_data)} bytes")
     
     # 1. 먼저 faster-whisper로 STT 시도
     try:
@@ -2111,31 +2016,32 @@ async def analyze_voice(audio: UploadFile = File(...)):
         
         try:
             # faster-whisper 모델 로드 및 STT 실행 (최적화 설정)
-            print("🔄 [VOICE_ANALYZE] faster-whisper로 STT 시작...")
-            model = WhisperModel("tiny", device="cpu", compute_type="int8", num_workers=2)
-            segments, info = model.transcribe(
-                temp_webm_path, 
-                language="ko",
-                beam_size=1,
-                best_of=1,
-                vad_filter=True,
-                vad_parameters=dict(min_silence_duration_ms=500)
-            )
-            
-            # 전사 결과 수집
-            transcript = ""
-            for segment in segments:
-                transcript += segment.text
+            logger.debug("🔄 [VOICE_ANALYZE] faster-whisper로 STT 시작...")
+            with span("stt"):
+                model = WhisperModel("tiny", device="cpu", compute_type="int8", num_workers=2)
+                segments, info = model.transcribe(
+                    temp_webm_path, 
+                    language="ko",
+                    beam_size=1,
+                    best_of=1,
+                    vad_filter=True,
+                    vad_parameters=dict(min_silence_duration_ms=500)
+                )
+                
+                # 전사 결과 수집 (segments 는 지연 생성 - 실제 디코딩은 여기서)
+                transcript = ""
+                for segment in segments:
+                    transcript += segment.text
             
             if not transcript.strip():
                 transcript = "음성을 인식하지 못했습니다."
             
-            print(f"✅ [VOICE_ANALYZE] faster-whisper-tiny STT 성공: {transcript}")
+            logger.debug(f"✅ [VOICE_ANALYZE] faster-whisper-tiny STT 성공: {transcript}")
             
             # 음성 분석 모듈이 활성화되어 있으면 추가 분석 수행
             if VOICE_ANALYSIS_AVAILABLE:
                 try:
-                    print("🔄 [VOICE_ANALYZE] 새로운 말투 분석 시스템으로 분석 시작...")
+                    logger.debug("🔄 [VOICE_ANALYZE] 새로운 말투 분석 시스템으로 분석 시작...")
                     from ..services.voice.voice_api import process_audio_simple
                     import numpy as np
                     import torchaudio
@@ -2155,26 +2061,27 @@ async def analyze_voice(audio: UploadFile = File(...)):
                             ).numpy().flatten()
                             sr = 16000
                         
-                        print(f"🎵 [VOICE_ANALYZE] 오디오 변환 완료: shape={audio_array.shape}, sr={sr}")
+                        logger.debug(f"🎵 [VOICE_ANALYZE] 오디오 변환 완료: shape={audio_array.shape}, sr={sr}")
                         
                         # 새로운 말투 분석 시스템으로 분석
-                        analysis_result = await asyncio.to_thread(
-                            process_audio_simple, 
-                            audio_array, 
-                            sr, 
-                            0.0  # elapsed_sec
-                        )
+                        with span("inference"):
+                            analysis_result = await asyncio.to_thread(
+                                process_audio_simple, 
+                                audio_array, 
+                                sr, 
+                                0.0  # elapsed_sec
+                            )
                         
                         # 분석 결과에 STT 결과 추가
                         analysis_result["transcript"] = transcript
                         analysis_result["voice_details"]["stt_method"] = "faster-whisper-tiny"
                         
-                        print(f"✅ [VOICE_ANALYZE] 말투 분석 완료")
-                        print(f"📊 [VOICE_ANALYZE] 총점: {analysis_result.get('total_score', 0):.1f}")
-                        print(f"🎤 [VOICE_ANALYZE] 음성톤: {analysis_result.get('voice_tone_score', 0):.1f}")
-                        print(f"💬 [VOICE_ANALYZE] 단어선택: {analysis_result.get('word_choice_score', 0):.1f}")
-                        print(f"😊 [VOICE_ANALYZE] 감정: {analysis_result.get('emotion', '중립')}")
-                        print(f"📝 [VOICE_ANALYZE] 전사: {transcript}")
+                        logger.debug(f"✅ [VOICE_ANALYZE] 말투 분석 완료")
+                        logger.debug(f"📊 [VOICE_ANALYZE] 총점: {analysis_result.get('total_score', 0):.1f}")
+                        logger.debug(f"🎤 [VOICE_ANALYZE] 음성톤: {analysis_result.get('voice_tone_score', 0):.1f}")
+                        logger.debug(f"💬 [VOICE_ANALYZE] 단어선택: {analysis_result.get('word_choice_score', 0):.1f}")
+                        logger.debug(f"😊 [VOICE_ANALYZE] 감정: {analysis_result.get('emotion', '중립')}")
+                        logger.debug(f"📝 [VOICE_ANALYZE] 전사: {transcript}")
                         
                         return {
                             "success": True,
@@ -2188,7 +2095,7 @@ async def analyze_voice(audio: UploadFile = File(...)):
                         }
                         
                     except Exception as audio_error:
-                        print(f"⚠️ [VOICE_ANALYZE] 오디오 변환 실패: {audio_error}")
+                        logger.warning(f"⚠️ [VOICE_ANALYZE] 오디오 변환 실패: {audio_error}")
                         # 오디오 변환 실패 시 STT 결과만 반환
                         return {
                             "success": True,
@@ -2214,7 +2121,7 @@ async def analyze_voice(audio: UploadFile = File(...)):
                         }
                     
                 except Exception as analysis_error:
-                    print(f"⚠️ [VOICE_ANALYZE] 말투 분석 실패, STT 결과만 반환: {analysis_error}")
+                    logger.warning(f"⚠️ [VOICE_ANALYZE] 말투 분석 실패, STT 결과만 반환: {analysis_error}")
                     # STT 결과만 반환
                     return {
                         "success": True,
@@ -2268,15 +2175,16 @@ async def analyze_voice(audio: UploadFile = File(...)):
             os.unlink(temp_webm_path)
             
     except Exception as e:
-        print(f"❌ [VOICE_ANALYZE] faster-whisper STT 실패: {e}")
+        logger.error(f"❌ [VOICE_ANALYZE] faster-whisper STT 실패: {e}")
         
         # faster-whisper 실패 시 기존 음성 분석 모듈 시도
         if VOICE_ANALYSIS_AVAILABLE:
             try:
-                print("🔄 [VOICE_ANALYZE] 기존 음성 분석 모듈로 fallback...")
+                logger.debug("🔄 [VOICE_ANALYZE] 기존 음성 분석 모듈로 fallback...")
                 from ..services.voice.voice_api import process_audio_simple
                 
-                analysis_result = await asyncio.to_thread(process_audio_simple, audio_data)
+                with span("inference"):
+                    analysis_result = await asyncio.to_thread(process_audio_simple, audio_data)
                 
                 return {
                     "success": True,
@@ -2290,7 +2198,7 @@ async def analyze_voice(audio: UploadFile = File(...)):
                 }
                 
             except Exception as fallback_error:
-                print(f"❌ [VOICE_ANALYZE] 모든 음성 분석 방법 실패: {fallback_error}")
+                logger.error(f"❌ [VOICE_ANALYZE] 모든 음성 분석 방법 실패: {fallback_error}")
                 return {
                     "success": False,
                     "analysis": {
@@ -2340,7 +2248,7 @@ async def analyze_voice(audio: UploadFile = File(...)):
     try:
         # 오디오 파일 읽기
         audio_data = await audio.read()
-        print(f"📊 [VOICE_ANALYZE] 오디오 데이터 크기: {len(audio_data)} bytes")
+        logger.debug(f"📊 [VOICE_ANALYZE] 오디오 데이터 크기: {len(audio_data)} bytes")
         
         # 오디오 데이터를 numpy 배열로 변환
         import io
@@ -2373,12 +2281,12 @@ async def analyze_voice(audio: UploadFile = File(...)):
                 
                 # numpy 배열로 변환
                 audio_array = waveform.squeeze().numpy()
-                print(f"🔄 [VOICE_ANALYZE] WebM→WAV 변환 및 전처리 완료 - 길이: {len(audio_array)}, 샘플레이트: {sample_rate}Hz")
+                logger.debug(f"🔄 [VOICE_ANALYZE] WebM→WAV 변환 및 전처리 완료 - 길이: {len(audio_array)}, 샘플레이트: {sample_rate}Hz")
                 
             except (subprocess.CalledProcessError, FileNotFoundError) as e:
-                print(f"⚠️ [VOICE_ANALYZE] ffmpeg 변환 실패: {e}")
+                logger.warning(f"⚠️ [VOICE_ANALYZE] ffmpeg 변환 실패: {e}")
                 # WebM 파일을 직접 faster-whisper로 처리
-                print("🔄 [VOICE_ANALYZE] WebM 파일 직접 처리 시도...")
+                logger.debug("🔄 [VOICE_ANALYZE] WebM 파일 직접 처리 시도...")
                 from faster_whisper import WhisperModel
                 model = WhisperModel("base", device="cpu", compute_type="int8")
                 segments, info = model.transcribe(temp_webm_path, language="ko")
@@ -2391,7 +2299,7 @@ async def analyze_voice(audio: UploadFile = File(...)):
                 if not transcript.strip():
                     transcript = "음성을 인식하지 못했습니다."
                 
-                print(f"✅ [VOICE_ANALYZE] WebM 직접 STT 성공: {transcript}")
+                logger.debug(f"✅ [VOICE_ANALYZE] WebM 직접 STT 성공: {transcript}")
                 
                 return {
                     "success": True,
@@ -2425,18 +2333,18 @@ async def analyze_voice(audio: UploadFile = File(...)):
                 }
             
             # faster-whisper로 음성 분석 수행
-            print("🔄 [VOICE_ANALYZE] faster-whisper로 음성 분석 시작...")
+            logger.debug("🔄 [VOICE_ANALYZE] faster-whisper로 음성 분석 시작...")
             from ..services.voice.voice_api import process_audio_simple
             analysis_result = await asyncio.to_thread(process_audio_simple, audio_array)
-            print(f"✅ [VOICE_ANALYZE] 음성 분석 완료")
+            logger.debug(f"✅ [VOICE_ANALYZE] 음성 분석 완료")
             
             # 결과 로그
-            print(f"📝 [VOICE_ANALYZE] 분석 결과:")
-            print(f"   - 인식된 텍스트: {analysis_result.get('transcript', 'N/A')}")
-            print(f"   - 감정: {analysis_result.get('emotion', 'N/A')} ({analysis_result.get('emotion_score', 0):.2f})")
-            print(f"   - 종합 점수: {analysis_result.get('total_score', 0):.1f}")
-            print(f"   - 음성 톤 점수: {analysis_result.get('voice_tone_score', 0):.1f}")
-            print(f"   - 단어 선택 점수: {analysis_result.get('word_choice_score', 0):.1f}")
+            logger.debug(f"📝 [VOICE_ANALYZE] 분석 결과:")
+            logger.debug(f"   - 인식된 텍스트: {analysis_result.get('transcript', 'N/A')}")
+            logger.debug(f"   - 감정: {analysis_result.get('emotion', 'N/A')} ({analysis_result.get('emotion_score', 0):.2f})")
+            logger.debug(f"   - 종합 점수: {analysis_result.get('total_score', 0):.1f}")
+            logger.debug(f"   - 음성 톤 점수: {analysis_result.get('voice_tone_score', 0):.1f}")
+            logger.debug(f"   - 단어 선택 점수: {analysis_result.get('word_choice_score', 0):.1f}")
             
             return {
                 "success": True,
@@ -2450,7 +2358,7 @@ async def analyze_voice(audio: UploadFile = File(...)):
             os.unlink(temp_wav_path)
         
     except Exception as e:
-        print(f"❌ [VOICE_ANALYZE] 음성 분석 중 오류: {e}")
+        logger.error(f"❌ [VOICE_ANALYZE] 음성 분석 중 오류: {e}")
         return {
             "success": False,
             "error": f"음성 분석 중 오류 발생: {str(e)}",
@@ -2473,7 +2381,7 @@ async def text_to_speech(request: Request):
         if not text:
             raise HTTPException(status_code=400, detail="Text is required")
         
-        print(f"🔊 [TTS] 음성 합성 요청: {text[:50]}... (목소리: {voice})")
+        logger.debug(f"🔊 [TTS] 음성 합성 요청: {text[:50]}... (목소리: {voice})")
         
         # 사용 가능한 목소리 목록 (대체용)
         available_voices = [
@@ -2496,22 +2404,23 @@ async def text_to_speech(request: Request):
         
         for try_voice in available_voices:
             try:
-                print(f"🔄 [TTS] 목소리 시도: {try_voice}")
+                logger.debug(f"🔄 [TTS] 목소리 시도: {try_voice}")
                 
                 # Edge-TTS로 음성 생성
                 communicate = edge_tts.Communicate(text, try_voice)
-                await communicate.save(temp_path)
+                with span("tts"):
+                    await communicate.save(temp_path)
                 
                 # 파일 읽기
                 with open(temp_path, 'rb') as f:
                     audio_data = f.read()
                 
                 used_voice = try_voice
-                print(f"✅ [TTS] 목소리 성공: {try_voice}")
+                logger.debug(f"✅ [TTS] 목소리 성공: {try_voice}")
                 break
                 
             except Exception as voice_error:
-                print(f"⚠️ [TTS] 목소리 실패 ({try_voice}): {voice_error}")
+                logger.warning(f"⚠️ [TTS] 목소리 실패 ({try_voice}): {voice_error}")
                 continue
         
         # 임시 파일 삭제
@@ -2520,7 +2429,7 @@ async def text_to_speech(request: Request):
         if not audio_data:
             raise Exception("모든 목소리 시도 실패")
         
-        print(f"✅ [TTS] 음성 합성 완료: {len(audio_data)} bytes (사용된 목소리: {used_voice})")
+        logger.debug(f"✅ [TTS] 음성 합성 완료: {len(audio_data)} bytes (사용된 목소리: {used_voice})")
         
         return Response(
             content=audio_data,
@@ -2532,7 +2441,7 @@ async def text_to_speech(request: Request):
         )
         
     except Exception as e:
-        print(f"❌ [TTS] 음성 합성 실패: {e}")
+        logger.error(f"❌ [TTS] 음성 합성 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/tts/voices")
@@ -2561,7 +2470,7 @@ async def get_available_voices():
         return {"voices": korean_voices, "default": "ko-KR-SunHiNeural"}
         
     except Exception as e:
-        print(f"❌ [TTS] 목소리 목록 조회 실패: {e}")
+        logger.error(f"❌ [TTS] 목소리 목록 조회 실패: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # ====== 세션 종료 API 엔드포인트 ======
@@ -2577,7 +2486,7 @@ class SessionEndRequest(BaseModel):
 @app.post("/api/session/end")
 async def end_session(request: SessionEndRequest):
     """대화 세션 종료 및 정리 - 빠른 응답 버전"""
-    print(f"🔍 [END_SESSION] 요청 받음 - session_id: {request.session_id}")
+    logger.debug(f"🔍 [END_SESSION] 요청 받음 - session_id: {request.session_id}")
     
     # 즉시 성공 응답 반환 (비동기로 백그라운드에서 처리)
     response_data = {
@@ -2601,16 +2510,19 @@ async def end_session(request: SessionEndRequest):
 async def _cleanup_session_background(request: SessionEndRequest):
     """백그라운드에서 세션 정리 작업 수행"""
     try:
-        print(f"🔄 [CLEANUP] 백그라운드 세션 정리 시작: {request.session_id}")
+        logger.debug(f"🔄 [CLEANUP] 백그라운드 세션 정리 시작: {request.session_id}")
         
         # 1. 세션 상태 업데이트 (MongoDB가 있는 경우)
         if DATABASE_AVAILABLE:
             try:
                 from ..database.database import update_session_end_time
                 await update_session_end_time(request.session_id)
-                print(f"✅ [CLEANUP] 세션 종료 시간 기록 완료")
+                logger.debug(f"✅ [CLEANUP] 세션 종료 시간 기록 완료")
+                # 종료된 세션의 메모리 캐시 정리
+                session_personas.forget(request.session_id)
+                context_assembler.forget(request.session_id)
             except Exception as e:
-                print(f"⚠️ [CLEANUP] 세션 종료 시간 기록 실패: {e}")
+                logger.warning(f"⚠️ [CLEANUP] 세션 종료 시간 기록 실패: {e}")
         
         # 2. 최종 피드백 저장 (있는 경우)
         if request.final_feedback:
@@ -2630,16 +2542,16 @@ async def _cleanup_session_background(request: SessionEndRequest):
                 with open(feedback_file, "w", encoding="utf-8") as f:
                     json.dump(feedback_data, f, ensure_ascii=False, indent=2)
                 
-                print(f"✅ [CLEANUP] 최종 피드백 저장 완료: {feedback_file}")
+                logger.debug(f"✅ [CLEANUP] 최종 피드백 저장 완료: {feedback_file}")
             except Exception as e:
-                print(f"⚠️ [CLEANUP] 피드백 저장 실패: {e}")
+                logger.warning(f"⚠️ [CLEANUP] 피드백 저장 실패: {e}")
         
         # 3. 리소스 정리 (파이프라인 제거됨)
         
-        print(f"✅ [CLEANUP] 백그라운드 세션 정리 완료: {request.session_id}")
+        logger.debug(f"✅ [CLEANUP] 백그라운드 세션 정리 완료: {request.session_id}")
         
     except Exception as e:
-        print(f"❌ [CLEANUP] 백그라운드 세션 정리 중 오류: {e}")
+        logger.error(f"❌ [CLEANUP] 백그라운드 세션 정리 중 오류: {e}")
 
 # 표정 분석기 import 추가
 import sys
@@ -2652,23 +2564,23 @@ try:
     
     # 필수 라이브러리 체크
     import torch
-    print("✅ PyTorch 확인됨")
+    logger.info("✅ PyTorch 확인됨")
     
     try:
         import mlflow.pytorch
-        print("✅ MLflow 확인됨")
+        logger.info("✅ MLflow 확인됨")
         MLFLOW_AVAILABLE = True
     except ImportError:
-        print("⚠️ MLflow 없음 - PyTorch 직접 로드 방식 사용")
+        logger.warning("⚠️ MLflow 없음 - PyTorch 직접 로드 방식 사용")
         MLFLOW_AVAILABLE = False
     
     from analysis.expression_analyzer import ExpressionAnalyzer
     EXPRESSION_ANALYZER_AVAILABLE = True
-    print("✅ 표정 분석기 모듈 로드 성공")
+    logger.info("✅ 표정 분석기 모듈 로드 성공")
 except ImportError as e:
     EXPRESSION_ANALYZER_AVAILABLE = False
-    print(f"⚠️ 표정 분석기 모듈 로드 실패: {e}")
-    print("⚠️ 필요한 라이브러리: torch, mlflow, PIL, cv2")
+    logger.warning(f"⚠️ 표정 분석기 모듈 로드 실패: {e}")
+    logger.warning("⚠️ 필요한 라이브러리: torch, mlflow, PIL, cv2")
 
 # 전역 표정 분석기 인스턴스
 _expression_analyzer = None
@@ -2680,10 +2592,10 @@ async def initialize_expression_analyzer_api():
     global _expression_analyzer
     
     try:
-        print("🔍 [EXPRESSION] 표정 분석기 초기화 요청 받음")
+        logger.debug("🔍 [EXPRESSION] 표정 분석기 초기화 요청 받음")
         
         if not EXPRESSION_ANALYZER_AVAILABLE:
-            print("❌ [EXPRESSION] 표정 분석기 모듈이 사용 불가능")
+            logger.error("❌ [EXPRESSION] 표정 분석기 모듈이 사용 불가능")
             return {
                 "success": False, 
                 "error": "Expression analyzer module not available. Missing required libraries.",
@@ -2691,16 +2603,16 @@ async def initialize_expression_analyzer_api():
             }
         
         # 새 인스턴스 생성 및 초기화
-        print("🔄 [EXPRESSION] ExpressionAnalyzer 인스턴스 생성 중...")
+        logger.debug("🔄 [EXPRESSION] ExpressionAnalyzer 인스턴스 생성 중...")
         _expression_analyzer = ExpressionAnalyzer()
-        print("🔄 [EXPRESSION] ExpressionAnalyzer 초기화 시작...")
-        print("🔄 [EXPRESSION] MLflow 모델 로딩 시도 중...")
+        logger.debug("🔄 [EXPRESSION] ExpressionAnalyzer 초기화 시작...")
+        logger.debug("🔄 [EXPRESSION] MLflow 모델 로딩 시도 중...")
         success = _expression_analyzer.initialize()
-        print(f"🔄 [EXPRESSION] ExpressionAnalyzer 초기화 완료: {success}")
-        print(f"🔄 [EXPRESSION] is_initialized 상태: {_expression_analyzer.is_initialized}")
-        print(f"🔄 [EXPRESSION] 모델 타입: {type(_expression_analyzer.model) if _expression_analyzer.model else 'None'}")
+        logger.debug(f"🔄 [EXPRESSION] ExpressionAnalyzer 초기화 완료: {success}")
+        logger.debug(f"🔄 [EXPRESSION] is_initialized 상태: {_expression_analyzer.is_initialized}")
+        logger.debug(f"🔄 [EXPRESSION] 모델 타입: {type(_expression_analyzer.model) if _expression_analyzer.model else 'None'}")
         
-        print(f"✅ [EXPRESSION] 표정 분석기 초기화 결과: {success}")
+        logger.debug(f"✅ [EXPRESSION] 표정 분석기 초기화 결과: {success}")
         
         if success:
             return {
@@ -2716,9 +2628,7 @@ async def initialize_expression_analyzer_api():
             }
             
     except Exception as e:
-        print(f"❌ [EXPRESSION] 표정 분석기 초기화 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ [EXPRESSION] 표정 분석기 초기화 실패: {e}", exc_info=True)
         return {
             "success": False, 
             "error": str(e),
@@ -2784,90 +2694,6 @@ async def initialize_expression_analyzer_api():
 #             "details": "Check server logs for detailed error information"
 #         }
 
-# 이미지 파일 서빙 개선
-@app.get("/frontend/img/{filename:path}")
-def serve_frontend_image(filename: str):
-    """frontend 이미지 파일 제공"""
-    import os
-    print(f"🔍 [IMAGE] 요청: {filename}")
-    
-    # 가능한 경로들 (더 많은 경로 추가)
-    possible_paths = [
-        f"src/frontend/assets/images/{filename}",
-        f"frontend/assets/images/{filename}",
-        f"assets/images/{filename}",
-        f"images/{filename}",
-        f"/usr/src/app/src/frontend/assets/images/{filename}",
-        f"/workspace/app/src/frontend/assets/images/{filename}"
-    ]
-    
-    for i, file_path in enumerate(possible_paths, 1):
-        print(f"📁 [IMAGE] 시도 {i}: {file_path}")
-        if os.path.exists(file_path):
-            print(f"✅ [IMAGE] 파일 발견: {file_path}")
-            # 파일 크기 확인
-            file_size = os.path.getsize(file_path)
-            print(f"📊 [IMAGE] 파일 크기: {file_size} bytes")
-            
-            # 파일 확장자에 따른 MIME 타입 설정
-            if filename.endswith('.webp'):
-                media_type = "image/webp"
-            elif filename.endswith('.png'):
-                media_type = "image/png"
-            elif filename.endswith('.jpg') or filename.endswith('.jpeg'):
-                media_type = "image/jpeg"
-            elif filename.endswith('.svg'):
-                media_type = "image/svg+xml"
-            else:
-                media_type = "image/*"
-            
-            return FileResponse(file_path, media_type=media_type)
-    
-    print(f"❌ [IMAGE] 파일을 찾을 수 없음: {filename}")
-    print(f"📋 [IMAGE] 시도한 경로들: {possible_paths}")
-    return Response(status_code=404, content=f"Image {filename} not found")
-
-# 비디오 파일 서빙 추가
-@app.get("/frontend/video/{filename:path}")
-def serve_frontend_video(filename: str):
-    """frontend 비디오 파일 제공"""
-    import os
-    print(f"🔍 [VIDEO] 요청: {filename}")
-    
-    # 가능한 경로들
-    possible_paths = [
-        f"src/frontend/assets/videos/{filename}",
-        f"frontend/assets/videos/{filename}",
-        f"assets/videos/{filename}",
-        f"videos/{filename}",
-        f"/usr/src/app/src/frontend/assets/videos/{filename}",
-        f"/workspace/app/src/frontend/assets/videos/{filename}"
-    ]
-    
-    for i, file_path in enumerate(possible_paths, 1):
-        print(f"📁 [VIDEO] 시도 {i}: {file_path}")
-        if os.path.exists(file_path):
-            print(f"✅ [VIDEO] 파일 발견: {file_path}")
-            # 파일 크기 확인
-            file_size = os.path.getsize(file_path)
-            print(f"📊 [VIDEO] 파일 크기: {file_size} bytes")
-            
-            # 파일 확장자에 따른 MIME 타입 설정
-            if filename.endswith('.mp4'):
-                media_type = "video/mp4"
-            elif filename.endswith('.webm'):
-                media_type = "video/webm"
-            elif filename.endswith('.avi'):
-                media_type = "video/x-msvideo"
-            else:
-                media_type = "video/*"
-            
-            return FileResponse(file_path, media_type=media_type)
-    
-    print(f"❌ [VIDEO] 파일을 찾을 수 없음: {filename}")
-    print(f"📋 [VIDEO] 시도한 경로들: {possible_paths}")
-    return Response(status_code=404, content=f"Video {filename} not found")
-
 # === 모니터링 엔드포인트 ===
 
 @app.get("/metrics")
@@ -2891,19 +2717,40 @@ def monitoring_health():
         "version": "1.0.0"
     }
 
+@app.get("/api/monitoring/blocking")
+def monitoring_blocking(limit: int = 20, route: Optional[str] = None):
+    """이벤트 루프 블로킹 원인 (누적 정지 시간 순, 경로별 합계 + 대표 스택)"""
+    if not (MONITORING_AVAILABLE and blocking_detector.running):
+        raise HTTPException(status_code=404, detail="Blocking detector disabled (BLOCKING_DETECTOR=true)")
+    return blocking_detector.report(limit=limit, route=route)
+
+@app.delete("/api/monitoring/blocking")
+def reset_monitoring_blocking():
+    """블로킹 집계 초기화 (수정 배포 후 다시 측정할 때)"""
+    if not (MONITORING_AVAILABLE and blocking_detector.running):
+        raise HTTPException(status_code=404, detail="Blocking detector disabled (BLOCKING_DETECTOR=true)")
+    blocking_detector.reset()
+    return {"status": "reset"}
+
 @app.post("/api/monitoring/alerts")
 async def receive_alert(request: Request):
     """AlertManager 웹훅 수신"""
     try:
         alert_data = await request.json()
-        print(f"🚨 [ALERT] 수신: {alert_data}")
+        # 알림 수신 자체는 서버 오류가 아님 - firing 은 warning, resolved 는 info
+        alerts = alert_data.get("alerts", []) if isinstance(alert_data, dict) else []
+        names = [a.get("labels", {}).get("alertname", "?") for a in alerts if isinstance(a, dict)]
+        status = alert_data.get("status") if isinstance(alert_data, dict) else None
+        level = logging.INFO if status == "resolved" else logging.WARNING
+        logger.log(level, f"🚨 [ALERT] 수신 ({status or 'unknown'}): {', '.join(names) or '-'}")
+        logger.debug(f"🚨 [ALERT] 페이로드: {alert_data}")
         
         # 알림 처리 로직 추가 가능
         # 예: 이메일 발송, Slack 알림 등
         
         return {"status": "received"}
     except Exception as e:
-        print(f"❌ [ALERT] 처리 실패: {e}")
+        logger.error(f"❌ [ALERT] 처리 실패: {e}")
         return {"status": "error", "message": str(e)}
 
 # === 표정 분석 API 엔드포인트 ===
@@ -2988,9 +2835,7 @@ async def analyze_expression_batch(request: Request):
         }
         
     except Exception as e:
-        print(f"❌ [EXPRESSION] 일괄 분석 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ [EXPRESSION] 일괄 분석 실패: {e}", exc_info=True)
         return {
             "success": False,
             "error": str(e)
@@ -3016,7 +2861,7 @@ def get_expression_analyzer_status():
         }
         
     except Exception as e:
-        print(f"❌ [EXPRESSION] 상태 확인 실패: {e}")
+        logger.error(f"❌ [EXPRESSION] 상태 확인 실패: {e}")
         return {
             "success": False,
             "error": str(e)
@@ -3041,7 +2886,7 @@ def get_mediapipe_analyzer_status():
         }
         
     except Exception as e:
-        print(f"❌ [MEDIAPIPE] 상태 확인 실패: {e}")
+        logger.error(f"❌ [MEDIAPIPE] 상태 확인 실패: {e}")
         return {
             "success": False,
             "error": str(e)
@@ -3065,7 +2910,7 @@ def initialize_mediapipe_analyzer():
         }
         
     except Exception as e:
-        print(f"❌ [MEDIAPIPE] 초기화 실패: {e}")
+        logger.error(f"❌ [MEDIAPIPE] 초기화 실패: {e}")
         return {
             "success": False,
             "error": str(e)
@@ -3089,7 +2934,7 @@ def get_mediapipe_summary():
         }
         
     except Exception as e:
-        print(f"❌ [MEDIAPIPE] 요약 조회 실패: {e}")
+        logger.error(f"❌ [MEDIAPIPE] 요약 조회 실패: {e}")
         return {
             "success": False,
             "error": str(e)
@@ -3116,7 +2961,7 @@ async def get_vector_service_status():
         }
         
     except Exception as e:
-        print(f"❌ [VECTOR] 상태 확인 실패: {e}")
+        logger.error(f"❌ [VECTOR] 상태 확인 실패: {e}")
         return {
             "success": False,
             "error": str(e)
@@ -3139,7 +2984,7 @@ async def initialize_vector_service():
         }
         
     except Exception as e:
-        print(f"❌ [VECTOR] 초기화 실패: {e}")
+        logger.error(f"❌ [VECTOR] 초기화 실패: {e}")
         return {
             "success": False,
             "error": str(e)
@@ -3181,21 +3026,19 @@ async def store_text_with_embedding(request: dict):
                 "content_type": content_type,
                 "content_id": content_id,
                 "vector_service_initialized": vector_service.is_initialized,
-                "pinecone_initialized": pinecone_client.is_initialized
+                "pinecone_initialized": vector_service.backend.is_initialized
             }
         }
         
     except Exception as e:
-        print(f"❌ [VECTOR] 저장 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ [VECTOR] 저장 실패: {e}", exc_info=True)
         return {
             "success": False,
             "error": str(e),
             "debug_info": {
                 "vector_service_available": VECTOR_SERVICE_AVAILABLE,
                 "vector_service_initialized": vector_service.is_initialized if VECTOR_SERVICE_AVAILABLE else False,
-                "pinecone_initialized": pinecone_client.is_initialized
+                "pinecone_initialized": vector_service.backend.is_initialized if VECTOR_SERVICE_AVAILABLE else False
             }
         }
 
@@ -3211,6 +3054,7 @@ async def search_similar_texts(request: dict):
         
         query_text = request.get("query_text")
         content_type = request.get("content_type")
+        session_id = request.get("session_id")
         top_k = request.get("top_k", 10)
         
         if not query_text:
@@ -3222,7 +3066,8 @@ async def search_similar_texts(request: dict):
         results = await vector_service.search_similar_texts(
             query_text=query_text,
             content_type=content_type,
-            top_k=top_k
+            top_k=top_k,
+            session_id=session_id
         )
         
         return {
@@ -3232,7 +3077,7 @@ async def search_similar_texts(request: dict):
         }
         
     except Exception as e:
-        print(f"❌ [VECTOR] 검색 실패: {e}")
+        logger.error(f"❌ [VECTOR] 검색 실패: {e}")
         return {
             "success": False,
             "error": str(e)
@@ -3255,7 +3100,7 @@ async def get_vector_statistics():
         }
         
     except Exception as e:
-        print(f"❌ [VECTOR] 통계 조회 실패: {e}")
+        logger.error(f"❌ [VECTOR] 통계 조회 실패: {e}")
         return {
             "success": False,
             "error": str(e)
@@ -3278,15 +3123,28 @@ async def delete_embedding(vector_id: str):
         }
         
     except Exception as e:
-        print(f"❌ [VECTOR] 삭제 실패: {e}")
+        logger.error(f"❌ [VECTOR] 삭제 실패: {e}")
         return {
             "success": False,
             "error": str(e)
         }
 
+@app.post("/api/vector/index/snapshot")
+async def snapshot_vector_index(request: dict = None):
+    """로컬 벡터 인덱스 스냅샷을 저장합니다 (path 지정 시 해당 디렉터리로 복사)."""
+    if not VECTOR_SERVICE_AVAILABLE or not hasattr(vector_service.backend, "snapshot"):
+        return {"success": False, "error": "현재 벡터 백엔드는 스냅샷을 지원하지 않습니다"}
+    try:
+        path = (request or {}).get("path")
+        result = await asyncio.to_thread(vector_service.backend.snapshot, path)
+        return {"success": True, "snapshot": result}
+    except Exception as e:
+        logger.error(f"❌ [VECTOR] 스냅샷 실패: {e}")
+        return {"success": False, "error": str(e)}
+
 @app.delete("/api/vector/index/delete")
 async def delete_pinecone_index():
-    """Pinecone 인덱스를 삭제합니다."""
+    """벡터 인덱스(Pinecone 또는 로컬)를 삭제합니다."""
     try:
         if not VECTOR_SERVICE_AVAILABLE:
             return {
@@ -3294,14 +3152,14 @@ async def delete_pinecone_index():
                 "error": "Vector service module not available"
             }
         
-        success = pinecone_client.delete_index()
+        success = await asyncio.to_thread(vector_service.backend.delete_index)
         return {
             "success": success,
-            "message": "Pinecone 인덱스 삭제 완료" if success else "Pinecone 인덱스 삭제 실패"
+            "message": "벡터 인덱스 삭제 완료" if success else "벡터 인덱스 삭제 실패"
         }
         
     except Exception as e:
-        print(f"❌ [VECTOR] 인덱스 삭제 실패: {e}")
+        logger.error(f"❌ [VECTOR] 인덱스 삭제 실패: {e}")
         return {
             "success": False,
             "error": str(e)
@@ -3313,7 +3171,7 @@ async def delete_pinecone_index():
 async def diagnose_mongodb():
     """MongoDB 데이터베이스 상태 진단"""
     try:
-        print("🔍 [DIAGNOSE_API] MongoDB 진단 요청")
+        logger.debug("🔍 [DIAGNOSE_API] MongoDB 진단 요청")
         
         if not DATABASE_AVAILABLE:
             return {
@@ -3330,7 +3188,7 @@ async def diagnose_mongodb():
         }
         
     except Exception as e:
-        print(f"❌ [DIAGNOSE_API] 진단 실패: {e}")
+        logger.error(f"❌ [DIAGNOSE_API] 진단 실패: {e}")
         return {
             "status": "error",
             "message": str(e),
@@ -3341,7 +3199,7 @@ async def diagnose_mongodb():
 async def diagnose_user(email: str):
     """특정 사용자 상태 진단"""
     try:
-        print(f"🔍 [DIAGNOSE_USER] 사용자 진단 요청: {email}")
+        logger.debug(f"🔍 [DIAGNOSE_USER] 사용자 진단 요청: {email}")
         
         if not DATABASE_AVAILABLE:
             return {
@@ -3375,7 +3233,7 @@ async def diagnose_user(email: str):
             }
             
     except Exception as e:
-        print(f"❌ [DIAGNOSE_USER] 사용자 진단 실패: {e}")
+        logger.error(f"❌ [DIAGNOSE_USER] 사용자 진단 실패: {e}")
         return {
             "status": "error",
             "message": str(e)
@@ -3405,6 +3263,17 @@ class ExpressionAnalysisResponse(BaseModel):
     processing_time: Optional[float] = None
     error: Optional[str] = None
 
+# 응답 모델의 기본값 (모델은 문서용으로만 유지, 응답은 검증 없이 바로 직렬화)
+_EXPRESSION_RESPONSE_DEFAULTS = {
+    name: field.default
+    for name, field in ExpressionAnalysisResponse.model_fields.items()
+    if not field.is_required()
+}
+
+def _expression_response(**fields) -> FastJSONResponse:
+    """ExpressionAnalysisResponse 형태의 응답 (pydantic 검증 생략)"""
+    return FastJSONResponse({**_EXPRESSION_RESPONSE_DEFAULTS, **fields})
+
 @app.post("/api/expression/analyze", response_model=ExpressionAnalysisResponse)
 async def analyze_expression_hybrid(request: Request):
     """
@@ -3421,25 +3290,27 @@ async def analyze_expression_hybrid(request: Request):
         # 요청 데이터 파싱 및 검증
         try:
             raw_data = await request.json()
-            print(f"🔍 [EXPRESSION] 받은 요청 데이터 키:", list(raw_data.keys()))
-            print(f"🔍 [EXPRESSION] 이미지 데이터 타입:", type(raw_data.get('image', 'None')))
-            print(f"🔍 [EXPRESSION] MediaPipe 점수 타입:", type(raw_data.get('mediapipe_scores', 'None')))
-            print(f"🔍 [EXPRESSION] 타임스탬프 타입:", type(raw_data.get('timestamp', 'None')))
-            print(f"🔍 [EXPRESSION] 사용자 ID 타입:", type(raw_data.get('user_id', 'None')))
+            # 프레임마다 호출되는 경로 - DEBUG 가 아니면 메시지 포맷도 생략
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"🔍 [EXPRESSION] 받은 요청 데이터 키: {list(raw_data.keys())}")
+                logger.debug(f"🔍 [EXPRESSION] 이미지 데이터 타입: {type(raw_data.get('image', 'None'))}")
+                logger.debug(f"🔍 [EXPRESSION] MediaPipe 점수 타입: {type(raw_data.get('mediapipe_scores', 'None'))}")
+                logger.debug(f"🔍 [EXPRESSION] 타임스탬프 타입: {type(raw_data.get('timestamp', 'None'))}")
+                logger.debug(f"🔍 [EXPRESSION] 사용자 ID 타입: {type(raw_data.get('user_id', 'None'))}")
             
             # ExpressionAnalysisRequest 모델로 변환
             request_data = ExpressionAnalysisRequest(**raw_data)
-            print(f"🧠 [EXPRESSION] 하이브리드 분석 시작 - 사용자: {request_data.user_id}")
+            logger.debug(f"🧠 [EXPRESSION] 하이브리드 분석 시작 - 사용자: {request_data.user_id}")
             
         except ValidationError as e:
-            print(f"❌ [EXPRESSION] 요청 데이터 검증 실패: {e}")
-            return ExpressionAnalysisResponse(
+            logger.error(f"❌ [EXPRESSION] 요청 데이터 검증 실패: {e}")
+            return _expression_response(
                 success=False,
                 error=f"요청 데이터 검증 실패: {str(e)}"
             )
         except Exception as e:
-            print(f"❌ [EXPRESSION] 요청 파싱 실패: {e}")
-            return ExpressionAnalysisResponse(
+            logger.error(f"❌ [EXPRESSION] 요청 파싱 실패: {e}")
+            return _expression_response(
                 success=False,
                 error=f"요청 파싱 실패: {str(e)}"
             )
@@ -3459,11 +3330,11 @@ async def analyze_expression_hybrid(request: Request):
             # PIL을 OpenCV 형식으로 변환
             image_cv = cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
             
-            print(f"✅ [EXPRESSION] 이미지 디코딩 완료: {image_cv.shape}")
+            logger.debug(f"✅ [EXPRESSION] 이미지 디코딩 완료: {image_cv.shape}")
             
         except Exception as e:
-            print(f"❌ [EXPRESSION] 이미지 디코딩 실패: {e}")
-            return ExpressionAnalysisResponse(
+            logger.error(f"❌ [EXPRESSION] 이미지 디코딩 실패: {e}")
+            return _expression_response(
                 success=False,
                 error=f"이미지 디코딩 실패: {str(e)}"
             )
@@ -3473,22 +3344,23 @@ async def analyze_expression_hybrid(request: Request):
         model_emotion = "neutral"
         
         try:
-            print(f"🔍 [EXPRESSION] 모델 상태 확인 - AVAILABLE: {EXPRESSION_ANALYSIS_AVAILABLE}, INITIALIZED: {expression_analyzer.is_initialized if 'expression_analyzer' in globals() else 'NOT_FOUND'}")
+            logger.debug(f"🔍 [EXPRESSION] 모델 상태 확인 - AVAILABLE: {EXPRESSION_ANALYSIS_AVAILABLE}, INITIALIZED: {expression_analyzer.is_initialized if 'expression_analyzer' in globals() else 'NOT_FOUND'}")
             
             # 모델이 사용 가능하지만 초기화되지 않은 경우 초기화 시도
             if EXPRESSION_ANALYSIS_AVAILABLE and not expression_analyzer.is_initialized:
-                print("🔄 [EXPRESSION] 모델 초기화 시도...")
+                logger.debug("🔄 [EXPRESSION] 모델 초기화 시도...")
                 try:
                     if expression_analyzer.initialize():
-                        print("✅ [EXPRESSION] 모델 초기화 성공")
+                        logger.debug("✅ [EXPRESSION] 모델 초기화 성공")
                     else:
-                        print("❌ [EXPRESSION] 모델 초기화 실패")
+                        logger.error("❌ [EXPRESSION] 모델 초기화 실패")
                 except Exception as init_error:
-                    print(f"❌ [EXPRESSION] 모델 초기화 오류: {init_error}")
+                    logger.error(f"❌ [EXPRESSION] 모델 초기화 오류: {init_error}")
             
             if EXPRESSION_ANALYSIS_AVAILABLE and expression_analyzer.is_initialized:
                 # 기존 표정 분석기 사용
-                analysis_result = expression_analyzer.analyze_expression_sync(image_cv)
+                with span("inference"):
+                    analysis_result = expression_analyzer.analyze_expression_sync(image_cv)
                 
                 if analysis_result and analysis_result.get("success"):
                     model_emotion = analysis_result.get("emotion", "neutral")
@@ -3513,13 +3385,13 @@ async def analyze_expression_hybrid(request: Request):
                         "predicted_class": analysis_result.get("predicted_class", 0)
                     }
                     
-                    print(f"✅ [EXPRESSION] 모델 분석 완료: {model_emotion} (신뢰도: {model_results.get('confidence', 0):.2f})")
-                    print(f"🔍 [EXPRESSION] 서버 응답 model_results:", model_results)
+                    logger.debug(f"✅ [EXPRESSION] 모델 분석 완료: {model_emotion} (신뢰도: {model_results.get('confidence', 0):.2f})")
+                    logger.debug(f"🔍 [EXPRESSION] 서버 응답 model_results: {model_results}")
                 else:
-                    print("⚠️ [EXPRESSION] 모델 분석 실패, 기본값 사용")
+                    logger.warning("⚠️ [EXPRESSION] 모델 분석 실패, 기본값 사용")
                     model_results = {"confidence": 0.0}
             else:
-                print("⚠️ [EXPRESSION] 분석 모델 비활성화됨 - 기본값 사용")
+                logger.warning("⚠️ [EXPRESSION] 분석 모델 비활성화됨 - 기본값 사용")
                 # 모델이 비활성화된 경우 기본 분석 결과 생성
                 model_emotion = "neutral"
                 model_results = {
@@ -3549,7 +3421,7 @@ async def analyze_expression_hybrid(request: Request):
                 }
                 
         except Exception as e:
-            print(f"❌ [EXPRESSION] 모델 분석 오류: {e}")
+            logger.error(f"❌ [EXPRESSION] 모델 분석 오류: {e}")
             model_results = {"confidence": 0.0}
         
         # 3. MediaPipe vs 모델 점수 비교
@@ -3571,7 +3443,7 @@ async def analyze_expression_hybrid(request: Request):
         is_anomaly = max_diff > anomaly_threshold
         
         if is_anomaly:
-            print(f"⚠️ [EXPRESSION] 이상 감지 - 최대 차이: {max_diff:.3f} (임계값: {anomaly_threshold})")
+            logger.warning(f"⚠️ [EXPRESSION] 이상 감지 - 최대 차이: {max_diff:.3f} (임계값: {anomaly_threshold})")
         
         # 5. 피드백 생성
         feedback = {
@@ -3584,9 +3456,9 @@ async def analyze_expression_hybrid(request: Request):
         }
         
         processing_time = time.time() - start_time
-        print(f"🎯 [EXPRESSION] 하이브리드 분석 완료 ({processing_time:.3f}초)")
+        logger.debug(f"🎯 [EXPRESSION] 하이브리드 분석 완료 ({processing_time:.3f}초)")
         
-        return ExpressionAnalysisResponse(
+        return _expression_response(
             success=True,
             model_emotion=model_emotion,
             model_scores=model_results,
@@ -3600,9 +3472,9 @@ async def analyze_expression_hybrid(request: Request):
         
     except Exception as e:
         processing_time = time.time() - start_time
-        print(f"❌ [EXPRESSION] 하이브리드 분석 실패: {e}")
+        logger.error(f"❌ [EXPRESSION] 하이브리드 분석 실패: {e}")
         
-        return ExpressionAnalysisResponse(
+        return _expression_response(
             success=False,
             error=str(e),
             processing_time=processing_time
@@ -3612,7 +3484,7 @@ async def analyze_expression_hybrid(request: Request):
 async def test_vector_storage():
     """벡터 저장 기능 테스트"""
     try:
-        print("🧪 [VECTOR_TEST] 벡터 저장 테스트 시작")
+        logger.debug("🧪 [VECTOR_TEST] 벡터 저장 테스트 시작")
         
         # 테스트 데이터
         test_text = "안녕하세요, 이것은 벡터 저장 테스트입니다."
@@ -3628,7 +3500,7 @@ async def test_vector_storage():
             }
         
         if not vector_service.is_initialized:
-            print("🔄 [VECTOR_TEST] 벡터 서비스 초기화 시도")
+            logger.debug("🔄 [VECTOR_TEST] 벡터 서비스 초기화 시도")
             init_success = await vector_service.initialize()
             if not init_success:
                 return {
@@ -3638,7 +3510,7 @@ async def test_vector_storage():
                 }
         
         # 실제 저장 테스트
-        print(f"💾 [VECTOR_TEST] 테스트 데이터 저장 중: {test_content_id}")
+        logger.debug(f"💾 [VECTOR_TEST] 테스트 데이터 저장 중: {test_content_id}")
         success = await vector_service.store_text_with_embedding(
             text=test_text,
             content_type=test_content_type,
@@ -3648,7 +3520,7 @@ async def test_vector_storage():
         
         # 저장 결과 확인
         if success:
-            print("✅ [VECTOR_TEST] 벡터 저장 테스트 성공")
+            logger.debug("✅ [VECTOR_TEST] 벡터 저장 테스트 성공")
             
             # 검색 테스트
             search_results = await vector_service.search_similar_texts(
@@ -3675,9 +3547,7 @@ async def test_vector_storage():
             }
             
     except Exception as e:
-        print(f"❌ [VECTOR_TEST] 테스트 실패: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error(f"❌ [VECTOR_TEST] 테스트 실패: {e}", exc_info=True)
         return {
             "success": False,
             "error": str(e),
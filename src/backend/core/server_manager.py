@@ -1,141 +1,196 @@
 #!/usr/bin/env python3
 """
-통합 서버 매니저
-- 메인 서버와 WebSocket 서버를 하나의 프로세스에서 관리
-- MongoDB 연결 관리
-- 프로세스 모니터링 및 정리
+통합 서버 매니저 (단일 포트, 멀티 워커)
+- main_server 앱 하나가 HTTP 와 모든 WebSocket 라우트를 제공 (기존 8000 + 8001 이중 프로세스 대체)
+- 워커마다 SO_REUSEPORT 소켓을 바인딩해 커널이 연결을 워커에 분산
+- 워커 프로세스 모니터링/재시작 및 정리
+
+gunicorn 사용 시 동일 구성:
+    gunicorn backend.core.main_server:app -k uvicorn.workers.UvicornWorker \\
+        -w $WEB_CONCURRENCY --reuse-port -b 0.0.0.0:$PORT
+    (PROMETHEUS_MULTIPROC_DIR 사용 시 gunicorn child_exit 훅에서 mark_worker_dead(worker.pid) 호출)
 """
 
 import os
-import sys
+import glob
 import time
+import socket
 import signal
-import asyncio
 import logging
-from pathlib import Path
-from typing import Optional
+import multiprocessing
+from typing import Dict
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class IntegratedServerManager:
-    def __init__(self):
-        self.main_server_task: Optional[asyncio.Task] = None
-        self.websocket_server_task: Optional[asyncio.Task] = None
-        self.shutdown_event = asyncio.Event()
-        
-    async def start_main_server(self):
-        """메인 서버 시작 (포트 8000)"""
-        try:
-            from backend.core.main_server import app
-            import uvicorn
-            
-            config = uvicorn.Config(
-                app=app,
-                host="0.0.0.0",
-                port=8000,
-                log_level="info",
-                access_log=True
-            )
-            
-            server = uvicorn.Server(config)
-            logger.info("🚀 메인 서버 시작 중... (포트: 8000)")
-            await server.serve()
-            
-        except Exception as e:
-            logger.error(f"❌ 메인 서버 시작 실패: {e}")
-            raise
-    
-    async def start_websocket_server(self):
-        """WebSocket 서버 시작 (포트 8001)"""
-        try:
-            from backend.core.websocket_server import app as ws_app
-            import uvicorn
-            
-            config = uvicorn.Config(
-                app=ws_app,
-                host="0.0.0.0",
-                port=8001,
-                log_level="info",
-                access_log=True
-            )
-            
-            server = uvicorn.Server(config)
-            logger.info("🔗 WebSocket 서버 시작 중... (포트: 8001)")
-            await server.serve()
-            
-        except Exception as e:
-            logger.error(f"❌ WebSocket 서버 시작 실패: {e}")
-            raise
-    
-    async def run_servers(self):
-        """두 서버를 동시에 실행"""
+APP_PATH = os.getenv("APP_MODULE", "backend.core.main_server:app")
+HOST = os.getenv("HOST", "0.0.0.0")
+PORT = int(os.getenv("PORT", "8000"))
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "2"))
+WORKER_RESTART_BACKOFF_SEC = float(os.getenv("WORKER_RESTART_BACKOFF_SEC", "1.0"))
+GRACEFUL_SHUTDOWN_SEC = float(os.getenv("GRACEFUL_SHUTDOWN_SEC", "15"))
+LOG_LEVEL = os.getenv("UVICORN_LOG_LEVEL", "info")
+# 멀티 워커 Prometheus 메트릭 디렉토리 (워커마다 *.db 파일, /metrics 에서 합산)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+REUSEPORT_SUPPORTED = hasattr(socket, "SO_REUSEPORT")
+
+
+def bind_reuseport_socket(host: str, port: int) -> socket.socket:
+    """SO_REUSEPORT 로 같은 포트를 워커마다 독립적으로 바인딩합니다."""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def prepare_multiproc_dir(path: str = PROMETHEUS_MULTIPROC_DIR):
+    """이전 실행의 메트릭 파일 정리 (워커 시작 전, 부모 프로세스에서 한 번)"""
+    if not path:
+        return
+    os.makedirs(path, exist_ok=True)
+    for db_file in glob.glob(os.path.join(path, "*.db")):
         try:
-            # 두 서버를 동시에 시작
-            self.main_server_task = asyncio.create_task(self.start_main_server())
-            self.websocket_server_task = asyncio.create_task(self.start_websocket_server())
-            
-            logger.info("🎉 모든 서버가 시작되었습니다!")
-            logger.info("📊 메인 서버: http://localhost:8000")
-            logger.info("🔗 WebSocket 서버: ws://localhost:8001")
-            logger.info("⏹️  종료하려면 Ctrl+C를 누르세요.")
-            
-            # 종료 이벤트 대기
-            await self.shutdown_event.wait()
-            
-        except Exception as e:
-            logger.error(f"❌ 서버 실행 중 오류: {e}")
-            raise
-        finally:
-            await self.cleanup()
-    
-    async def cleanup(self):
-        """리소스 정리"""
-        logger.info("🧹 서버 정리 중...")
-        
-        # 태스크 취소
-        if self.main_server_task:
-            self.main_server_task.cancel()
-        if self.websocket_server_task:
-            self.websocket_server_task.cancel()
-        
-        # 취소된 태스크들 대기
-        if self.main_server_task:
-            try:
-                await self.main_server_task
-            except asyncio.CancelledError:
-                pass
-        
-        if self.websocket_server_task:
-            try:
-                await self.websocket_server_task
-            except asyncio.CancelledError:
-                pass
-        
-        logger.info("✅ 서버 정리 완료")
-    
+            os.remove(db_file)
+        except OSError as e:
+            logger.warning(f"⚠️ 메트릭 파일 삭제 실패: {db_file} ({e})")
+    logger.info(f"📊 Prometheus 멀티프로세스 모드: {path}")
+
+
+def mark_worker_dead(pid: int):
+    """종료된 워커의 live* 게이지 파일 정리"""
+    if not PROMETHEUS_MULTIPROC_DIR or pid is None:
+        return
+    try:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid, PROMETHEUS_MULTIPROC_DIR)
+    except Exception as e:
+        logger.warning(f"⚠️ 워커 메트릭 정리 실패 (pid: {pid}): {e}")
+
+
+def _worker_main(app_path: str, host: str, port: int, worker_id: int, log_level: str):
+    """워커 프로세스 진입점 (spawn)"""
+    import uvicorn
+
+    sock = bind_reuseport_socket(host, port)
+    config = uvicorn.Config(
+        app=app_path,
+        host=host,
+        port=port,
+        log_level=log_level,
+        access_log=True
+    )
+    server = uvicorn.Server(config)
+    logger.info(f"🚀 워커 {worker_id} 시작 (pid: {os.getpid()}, 포트: {port})")
+    server.run(sockets=[sock])
+
+
+class UnifiedServerManager:
+    """단일 포트 ASGI 앱을 SO_REUSEPORT 멀티 워커로 실행합니다."""
+
+    def __init__(self,
+                 app_path: str = APP_PATH,
+                 host: str = HOST,
+                 port: int = PORT,
+                 workers: int = WEB_CONCURRENCY):
+        self.app_path = app_path
+        self.host = host
+        self.port = port
+        self.workers = max(1, workers)
+        self.processes: Dict[int, multiprocessing.Process] = {}
+        self._ctx = multiprocessing.get_context("spawn")
+        self._shutting_down = False
+
+    def _spawn(self, worker_id: int):
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.app_path, self.host, self.port, worker_id, LOG_LEVEL),
+            name=f"uvicorn-worker-{worker_id}",
+            daemon=False
+        )
+        process.start()
+        self.processes[worker_id] = process
+
+    def _run_single(self):
+        """SO_REUSEPORT 를 쓸 수 없거나 워커가 하나면 uvicorn 기본 실행"""
+        import uvicorn
+
+        if self.workers > 1:
+            logger.warning("⚠️ SO_REUSEPORT 미지원 - uvicorn 공유 소켓 멀티 워커로 실행")
+        uvicorn.run(
+            self.app_path,
+            host=self.host,
+            port=self.port,
+            workers=self.workers,
+            log_level=LOG_LEVEL,
+            access_log=True
+        )
+
     def signal_handler(self, signum, frame):
         """시그널 핸들러"""
         logger.info(f"🛑 시그널 {signum} 수신, 종료 시작...")
-        self.shutdown_event.set()
-    
+        self._shutting_down = True
+
+    def _monitor(self):
+        """종료된 워커를 재시작합니다."""
+        while not self._shutting_down:
+            time.sleep(0.5)
+            for worker_id, process in list(self.processes.items()):
+                if process.is_alive() or self._shutting_down:
+                    continue
+                logger.warning(f"⚠️ 워커 {worker_id} 종료됨 (exit: {process.exitcode}) - 재시작")
+                mark_worker_dead(process.pid)
+                time.sleep(WORKER_RESTART_BACKOFF_SEC)
+                self._spawn(worker_id)
+
+    def cleanup(self):
+        """워커 정리 (SIGTERM → 유예 → SIGKILL)"""
+        logger.info("🧹 워커 정리 중...")
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.time() + GRACEFUL_SHUTDOWN_SEC
+        for process in self.processes.values():
+            process.join(timeout=max(0.0, deadline - time.time()))
+            if process.is_alive():
+                logger.warning(f"⚠️ 워커 강제 종료: pid {process.pid}")
+                process.kill()
+                process.join()
+            mark_worker_dead(process.pid)
+
+        logger.info("✅ 워커 정리 완료")
+
     def run(self):
         """메인 실행 함수"""
-        # 시그널 핸들러 등록
+        prepare_multiproc_dir()
+        # 워커가 자신 외에 다른 워커가 있는지 알 수 있도록 (캘리브레이션 세션 등 워커 메모리 상태 점검)
+        os.environ["WEB_CONCURRENCY"] = str(self.workers)
+        if self.workers == 1 or not REUSEPORT_SUPPORTED:
+            self._run_single()
+            return
+
         signal.signal(signal.SIGINT, self.signal_handler)
         signal.signal(signal.SIGTERM, self.signal_handler)
-        
+
+        logger.info(f"🎉 단일 포트 서버 시작: http://{self.host}:{self.port} (워커 {self.workers}개, SO_REUSEPORT)")
+        logger.info(f"🔗 WebSocket: ws://{self.host}:{self.port}/ws/{{landmarks,telemetry,analysis}}")
+
         try:
-            # 이벤트 루프 실행
-            asyncio.run(self.run_servers())
+            for worker_id in range(self.workers):
+                self._spawn(worker_id)
+            self._monitor()
         except KeyboardInterrupt:
             logger.info("🛑 사용자에 의해 중단되었습니다.")
-        except Exception as e:
-            logger.error(f"❌ 예기치 않은 오류: {e}")
         finally:
+            self._shutting_down = True
+            self.cleanup()
             logger.info("👋 서버 매니저 종료")
 
+
 if __name__ == "__main__":
-    manager = IntegratedServerManager()
-    manager.run()
+    UnifiedServerManager().run()
@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+정적 자산 매니페스트
+- 시작 시 frontend 디렉터리를 한 번 훑어 상대 경로 → (실제 파일, 크기, mtime, 내용 해시 ETag, MIME) 색인 생성
+  (요청마다 os.path.exists 로 후보 경로를 뒤지거나 템플릿을 다시 읽지 않음)
+- 작은 파일은 메모리에 보관, 텍스트 자산은 gzip/brotli 압축본을 미리 만들어 Accept-Encoding 으로 선택
+- If-None-Match / If-Modified-Since → 304, 큰 파일(MP4 등)은 디스크에서 Range(206) 지원
+  (서버가 ASGI zerocopy 확장을 제공하면 sendfile, 아니면 청크 선읽기를 STATIC_READAHEAD_CHUNKS 개로 제한)
+- 캐시 헤더: HTML 은 no-cache(ETag 재검증), ?v= 버전 URL 과 이미지/비디오는 immutable
+"""
+
+import os
+import gzip
+import time
+import hashlib
+import logging
+import mimetypes
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import anyio
+from starlette.requests import Request
+from starlette.responses import Response
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 이 크기 이하 파일은 메모리에 보관 (큰 비디오는 디스크에서 Range 서빙)
+STATIC_MEMORY_MAX_BYTES = int(os.getenv("STATIC_MEMORY_MAX_BYTES", str(512 * 1024)))
+# 이 크기 이상 텍스트 자산만 미리 압축
+STATIC_COMPRESS_MIN_BYTES = int(os.getenv("STATIC_COMPRESS_MIN_BYTES", "1024"))
+# 버전 없는 텍스트 자산(js/css)의 max-age
+STATIC_MAX_AGE_SEC = int(os.getenv("STATIC_MAX_AGE_SEC", "3600"))
+# 이미지/비디오를 버전 없이도 immutable 로 캐시 (교체 시 파일명을 바꾸는 전제)
+STATIC_IMMUTABLE_MEDIA = os.getenv("STATIC_IMMUTABLE_MEDIA", "true").lower() in ("1", "true", "yes")
+
+# 디스크 스트리밍 청크 크기 / 전송 대기 중 미리 읽어 둘 청크 수 (연결당 메모리 ≈ 크기 × (개수 + 1))
+STATIC_CHUNK_SIZE = int(os.getenv("STATIC_CHUNK_SIZE", str(256 * 1024)))
+STATIC_READAHEAD_CHUNKS = int(os.getenv("STATIC_READAHEAD_CHUNKS", "2"))
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# mimetypes 기본 테이블에 없거나 플랫폼마다 다른 것들
+_MEDIA_TYPES = {
+    ".js": "application/javascript",
+    ".mjs": "application/javascript",
+    ".css": "text/css",
+    ".html": "text/html",
+    ".json": "application/json",
+    ".svg": "image/svg+xml",
+    ".webp": "image/webp",
+    ".mp4": "video/mp4",
+    ".webm": "video/webm",
+    ".woff2": "font/woff2",
+}
+_TEXT_TYPES = ("application/javascript", "application/json", "image/svg+xml")
+_SKIP_DIRS = {"__pycache__", ".git", "node_modules"}
+_SKIP_SUFFIXES = {".py", ".pyc"}
+
+
+def _media_type(path: Path) -> str:
+    suffix = path.suffix.lower()
+    return _MEDIA_TYPES.get(suffix) or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+
+
+def _is_text(media_type: str) -> bool:
+    return media_type.startswith("text/") or media_type in _TEXT_TYPES
+
+
+def _accepted_encodings(header: str) -> Dict[str, float]:
+    """Accept-Encoding → {encoding: q}"""
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    return accepted
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """단일 bytes 범위 → (start, end) 포함 구간. 형식 오류/다중 범위는 None (전체 200 응답)"""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        if first == "":
+            # 끝에서 N 바이트
+            length = int(last)
+            if length <= 0:
+                return (size, size)
+            return (max(0, size - length), size - 1)
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+    if start >= size:
+        # 만족할 수 없는 범위 → 416
+        return (size, size)
+    if start > end:
+        return None
+    return (start, min(end, size - 1))
+
+
+class FileRangeResponse(Response):
+    """파일의 [offset, offset + length) 구간 전송
+    - scope 에 http.response.zerocopy 확장이 있으면 sendfile (사용자 공간 복사 없음)
+    - 없으면 읽기 태스크가 스레드에서 os.pread 로 최대 readahead 개 청크까지만 앞서 읽음
+      (느린 시청자가 있어도 연결당 메모리 상한 고정, 연결 끊김 시 읽기 중단)
+    """
+
+    zerocopy_sent = 0
+
+    def __init__(self, path: Path, offset: int, length: int, status_code: int = 200,
+                 media_type: Optional[str] = None, headers: Optional[Dict[str, str]] = None,
+                 chunk_size: int = STATIC_CHUNK_SIZE, readahead: int = STATIC_READAHEAD_CHUNKS):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.chunk_size = max(4096, chunk_size)
+        self.readahead = max(1, readahead)
+        self.status_code = status_code
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(length)
+
+    async def _send_zerocopy(self, send, f):
+        await send({
+            "type": "http.response.zerocopy",
+            "file": f,
+            "offset": self.offset,
+            "count": self.length,
+            "more_body": False,
+        })
+        FileRangeResponse.zerocopy_sent += 1
+
+    async def _send_chunks(self, send, fd: int):
+        sender, receiver = anyio.create_memory_object_stream(self.readahead - 1)
+
+        async def read_ahead():
+            async with sender:
+                position, end = self.offset, self.offset + self.length
+                while position < end:
+                    chunk = await anyio.to_thread.run_sync(
+                        os.pread, fd, min(self.chunk_size, end - position), position
+                    )
+                    if not chunk:
+                        break
+                    position += len(chunk)
+                    # 버퍼가 차면 여기서 대기 → 앞서 읽는 양이 readahead 로 제한
+                    await sender.send(chunk)
+
+        async with anyio.create_task_group() as task_group:
+            task_group.start_soon(read_ahead)
+            async with receiver:
+                async for chunk in receiver:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def _stream(self, scope, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope.get("method") == "HEAD" or self.length <= 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        with open(self.path, "rb") as f:
+            if "http.response.zerocopy" in scope.get("extensions", {}):
+                await self._send_zerocopy(send, f)
+            else:
+                await self._send_chunks(send, f.fileno())
+
+    @staticmethod
+    async def _listen_for_disconnect(receive):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+
+    async def __call__(self, scope, receive, send):
+        # 전송과 연결 끊김 감시를 함께 실행 - 먼저 끝나는 쪽이 나머지를 취소
+        async with anyio.create_task_group() as task_group:
+            async def run(func):
+                await func()
+                task_group.cancel_scope.cancel()
+
+            task_group.start_soon(run, lambda: self._stream(scope, send))
+            await run(lambda: self._listen_for_disconnect(receive))
+
+
+class Asset:
+    """매니페스트 항목 (변형 ETag 는 "<해시>-br" / "<해시>-gz")"""
+
+    __slots__ = ("key", "path", "size", "mtime", "etag", "media_type",
+                 "last_modified", "data", "variants")
+
+    def __init__(self, key: str, path: Path, size: int, mtime: float, digest: str,
+                 media_type: str, data: Optional[bytes]):
+        self.key = key
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self.etag = f'"{digest}"'
+        self.media_type = media_type
+        self.last_modified = formatdate(mtime, usegmt=True)
+        self.data = data
+        # encoding -> (압축 바이트, ETag)
+        self.variants: Dict[str, Tuple[bytes, str]] = {}
+
+    @property
+    def compressible(self) -> bool:
+        return bool(self.variants)
+
+
+class AssetManifest:
+    """frontend 디렉터리 색인 + 조건부/압축/Range 응답"""
+
+    def __init__(self, root: Path,
+                 memory_max_bytes: int = STATIC_MEMORY_MAX_BYTES,
+                 compress_min_bytes: int = STATIC_COMPRESS_MIN_BYTES):
+        self.root = Path(root)
+        self.memory_max_bytes = memory_max_bytes
+        self.compress_min_bytes = compress_min_bytes
+        self._assets: Dict[str, Asset] = {}
+        self.built_at: Optional[float] = None
+        self.build_duration = 0.0
+        self.hits = 0
+        self.not_modified = 0
+        self.partial = 0
+        self.streams = 0
+        self.misses = 0
+
+    @property
+    def built(self) -> bool:
+        return self.built_at is not None
+
+    # ---------- 색인 ----------
+
+    def _load(self, path: Path) -> Asset:
+        stat = path.stat()
+        media_type = _media_type(path)
+        hasher = hashlib.blake2b(digest_size=12)
+        data: Optional[bytes] = None
+        if stat.st_size <= self.memory_max_bytes:
+            data = path.read_bytes()
+            hasher.update(data)
+        else:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    hasher.update(chunk)
+        key = path.relative_to(self.root).as_posix()
+        asset = Asset(key, path, stat.st_size, stat.st_mtime, hasher.hexdigest(), media_type, data)
+
+        if data is not None and _is_text(media_type) and len(data) >= self.compress_min_bytes:
+            digest = asset.etag.strip('"')
+            candidates = [("gzip", "gz", gzip.compress(data, compresslevel=9, mtime=0))]
+            if BROTLI_AVAILABLE:
+                candidates.insert(0, ("br", "br", brotli.compress(data, quality=11)))
+            for encoding, tag, body in candidates:
+                # 줄어드는 양이 적으면 압축본을 두지 않음
+                if len(body) < len(data) * 0.9:
+                    asset.variants[encoding] = (body, f'"{digest}-{tag}"')
+        return asset
+
+    def build(self) -> int:
+        """디렉터리 전체 색인 (시작 시 1회, 동기 - asyncio.to_thread 로 호출)"""
+        started = time.perf_counter()
+        assets: Dict[str, Asset] = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in _SKIP_DIRS and not d.startswith(".")]
+            for filename in filenames:
+                path = Path(dirpath) / filename
+                if filename.startswith(".") or path.suffix in _SKIP_SUFFIXES:
+                    continue
+                try:
+                    asset = self._load(path)
+                except OSError as e:
+                    logger.warning(f"⚠️ 정적 자산 색인 실패: {path} ({e})")
+                    continue
+                assets[asset.key] = asset
+        self._assets = assets
+        self.built_at = time.time()
+        self.build_duration = time.perf_counter() - started
+        logger.info(
+            f"📦 정적 자산 매니페스트: {len(assets)}개 "
+            f"({sum(a.size for a in assets.values()) / 1024 / 1024:.1f}MB, {self.build_duration * 1000:.0f}ms)"
+        )
+        return len(assets)
+
+    def get(self, key: str) -> Optional[Asset]:
+        if not self.built:
+            self.build()
+        # 색인에 있는 키만 서빙하므로 '..' 등은 그대로 미스
+        return self._assets.get(key.lstrip("/"))
+
+    # ---------- 응답 ----------
+
+    def _cache_control(self, asset: Asset, request: Request) -> str:
+        if asset.media_type == "text/html":
+            return "no-cache"
+        if "v" in request.query_params:
+            return IMMUTABLE_CACHE_CONTROL
+        if STATIC_IMMUTABLE_MEDIA and asset.media_type.split("/")[0] in ("image", "video", "audio", "font"):
+            return IMMUTABLE_CACHE_CONTROL
+        return f"public, max-age={STATIC_MAX_AGE_SEC}"
+
+    @staticmethod
+    def _etag_matches(asset: Asset, if_none_match: str) -> bool:
+        if if_none_match.strip() == "*":
+            return True
+        digest = asset.etag.strip('"')
+        for tag in if_none_match.split(","):
+            tag = tag.strip()
+            if tag.startswith("W/"):
+                tag = tag[2:]
+            # 압축 변형 ETag 도 같은 내용으로 취급
+            if tag.strip('"').split("-", 1)[0] == digest:
+                return True
+        return False
+
+    def _not_modified(self, asset: Asset, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            return self._etag_matches(asset, if_none_match)
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since:
+            try:
+                return int(asset.mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _select_variant(self, asset: Asset, request: Request) -> Optional[str]:
+        if not asset.variants:
+            return None
+        accepted = _accepted_encodings(request.headers.get("accept-encoding", ""))
+        for encoding in ("br", "gzip"):
+            if encoding in asset.variants and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+                return encoding
+        return None
+
+    def response(self, request: Request, *keys: str) -> Response:
+        """keys 중 색인에 있는 첫 자산으로 응답 (없으면 404)"""
+        asset = None
+        for key in keys:
+            asset = self.get(key)
+            if asset is not None:
+                break
+        if asset is None:
+            self.misses += 1
+            return Response(status_code=404, content=f"{keys[0].rsplit('/', 1)[-1]} not found")
+        self.hits += 1
+
+        headers = {
+            "Cache-Control": self._cache_control(asset, request),
+            "Last-Modified": asset.last_modified,
+            "ETag": asset.etag,
+        }
+        if asset.compressible:
+            headers["Vary"] = "Accept-Encoding"
+        else:
+            headers["Accept-Ranges"] = "bytes"
+
+        encoding = self._select_variant(asset, request)
+        if encoding is not None:
+            headers["ETag"] = asset.variants[encoding][1]
+
+        if self._not_modified(asset, request):
+            self.not_modified += 1
+            return Response(status_code=304, headers=headers)
+
+        head = request.method == "HEAD"
+        if encoding is not None:
+            body = asset.variants[encoding][0]
+            headers["Content-Encoding"] = encoding
+            return self._bytes_response(body, asset.media_type, headers, head)
+
+        range_header = request.headers.get("range")
+        if range_header and not asset.compressible:
+            if_range = request.headers.get("if-range")
+            if if_range is None or if_range.strip() in (asset.etag, asset.last_modified):
+                byte_range = _parse_range(range_header, asset.size)
+                if byte_range is not None:
+                    return self._range_response(asset, byte_range, headers, head)
+
+        if asset.data is not None:
+            return self._bytes_response(asset.data, asset.media_type, headers, head)
+        headers["Content-Length"] = str(asset.size)
+        if head:
+            return Response(status_code=200, media_type=asset.media_type, headers=headers)
+        self.streams += 1
+        return FileRangeResponse(asset.path, 0, asset.size, media_type=asset.media_type, headers=headers)
+
+    @staticmethod
+    def _bytes_response(body: bytes, media_type: str, headers: Dict[str, str], head: bool) -> Response:
+        if head:
+            headers["Content-Length"] = str(len(body))
+            return Response(status_code=200, media_type=media_type, headers=headers)
+        return Response(content=body, media_type=media_type, headers=headers)
+
+    def _range_response(self, asset: Asset, byte_range: Tuple[int, int],
+                        headers: Dict[str, str], head: bool) -> Response:
+        start, end = byte_range
+        if start >= asset.size:
+            headers["Content-Range"] = f"bytes */{asset.size}"
+            return Response(status_code=416, headers=headers)
+        self.partial += 1
+        length = end - start + 1
+        headers["Content-Range"] = f"bytes {start}-{end}/{asset.size}"
+        headers["Content-Length"] = str(length)
+        if head:
+            return Response(status_code=206, media_type=asset.media_type, headers=headers)
+        if asset.data is not None:
+            return Response(content=asset.data[start:end + 1], status_code=206,
+                            media_type=asset.media_type, headers=headers)
+        self.streams += 1
+        return FileRangeResponse(asset.path, start, length, status_code=206,
+                                 media_type=asset.media_type, headers=headers)
+
+    # ---------- 마운트 ----------
+
+    def mount(self, subdir: str = "") -> "AssetMount":
+        """app.mount(...) 용 ASGI 앱 (StaticFiles 대체)"""
+        return AssetMount(self, subdir)
+
+    def stats(self) -> Dict[str, Any]:
+        assets = self._assets.values()
+        return {
+            "built": self.built,
+            "assets": len(self._assets),
+            "bytes": sum(a.size for a in assets),
+            "memory_bytes": sum(len(a.data) for a in assets if a.data is not None)
+                            + sum(len(body) for a in assets for body, _ in a.variants.values()),
+            "compressed": sum(1 for a in assets if a.variants),
+            "brotli": BROTLI_AVAILABLE,
+            "build_ms": round(self.build_duration * 1000, 1),
+            "hits": self.hits,
+            "not_modified": self.not_modified,
+            "partial": self.partial,
+            "streams": self.streams,
+            "zerocopy_streams": FileRangeResponse.zerocopy_sent,
+            "misses": self.misses,
+        }
+
+
+class AssetMount:
+    """매니페스트의 하위 디렉터리를 마운트 경로로 노출 (GET/HEAD)"""
+
+    def __init__(self, manifest: AssetManifest, subdir: str = ""):
+        self.manifest = manifest
+        self.prefix = f"{subdir.strip('/')}/" if subdir.strip("/") else ""
+
+    async def __call__(self, scope, receive, send):
+        assert scope["type"] == "http"
+        request = Request(scope, receive)
+        if request.method not in ("GET", "HEAD"):
+            response = Response(status_code=405, headers={"Allow": "GET, HEAD"})
+        else:
+            path = scope["path"].lstrip("/")
+            keys: List[str] = [self.prefix + path]
+            if path == "" or path.endswith("/"):
+                keys = [self.prefix + path + "index.html"]
+            response = self.manifest.response(request, *keys)
+        await response(scope, receive, send)
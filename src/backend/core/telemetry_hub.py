@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+텔레메트리 허브
+- 생산자 태스크 하나가 틱마다 스냅샷을 한 번 계산/직렬화하고 모든 구독자에게 팬아웃
+- 내용이 바뀌지 않으면 전송 생략 (keepalive 주기마다만 재전송)
+- 구독자별 최소 전송 간격 (rate limit), 최신 값만 유지하는 슬롯
+- 느린 소비자는 중간 스냅샷을 건너뜀 (실제 전송/타임아웃은 연결 레지스트리의 송신 큐가 담당)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Callable, Dict, Any, Optional, Set, Tuple
+
+from ..common.serialization import dumps, dumps_text
+
+logger = logging.getLogger(__name__)
+
+TELEMETRY_TICK_SEC = float(os.getenv("TELEMETRY_TICK_SEC", "2.0"))
+TELEMETRY_KEEPALIVE_SEC = float(os.getenv("TELEMETRY_KEEPALIVE_SEC", "10.0"))
+
+
+class TelemetrySubscriber:
+    """구독자 하나의 최신 스냅샷 슬롯"""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self.sent = 0
+        self.dropped = 0
+        self._pending: Optional[str] = None
+        self._event = asyncio.Event()
+        self._last_sent = 0.0
+
+    def offer(self, text: str):
+        """생산자가 호출 - 이전 스냅샷이 아직 안 나갔으면 덮어씀 (O(1), 대기 없음)"""
+        if self._pending is not None:
+            self.dropped += 1
+        self._pending = text
+        self._event.set()
+
+    async def next(self) -> str:
+        """다음에 보낼 최신 스냅샷 (구독자 전송 간격 준수)"""
+        await self._event.wait()
+        wait = self.min_interval - (time.monotonic() - self._last_sent)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        text = self._pending
+        self._pending = None
+        self._event.clear()
+        return text
+
+    def mark_sent(self):
+        self._last_sent = time.monotonic()
+        self.sent += 1
+
+
+class TelemetryHub:
+    """스냅샷 생산자 하나 + 구독자 팬아웃"""
+
+    def __init__(self,
+                 provider: Callable[[], Dict[str, Any]],
+                 tick: float = TELEMETRY_TICK_SEC,
+                 keepalive: float = TELEMETRY_KEEPALIVE_SEC,
+                 volatile_keys: Tuple[str, ...] = ("timestamp",)):
+        self.provider = provider
+        self.tick = tick
+        self.keepalive = keepalive
+        self.volatile_keys = volatile_keys
+
+        self._subscribers: Set[TelemetrySubscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._last_key: Optional[bytes] = None
+        self._last_text: Optional[str] = None
+        self._last_broadcast = 0.0
+
+        self.ticks = 0
+        self.broadcasts = 0
+        self.skipped_unchanged = 0
+
+    def subscribe(self, min_interval: Optional[float] = None) -> TelemetrySubscriber:
+        """구독자를 등록하고 필요하면 생산자 태스크를 시작합니다."""
+        interval = max(self.tick, min_interval or self.tick)
+        subscriber = TelemetrySubscriber(interval)
+        self._subscribers.add(subscriber)
+
+        # 새 구독자는 다음 틱을 기다리지 않고 마지막 스냅샷을 바로 받음
+        if self._last_text is not None:
+            subscriber.offer(self._last_text)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._produce())
+        return subscriber
+
+    def unsubscribe(self, subscriber: TelemetrySubscriber):
+        self._subscribers.discard(subscriber)
+        if not self._subscribers and self._task is not None:
+            # 구독자가 없으면 생산자도 멈춤 (유휴 비용 0)
+            self._task.cancel()
+            self._task = None
+            self._last_key = None
+            self._last_text = None
+
+    def _change_key(self, snapshot: Dict[str, Any]) -> bytes:
+        stable = {k: v for k, v in snapshot.items() if k not in self.volatile_keys}
+        return dumps(stable, sort_keys=True)
+
+    async def _produce(self):
+        try:
+            while self._subscribers:
+                self.ticks += 1
+                try:
+                    snapshot = self.provider()
+                    key = self._change_key(snapshot)
+                    now = time.monotonic()
+                    if key != self._last_key or now - self._last_broadcast >= self.keepalive:
+                        # 틱당 직렬화 1회, 모든 구독자가 같은 문자열 공유
+                        text = dumps_text(snapshot)
+                        self._last_key = key
+                        self._last_text = text
+                        self._last_broadcast = now
+                        self.broadcasts += 1
+                        for subscriber in list(self._subscribers):
+                            subscriber.offer(text)
+                    else:
+                        self.skipped_unchanged += 1
+                except Exception as e:
+                    logger.error(f"❌ 텔레메트리 스냅샷 생성 실패: {e}")
+                await asyncio.sleep(self.tick)
+        except asyncio.CancelledError:
+            pass
+
+    async def serve(self, subscriber: TelemetrySubscriber, send: Callable[[str], bool]):
+        """구독자 슬롯을 send 로 내보냅니다. send 가 False 를 반환하면(연결 종료) 끝냅니다."""
+        while True:
+            text = await subscriber.next()
+            if not send(text):
+                return
+            subscriber.mark_sent()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self._subscribers),
+            "running": self._task is not None and not self._task.done(),
+            "ticks": self.ticks,
+            "broadcasts": self.broadcasts,
+            "skipped_unchanged": self.skipped_unchanged,
+            "dropped_snapshots": sum(s.dropped for s in self._subscribers),
+        }
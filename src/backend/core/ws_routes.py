@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+WebSocket 라우트 (단일 포트 통합)
+- /ws/landmarks: 랜드마크 배치 수신 + MediaPipe 분석 + 세션 기록
+- /ws/telemetry: 텔레메트리 주기 전송
+- /ws/analysis: 분석 요약 요청/응답
+- main_server / websocket_server 가 같은 라우터와 연결 레지스트리를 공유
+"""
+
+import time
+import asyncio
+import base64
+import logging
+from typing import Dict, List, Any
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from ..common.serialization import loads
+from .connection_registry import registry
+from .telemetry_hub import TelemetryHub
+
+logger = logging.getLogger(__name__)
+
+# MediaPipe 분석기 import (선택적)
+try:
+    from ..services.analysis.mediapipe_analyzer import mediapipe_analyzer
+    MEDIAPIPE_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ MediaPipe 분석기 로드 실패 (WebSocket 라우트): {e}")
+    MEDIAPIPE_AVAILABLE = False
+
+# 랜드마크 세션 레코더 import (선택적)
+try:
+    from ..services.analysis.landmark_recorder import open_session_recorder
+    LANDMARK_RECORDER_AVAILABLE = True
+except ImportError as e:
+    print(f"⚠️ 랜드마크 레코더 로드 실패: {e}")
+    LANDMARK_RECORDER_AVAILABLE = False
+
+router = APIRouter()
+
+# 서버 전역 토글 (UI-only mode)
+debug_overlay = False
+
+EXPECTED_FACE_LANDMARKS = 468
+
+
+def _get_telemetry() -> dict:
+    """
+    UI-only mode 텔레메트리 데이터 반환
+    """
+    return {
+        "ok": True,
+        "simulation_mode": True,
+        "message": "UI-only mode로 동작 중입니다.",
+        "data_source": "ui_only",
+        "debug_info": {
+            "pipeline_mode": "ui_only",
+            "camera_connected": False,
+            "reason": "UI 디자인 모드 - 실제 분석 비활성화"
+        },
+        "pipeline_running": False,
+        "pipeline_interval": 1.0,
+        "active_connections": registry.count(),
+        "timestamp": time.time()
+    }
+
+
+def _telemetry_snapshot() -> dict:
+    """허브 생산자가 틱마다 한 번 호출하는 스냅샷"""
+    d = _get_telemetry()
+
+    # 서버 전역 토글/메타 추가
+    d["debug_overlay"] = bool(debug_overlay)
+    d.setdefault("ok", True)
+    return d
+
+
+# 틱당 스냅샷 1회 계산/직렬화 후 모든 /ws/telemetry 구독자에게 팬아웃
+telemetry_hub = TelemetryHub(_telemetry_snapshot)
+
+
+def _describe_first_frame(frames: List[Dict[str, Any]]) -> str:
+    """첫 프레임의 랜드마크 개수 요약 (로그용)"""
+    first_frame = frames[0] if frames else None
+    if not first_frame:
+        return "없음"
+    if first_frame.get("lm"):
+        try:
+            # base64 Float32Array (x, y, z 반복)
+            landmark_count = len(base64.b64decode(first_frame["lm"])) // 4 // 3
+            is_valid = landmark_count == EXPECTED_FACE_LANDMARKS
+            return f"{landmark_count}개 랜드마크 (예상: {EXPECTED_FACE_LANDMARKS}개, 유효: {'✅' if is_valid else '❌'})"
+        except Exception as e:
+            return f"디코딩 오류: {e}"
+    return f"face {len(first_frame.get('face_landmarks', []))}개 / pose {len(first_frame.get('pose_landmarks', []))}개"
+
+
+def _analyze_frames(frames: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """딕셔너리 랜드마크가 포함된 프레임을 MediaPipe 분석기로 분석합니다."""
+    results = []
+    for frame in frames:
+        face_landmarks = frame.get("face_landmarks", [])
+        pose_landmarks = frame.get("pose_landmarks", [])
+        if not (face_landmarks or pose_landmarks):
+            continue
+        result = mediapipe_analyzer.analyze_landmarks(face_landmarks, pose_landmarks)
+        if result:
+            results.append({
+                "timestamp": result.timestamp,
+                "scores": result.scores,
+                "metrics": result.metrics
+            })
+    return results
+
+
+@router.websocket("/ws/telemetry")
+async def ws_telemetry(ws: WebSocket):
+    await registry.connect(ws, "telemetry")
+
+    # 구독자별 최소 전송 간격 (?interval=초, 허브 틱보다 짧을 수 없음)
+    try:
+        min_interval = float(ws.query_params.get("interval", 0)) or None
+    except ValueError:
+        min_interval = None
+    subscriber = telemetry_hub.subscribe(min_interval)
+
+    try:
+        # 전송은 연결별 송신 큐/writer 가 담당 (느린 소비자는 레지스트리가 정리)
+        await telemetry_hub.serve(subscriber, lambda text: registry.send(ws, "telemetry", text))
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"❌ 텔레메트리 WebSocket 오류: {e}")
+    finally:
+        telemetry_hub.unsubscribe(subscriber)
+        registry.disconnect(ws, "telemetry")
+
+
+@router.websocket("/ws/landmarks")
+async def ws_landmarks(ws: WebSocket):
+    """랜드마크 데이터를 위한 WebSocket 엔드포인트"""
+    await registry.connect(ws, "landmarks")
+
+    # MediaPipe 분석기 지연 초기화 (워커별)
+    if MEDIAPIPE_AVAILABLE and not mediapipe_analyzer.is_initialized:
+        await asyncio.to_thread(mediapipe_analyzer.initialize)
+
+    # 세션 기록 (LANDMARK_RECORDING 설정 + ?record=1 옵트인)
+    recorder = None
+    if LANDMARK_RECORDER_AVAILABLE:
+        recorder = open_session_recorder(ws.client.host if ws.client else None, dict(ws.query_params))
+
+    try:
+        while True:
+            # 클라이언트로부터 랜드마크 데이터 수신
+            data = loads(await ws.receive_text())
+            registry.record_inbound("landmarks")
+            msg_type = data.get("type")
+
+            if msg_type == "landmarks_batch":
+                frames = data.get("frames", [])
+                fps = data.get("fps", 10)
+                timestamp = data.get("ts", time.time())
+
+                if recorder and recorder.append_batch(frames, timestamp):
+                    await recorder.flush_async()
+
+                # 프레임마다 오는 경로 - DEBUG 가 꺼져 있으면 첫 프레임 디코딩도 생략 (0개 프레임 로그는 생략)
+                if frames and logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"📊 랜드마크 배치 수신: {len(frames)}개 프레임, {_describe_first_frame(frames)}")
+
+                # 서버 측 분석은 분석기가 초기화된 경우에만 (루프 밖 스레드에서 수행)
+                analysis_results = []
+                if MEDIAPIPE_AVAILABLE and mediapipe_analyzer.is_initialized and frames:
+                    analysis_results = await asyncio.to_thread(_analyze_frames, frames)
+
+                registry.send(ws, "landmarks", {
+                    "ok": True,
+                    "message": "랜드마크 데이터 수신 완료",
+                    "frames_processed": len(frames),
+                    "analysis_results": analysis_results,
+                    "fps": fps,
+                    "timestamp": timestamp,
+                    "server_time": time.time()
+                })
+
+            elif msg_type == "ping":
+                registry.send(ws, "landmarks", {
+                    "type": "pong",
+                    "timestamp": time.time()
+                })
+
+            else:
+                # 기타 메시지 처리
+                registry.send(ws, "landmarks", {
+                    "ok": True,
+                    "message": "메시지 수신됨",
+                    "data": data
+                })
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"❌ 랜드마크 WebSocket 오류: {e}")
+    finally:
+        registry.disconnect(ws, "landmarks")
+        if recorder:
+            await recorder.close()
+
+
+@router.websocket("/ws/analysis")
+async def ws_analysis(ws: WebSocket):
+    """실시간 분석 결과 전송용 웹소켓"""
+    await registry.connect(ws, "analysis")
+
+    try:
+        while True:
+            # 클라이언트로부터 분석 요청 수신
+            data = loads(await ws.receive_text())
+            registry.record_inbound("analysis")
+            msg_type = data.get("type")
+
+            if msg_type == "get_analysis_summary":
+                # 최근 분석 결과 요약 전송
+                if MEDIAPIPE_AVAILABLE and mediapipe_analyzer.is_initialized:
+                    response = {
+                        "ok": True,
+                        "type": "analysis_summary",
+                        "summary": mediapipe_analyzer.get_analysis_summary(),
+                        "timestamp": time.time()
+                    }
+                else:
+                    response = {
+                        "ok": False,
+                        "type": "analysis_summary",
+                        "error": "MediaPipe 분석기를 사용할 수 없습니다",
+                        "timestamp": time.time()
+                    }
+
+            elif msg_type == "start_realtime_analysis":
+                response = {
+                    "ok": True,
+                    "type": "realtime_analysis_started",
+                    "message": "실시간 분석이 시작되었습니다",
+                    "timestamp": time.time()
+                }
+
+            elif msg_type == "stop_realtime_analysis":
+                response = {
+                    "ok": True,
+                    "type": "realtime_analysis_stopped",
+                    "message": "실시간 분석이 중지되었습니다",
+                    "timestamp": time.time()
+                }
+
+            else:
+                response = {
+                    "ok": True,
+                    "message": "분석 웹소켓 메시지 수신됨",
+                    "data": data,
+                    "timestamp": time.time()
+                }
+
+            registry.send(ws, "analysis", response)
+
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"❌ 분석 WebSocket 오류: {e}")
+    finally:
+        registry.disconnect(ws, "analysis")
+
+
+@router.get("/api/ws/stats")
+async def ws_stats():
+    """현재 워커의 WebSocket 연결 현황"""
+    return {**registry.stats(), "telemetry": telemetry_hub.stats()}
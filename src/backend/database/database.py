@@ -1,72 +1,93 @@
 import os
-import motor.motor_asyncio
-from pymongo import MongoClient
+import asyncio
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import BulkWriteError
 from typing import Optional, List, Dict, Any
-from datetime import datetime
+from datetime import datetime, timezone
 import logging
 import hashlib
+import base64
+from functools import lru_cache
+import struct
+
+from .mongo_client import MONGODB_URI, create_mongo_client
 
 # 로깅 설정
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # MongoDB 설정 (로컬 또는 Atlas)
-MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
 DATABASE_NAME = os.getenv("DATABASE_NAME", "dys-chatbot")
+# Supabase UUID -> ObjectId 변환 메모이즈 크기
+USER_ID_CACHE_SIZE = int(os.getenv("USER_ID_CACHE_SIZE", "10000"))
+# 메시지 삽입 + 세션 카운터 갱신을 트랜잭션으로 묶음 (레플리카셋/Atlas 필요)
+MONGO_USE_TRANSACTIONS = os.getenv("MONGO_USE_TRANSACTIONS", "false").lower() in ("1", "true", "yes")
 
-print(f"🔗 [DATABASE] MongoDB URI: {MONGODB_URI}")
-print(f"📊 [DATABASE] Database Name: {DATABASE_NAME}")
+logger.debug(f"🔗 [DATABASE] MongoDB URI: {MONGODB_URI}")
+logger.debug(f"📊 [DATABASE] Database Name: {DATABASE_NAME}")
 
-# 비동기 MongoDB 클라이언트
-async_client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URI)
+# 비동기 MongoDB 클라이언트 (프로세스당 하나, 풀 설정은 mongo_client 참고)
+async_client = create_mongo_client(MONGODB_URI)
 database = async_client[DATABASE_NAME]
 
-# 동기 MongoDB 클라이언트 (인덱스 생성용)
-sync_client = MongoClient(MONGODB_URI)
-sync_database = sync_client[DATABASE_NAME]
-
 # 컬렉션 참조 (chat 컬렉션 사용)
 users_collection = database.users
 chat_sessions_collection = database.chat_sessions
 chat_messages_collection = database.chat  # dys-chatbot.chat 컬렉션 사용
+# 진행 중인 캘리브레이션 세션 누적 통계 (워커 간 공유, expires_at TTL)
+calibration_sessions_collection = database.calibration_sessions
 
-print(f"📁 [DATABASE] Collections: users, chat_sessions, chat")
+logger.debug(f"📁 [DATABASE] Collections: users, chat_sessions, chat, calibration_sessions")
 
+@lru_cache(maxsize=USER_ID_CACHE_SIZE)
 def supabase_uuid_to_objectid(uuid_string: str) -> str:
-    """Supabase UUID를 MongoDB ObjectId로 변환"""
-    try:
-        # UUID를 해시하여 일관된 ObjectId 생성
-        hash_object = hashlib.md5(uuid_string.encode())
-        hash_hex = hash_object.hexdigest()
-        # 24자리 ObjectId 형식으로 변환
-        object_id = hash_hex[:24]
-        print(f"🔄 [UUID_CONVERT] {uuid_string} -> {object_id}")
-        return object_id
-    except Exception as e:
-        print(f"❌ [UUID_CONVERT] 변환 실패: {e}")
-        # 폴백: 기본 ObjectId 생성
-        from bson import ObjectId
-        return str(ObjectId())
+    """Supabase UUID를 MongoDB ObjectId로 변환 (결정적 해시, 결과 메모이즈)"""
+    # UUID를 해시하여 일관된 ObjectId 생성 (24자리 ObjectId 형식)
+    return hashlib.md5(uuid_string.encode()).hexdigest()[:24]
+
+def to_mongo_user_id(user_id: str) -> str:
+    """요청 user_id -> 저장용 ObjectId 문자열 (Supabase UUID 면 변환, 아니면 그대로)"""
+    if len(user_id) == 36 and '-' in user_id:  # UUID 형식인지 확인
+        return supabase_uuid_to_objectid(user_id)
+    return user_id
+
+# 인덱스 정의 (컬렉션 이름 -> IndexModel 목록)
+INDEX_MODELS = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True),
+        IndexModel([("created_at", DESCENDING)]),
+    ],
+    "chat_sessions": [
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)]),
+        # get_user_sessions: user_id 필터 + last_message_at 최신순 정렬
+        IndexModel([("user_id", ASCENDING), ("last_message_at", DESCENDING)]),
+        IndexModel([("is_active", ASCENDING)]),
+    ],
+    # 채팅 메시지 인덱스 (chat 컬렉션)
+    "chat": [
+        IndexModel([("user_id", ASCENDING), ("session_id", ASCENDING), ("timestamp", DESCENDING)]),
+        # 히스토리 키셋 페이지네이션 (session_id, timestamp, _id)
+        IndexModel([("session_id", ASCENDING), ("timestamp", ASCENDING), ("_id", ASCENDING)]),
+    ],
+    "calibration_sessions": [
+        # 마지막 프레임 이후 유휴 만료 (expires_at 시각에 삭제)
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0),
+    ],
+}
 
 # 인덱스 생성
-def create_indexes():
-    """MongoDB 인덱스 생성"""
-    try:
-        # 사용자 컬렉션 인덱스
-        sync_database.users.create_index([("email", 1)], unique=True)
-        sync_database.users.create_index([("created_at", -1)])
-        
-        # 채팅 세션 인덱스
-        sync_database.chat_sessions.create_index([("user_id", 1), ("created_at", -1)])
-        sync_database.chat_sessions.create_index([("is_active", 1)])
-        
-        # 채팅 메시지 인덱스 (chat 컬렉션)
-        sync_database.chat.create_index([("user_id", 1), ("session_id", 1), ("timestamp", -1)])
-        sync_database.chat.create_index([("session_id", 1), ("timestamp", 1)])
-        
+async def create_indexes():
+    """MongoDB 인덱스 생성 (컬렉션별 create_indexes 한 번씩, 동시에 실행)"""
+    results = await asyncio.gather(
+        *(database[name].create_indexes(models) for name, models in INDEX_MODELS.items()),
+        return_exceptions=True
+    )
+    failed = False
+    for name, result in zip(INDEX_MODELS, results):
+        if isinstance(result, Exception):
+            failed = True
+            logger.error(f"❌ MongoDB 인덱스 생성 실패 ({name}): {result}")
+    if not failed:
         logger.info("✅ MongoDB 인덱스 생성 완료")
-    except Exception as e:
-        logger.error(f"❌ MongoDB 인덱스 생성 실패: {e}")
 
 # 데이터베이스 연결 테스트
 async def test_connection():
@@ -82,11 +103,11 @@ async def test_connection():
 async def diagnose_database():
     """MongoDB 데이터베이스 상태 진단"""
     try:
-        print("🔍 [DIAGNOSE] MongoDB 데이터베이스 상태 진단 시작...")
+        logger.debug("🔍 [DIAGNOSE] MongoDB 데이터베이스 상태 진단 시작...")
         
         # 1. 연결 테스트
         connection_ok = await test_connection()
-        print(f"📊 [DIAGNOSE] 연결 상태: {'✅ 성공' if connection_ok else '❌ 실패'}")
+        logger.debug(f"📊 [DIAGNOSE] 연결 상태: {'✅ 성공' if connection_ok else '❌ 실패'}")
         
         if not connection_ok:
             return {"status": "connection_failed", "error": "MongoDB 연결 실패"}
@@ -94,50 +115,50 @@ async def diagnose_database():
         # 2. 데이터베이스 목록 확인
         try:
             db_list = await async_client.list_database_names()
-            print(f"📊 [DIAGNOSE] 사용 가능한 데이터베이스: {db_list}")
+            logger.debug(f"📊 [DIAGNOSE] 사용 가능한 데이터베이스: {db_list}")
         except Exception as e:
-            print(f"❌ [DIAGNOSE] 데이터베이스 목록 조회 실패: {e}")
+            logger.error(f"❌ [DIAGNOSE] 데이터베이스 목록 조회 실패: {e}")
         
         # 3. 현재 데이터베이스 컬렉션 확인
         try:
             collections = await database.list_collection_names()
-            print(f"📊 [DIAGNOSE] 현재 DB 컬렉션: {collections}")
+            logger.debug(f"📊 [DIAGNOSE] 현재 DB 컬렉션: {collections}")
         except Exception as e:
-            print(f"❌ [DIAGNOSE] 컬렉션 목록 조회 실패: {e}")
+            logger.error(f"❌ [DIAGNOSE] 컬렉션 목록 조회 실패: {e}")
         
         # 4. 사용자 컬렉션 상태 확인
         try:
             user_count = await users_collection.count_documents({})
-            print(f"📊 [DIAGNOSE] 사용자 수: {user_count}")
+            logger.debug(f"📊 [DIAGNOSE] 사용자 수: {user_count}")
             
             if user_count > 0:
                 # 최근 사용자 3명 조회
                 recent_users = await users_collection.find().sort("created_at", -1).limit(3).to_list(3)
-                print(f"📊 [DIAGNOSE] 최근 사용자:")
+                logger.debug(f"📊 [DIAGNOSE] 최근 사용자:")
                 for user in recent_users:
-                    print(f"  - ID: {user.get('_id')}, Email: {user.get('email')}, Created: {user.get('created_at')}")
+                    logger.debug(f"  - ID: {user.get('_id')}, Email: {user.get('email')}, Created: {user.get('created_at')}")
         except Exception as e:
-            print(f"❌ [DIAGNOSE] 사용자 컬렉션 조회 실패: {e}")
+            logger.error(f"❌ [DIAGNOSE] 사용자 컬렉션 조회 실패: {e}")
         
         # 5. 채팅 세션 컬렉션 상태 확인
         try:
             session_count = await chat_sessions_collection.count_documents({})
-            print(f"📊 [DIAGNOSE] 채팅 세션 수: {session_count}")
+            logger.debug(f"📊 [DIAGNOSE] 채팅 세션 수: {session_count}")
         except Exception as e:
-            print(f"❌ [DIAGNOSE] 채팅 세션 컬렉션 조회 실패: {e}")
+            logger.error(f"❌ [DIAGNOSE] 채팅 세션 컬렉션 조회 실패: {e}")
         
         # 6. 채팅 메시지 컬렉션 상태 확인
         try:
             message_count = await chat_messages_collection.count_documents({})
-            print(f"📊 [DIAGNOSE] 채팅 메시지 수: {message_count}")
+            logger.debug(f"📊 [DIAGNOSE] 채팅 메시지 수: {message_count}")
         except Exception as e:
-            print(f"❌ [DIAGNOSE] 채팅 메시지 컬렉션 조회 실패: {e}")
+            logger.error(f"❌ [DIAGNOSE] 채팅 메시지 컬렉션 조회 실패: {e}")
         
-        print("✅ [DIAGNOSE] MongoDB 진단 완료")
+        logger.debug("✅ [DIAGNOSE] MongoDB 진단 완료")
         return {"status": "success", "connection": connection_ok}
         
     except Exception as e:
-        print(f"❌ [DIAGNOSE] 진단 중 오류 발생: {e}")
+        logger.error(f"❌ [DIAGNOSE] 진단 중 오류 발생: {e}")
         return {"status": "error", "error": str(e)}
 
 # 사용자 관련 함수
@@ -176,19 +197,13 @@ async def get_user_by_id(user_id: str) -> Optional[Dict[str, Any]]:
 # 채팅 세션 관련 함수
 async def create_chat_session(user_id: str, session_name: str = "새로운 대화") -> Optional[str]:
     """새 채팅 세션 생성"""
-    print(f"🔍 [CREATE_SESSION] 세션 생성 시작 - user_id: {user_id}, session_name: {session_name}")
+    logger.debug(f"🔍 [CREATE_SESSION] 세션 생성 시작 - user_id: {user_id}, session_name: {session_name}")
     
     try:
         from bson import ObjectId
         
         # Supabase UUID를 MongoDB ObjectId로 변환
-        if len(user_id) == 36 and '-' in user_id:  # UUID 형식인지 확인
-            print(f"🔄 [CREATE_SESSION] Supabase UUID 감지: {user_id}")
-            mongo_user_id = supabase_uuid_to_objectid(user_id)
-            print(f"✅ [CREATE_SESSION] MongoDB ObjectId로 변환: {mongo_user_id}")
-        else:
-            mongo_user_id = user_id
-            print(f"ℹ️ [CREATE_SESSION] 기존 user_id 사용: {mongo_user_id}")
+        mongo_user_id = to_mongo_user_id(user_id)
         
         session_data = {
             "user_id": ObjectId(mongo_user_id),
@@ -199,33 +214,27 @@ async def create_chat_session(user_id: str, session_name: str = "새로운 대
             "is_active": True
         }
         
-        print(f"🔄 [CREATE_SESSION] MongoDB Atlas에 세션 저장 중...")
+        logger.debug(f"🔄 [CREATE_SESSION] MongoDB Atlas에 세션 저장 중...")
         result = await chat_sessions_collection.insert_one(session_data)
-        print(f"✅ [CREATE_SESSION] 세션 생성 성공: {result.inserted_id}")
+        logger.debug(f"✅ [CREATE_SESSION] 세션 생성 성공: {result.inserted_id}")
         
         logger.info(f"✅ 채팅 세션 생성 완료: {result.inserted_id}")
         return str(result.inserted_id)
     except Exception as e:
-        print(f"❌ [CREATE_SESSION] 오류 발생: {e}")
+        logger.error(f"❌ [CREATE_SESSION] 오류 발생: {e}")
         logger.error(f"❌ 채팅 세션 생성 실패: {e}")
         return None
 
 async def create_chat_session_with_persona(user_id: str, session_name: str, persona_info: Dict[str, Any]) -> Optional[str]:
     """페르소나 정보를 포함한 새 채팅 세션 생성"""
-    print(f"🔍 [CREATE_SESSION_PERSONA] 세션 생성 시작 - user_id: {user_id}, session_name: {session_name}")
-    print(f"👤 [CREATE_SESSION_PERSONA] 페르소나: {persona_info.get('persona_name', 'N/A')}")
+    logger.debug(f"🔍 [CREATE_SESSION_PERSONA] 세션 생성 시작 - user_id: {user_id}, session_name: {session_name}")
+    logger.debug(f"👤 [CREATE_SESSION_PERSONA] 페르소나: {persona_info.get('persona_name', 'N/A')}")
     
     try:
         from bson import ObjectId
         
         # Supabase UUID를 MongoDB ObjectId로 변환
-        if len(user_id) == 36 and '-' in user_id:  # UUID 형식인지 확인
-            print(f"🔄 [CREATE_SESSION_PERSONA] Supabase UUID 감지: {user_id}")
-            mongo_user_id = supabase_uuid_to_objectid(user_id)
-            print(f"✅ [CREATE_SESSION_PERSONA] MongoDB ObjectId로 변환: {mongo_user_id}")
-        else:
-            mongo_user_id = user_id
-            print(f"ℹ️ [CREATE_SESSION_PERSONA] 기존 user_id 사용: {mongo_user_id}")
+        mongo_user_id = to_mongo_user_id(user_id)
         
         session_data = {
             "user_id": ObjectId(mongo_user_id),
@@ -243,14 +252,14 @@ async def create_chat_session_with_persona(user_id: str, session_name: str, pers
             "persona_image": persona_info.get('persona_image')
         }
         
-        print(f"🔄 [CREATE_SESSION_PERSONA] MongoDB Atlas에 세션 저장 중...")
+        logger.debug(f"🔄 [CREATE_SESSION_PERSONA] MongoDB Atlas에 세션 저장 중...")
         result = await chat_sessions_collection.insert_one(session_data)
-        print(f"✅ [CREATE_SESSION_PERSONA] 세션 생성 성공: {result.inserted_id}")
+        logger.debug(f"✅ [CREATE_SESSION_PERSONA] 세션 생성 성공: {result.inserted_id}")
         
         logger.info(f"✅ 페르소나 포함 채팅 세션 생성 완료: {result.inserted_id}")
         return str(result.inserted_id)
     except Exception as e:
-        print(f"❌ [CREATE_SESSION_PERSONA] 오류 발생: {e}")
+        logger.error(f"❌ [CREATE_SESSION_PERSONA] 오류 발생: {e}")
         logger.error(f"❌ 페르소나 포함 채팅 세션 생성 실패: {e}")
         return None
 
@@ -260,13 +269,7 @@ async def get_user_sessions(user_id: str) -> List[Dict[str, Any]]:
         from bson import ObjectId
         
         # Supabase UUID를 MongoDB ObjectId로 변환
-        if len(user_id) == 36 and '-' in user_id:  # UUID 형식인지 확인
-            print(f"🔄 [GET_SESSIONS] Supabase UUID 감지: {user_id}")
-            mongo_user_id = supabase_uuid_to_objectid(user_id)
-            print(f"✅ [GET_SESSIONS] MongoDB ObjectId로 변환: {mongo_user_id}")
-        else:
-            mongo_user_id = user_id
-            print(f"ℹ️ [GET_SESSIONS] 기존 user_id 사용: {mongo_user_id}")
+        mongo_user_id = to_mongo_user_id(user_id)
         
         cursor = chat_sessions_collection.find(
             {"user_id": ObjectId(mongo_user_id)},
@@ -286,82 +289,141 @@ async def get_user_sessions(user_id: str) -> List[Dict[str, Any]]:
         return []
 
 # 채팅 메시지 관련 함수
-async def save_message(user_id: str, session_id: str, role: str, content: str) -> Optional[str]:
-    """채팅 메시지 저장 (dys-chatbot.chat 컬렉션)"""
-    print(f"🔍 [SAVE_MESSAGE] 저장 시작 - user_id: {user_id}, session_id: {session_id}, role: {role}")
-    print(f"📝 [SAVE_MESSAGE] 메시지 내용: {content[:50]}...")
+def _resolve_mongo_user_id(user_id: str) -> str:
+    """user_id 검증 + Supabase UUID 변환 (유효하지 않으면 기본 사용자 ID 생성)"""
+    if not user_id or user_id == "null" or len(user_id) < 12:
+        logger.warning(f"⚠️ [SAVE_MESSAGE] 유효하지 않은 user_id: {user_id}")
+        import time
+        # 타임스탬프 기반 고유 ID 생성
+        unique_string = f"default_user_{int(time.time())}"
+        user_id = hashlib.md5(unique_string.encode()).hexdigest()[:24]
+        logger.debug(f"✅ [SAVE_MESSAGE] 기본 사용자 ID 생성: {user_id}")
     
-    try:
-        from bson import ObjectId
-        
-        # session_id 유효성 검사
-        if not session_id or session_id == "null":
-            print(f"❌ [SAVE_MESSAGE] 유효하지 않은 session_id: {session_id}")
-            return None
-        
-        # user_id 유효성 검사 및 기본값 생성
-        if not user_id or user_id == "null" or len(user_id) < 12:
-            print(f"⚠️ [SAVE_MESSAGE] 유효하지 않은 user_id: {user_id}")
-            import hashlib
-            import time
-            # 타임스탬프 기반 고유 ID 생성
-            unique_string = f"default_user_{int(time.time())}"
-            user_id = hashlib.md5(unique_string.encode()).hexdigest()[:24]
-            print(f"✅ [SAVE_MESSAGE] 기본 사용자 ID 생성: {user_id}")
-        
-        # Supabase UUID를 MongoDB ObjectId로 변환
-        if len(user_id) == 36 and '-' in user_id:  # UUID 형식인지 확인
-            print(f"🔄 [SAVE_MESSAGE] Supabase UUID 감지: {user_id}")
-            mongo_user_id = supabase_uuid_to_objectid(user_id)
-            print(f"✅ [SAVE_MESSAGE] MongoDB ObjectId로 변환: {mongo_user_id}")
-        else:
-            mongo_user_id = user_id
-            print(f"ℹ️ [SAVE_MESSAGE] 기존 user_id 사용: {mongo_user_id}")
-        
-        message_data = {
-            "user_id": ObjectId(mongo_user_id),
+    # Supabase UUID를 MongoDB ObjectId로 변환
+    return to_mongo_user_id(user_id)
+
+def _only_duplicate_errors(error: BulkWriteError) -> bool:
+    return all(e.get("code") == 11000 for e in error.details.get("writeErrors", []))
+
+async def _append_in_transaction(documents: List[Dict[str, Any]], session_update: Dict[str, Any],
+                                 session_oid) -> int:
+    """트랜잭션 안에서 메시지 삽입 + 세션 카운터 갱신 (이미 저장된 ID 는 제외)"""
+    async with await async_client.start_session() as session:
+        async with session.start_transaction():
+            ids = [doc["_id"] for doc in documents]
+            existing = {
+                doc["_id"] async for doc in
+                chat_messages_collection.find({"_id": {"$in": ids}}, {"_id": 1}, session=session)
+            }
+            new_documents = [doc for doc in documents if doc["_id"] not in existing]
+            if not new_documents:
+                return 0
+            await chat_messages_collection.insert_many(new_documents, session=session)
+            session_update["$inc"]["message_count"] = len(new_documents)
+            await chat_sessions_collection.update_one({"_id": session_oid}, session_update, session=session)
+            return len(new_documents)
+
+async def append_messages(user_id: str, session_id: str, messages: List[Dict[str, Any]],
+                          use_transaction: bool = MONGO_USE_TRANSACTIONS) -> List[str]:
+    """
+    세션에 메시지 여러 개를 한 번에 추가 (insert_many 1회 + 세션 update_one 1회)
+    - messages: [{role, content, message_id?, timestamp?}] (사용자+AI 한 턴을 같이 넘기면 왕복 2회)
+    - message_id 가 이미 저장돼 있으면 건너뜀 (write-behind 재시도에도 중복 없음, 카운트도 중복 증가 없음)
+    - use_transaction: 레플리카셋/Atlas 에서 삽입과 카운터 갱신을 원자적으로 처리
+    반환: 메시지 ID 목록 (입력 순서)
+    """
+    from bson import ObjectId
+    
+    # session_id 유효성 검사
+    if not session_id or session_id == "null":
+        logger.error(f"❌ [SAVE_MESSAGE] 유효하지 않은 session_id: {session_id}")
+        return []
+    if not messages:
+        return []
+    
+    mongo_user_id = ObjectId(_resolve_mongo_user_id(user_id))
+    documents = []
+    for message in messages:
+        documents.append({
+            "_id": ObjectId(message["message_id"]) if message.get("message_id") else ObjectId(),
+            "user_id": mongo_user_id,
             "session_id": session_id,
-            "role": role,
-            "content": content,
-            "timestamp": datetime.utcnow()
-        }
-        
-        print(f"🔄 [SAVE_MESSAGE] MongoDB Atlas chat 컬렉션에 저장 중...")
-        result = await chat_messages_collection.insert_one(message_data)
-        print(f"✅ [SAVE_MESSAGE] 메시지 저장 성공: {result.inserted_id}")
-        
-        # 세션의 마지막 메시지 시간 및 메시지 수 업데이트
-        print(f"🔄 [SAVE_MESSAGE] 세션 정보 업데이트 중...")
+            "role": message["role"],
+            "content": message["content"],
+            "timestamp": message.get("timestamp") or datetime.utcnow()
+        })
+    message_ids = [str(doc["_id"]) for doc in documents]
+    
+    # 지연 저장돼도 last_message_at 이 되돌아가지 않도록 $max 사용
+    session_oid = ObjectId(session_id)
+    session_update = {
+        "$max": {"last_message_at": max(doc["timestamp"] for doc in documents)},
+        "$inc": {"message_count": len(documents)}
+    }
+    
+    if use_transaction:
+        inserted = await _append_in_transaction(documents, session_update, session_oid)
+        logger.debug(f"✅ [SAVE_MESSAGE] 트랜잭션 저장 완료: {inserted}/{len(documents)}개")
+        return message_ids
+    
+    try:
+        result = await chat_messages_collection.insert_many(documents, ordered=False)
+        inserted = len(result.inserted_ids)
+    except BulkWriteError as e:
+        if not _only_duplicate_errors(e):
+            raise
+        # 이미 저장된 메시지 (재시도) - 새로 들어간 것만 카운트
+        inserted = e.details.get("nInserted", 0)
+        logger.debug(f"ℹ️ [SAVE_MESSAGE] 이미 저장된 메시지 {len(documents) - inserted}개 건너뜀")
+    
+    if inserted:
+        session_update["$inc"]["message_count"] = inserted
         try:
-            await chat_sessions_collection.update_one(
-                {"_id": ObjectId(session_id)},
-                {
-                    "$set": {"last_message_at": datetime.utcnow()},
-                    "$inc": {"message_count": 1}
-                }
-            )
-            print(f"✅ [SAVE_MESSAGE] 세션 정보 업데이트 완료")
+            await chat_sessions_collection.update_one({"_id": session_oid}, session_update)
         except Exception as session_error:
-            print(f"⚠️ [SAVE_MESSAGE] 세션 정보 업데이트 실패: {session_error}")
+            logger.warning(f"⚠️ [SAVE_MESSAGE] 세션 정보 업데이트 실패: {session_error}")
             # 세션 업데이트 실패해도 메시지 저장은 성공으로 처리
-        
-        logger.info(f"✅ 메시지 저장 완료: {result.inserted_id}")
-        return str(result.inserted_id)
+    
+    logger.debug(f"✅ [SAVE_MESSAGE] 메시지 {inserted}개 저장 완료 - session: {session_id}")
+    return message_ids
+
+async def save_message(user_id: str, session_id: str, role: str, content: str,
+                       message_id: Optional[str] = None,
+                       timestamp: Optional[datetime] = None) -> Optional[str]:
+    """
+    채팅 메시지 1개 저장 (dys-chatbot.chat 컬렉션) - append_messages 의 단건 버전
+    - message_id: 미리 생성한 ObjectId 문자열 (write-behind 재시도 시 중복 저장 방지)
+    - timestamp: 메시지 발생 시각 (지연 저장돼도 원래 순서 유지)
+    """
+    logger.debug(f"🔍 [SAVE_MESSAGE] 저장 시작 - user_id: {user_id}, session_id: {session_id}, role: {role}")
+    try:
+        message_ids = await append_messages(user_id, session_id, [{
+            "role": role,
+            "content": content,
+            "message_id": message_id,
+            "timestamp": timestamp
+        }])
+        return message_ids[0] if message_ids else None
     except Exception as e:
-        print(f"❌ [SAVE_MESSAGE] 오류 발생: {e}")
+        logger.error(f"❌ [SAVE_MESSAGE] 오류 발생: {e}")
         logger.error(f"❌ 메시지 저장 실패: {e}")
         return None
 
-async def get_session_messages(session_id: str, limit: int = 50) -> List[Dict[str, Any]]:
-    """세션의 메시지 목록 조회 (dys-chatbot.chat 컬렉션)"""
+async def get_session_messages(session_id: str, limit: int = 50, latest: bool = False) -> List[Dict[str, Any]]:
+    """
+    세션의 메시지 목록 조회 (dys-chatbot.chat 컬렉션, 시간순)
+    - latest=True 이면 가장 최근 limit 개 (세션 기억 하이드레이션용)
+    """
     try:
         from bson import ObjectId
         
         cursor = chat_messages_collection.find(
             {"session_id": session_id}
-        ).sort("timestamp", 1).limit(limit)
+        ).sort("timestamp", -1 if latest else 1).limit(limit)
         
         messages = await cursor.to_list(length=limit)
+        if latest:
+            messages.reverse()
         
         # ObjectId를 문자열로 변환
         for message in messages:
@@ -373,6 +435,106 @@ async def get_session_messages(session_id: str, limit: int = 50) -> List[Dict[st
         logger.error(f"❌ 메시지 조회 실패: {e}")
         return []
 
+# ====== 메시지 히스토리 키셋 페이지네이션 ======
+# 페이지 조회에 허용하는 필드 (_id 는 항상 포함)
+MESSAGE_PAGE_FIELDS = ("user_id", "session_id", "role", "content", "timestamp")
+MESSAGE_PAGE_MAX_LIMIT = 200
+
+def _epoch_millis(timestamp: datetime) -> int:
+    """저장된 timestamp(naive UTC) -> epoch 밀리초"""
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp() * 1000)
+
+def encode_message_cursor(timestamp: datetime, message_id) -> str:
+    """(timestamp, _id) -> URL-safe 토큰 (밀리초 8바이트 + ObjectId 12바이트)"""
+    from bson import ObjectId
+    raw = struct.pack(">q", _epoch_millis(timestamp)) + ObjectId(str(message_id)).binary
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_message_cursor(token: str):
+    """토큰 -> (timestamp, ObjectId), 형식이 틀리면 ValueError"""
+    from bson import ObjectId
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        if len(raw) != 20:
+            raise ValueError("length")
+        millis = struct.unpack(">q", raw[:8])[0]
+        timestamp = datetime.fromtimestamp(millis / 1000, tz=timezone.utc).replace(tzinfo=None)
+        return timestamp, ObjectId(raw[8:])
+    except Exception as e:
+        raise ValueError(f"invalid cursor: {token}") from e
+
+async def get_session_messages_page(session_id: str,
+                                    limit: int = 50,
+                                    before: Optional[str] = None,
+                                    after: Optional[str] = None,
+                                    fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    세션 메시지 한 페이지 (키셋 페이지네이션, (session_id, timestamp, _id) 인덱스 사용)
+    - 토큰이 없으면 가장 최근 limit 개, before=토큰 이면 그보다 이전, after=토큰 이면 그 이후
+    - 세션 길이와 관계없이 인덱스 범위 스캔 limit+1 건
+    - 반환: {messages (시간순), before, after, has_more}
+      before/after 는 이 페이지의 가장 오래된/최신 메시지 토큰, has_more 는 조회 방향으로 더 있는지
+    """
+    if before and after:
+        raise ValueError("before 와 after 는 함께 사용할 수 없습니다")
+    limit = max(1, min(limit, MESSAGE_PAGE_MAX_LIMIT))
+    selected = [f for f in (fields or MESSAGE_PAGE_FIELDS) if f in MESSAGE_PAGE_FIELDS]
+    projection = {field: 1 for field in selected}
+    # 커서 생성에 timestamp 가 필요하므로 항상 조회
+    projection["timestamp"] = 1
+    
+    query: Dict[str, Any] = {"session_id": session_id}
+    forward = bool(after)
+    if before or after:
+        timestamp, oid = decode_message_cursor(before or after)
+        op = "$gt" if forward else "$lt"
+        query["$or"] = [
+            {"timestamp": {op: timestamp}},
+            {"timestamp": timestamp, "_id": {op: oid}},
+        ]
+    direction = ASCENDING if forward else DESCENDING
+    
+    cursor = chat_messages_collection.find(query, projection) \
+        .sort([("timestamp", direction), ("_id", direction)]) \
+        .limit(limit + 1)
+    documents = await cursor.to_list(length=limit + 1)
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+    if not forward:
+        documents.reverse()
+    
+    page_before = encode_message_cursor(documents[0]["timestamp"], documents[0]["_id"]) if documents else before
+    page_after = encode_message_cursor(documents[-1]["timestamp"], documents[-1]["_id"]) if documents else after
+    
+    drop_timestamp = "timestamp" not in selected
+    for document in documents:
+        document["_id"] = str(document["_id"])
+        if "user_id" in document:
+            document["user_id"] = str(document["user_id"])
+        if drop_timestamp:
+            del document["timestamp"]
+    
+    return {"messages": documents, "before": page_before, "after": page_after, "has_more": has_more}
+
+def compact_message_page(page: Dict[str, Any], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    압축 응답: 메시지마다 키를 반복하지 않고 columns + rows 배열로 변환
+    - timestamp 는 epoch 밀리초 정수
+    """
+    columns = ["_id"] + [f for f in (fields or MESSAGE_PAGE_FIELDS) if f in MESSAGE_PAGE_FIELDS]
+    rows = []
+    for message in page["messages"]:
+        row = []
+        for column in columns:
+            value = message.get(column)
+            if column == "timestamp" and isinstance(value, datetime):
+                value = _epoch_millis(value)
+            row.append(value)
+        rows.append(row)
+    return {"columns": columns, "rows": rows, "before": page["before"], "after": page["after"], "has_more": page["has_more"]}
+
 async def get_session_info(session_id: str) -> Optional[Dict[str, Any]]:
     """세션 정보 조회 (페르소나 정보 포함)"""
     try:
@@ -394,6 +556,33 @@ async def get_session_info(session_id: str) -> Optional[Dict[str, Any]]:
         logger.error(f"❌ 세션 정보 조회 실패: {e}")
         return None
 
+async def get_session_persona(session_id: str) -> Optional[Dict[str, Any]]:
+    """세션 페르소나 바인딩용 - persona_* 필드만 조회 (DB 오류는 호출자에게 전달, 세션 없음만 None)"""
+    from bson import ObjectId
+    from bson.errors import InvalidId
+    
+    try:
+        object_id = ObjectId(session_id)
+    except (InvalidId, TypeError):
+        # ObjectId 가 아닌 임시 세션 ID - 저장된 세션 없음
+        return None
+    return await chat_sessions_collection.find_one(
+        {"_id": object_id},
+        {"_id": 0, "persona_name": 1, "persona_age": 1, "persona_mbti": 1, "persona_job": 1, "persona_personality": 1}
+    )
+
+async def get_session_version(session_id: str) -> Optional[Dict[str, Any]]:
+    """세션 기억 동기화용 - 저장된 메시지 수 / 마지막 메시지 시각만 조회"""
+    try:
+        from bson import ObjectId
+        
+        return await chat_sessions_collection.find_one(
+            {"_id": ObjectId(session_id)}, {"_id": 0, "message_count": 1, "last_message_at": 1}
+        )
+    except Exception as e:
+        logger.debug(f"세션 버전 조회 실패: {e}")
+        return None
+
 async def update_session_end_time(session_id: str, end_time: datetime = None) -> bool:
     """세션 종료 시간 업데이트"""
     try:
@@ -434,7 +623,7 @@ async def init_database():
         return False
     
     # 인덱스 생성
-    create_indexes()
+    await create_indexes()
     
     logger.info("✅ MongoDB Atlas 초기화 완료")
     return True
@@ -444,16 +633,14 @@ async def get_database():
     """비동기 MongoDB 데이터베이스 핸들 반환"""
     return database
 
-def get_sync_database():
-    """동기 MongoDB 데이터베이스 핸들 반환 (인덱스/관리용)"""
-    return sync_database
-
 __all__ = [
     "database",
     "async_client",
-    "sync_database",
     "get_database",
-    "get_sync_database",
+    "calibration_sessions_collection",
+    "append_messages",
+    "to_mongo_user_id",
+    "get_session_messages_page",
     "create_indexes",
     "init_database",
 ]
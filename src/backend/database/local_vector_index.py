@@ -0,0 +1,767 @@
+#!/usr/bin/env python3
+"""
+로컬 벡터 인덱스 (Pinecone 대체/개발용 백엔드)
+- float32 행렬을 memmap 파일에 저장 (정규화된 벡터 → 내적 = 코사인 유사도)
+- 검색: 작은 규모는 NumPy 전수 탐색, LOCAL_VECTOR_HNSW_MIN 이상이면 hnswlib(설치된 경우)
+- content_type / session_id 역색인으로 메타데이터 필터, 그 외 필드는 메타데이터 스캔
+- 증분 추가/갱신/삭제, snapshot()/restore() 로 재시작 후 복원
+- 멀티 워커: 디렉터리 잠금을 얻은 워커(소유)만 memmap 파일에 씀
+  나머지 워커의 쓰기는 자기 메모리에 반영 + pending.jsonl 로 소유 워커에 전달
+  소유 워커는 반영한 모든 쓰기를 변경 로그(changes.<세대>.jsonl)에 추가하고, 스냅샷마다 새 세대로 교체
+  동기화 스레드가 LOCAL_VECTOR_SYNC_SEC 마다 소유 워커는 전달분 반영, 나머지는 변경 로그를 오프셋부터 이어 읽어
+  바뀐 벡터만 반영 (HNSW 도 add_items/mark_deleted 로 증분 갱신, 한 세대 넘게 뒤처졌을 때만 스냅샷 다시 읽기)
+  (소유 워커가 종료되면 다음 동기화에서 잠금을 얻은 워커가 스냅샷 + 변경 로그로 복구 후 소유권 인수)
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+import numpy as np
+
+try:
+    import hnswlib
+    HNSWLIB_AVAILABLE = True
+except ImportError:
+    HNSWLIB_AVAILABLE = False
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+from .vector_backend import VectorBackend
+
+logger = logging.getLogger(__name__)
+
+LOCAL_VECTOR_DIR = os.getenv("LOCAL_VECTOR_DIR", "/tmp/dys_vector_index")
+LOCAL_VECTOR_INITIAL_CAPACITY = int(os.getenv("LOCAL_VECTOR_INITIAL_CAPACITY", "1024"))
+# 이 개수 이상이면 hnswlib 인덱스 사용 (미설치 시 전수 탐색 유지)
+LOCAL_VECTOR_HNSW_MIN = int(os.getenv("LOCAL_VECTOR_HNSW_MIN", "20000"))
+# 추가/삭제가 이 횟수만큼 쌓이면 자동 스냅샷 (0 = 종료 시에만)
+LOCAL_VECTOR_SNAPSHOT_EVERY = int(os.getenv("LOCAL_VECTOR_SNAPSHOT_EVERY", "500"))
+# 멀티 워커 동기화 주기 (0 = 끔 - 단일 워커 전용)
+LOCAL_VECTOR_SYNC_SEC = float(os.getenv("LOCAL_VECTOR_SYNC_SEC", "2.0"))
+
+# 역색인을 유지하는 메타데이터 필드
+INDEXED_FIELDS = ("content_type", "session_id")
+
+
+class LocalVectorIndex(VectorBackend):
+    """프로세스 내 벡터 인덱스"""
+
+    def __init__(self, directory: str = LOCAL_VECTOR_DIR, dimension: int = 1536):
+        self.directory = directory
+        self.index_name = f"local:{directory}"
+        self.dimension = dimension
+        self.metric = "cosine"
+        self.is_initialized = False
+
+        self._lock = threading.RLock()
+        self._matrix: Optional[np.ndarray] = None
+        self._capacity = 0
+        self._rows = 0                          # 사용된 행 수 (삭제된 행 포함)
+        self._ids: List[Optional[str]] = []     # 행 -> 벡터 ID (삭제 시 None)
+        self._metadata: List[Optional[Dict[str, Any]]] = []
+        self._row_of: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._alive: Optional[np.ndarray] = None
+        self._inverted: Dict[str, Dict[Any, Set[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self._hnsw = None
+        self._dirty = 0
+        self._lock_file = None
+        self._snapshot_mtime = 0.0
+        # 변경 로그 위치 (소유 워커: 쓰는 중인 세대, 나머지: 읽은 세대/오프셋)
+        self._log_gen: Optional[int] = None
+        self._log_offset = 0
+        self._log_file = None
+        self._sync_thread: Optional[threading.Thread] = None
+        self._sync_stop = threading.Event()
+        self.writable = False
+        self.forwarded = 0
+        self.ingested = 0
+        self.tailed = 0
+        self.reloads = 0
+
+    # ---------- 초기화 / 저장 ----------
+
+    @property
+    def _matrix_path(self) -> str:
+        return os.path.join(self.directory, "vectors.f32")
+
+    @property
+    def _meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    @property
+    def _outbox_path(self) -> str:
+        return os.path.join(self.directory, "pending.jsonl")
+
+    @property
+    def _changelog_enabled(self) -> bool:
+        return FCNTL_AVAILABLE and LOCAL_VECTOR_SYNC_SEC > 0
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"changes.{generation}.jsonl")
+
+    def _log_generations(self) -> List[int]:
+        generations = []
+        for name in os.listdir(self.directory):
+            if name.startswith("changes.") and name.endswith(".jsonl"):
+                try:
+                    generations.append(int(name[len("changes."):-len(".jsonl")]))
+                except ValueError:
+                    continue
+        return generations
+
+    def initialize(self) -> bool:
+        with self._lock:
+            if self.is_initialized:
+                return True
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self.writable = self._acquire_dir_lock()
+                if os.path.exists(self._meta_path):
+                    self.restore()
+                else:
+                    self._allocate(LOCAL_VECTOR_INITIAL_CAPACITY)
+                if self.writable:
+                    self._recover()
+                self.is_initialized = True
+                mode = "memmap" if self.writable else "snapshot 사본 (다른 워커가 소유)"
+                logger.info(f"✅ 로컬 벡터 인덱스 준비 - {self.count()}개, {mode}, hnswlib={HNSWLIB_AVAILABLE}")
+                if not self.writable:
+                    if LOCAL_VECTOR_SYNC_SEC > 0:
+                        logger.warning("⚠️ 로컬 벡터 인덱스를 다른 워커가 소유 - 쓰기는 소유 워커로 전달되고 "
+                                       f"검색 결과는 최대 {LOCAL_VECTOR_SYNC_SEC:g}s 늦게 반영됩니다")
+                    else:
+                        logger.warning("⚠️ 로컬 벡터 인덱스를 다른 워커가 소유하는데 LOCAL_VECTOR_SYNC_SEC=0 - "
+                                       "이 워커의 쓰기는 저장되지 않습니다 (VECTOR_BACKEND=pinecone 또는 WEB_CONCURRENCY=1 권장)")
+                self._start_sync()
+                return True
+            except Exception as e:
+                logger.error(f"❌ 로컬 벡터 인덱스 초기화 실패: {e}")
+                return False
+
+    def _acquire_dir_lock(self) -> bool:
+        if not FCNTL_AVAILABLE:
+            return True
+        lock_file = open(os.path.join(self.directory, ".lock"), "w")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _allocate(self, capacity: int, source: Optional[np.ndarray] = None):
+        """행렬을 capacity 행으로 (재)할당하고 기존 행을 복사합니다."""
+        capacity = max(capacity, 1)
+        if self.writable:
+            tmp_path = f"{self._matrix_path}.grow"
+            matrix = np.memmap(tmp_path, dtype=np.float32, mode="w+", shape=(capacity, self.dimension))
+        else:
+            matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+        alive = np.zeros(capacity, dtype=bool)
+        if source is not None and self._rows:
+            matrix[:self._rows] = source[:self._rows]
+            alive[:self._rows] = self._alive[:self._rows]
+        if self.writable:
+            matrix.flush()
+            if isinstance(self._matrix, np.memmap):
+                del self._matrix
+            os.replace(tmp_path, self._matrix_path)
+            matrix = np.memmap(self._matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+        self._matrix = matrix
+        self._alive = alive
+        self._capacity = capacity
+
+    def snapshot(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """메타데이터를 기록하고 행렬을 디스크에 반영합니다. path 를 주면 그 디렉터리로 전체 복사."""
+        with self._lock:
+            meta = {
+                "dimension": self.dimension,
+                "rows": self._rows,
+                "ids": self._ids,
+                "metadata": self._metadata,
+                "saved_at": time.time(),
+                "log": None,
+            }
+            target = path or self.directory
+            if target == self.directory and not self.writable:
+                # 이 워커의 쓰기는 이미 pending.jsonl 로 전달됨 - 소유 워커의 다음 동기화에서 기록
+                return {"path": target, "vectors": self.count(), "rows": self._rows,
+                        "owner": False, "forwarded": self.forwarded}
+            os.makedirs(target, exist_ok=True)
+            if target == self.directory and self._changelog_enabled:
+                # 스냅샷에 지금까지의 변경이 모두 들어가므로 새 세대 로그부터 이어 읽으면 됨
+                if self._log_file is None or self._log_offset:
+                    self._open_changelog()
+                meta["log"] = [self._log_gen, self._log_offset]
+
+            if isinstance(self._matrix, np.memmap) and target == self.directory:
+                self._matrix.flush()
+            else:
+                matrix_path = os.path.join(target, "vectors.f32")
+                tmp_matrix = f"{matrix_path}.tmp"
+                self._matrix[:self._rows].tofile(tmp_matrix)
+                os.replace(tmp_matrix, matrix_path)
+
+            meta_path = os.path.join(target, "meta.json")
+            tmp_meta = f"{meta_path}.tmp"
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+            os.replace(tmp_meta, meta_path)
+            if target == self.directory:
+                self._dirty = 0
+                self._snapshot_mtime = os.stat(meta_path).st_mtime
+            return {"path": target, "vectors": self.count(), "rows": self._rows}
+
+    def restore(self, path: Optional[str] = None):
+        """스냅샷(meta.json + vectors.f32)에서 인덱스를 복원합니다."""
+        source_dir = path or self.directory
+        with self._lock:
+            meta_mtime = os.stat(os.path.join(source_dir, "meta.json")).st_mtime
+            with open(os.path.join(source_dir, "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["dimension"] != self.dimension:
+                raise ValueError(f"스냅샷 차원 불일치: {meta['dimension']} != {self.dimension}")
+
+            rows = int(meta["rows"])
+            matrix_path = os.path.join(source_dir, "vectors.f32")
+            stored = np.fromfile(matrix_path, dtype=np.float32, count=rows * self.dimension).reshape(rows, self.dimension) \
+                if rows else np.zeros((0, self.dimension), dtype=np.float32)
+
+            self._rows = 0
+            self._ids, self._metadata = [], []
+            self._row_of, self._free_rows = {}, []
+            self._inverted = {field: {} for field in INDEXED_FIELDS}
+            self._hnsw = None
+            self._matrix = None
+            self._allocate(max(LOCAL_VECTOR_INITIAL_CAPACITY, rows * 2))
+            self._matrix[:rows] = stored
+            self._rows = rows
+            self._ids = list(meta["ids"])
+            self._metadata = list(meta["metadata"])
+            for row, vector_id in enumerate(self._ids):
+                if vector_id is None:
+                    self._free_rows.append(row)
+                    continue
+                self._alive[row] = True
+                self._row_of[vector_id] = row
+                self._index_metadata(row, self._metadata[row])
+            self._maybe_build_hnsw()
+            self._dirty = 0
+            if source_dir == self.directory:
+                self._snapshot_mtime = meta_mtime
+                self._log_gen, self._log_offset = meta.get("log") or (None, 0)
+            logger.info(f"♻️ 로컬 벡터 인덱스 복원 - {self.count()}개 ({source_dir})")
+
+    # ---------- 쓰기 ----------
+
+    def upsert_vectors(self, vectors: List[Dict[str, Any]]) -> bool:
+        if not self.is_initialized:
+            logger.error("❌ 로컬 벡터 인덱스가 초기화되지 않았습니다")
+            return False
+        try:
+            with self._lock:
+                accepted = self._apply_upsert(vectors)
+                self._publish({"op": "upsert", "vectors": accepted})
+                self._after_write(len(vectors))
+            return True
+        except Exception as e:
+            logger.error(f"❌ 로컬 벡터 업서트 실패: {e}")
+            return False
+
+    def _apply_upsert(self, vectors: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """유효한 벡터를 정규화해 반영하고, 반영한 항목을 (전달용) 목록으로 반환"""
+        accepted = []
+        for vector_data in vectors:
+            vector_id = vector_data.get("id")
+            values = np.asarray(vector_data.get("values"), dtype=np.float32)
+            if not vector_id or values.shape != (self.dimension,) or not np.isfinite(values).all():
+                logger.warning(f"⚠️ 잘못된 벡터 데이터: {vector_id}")
+                continue
+            norm = float(np.linalg.norm(values))
+            if norm == 0.0:
+                continue
+            metadata = dict(vector_data.get("metadata") or {})
+            self._put(vector_id, values / norm, metadata)
+            accepted.append({"id": vector_id, "values": values.tolist(), "metadata": metadata})
+        return accepted
+
+    def _put(self, vector_id: str, vector: np.ndarray, metadata: Dict[str, Any]):
+        row = self._row_of.get(vector_id)
+        if row is not None:
+            self._unindex_metadata(row, self._metadata[row])
+        elif self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            if self._rows >= self._capacity:
+                self._allocate(self._capacity * 2, source=self._matrix)
+                if self._hnsw is not None:
+                    self._hnsw.resize_index(self._capacity)
+            row = self._rows
+            self._rows += 1
+            self._ids.append(None)
+            self._metadata.append(None)
+
+        self._matrix[row] = vector
+        self._alive[row] = True
+        self._ids[row] = vector_id
+        self._metadata[row] = metadata
+        self._row_of[vector_id] = row
+        self._index_metadata(row, metadata)
+        if self._hnsw is not None:
+            # 삭제 표시된 라벨을 다시 추가하면 hnswlib 가 표시 해제 후 갱신
+            self._hnsw.add_items(vector[np.newaxis, :], np.array([row]))
+
+    def delete_vectors(self, vector_ids: List[str]) -> bool:
+        if not self.is_initialized:
+            return False
+        try:
+            with self._lock:
+                self._apply_delete(vector_ids)
+                self._publish({"op": "delete", "ids": list(vector_ids)})
+                self._after_write(len(vector_ids))
+            return True
+        except Exception as e:
+            logger.error(f"❌ 로컬 벡터 삭제 실패: {e}")
+            return False
+
+    def _apply_delete(self, vector_ids: List[str]):
+        for vector_id in vector_ids:
+            row = self._row_of.pop(vector_id, None)
+            if row is None:
+                continue
+            self._unindex_metadata(row, self._metadata[row])
+            self._alive[row] = False
+            self._ids[row] = None
+            self._metadata[row] = None
+            self._free_rows.append(row)
+            if self._hnsw is not None:
+                try:
+                    self._hnsw.mark_deleted(row)
+                except RuntimeError:
+                    pass
+
+    def _after_write(self, changes: int):
+        self._dirty += changes
+        self._maybe_build_hnsw()
+        if self.writable and LOCAL_VECTOR_SNAPSHOT_EVERY and self._dirty >= LOCAL_VECTOR_SNAPSHOT_EVERY:
+            self.snapshot()
+
+    def _apply_record(self, record: Dict[str, Any]) -> int:
+        """변경 로그/전달 기록 한 줄 반영 (변경 수)"""
+        if record.get("op") == "upsert":
+            vectors = record.get("vectors") or []
+            self._apply_upsert(vectors)
+            return len(vectors)
+        if record.get("op") == "delete":
+            ids = record.get("ids") or []
+            self._apply_delete(ids)
+            return len(ids)
+        return 0
+
+    # ---------- 멀티 워커 동기화 ----------
+
+    def _publish(self, record: Dict[str, Any]):
+        """반영한 쓰기를 다른 워커에 알림 (소유 워커: 변경 로그, 나머지: 소유 워커로 전달)"""
+        if self.writable:
+            self._append_change(record)
+        else:
+            self._forward(record)
+
+    def _open_changelog(self):
+        """소유 워커: 새 세대 변경 로그를 열고 두 세대 이전 로그 삭제 (한 세대 뒤처진 워커까지는 이어 읽기 가능)"""
+        if self._log_file is not None:
+            self._log_file.close()
+        generation = max(self._log_generations() + [self._log_gen or 0]) + 1
+        self._log_file = open(self._log_path(generation), "ab")
+        self._log_gen, self._log_offset = generation, 0
+        for old in self._log_generations():
+            if old < generation - 1:
+                try:
+                    os.remove(self._log_path(old))
+                except OSError:
+                    pass
+
+    def _append_change(self, record: Dict[str, Any]):
+        if self._log_file is None:
+            return
+        # 한 줄 단위로만 읽으므로 쓰는 도중의 마지막 줄은 다음 동기화에서 반영됨
+        self._log_file.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+        self._log_file.flush()
+        self._log_offset = self._log_file.tell()
+
+    def _tail_changes(self) -> bool:
+        """읽은 위치 이후의 변경 로그를 반영 - 그 세대 로그가 이미 삭제되어 이어갈 수 없으면 False"""
+        while True:
+            # 다음 세대가 먼저 보였다면 현재 세대 파일은 더 이상 늘어나지 않음
+            rotated = os.path.exists(self._log_path(self._log_gen + 1))
+            try:
+                with open(self._log_path(self._log_gen), "rb") as f:
+                    f.seek(self._log_offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return False
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                # 기록마다 잠금 - 긴 로그를 반영하는 동안에도 검색이 끼어들 수 있음
+                with self._lock:
+                    self._apply_record(record)
+                self.tailed += 1
+            self._log_offset += end
+            if not rotated:
+                return True
+            self._log_gen += 1
+            self._log_offset = 0
+
+    def _recover(self):
+        """소유 워커 시작/인수: 스냅샷 이후 변경 로그 재생 → 새 세대 로그 → 전달분 반영 → 스냅샷"""
+        if self._changelog_enabled and self._log_gen is not None and not self._tail_changes():
+            logger.warning("⚠️ 로컬 벡터 변경 로그 일부 없음 - 마지막 스냅샷 기준으로 복구")
+        if self._changelog_enabled:
+            self._open_changelog()
+        # 이전 소유 워커가 반영하지 못한 전달분
+        self._ingest_outbox()
+        self.snapshot()
+
+    def _forward(self, record: Dict[str, Any]):
+        """비소유 워커의 쓰기를 pending.jsonl 에 한 줄로 추가 (소유 워커가 반영)"""
+        if LOCAL_VECTOR_SYNC_SEC <= 0:
+            return
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        while True:
+            f = open(self._outbox_path, "ab")
+            try:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                try:
+                    current = os.stat(self._outbox_path).st_ino == os.fstat(f.fileno()).st_ino
+                except FileNotFoundError:
+                    current = False
+                if current:
+                    f.write(line)
+                    f.flush()
+                    self.forwarded += 1
+                    return
+            finally:
+                f.close()
+            # 잠금을 기다리는 동안 소유 워커가 파일을 가져감 - 새 파일로 다시 시도
+
+    def _ingest_outbox(self) -> int:
+        """소유 워커: 다른 워커가 전달한 쓰기를 순서대로 반영 (반영한 기록 수)"""
+        if not FCNTL_AVAILABLE or not os.path.exists(self._outbox_path):
+            return 0
+        claimed = f"{self._outbox_path}.ingest"
+        with open(self._outbox_path, "rb") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            # 잠금을 쥔 채 이름을 바꿔야 쓰는 중인 줄이 없음 (이후 쓰기는 새 파일로)
+            os.replace(self._outbox_path, claimed)
+            lines = f.read().splitlines()
+        applied = 0
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            changes = self._apply_record(record)
+            self._append_change(record)
+            self._after_write(changes)
+            applied += 1
+        os.remove(claimed)
+        self.ingested += applied
+        return applied
+
+    def sync(self):
+        """소유 워커: 전달분 반영 / 나머지: 변경 로그 증분 반영, 소유 워커가 없으면 인수"""
+        with self._lock:
+            if not self.is_initialized:
+                return
+            if not self.writable and self._acquire_dir_lock():
+                self.writable = True
+                logger.info("🔓 로컬 벡터 인덱스 소유권 인수 (이전 소유 워커 종료)")
+                if os.path.exists(self._meta_path):
+                    self.restore()
+                self._recover()
+            if self.writable:
+                self._ingest_outbox()
+                return
+        self._follow()
+
+    def _follow(self):
+        """비소유 워커: 변경 로그를 이어 읽음 (처음이거나 한 세대 넘게 뒤처졌을 때만 스냅샷 다시 읽기)"""
+        if self._log_gen is None:
+            # 아직 변경 로그 위치를 모름 (소유 워커의 첫 스냅샷 전)
+            if os.path.exists(self._meta_path) and os.stat(self._meta_path).st_mtime > self._snapshot_mtime:
+                with self._lock:
+                    self.restore()
+            if self._log_gen is None:
+                return
+        if not self._tail_changes():
+            logger.info("♻️ 로컬 벡터 변경 로그를 놓침 - 스냅샷 다시 읽기")
+            self.reloads += 1
+            with self._lock:
+                self.restore()
+            if self._log_gen is not None:
+                self._tail_changes()
+        with self._lock:
+            self._maybe_build_hnsw()
+
+    def _sync_loop(self):
+        while not self._sync_stop.wait(LOCAL_VECTOR_SYNC_SEC):
+            try:
+                self.sync()
+            except Exception as e:
+                logger.warning(f"⚠️ 로컬 벡터 인덱스 동기화 실패: {e}")
+
+    def _start_sync(self):
+        if not FCNTL_AVAILABLE or LOCAL_VECTOR_SYNC_SEC <= 0 or self._sync_thread is not None:
+            return
+        self._sync_stop.clear()
+        self._sync_thread = threading.Thread(target=self._sync_loop, name="local-vector-sync", daemon=True)
+        self._sync_thread.start()
+
+    def _index_metadata(self, row: int, metadata: Optional[Dict[str, Any]]):
+        if not metadata:
+            return
+        for field in INDEXED_FIELDS:
+            value = metadata.get(field)
+            if value is not None:
+                self._inverted[field].setdefault(value, set()).add(row)
+
+    def _unindex_metadata(self, row: int, metadata: Optional[Dict[str, Any]]):
+        if not metadata:
+            return
+        for field in INDEXED_FIELDS:
+            rows = self._inverted[field].get(metadata.get(field))
+            if rows is not None:
+                rows.discard(row)
+
+    def _maybe_build_hnsw(self):
+        """벡터 수가 임계치를 넘으면 hnswlib 인덱스를 한 번 구축합니다 (이후 증분 추가)."""
+        if not HNSWLIB_AVAILABLE or self._hnsw is not None:
+            return
+        if self.count() < LOCAL_VECTOR_HNSW_MIN:
+            return
+        started = time.perf_counter()
+        index = hnswlib.Index(space="ip", dim=self.dimension)
+        index.init_index(max_elements=self._capacity, ef_construction=200, M=16)
+        rows = np.flatnonzero(self._alive[:self._rows])
+        index.add_items(self._matrix[rows], rows)
+        index.set_ef(64)
+        self._hnsw = index
+        logger.info(f"✅ hnswlib 인덱스 구축 - {len(rows)}개, {time.perf_counter() - started:.2f}s")
+
+    # ---------- 검색 ----------
+
+    def _candidate_rows(self, filter_dict: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """필터에 맞는 행 번호 배열 (필터 없으면 None = 전체)"""
+        if not filter_dict:
+            return None
+        candidates: Optional[Set[int]] = None
+        residual: Dict[str, Any] = {}
+        for field, condition in filter_dict.items():
+            if field in self._inverted:
+                values = self._condition_values(condition)
+                if values is None:
+                    residual[field] = condition
+                    continue
+                rows: Set[int] = set()
+                for value in values:
+                    rows |= self._inverted[field].get(value, set())
+                candidates = rows if candidates is None else candidates & rows
+            else:
+                residual[field] = condition
+
+        if candidates is None:
+            candidates = set(self._row_of.values())
+        if residual:
+            candidates = {
+                row for row in candidates
+                if all(self._matches(self._metadata[row].get(field), cond) for field, cond in residual.items())
+            }
+        return np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+
+    @staticmethod
+    def _condition_values(condition: Any) -> Optional[List[Any]]:
+        """역색인으로 처리 가능한 조건 ($eq / $in / 값) 의 값 목록"""
+        if not isinstance(condition, dict):
+            return [condition]
+        if set(condition) == {"$eq"}:
+            return [condition["$eq"]]
+        if set(condition) == {"$in"}:
+            return list(condition["$in"])
+        return None
+
+    @staticmethod
+    def _matches(value: Any, condition: Any) -> bool:
+        """Pinecone 필터 문법 일부 지원 ($eq, $ne, $in, $nin, $gt, $gte, $lt, $lte)"""
+        if not isinstance(condition, dict):
+            return value == condition
+        for op, operand in condition.items():
+            if op == "$eq" and value != operand:
+                return False
+            if op == "$ne" and value == operand:
+                return False
+            if op == "$in" and value not in operand:
+                return False
+            if op == "$nin" and value in operand:
+                return False
+            if op in ("$gt", "$gte", "$lt", "$lte"):
+                if value is None:
+                    return False
+                if op == "$gt" and not value > operand:
+                    return False
+                if op == "$gte" and not value >= operand:
+                    return False
+                if op == "$lt" and not value < operand:
+                    return False
+                if op == "$lte" and not value <= operand:
+                    return False
+        return True
+
+    def query_vectors(self,
+                      query_vector: List[float],
+                      top_k: int = 10,
+                      filter_dict: Optional[Dict[str, Any]] = None,
+                      include_metadata: bool = True) -> List[Dict[str, Any]]:
+        if not self.is_initialized:
+            logger.error("❌ 로컬 벡터 인덱스가 초기화되지 않았습니다")
+            return []
+        query = np.asarray(query_vector, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if query.shape != (self.dimension,) or norm == 0.0:
+            return []
+        query = query / norm
+
+        with self._lock:
+            if not self._row_of:
+                return []
+            candidates = self._candidate_rows(filter_dict)
+            if candidates is not None and len(candidates) == 0:
+                return []
+
+            if self._hnsw is not None and (candidates is None or len(candidates) > LOCAL_VECTOR_HNSW_MIN):
+                rows, scores = self._search_hnsw(query, top_k, candidates)
+            else:
+                rows, scores = self._search_exact(query, top_k, candidates)
+
+            return [
+                {
+                    "id": self._ids[row],
+                    "score": float(score),
+                    "metadata": dict(self._metadata[row]) if include_metadata else {},
+                }
+                for row, score in zip(rows, scores)
+            ]
+
+    def _search_exact(self, query: np.ndarray, top_k: int, candidates: Optional[np.ndarray]):
+        if candidates is None:
+            scores = self._matrix[:self._rows] @ query
+            scores[~self._alive[:self._rows]] = -np.inf
+            rows = np.arange(self._rows)
+        else:
+            rows = candidates
+            scores = self._matrix[rows] @ query
+        k = min(top_k, int(np.isfinite(scores).sum()))
+        if k <= 0:
+            return [], []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return rows[top].tolist(), scores[top].tolist()
+
+    def _search_hnsw(self, query: np.ndarray, top_k: int, candidates: Optional[np.ndarray]):
+        allowed = set(candidates.tolist()) if candidates is not None else None
+        k = min(top_k, self.count())
+        labels, distances = self._hnsw.knn_query(
+            query, k=k, filter=(lambda label: label in allowed) if allowed is not None else None
+        )
+        # ip 공간의 distance = 1 - 내적
+        return labels[0].tolist(), (1.0 - distances[0]).tolist()
+
+    # ---------- 조회 / 정리 ----------
+
+    def count(self) -> int:
+        return len(self._row_of)
+
+    def get_index_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "total_vector_count": self.count(),
+                "dimension": self.dimension,
+                "index_fullness": self._rows / self._capacity if self._capacity else 0.0,
+                "namespaces": {},
+                "capacity": self._capacity,
+                "hnsw": self._hnsw is not None,
+                "writable": self.writable,
+                "unsaved_changes": self._dirty,
+                "forwarded": self.forwarded,
+                "ingested": self.ingested,
+                "log_generation": self._log_gen,
+                "tailed": self.tailed,
+                "reloads": self.reloads,
+            }
+
+    def health_check(self) -> Dict[str, Any]:
+        if not self.is_initialized:
+            return {"status": "not_initialized", "message": "로컬 벡터 인덱스가 초기화되지 않았습니다"}
+        return {
+            "status": "healthy",
+            "index_name": self.index_name,
+            "dimension": self.dimension,
+            "metric": self.metric,
+            "stats": self.get_index_stats(),
+            "environment": "local",
+        }
+
+    def delete_index(self) -> bool:
+        with self._lock:
+            if not self.writable:
+                return False
+            self._matrix = None
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.is_initialized = False
+            return True
+
+    def cleanup(self):
+        if self._sync_thread is not None:
+            self._sync_stop.set()
+            self._sync_thread.join(timeout=2.0)
+            self._sync_thread = None
+        with self._lock:
+            if self.is_initialized and self.writable:
+                try:
+                    self._ingest_outbox()
+                except Exception as e:
+                    logger.error(f"❌ 로컬 벡터 전달분 반영 실패: {e}")
+            if self.is_initialized and self.writable and self._dirty:
+                try:
+                    self.snapshot()
+                except Exception as e:
+                    logger.error(f"❌ 로컬 벡터 인덱스 스냅샷 실패: {e}")
+            self.is_initialized = False
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+            logger.info("🧹 로컬 벡터 인덱스 정리 완료")
+
+
+# 전역 인스턴스
+local_vector_index = LocalVectorIndex()
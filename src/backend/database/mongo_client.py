@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+MongoDB 비동기 클라이언트 팩토리
+- 프로세스당 motor 클라이언트 하나 (풀 크기 / 유휴 시간 / 압축 / 서버 선택 타임아웃 환경변수로 설정)
+- pymongo 명령 모니터링으로 모든 명령의 소요 시간을 DATABASE_QUERIES / DATABASE_QUERY_DURATION 에 기록
+- 커넥션 풀 이벤트로 열린 연결 수를 DATABASE_CONNECTIONS 에 기록
+"""
+
+import os
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import motor.motor_asyncio
+from pymongo import monitoring as pymongo_monitoring
+
+try:
+    from ..monitoring.monitoring import monitoring, DATABASE_CONNECTIONS
+    MONITORING_AVAILABLE = True
+except ImportError:
+    MONITORING_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+
+# 커넥션 풀 설정 (워커 프로세스마다 별도 풀)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "60000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+# 와이어 압축 (zstd 는 zstandard, snappy 는 python-snappy 패키지가 있을 때만 사용)
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,zlib")
+MONGO_APP_NAME = os.getenv("MONGO_APP_NAME", "dys-backend")
+
+# 메트릭에 기록하지 않는 내부 명령 (헬스체크/핸드셰이크)
+_IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "saslStart", "saslContinue", "endSessions", "buildInfo"}
+
+
+class MongoCommandMetrics(pymongo_monitoring.CommandListener):
+    """명령 시작 시 컬렉션 이름을 기억해두고, 완료/실패 시 소요 시간 기록"""
+
+    def __init__(self):
+        self._pending: Dict[Any, tuple] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(event) -> tuple:
+        return (event.connection_id, event.request_id, event.operation_id)
+
+    def started(self, event):
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else event.database_name
+        with self._lock:
+            self._pending[self._key(event)] = (event.command_name, collection)
+
+    def _finish(self, event, status: str):
+        with self._lock:
+            entry = self._pending.pop(self._key(event), None)
+        if entry is None or not MONITORING_AVAILABLE:
+            return
+        operation, collection = entry
+        monitoring.record_database_query(operation, collection, status, event.duration_micros / 1_000_000)
+
+    def succeeded(self, event):
+        self._finish(event, "success")
+
+    def failed(self, event):
+        self._finish(event, "error")
+
+
+class MongoPoolMetrics(pymongo_monitoring.ConnectionPoolListener):
+    """열린 연결 수 추적"""
+
+    def __init__(self):
+        self._open = 0
+        self._lock = threading.Lock()
+
+    def _update(self, delta: int):
+        with self._lock:
+            self._open = max(0, self._open + delta)
+            count = self._open
+        if MONITORING_AVAILABLE:
+            DATABASE_CONNECTIONS.set(count)
+
+    def connection_created(self, event):
+        self._update(1)
+
+    def connection_closed(self, event):
+        self._update(-1)
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_cleared(self, event): pass
+    def pool_closed(self, event): pass
+    def connection_ready(self, event): pass
+    def connection_check_out_started(self, event): pass
+    def connection_check_out_failed(self, event): pass
+    def connection_checked_out(self, event): pass
+    def connection_checked_in(self, event): pass
+
+
+def _available_compressors(names: str) -> list:
+    """설치된 압축 모듈만 남김 (미설치 압축기로 인한 경고 방지)"""
+    available = []
+    for name in (n.strip() for n in names.split(",")):
+        if not name:
+            continue
+        module = {"zstd": "zstandard", "snappy": "snappy"}.get(name)
+        if module:
+            try:
+                __import__(module)
+            except ImportError:
+                continue
+        available.append(name)
+    return available
+
+
+def client_options(**overrides) -> Dict[str, Any]:
+    """환경변수 기반 클라이언트 옵션 (overrides 로 개별 값 변경)"""
+    options: Dict[str, Any] = {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": min(MONGO_MIN_POOL_SIZE, MONGO_MAX_POOL_SIZE),
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "appname": MONGO_APP_NAME,
+    }
+    compressors = _available_compressors(MONGO_COMPRESSORS)
+    if compressors:
+        options["compressors"] = ",".join(compressors)
+    options.update(overrides)
+    return options
+
+
+def create_mongo_client(uri: Optional[str] = None, **overrides) -> motor.motor_asyncio.AsyncIOMotorClient:
+    """
+    설정이 적용된 motor 클라이언트 생성
+    - 프로세스에서는 database.async_client 하나를 공유하고, 이 함수는 그 생성에만 사용
+    """
+    options = client_options(**overrides)
+    options.setdefault("event_listeners", [MongoCommandMetrics(), MongoPoolMetrics()])
+    client = motor.motor_asyncio.AsyncIOMotorClient(uri or MONGODB_URI, **options)
+    logger.info(
+        f"🔗 MongoDB 클라이언트 생성 - pool {options['minPoolSize']}~{options['maxPoolSize']}, "
+        f"idle {options['maxIdleTimeMS']}ms, compressors={options.get('compressors', 'none')}"
+    )
+    return client
+
+
+def pool_settings() -> Dict[str, Any]:
+    """/health 등에 노출할 풀 설정 요약"""
+    options = client_options()
+    return {
+        "max_pool_size": options["maxPoolSize"],
+        "min_pool_size": options["minPoolSize"],
+        "max_idle_time_ms": options["maxIdleTimeMS"],
+        "server_selection_timeout_ms": options["serverSelectionTimeoutMS"],
+        "compressors": options.get("compressors"),
+    }
@@ -9,15 +9,24 @@ import os
 import logging
 import asyncio
 from typing import List, Dict, Any, Optional, Tuple
-import pinecone
-from datetime import datetime
 import math
 
+try:
+    import pinecone
+    PINECONE_AVAILABLE = True
+except ImportError:
+    PINECONE_AVAILABLE = False
+
+from .vector_backend import VectorBackend
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class PineconeClient:
+# 업서트 요청 1회당 벡터 수 (Pinecone 권장: 요청당 2MB / 100개 이하)
+PINECONE_UPSERT_BATCH = int(os.getenv("PINECONE_UPSERT_BATCH", "100"))
+
+class PineconeClient(VectorBackend):
     """Pinecone Vector Database 클라이언트"""
     
     def __init__(self):
@@ -37,6 +46,10 @@ class PineconeClient:
     def initialize(self) -> bool:
         """Pinecone 클라이언트 초기화"""
         try:
+            if not PINECONE_AVAILABLE:
+                logger.warning("⚠️ pinecone 패키지가 설치되지 않았습니다. Pinecone 기능이 비활성화됩니다.")
+                return False
+            
             if not self.api_key:
                 logger.warning("⚠️ PINECONE_API_KEY가 설정되지 않았습니다. Pinecone 기능이 비활성화됩니다.")
                 return False
@@ -97,8 +110,11 @@ class PineconeClient:
             logger.error(f"❌ Pinecone 초기화 실패: {e}")
             return False
     
-    def upsert_vectors(self, vectors: List[Dict[str, Any]]) -> bool:
-        """벡터 데이터 업서트 (삽입 또는 업데이트)"""
+    def upsert_vectors(self, vectors: List[Dict[str, Any]], batch_size: int = PINECONE_UPSERT_BATCH) -> bool:
+        """
+        벡터 데이터 업서트 (삽입 또는 업데이트)
+        - batch_size 개씩 나눠 요청 (동기 호출이므로 async 코드에서는 asyncio.to_thread 로 실행)
+        """
         try:
             if not self.is_initialized:
                 logger.error("❌ Pinecone 클라이언트가 초기화되지 않았습니다")
@@ -135,10 +151,11 @@ class PineconeClient:
                 })
             
             if upsert_data:
-                logger.info(f"💾 [PINECONE] {len(upsert_data)}개 벡터 업서트 시작...")
+                logger.info(f"💾 [PINECONE] {len(upsert_data)}개 벡터 업서트 시작 (배치 크기 {batch_size})...")
                 try:
-                    result = self.index.upsert(vectors=upsert_data)
-                    logger.info(f"✅ [PINECONE] 업서트 완료 - 결과: {result}")
+                    for start in range(0, len(upsert_data), max(1, batch_size)):
+                        self.index.upsert(vectors=upsert_data[start:start + max(1, batch_size)])
+                    logger.info(f"✅ [PINECONE] 업서트 완료 - {len(upsert_data)}개")
                     logger.info(f"📊 [PINECONE] 벡터 ID들: {[v['id'] for v in upsert_data[:3]]}")  # 처음 3개만
                 except Exception as upsert_error:
                     logger.error(f"❌ [PINECONE] 업서트 실행 실패: {upsert_error}")
@@ -226,13 +243,6 @@ class PineconeClient:
             logger.error(f"❌ 인덱스 통계 조회 실패: {e}")
             return {}
     
-    def create_embedding_id(self, content_type: str, content_id: str, timestamp: Optional[str] = None) -> str:
-        """임베딩 ID 생성"""
-        if not timestamp:
-            timestamp = datetime.now().isoformat()
-        
-        return f"{content_type}:{content_id}:{timestamp}"
-    
     def extract_metadata_from_id(self, embedding_id: str) -> Dict[str, str]:
         """임베딩 ID에서 메타데이터 추출"""
         try:
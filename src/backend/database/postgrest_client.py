@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Supabase PostgREST 비동기 클라이언트
+- supabase-py 의 동기 .execute() 대신 풀링된 httpx.AsyncClient 로 /rest/v1 직접 호출 (이벤트 루프 블로킹 없음)
+- select / upsert / update 만 제공 (필터는 eq 조건 dict, 나머지 PostgREST 파라미터는 params 로 그대로 전달)
+"""
+
+import os
+import logging
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
+# 서버 전용 키가 있으면 사용 (RLS 우회가 필요한 서버 작업), 없으면 anon 키
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
+POSTGREST_TIMEOUT_SEC = float(os.getenv("POSTGREST_TIMEOUT_SEC", "5.0"))
+POSTGREST_MAX_CONNECTIONS = int(os.getenv("POSTGREST_MAX_CONNECTIONS", "20"))
+
+
+class PostgRESTError(Exception):
+    """PostgREST 오류 응답 (status, code 는 PGRST*/SQLSTATE)"""
+
+    def __init__(self, status: int, code: Optional[str], message: str):
+        super().__init__(f"{status} {code or ''} {message}".strip())
+        self.status = status
+        self.code = code
+
+
+def _eq_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    return {column: f"eq.{value}" for column, value in (filters or {}).items()}
+
+
+class PostgRESTClient:
+    """/rest/v1 비동기 클라이언트 (프로세스당 커넥션 풀 하나)"""
+
+    def __init__(self,
+                 url: Optional[str] = SUPABASE_URL,
+                 api_key: Optional[str] = SUPABASE_SERVICE_KEY or SUPABASE_ANON_KEY,
+                 timeout: float = POSTGREST_TIMEOUT_SEC,
+                 max_connections: int = POSTGREST_MAX_CONNECTIONS):
+        self.base_url = f"{url.rstrip('/')}/rest/v1" if url else None
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self._client: Optional[httpx.AsyncClient] = None
+        self.requests = 0
+        self.errors = 0
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.base_url and self.api_key)
+
+    def _http(self) -> httpx.AsyncClient:
+        # 첫 요청 시 생성 (이벤트 루프 안에서)
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "apikey": self.api_key,
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Accept": "application/json",
+                },
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections
+                ),
+            )
+        return self._client
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, table: str, params: Dict[str, Any],
+                       json: Any = None, prefer: Optional[str] = None) -> List[Dict[str, Any]]:
+        if not self.configured:
+            raise PostgRESTError(503, None, "Supabase 환경변수가 설정되지 않음")
+        headers = {"Prefer": prefer} if prefer else None
+        self.requests += 1
+        response = await self._http().request(method, f"/{table}", params=params, json=json, headers=headers)
+        if response.status_code >= 400:
+            self.errors += 1
+            try:
+                body = response.json()
+            except ValueError:
+                body = {}
+            raise PostgRESTError(response.status_code, body.get("code"), body.get("message") or response.text)
+        if not response.content:
+            return []
+        data = response.json()
+        return data if isinstance(data, list) else [data]
+
+    async def select(self, table: str, columns: str = "*", filters: Optional[Dict[str, Any]] = None,
+                     order: Optional[str] = None, limit: Optional[int] = None,
+                     params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """GET /table?select=...&col=eq.val&order=...&limit=..."""
+        query: Dict[str, Any] = {"select": columns, **_eq_filters(filters)}
+        if order:
+            query["order"] = order
+        if limit is not None:
+            query["limit"] = str(limit)
+        if params:
+            query.update(params)
+        return await self._request("GET", table, query)
+
+    async def upsert(self, table: str, rows: Any, on_conflict: Optional[str] = None,
+                     returning: bool = True) -> List[Dict[str, Any]]:
+        query = {"on_conflict": on_conflict} if on_conflict else {}
+        prefer = "resolution=merge-duplicates," + ("return=representation" if returning else "return=minimal")
+        return await self._request("POST", table, query, json=rows, prefer=prefer)
+
+    async def update(self, table: str, values: Dict[str, Any], filters: Dict[str, Any],
+                     returning: bool = True) -> List[Dict[str, Any]]:
+        prefer = "return=representation" if returning else "return=minimal"
+        return await self._request("PATCH", table, _eq_filters(filters), json=values, prefer=prefer)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"configured": self.configured, "requests": self.requests, "errors": self.errors}
+
+
+# 전역 인스턴스
+postgrest = PostgRESTClient()
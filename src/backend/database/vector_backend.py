@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+벡터 백엔드 인터페이스
+- VectorService 가 사용하는 벡터 저장/검색 계약 (동기 API, async 코드에서는 asyncio.to_thread 로 호출)
+- 구현: PineconeClient (원격), LocalVectorIndex (프로세스 내 memmap + NumPy/hnswlib)
+- VECTOR_BACKEND=auto | pinecone | local (auto: PINECONE_API_KEY 가 있으면 pinecone, 없으면 local)
+"""
+
+import os
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "auto").lower()
+
+
+class VectorBackend(ABC):
+    """벡터 저장소 공통 인터페이스"""
+
+    index_name: str = ""
+    dimension: int = 1536
+    is_initialized: bool = False
+
+    @abstractmethod
+    def initialize(self) -> bool:
+        ...
+
+    @abstractmethod
+    def upsert_vectors(self, vectors: List[Dict[str, Any]]) -> bool:
+        """[{id, values, metadata}] 삽입 또는 갱신"""
+
+    @abstractmethod
+    def query_vectors(self,
+                      query_vector: List[float],
+                      top_k: int = 10,
+                      filter_dict: Optional[Dict[str, Any]] = None,
+                      include_metadata: bool = True) -> List[Dict[str, Any]]:
+        """[{id, score, metadata}] 를 점수 내림차순으로 반환"""
+
+    @abstractmethod
+    def delete_vectors(self, vector_ids: List[str]) -> bool:
+        ...
+
+    @abstractmethod
+    def get_index_stats(self) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def health_check(self) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def cleanup(self):
+        ...
+
+    def delete_index(self) -> bool:
+        """인덱스 전체 삭제 (지원하지 않는 백엔드는 False)"""
+        return False
+
+    def create_embedding_id(self, content_type: str, content_id: str, timestamp: Optional[str] = None) -> str:
+        """임베딩 ID 생성"""
+        if not timestamp:
+            timestamp = datetime.now().isoformat()
+
+        return f"{content_type}:{content_id}:{timestamp}"
+
+
+def get_vector_backend(name: str = VECTOR_BACKEND) -> VectorBackend:
+    """설정에 맞는 벡터 백엔드 인스턴스"""
+    if name == "auto":
+        name = "pinecone" if os.getenv("PINECONE_API_KEY") else "local"
+
+    if name == "local":
+        from .local_vector_index import local_vector_index
+        logger.info("📦 벡터 백엔드: local (프로세스 내 인덱스)")
+        return local_vector_index
+
+    if name != "pinecone":
+        logger.warning(f"⚠️ 알 수 없는 VECTOR_BACKEND '{name}' - pinecone 사용")
+    from .pinecone_client import pinecone_client
+    logger.info("🎯 벡터 백엔드: pinecone")
+    return pinecone_client
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+이벤트 루프 블로킹 탐지 (진단 모드)
+- 루프 스레드가 짧은 주기로 하트비트를 남기고, 감시 스레드가 하트비트가 임계값 이상 끊기면
+  sys._current_frames() 로 루프 스레드의 스택을 캡처
+- 당시 루프가 실행 중이던 태스크 -> 요청 경로 템플릿으로 귀속 (tracing.MetricsMiddleware)
+- (경로, 애플리케이션 코드 최상단 프레임) 별로 횟수/누적/최대 정지 시간과 대표 스택을 집계
+  → /api/monitoring/blocking, dys_event_loop_blocks_total / dys_event_loop_block_duration_seconds
+"""
+
+import os
+import sys
+import time
+import asyncio
+import logging
+import threading
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+from .monitoring import LOOP_BLOCKS, LOOP_BLOCK_DURATION
+from .tracing import enable_task_tracking, route_for_task
+
+logger = logging.getLogger(__name__)
+
+# 진단 모드 활성화 (감시 스레드 + 스택 캡처 비용이 있어 기본 꺼짐)
+BLOCKING_DETECTOR = os.getenv("BLOCKING_DETECTOR", "false").lower() in ("1", "true", "yes")
+# 이 시간 이상 루프를 붙잡으면 블로킹으로 기록
+BLOCKING_THRESHOLD_MS = float(os.getenv("BLOCKING_THRESHOLD_MS", "100"))
+# 하트비트/감시 주기
+BLOCKING_CHECK_INTERVAL_MS = float(os.getenv("BLOCKING_CHECK_INTERVAL_MS", "20"))
+# 집계할 (경로, 위치) 최대 개수
+BLOCKING_MAX_OFFENDERS = int(os.getenv("BLOCKING_MAX_OFFENDERS", "200"))
+BLOCKING_STACK_LIMIT = int(os.getenv("BLOCKING_STACK_LIMIT", "30"))
+
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SELF_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _blame_frame(stack: List[traceback.FrameSummary]) -> str:
+    """스택에서 가장 안쪽의 애플리케이션 코드 프레임 (라이브러리 내부보다 고칠 위치가 중요)"""
+    for frame in reversed(stack):
+        filename = os.path.abspath(frame.filename)
+        if filename.startswith(_PACKAGE_DIR) and not filename.startswith(_SELF_DIR):
+            return f"{os.path.relpath(filename, _PACKAGE_DIR)}:{frame.lineno} {frame.name}"
+    if stack:
+        frame = stack[-1]
+        return f"{frame.filename}:{frame.lineno} {frame.name}"
+    return "unknown"
+
+
+class Offender:
+    __slots__ = ("route", "location", "count", "total", "max", "stack", "last_seen")
+
+    def __init__(self, route: str, location: str, stack: List[str]):
+        self.route = route
+        self.location = location
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.stack = stack
+        self.last_seen = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "route": self.route,
+            "location": self.location,
+            "count": self.count,
+            "total_ms": round(self.total * 1000, 1),
+            "max_ms": round(self.max * 1000, 1),
+            "avg_ms": round(self.total / self.count * 1000, 1) if self.count else 0.0,
+            "last_seen": self.last_seen,
+            "stack": self.stack,
+        }
+
+
+class BlockingDetector:
+    """하트비트 감시 스레드로 루프 정지를 탐지하고 원인 스택을 집계"""
+
+    def __init__(self,
+                 threshold_ms: float = BLOCKING_THRESHOLD_MS,
+                 check_interval_ms: float = BLOCKING_CHECK_INTERVAL_MS,
+                 max_offenders: int = BLOCKING_MAX_OFFENDERS):
+        self.threshold = threshold_ms / 1000.0
+        self.interval = check_interval_ms / 1000.0
+        self.max_offenders = max(1, max_offenders)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._beat = time.monotonic()
+        self._heartbeat_handle: Optional[asyncio.TimerHandle] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._offenders: Dict[Tuple[str, str], Offender] = {}
+        self.stalls = 0
+        self.dropped = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    # ---------- 루프 쪽 ----------
+
+    def _heartbeat(self):
+        self._beat = time.monotonic()
+        self._heartbeat_handle = self._loop.call_later(self.interval, self._heartbeat)
+
+    # ---------- 감시 스레드 ----------
+
+    def _capture(self) -> Tuple[str, str, List[str]]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        task = asyncio.tasks._current_tasks.get(self._loop)
+        route = route_for_task(task)
+        if frame is None:
+            return route, "unknown", []
+        stack = traceback.extract_stack(frame, limit=BLOCKING_STACK_LIMIT)
+        del frame
+        lines = [f"{f.filename}:{f.lineno} {f.name} | {f.line or ''}".rstrip(" |") for f in stack]
+        return route, _blame_frame(stack), lines
+
+    def _record(self, route: str, location: str, stack: List[str], duration: float):
+        LOOP_BLOCKS.labels(route=route).inc()
+        LOOP_BLOCK_DURATION.labels(route=route).observe(duration)
+        key = (route, location)
+        with self._lock:
+            self.stalls += 1
+            offender = self._offenders.get(key)
+            if offender is None:
+                if len(self._offenders) >= self.max_offenders:
+                    self.dropped += 1
+                    return
+                offender = self._offenders[key] = Offender(route, location, stack)
+            offender.count += 1
+            offender.total += duration
+            offender.last_seen = time.time()
+            if duration >= offender.max:
+                # 가장 긴 정지의 스택을 대표로 보관
+                offender.max = duration
+                offender.stack = stack
+        logger.warning(f"🐢 이벤트 루프 블로킹 {duration * 1000:.0f}ms - {route} @ {location}")
+
+    def _watch(self):
+        captured: Optional[Tuple[str, str, List[str]]] = None
+        stalled_since = 0.0
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            gap = time.monotonic() - beat
+            if captured is None:
+                if gap >= self.threshold:
+                    # 정지 중 - 지금 루프 스레드가 실행 중인 코드가 원인
+                    captured = self._capture()
+                    stalled_since = beat
+            elif beat != stalled_since:
+                # 하트비트 재개 - 정지 시간 = 하트비트 간격 - 예정 주기
+                duration = max(self.threshold, beat - stalled_since - self.interval)
+                self._record(*captured, duration)
+                captured = None
+
+    # ---------- 수명 주기 ----------
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        enable_task_tracking(True)
+        self._stop.clear()
+        self._heartbeat()
+        self._thread = threading.Thread(target=self._watch, name="loop-blocking-detector", daemon=True)
+        self._thread.start()
+        logger.info(f"🐢 루프 블로킹 탐지 시작 (임계값 {self.threshold * 1000:.0f}ms)")
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        if self._heartbeat_handle is not None:
+            self._heartbeat_handle.cancel()
+            self._heartbeat_handle = None
+        self._thread.join(timeout=1.0)
+        self._thread = None
+        enable_task_tracking(False)
+
+    # ---------- 조회 ----------
+
+    def report(self, limit: int = 20, route: Optional[str] = None) -> Dict[str, Any]:
+        """누적 정지 시간 순 상위 원인"""
+        with self._lock:
+            offenders = [o for o in self._offenders.values() if route is None or o.route == route]
+            offenders.sort(key=lambda o: o.total, reverse=True)
+            by_route: Dict[str, Dict[str, float]] = {}
+            for o in self._offenders.values():
+                entry = by_route.setdefault(o.route, {"count": 0, "total_ms": 0.0})
+                entry["count"] += o.count
+                entry["total_ms"] = round(entry["total_ms"] + o.total * 1000, 1)
+            return {
+                **self.stats(),
+                "routes": dict(sorted(by_route.items(), key=lambda item: item[1]["total_ms"], reverse=True)),
+                "offenders": [o.to_dict() for o in offenders[:max(1, limit)]],
+            }
+
+    def reset(self):
+        with self._lock:
+            self._offenders.clear()
+            self.stalls = 0
+            self.dropped = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.running,
+            "threshold_ms": self.threshold * 1000,
+            "stalls": self.stalls,
+            "tracked": len(self._offenders),
+            "dropped": self.dropped,
+        }
+
+
+# 전역 인스턴스 (BLOCKING_DETECTOR=true 일 때 main_server 시작 시 start)
+blocking_detector = BlockingDetector()
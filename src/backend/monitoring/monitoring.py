@@ -4,14 +4,21 @@ DYS 백엔드 모니터링 모듈
 Prometheus 메트릭 수집 및 노드 추적
 """
 
-from prometheus_client import Counter, Histogram, Gauge, Info, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import (
+    CollectorRegistry, Counter, Histogram, Gauge, Info, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+)
+from prometheus_client import multiprocess
 from fastapi import Response
+import gc
 import time
 import psutil
 import os
 import socket
 import platform
 
+# 설정되면 워커 프로세스마다 메트릭을 파일로 남기고 /metrics 에서 합산 (멀티 워커)
+PROMETHEUS_MULTIPROC_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR") or os.getenv("prometheus_multiproc_dir")
+
 # === Prometheus 메트릭 정의 ===
 
 # 기본 애플리케이션 메트릭
@@ -27,6 +34,14 @@ REQUEST_DURATION = Histogram(
     ['method', 'endpoint']
 )
 
+# 요청 내부 단계별 소요 시간 (stage: auth | db | embed | llm | stt | inference | tts, route: 경로 템플릿)
+STAGE_DURATION = Histogram(
+    'dys_stage_duration_seconds',
+    'Duration of a stage inside a request in seconds',
+    ['stage', 'route', 'status'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
 # AI 모델 메트릭
 EXPRESSION_ANALYSIS_COUNT = Counter(
     'dys_expression_analysis_total',
@@ -50,10 +65,50 @@ VOICE_ANALYSIS_DURATION = Histogram(
     'Voice analysis duration in seconds'
 )
 
-# 시스템 리소스 메트릭
-SYSTEM_CPU_USAGE = Gauge('dys_system_cpu_percent', 'System CPU usage percentage')
-SYSTEM_MEMORY_USAGE = Gauge('dys_system_memory_percent', 'System memory usage percentage')
-SYSTEM_DISK_USAGE = Gauge('dys_system_disk_percent', 'System disk usage percentage')
+# 시스템 리소스 메트릭 (호스트 전체 값 - 멀티 워커에서는 살아있는 워커 중 최신 샘플)
+SYSTEM_CPU_USAGE = Gauge('dys_system_cpu_percent', 'System CPU usage percentage', multiprocess_mode='livemostrecent')
+SYSTEM_MEMORY_USAGE = Gauge('dys_system_memory_percent', 'System memory usage percentage', multiprocess_mode='livemostrecent')
+SYSTEM_DISK_USAGE = Gauge('dys_system_disk_percent', 'System disk usage percentage', multiprocess_mode='livemostrecent')
+
+# 워커 프로세스 메트릭 (pid 라벨로 워커별 노출 - 기본 process_/python_gc_ 수집기는 멀티프로세스 모드에서 비활성)
+PROCESS_RSS = Gauge('dys_process_resident_memory_bytes', 'Worker resident memory in bytes', multiprocess_mode='liveall')
+PROCESS_CPU_USAGE = Gauge('dys_process_cpu_percent', 'Worker CPU usage percentage', multiprocess_mode='liveall')
+PROCESS_THREADS = Gauge('dys_process_threads', 'Worker OS threads', multiprocess_mode='liveall')
+PROCESS_OPEN_FDS = Gauge('dys_process_open_fds', 'Worker open file descriptors', multiprocess_mode='liveall')
+GC_COLLECTIONS = Gauge(
+    'dys_python_gc_collections',
+    'Garbage collections since worker start',
+    ['generation'],
+    multiprocess_mode='liveall'
+)
+GC_OBJECTS = Gauge(
+    'dys_python_gc_objects_pending',
+    'Objects tracked in each GC generation',
+    ['generation'],
+    multiprocess_mode='liveall'
+)
+
+# 이벤트 루프 지연 (예약한 sleep 이 늦게 깨어난 시간)
+EVENT_LOOP_LAG = Gauge('dys_event_loop_lag_seconds', 'Max event loop lag over the last sampling interval', multiprocess_mode='liveall')
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    'dys_event_loop_lag_probe_seconds',
+    'Event loop lag per probe',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+# 이벤트 루프를 임계값 이상 붙잡은 콜백 (route: 당시 실행 중이던 요청의 경로 템플릿)
+LOOP_BLOCKS = Counter('dys_event_loop_blocks_total', 'Event loop stalls beyond the blocking threshold', ['route'])
+LOOP_BLOCK_DURATION = Histogram(
+    'dys_event_loop_block_duration_seconds',
+    'Duration of event loop stalls beyond the blocking threshold',
+    ['route'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+# 스레드 풀 포화도 (pool: anyio = FastAPI 동기 엔드포인트, asyncio = asyncio.to_thread)
+THREADPOOL_BUSY = Gauge('dys_threadpool_busy_workers', 'Busy thread pool workers', ['pool'], multiprocess_mode='liveall')
+THREADPOOL_LIMIT = Gauge('dys_threadpool_max_workers', 'Thread pool capacity', ['pool'], multiprocess_mode='liveall')
+THREADPOOL_WAITING = Gauge('dys_threadpool_waiting_tasks', 'Tasks waiting for a thread pool worker', ['pool'], multiprocess_mode='liveall')
 
 # WebSocket 연결 메트릭
 WEBSOCKET_CONNECTIONS = Gauge('dys_websocket_connections_active', 'Active WebSocket connections')
@@ -62,8 +117,13 @@ WEBSOCKET_MESSAGES = Counter(
     'Total WebSocket messages',
     ['direction', 'type']
 )
+WEBSOCKET_SEND_QUEUE_DEPTH = Gauge(
+    'dys_websocket_send_queue_depth',
+    'Queued outbound WebSocket messages',
+    ['channel']
+)
 
-# 노드 및 배포 추적 메트릭
+# 노드 및 배포 추적 메트릭 (프로세스 메모리 값 - 멀티프로세스 모드에서는 스크레이프한 워커의 값을 직접 노출)
 NODE_INFO = Info('dys_node_info', 'Node information for deployment tracking')
 DEPLOYMENT_INFO = Info('dys_deployment_info', 'Deployment information')
 BUILD_INFO = Info('dys_build_info', 'Build information')
@@ -82,11 +142,20 @@ DATABASE_QUERY_DURATION = Histogram(
     ['operation', 'collection']
 )
 
+# 임베딩 캐시 메트릭 (tier: memory | sqlite | mongo, result: hit | miss)
+EMBEDDING_CACHE_REQUESTS = Counter(
+    'dys_embedding_cache_requests_total',
+    'Embedding cache lookups',
+    ['tier', 'result']
+)
+EMBEDDING_CACHE_ENTRIES = Gauge('dys_embedding_cache_entries', 'Embeddings held in the in-memory cache')
+
 class MonitoringManager:
     """모니터링 관리자 - 메트릭 수집 및 노드 추적"""
     
     def __init__(self):
         self.start_time = time.time()
+        self._process = psutil.Process()
         self._update_node_info()
         self._update_deployment_info()
         self._update_build_info()
@@ -140,10 +209,10 @@ class MonitoringManager:
             print(f"⚠️ 빌드 정보 업데이트 실패: {e}")
     
     def update_system_metrics(self):
-        """시스템 메트릭 업데이트"""
+        """시스템 메트릭 업데이트 (블로킹 없음 - CPU 는 직전 호출 이후 평균)"""
         try:
-            # CPU 사용률
-            cpu_percent = psutil.cpu_percent(interval=1)
+            # CPU 사용률 (interval=None: 첫 호출은 0.0, 이후 호출 간 구간 평균)
+            cpu_percent = psutil.cpu_percent(interval=None)
             SYSTEM_CPU_USAGE.set(cpu_percent)
             
             # 메모리 사용률
@@ -158,6 +227,23 @@ class MonitoringManager:
         except Exception as e:
             print(f"⚠️ 시스템 메트릭 업데이트 실패: {e}")
     
+    def update_process_metrics(self):
+        """워커 프로세스 메트릭 업데이트 (RSS, CPU, 스레드, FD, GC)"""
+        try:
+            process = self._process
+            with process.oneshot():
+                PROCESS_RSS.set(process.memory_info().rss)
+                PROCESS_CPU_USAGE.set(process.cpu_percent(interval=None))
+                PROCESS_THREADS.set(process.num_threads())
+                if hasattr(process, "num_fds"):
+                    PROCESS_OPEN_FDS.set(process.num_fds())
+            for generation, stats in enumerate(gc.get_stats()):
+                GC_COLLECTIONS.labels(generation=str(generation)).set(stats.get("collections", 0))
+            for generation, count in enumerate(gc.get_count()):
+                GC_OBJECTS.labels(generation=str(generation)).set(count)
+        except Exception as e:
+            print(f"⚠️ 프로세스 메트릭 업데이트 실패: {e}")
+    
     def record_http_request(self, method: str, endpoint: str, status_code: int, duration: float):
         """HTTP 요청 메트릭 기록"""
         REQUEST_COUNT.labels(method=method, endpoint=endpoint, status_code=status_code).inc()
@@ -193,14 +279,27 @@ class MonitoringManager:
 # 전역 모니터링 매니저 인스턴스
 monitoring = MonitoringManager()
 
+_scrape_registry = None
+
+def get_scrape_registry():
+    """스크레이프용 레지스트리 (멀티프로세스 모드면 워커 파일을 합산하는 전용 레지스트리)"""
+    global _scrape_registry
+    if _scrape_registry is None:
+        if PROMETHEUS_MULTIPROC_DIR:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)
+            # Info 는 워커 파일로 기록되지 않음 - 노드/배포/빌드 정보는 워커마다 같으므로 이 워커 값으로 노출
+            for info in (NODE_INFO, DEPLOYMENT_INFO, BUILD_INFO):
+                registry.register(info)
+            _scrape_registry = registry
+        else:
+            _scrape_registry = REGISTRY
+    return _scrape_registry
+
 def get_metrics():
-    """Prometheus 메트릭 반환"""
-    # 시스템 메트릭 업데이트
-    monitoring.update_system_metrics()
-    
-    # 메트릭 생성
+    """Prometheus 메트릭 반환 (값 갱신은 system_sampler 가 백그라운드에서 - 여기서는 직렬화만)"""
     return Response(
-        content=generate_latest(),
+        content=generate_latest(get_scrape_registry()),
         media_type=CONTENT_TYPE_LATEST
     )
 
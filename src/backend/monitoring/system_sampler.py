@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+백그라운드 시스템 메트릭 샘플러
+- 고정 주기로 CPU/메모리/디스크, 워커 RSS/GC, 이벤트 루프 지연, 스레드 풀 포화도를 갱신
+- psutil 호출은 asyncio.to_thread 로 실행 (루프 블로킹 없음), /metrics 는 레지스트리 직렬화만 수행
+- 루프 지연은 짧은 주기 프로브(sleep 이 예정보다 늦게 깨어난 시간)의 구간 최대값
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from .monitoring import (
+    monitoring, EVENT_LOOP_LAG, EVENT_LOOP_LAG_HISTOGRAM,
+    THREADPOOL_BUSY, THREADPOOL_LIMIT, THREADPOOL_WAITING
+)
+
+try:
+    from anyio.to_thread import current_default_thread_limiter
+    ANYIO_AVAILABLE = True
+except ImportError:
+    ANYIO_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 시스템 메트릭 갱신 주기 (Prometheus 스크레이프 주기와 비슷하게)
+SYSTEM_METRICS_INTERVAL_SEC = float(os.getenv("SYSTEM_METRICS_INTERVAL_SEC", "10"))
+# 이벤트 루프 지연 프로브 주기
+LOOP_LAG_PROBE_INTERVAL_SEC = float(os.getenv("LOOP_LAG_PROBE_INTERVAL_SEC", "0.25"))
+
+
+def _executor_stats(executor) -> Optional[Dict[str, int]]:
+    """concurrent.futures.ThreadPoolExecutor 내부 상태 (없거나 구현이 다르면 None)"""
+    if executor is None:
+        return None
+    try:
+        threads = len(executor._threads)
+        idle = executor._idle_semaphore._value
+        return {
+            "busy": max(0, threads - idle),
+            "limit": executor._max_workers,
+            "waiting": executor._work_queue.qsize(),
+        }
+    except AttributeError:
+        return None
+
+
+class SystemSampler:
+    """시스템/프로세스/루프 메트릭 주기 갱신"""
+
+    def __init__(self,
+                 interval: float = SYSTEM_METRICS_INTERVAL_SEC,
+                 probe_interval: float = LOOP_LAG_PROBE_INTERVAL_SEC):
+        self.interval = interval
+        self.probe_interval = probe_interval
+        self._sample_task: Optional[asyncio.Task] = None
+        self._probe_task: Optional[asyncio.Task] = None
+        self._window_lag = 0.0
+        self.last_lag = 0.0
+        self.last_sample_at: Optional[float] = None
+        self.last_sample_duration = 0.0
+        self.samples = 0
+
+    @property
+    def started(self) -> bool:
+        return self._sample_task is not None
+
+    # ---------- 이벤트 루프 지연 ----------
+
+    async def _probe_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.probe_interval
+            await asyncio.sleep(self.probe_interval)
+            lag = max(0.0, loop.time() - expected)
+            EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+            if lag > self._window_lag:
+                self._window_lag = lag
+
+    # ---------- 스레드 풀 ----------
+
+    def _sample_threadpools(self):
+        """루프 스레드에서 호출 (anyio 리미터는 실행 중인 루프 컨텍스트 필요)"""
+        if ANYIO_AVAILABLE:
+            try:
+                limiter = current_default_thread_limiter()
+                THREADPOOL_BUSY.labels(pool="anyio").set(limiter.borrowed_tokens)
+                THREADPOOL_LIMIT.labels(pool="anyio").set(limiter.total_tokens)
+                THREADPOOL_WAITING.labels(pool="anyio").set(limiter.statistics().tasks_waiting)
+            except Exception as e:
+                logger.debug(f"anyio 스레드 풀 샘플 실패: {e}")
+
+        stats = _executor_stats(getattr(asyncio.get_running_loop(), "_default_executor", None))
+        if stats is not None:
+            THREADPOOL_BUSY.labels(pool="asyncio").set(stats["busy"])
+            THREADPOOL_LIMIT.labels(pool="asyncio").set(stats["limit"])
+            THREADPOOL_WAITING.labels(pool="asyncio").set(stats["waiting"])
+
+    def _sample_blocking(self):
+        monitoring.update_system_metrics()
+        monitoring.update_process_metrics()
+
+    async def sample_once(self):
+        started = time.perf_counter()
+        self._sample_threadpools()
+        # psutil 호출(/proc 읽기, 수 ms)은 루프 밖에서
+        await asyncio.to_thread(self._sample_blocking)
+        self.last_lag, self._window_lag = self._window_lag, 0.0
+        EVENT_LOOP_LAG.set(self.last_lag)
+        self.last_sample_at = time.time()
+        self.last_sample_duration = time.perf_counter() - started
+        self.samples += 1
+
+    async def _sample_loop(self):
+        while True:
+            # start() 의 기준점 이후 한 주기가 지나야 CPU 평균이 의미 있음
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sample_once()
+            except Exception as e:
+                logger.warning(f"⚠️ 시스템 메트릭 샘플 실패: {e}")
+
+    # ---------- 수명 주기 ----------
+
+    def start(self):
+        if self._sample_task is not None or self.interval <= 0:
+            return
+        # cpu_percent(interval=None) 기준점 (첫 샘플이 0.0 이 되지 않도록)
+        monitoring.update_system_metrics()
+        monitoring.update_process_metrics()
+        if self.probe_interval > 0:
+            self._probe_task = asyncio.create_task(self._probe_loop())
+        self._sample_task = asyncio.create_task(self._sample_loop())
+
+    async def stop(self):
+        for task in (self._sample_task, self._probe_task):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._sample_task = None
+        self._probe_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.started,
+            "interval_sec": self.interval,
+            "samples": self.samples,
+            "last_sample_at": self.last_sample_at,
+            "last_sample_ms": round(self.last_sample_duration * 1000, 2),
+            "loop_lag_ms": round(self.last_lag * 1000, 2),
+        }
+
+
+# 전역 인스턴스 (main_server 시작 시 start)
+system_sampler = SystemSampler()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+요청 지연 계측
+- MetricsMiddleware: 순수 ASGI 미들웨어, 경로 템플릿(/api/chat/sessions/{session_id}/messages) 기준
+  REQUEST_COUNT / REQUEST_DURATION 기록 + Server-Timing 응답 헤더
+- span(stage): contextvars 기반 단계 계측 (auth/db/embed/llm/stt/inference/tts)
+  STAGE_DURATION 히스토그램으로 내보내고, 요청별 단계 합계는 Server-Timing 에 포함
+- opentelemetry 가 설치돼 있으면 요청/단계를 OTel 스팬으로도 기록 (SDK/익스포터 설정은 배포 환경에서)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from .monitoring import REQUEST_COUNT, REQUEST_DURATION, STAGE_DURATION
+
+try:
+    from opentelemetry import trace as otel_trace
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# OTel 스팬 기록 (auto: 패키지가 있으면 사용)
+TRACING_OTEL = os.getenv("TRACING_OTEL", "auto").lower()
+# 응답에 Server-Timing 헤더 추가
+TRACING_SERVER_TIMING = os.getenv("TRACING_SERVER_TIMING", "true").lower() in ("1", "true", "yes")
+
+OTEL_ENABLED = OTEL_AVAILABLE and TRACING_OTEL not in ("0", "false", "no")
+_tracer = otel_trace.get_tracer("dys-backend") if OTEL_ENABLED else None
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestTrace:
+    """요청 하나의 계측 상태 (스팬 합계는 Server-Timing 용)"""
+    __slots__ = ("scope", "stages", "_route")
+
+    def __init__(self, scope: Dict[str, Any]):
+        self.scope = scope
+        self.stages: Dict[str, float] = {}
+        self._route: Optional[str] = None
+
+    @property
+    def route(self) -> str:
+        # 라우팅은 핸들러 실행 전에 끝나므로 첫 스팬 종료 시점에는 endpoint 가 scope 에 있음
+        if self._route is None and "endpoint" in self.scope:
+            self._route = route_template(self.scope)
+        return self._route or UNMATCHED_ROUTE
+
+    def add(self, stage: str, duration: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + duration
+
+
+_current: ContextVar[Optional[RequestTrace]] = ContextVar("dys_request_trace", default=None)
+
+
+def current_route() -> str:
+    trace = _current.get()
+    return trace.route if trace else "background"
+
+
+# 태스크 -> 요청 (루프 밖 스레드에서 "지금 루프가 처리 중인 요청" 을 찾기 위함, 진단 모드에서만)
+_task_traces: Dict[asyncio.Task, RequestTrace] = {}
+_track_tasks = False
+
+
+def enable_task_tracking(enabled: bool = True):
+    global _track_tasks
+    _track_tasks = enabled
+    if not enabled:
+        _task_traces.clear()
+
+
+def route_for_task(task: Optional[asyncio.Task]) -> str:
+    if task is None:
+        return "idle"
+    trace = _task_traces.get(task)
+    return trace.route if trace else "background"
+
+
+@contextmanager
+def span(stage: str, **attributes):
+    """
+    단계 계측 (동기/비동기 코드 모두 with 로 사용)
+        with span("llm"):
+            response = await asyncio.to_thread(...)
+    """
+    trace = _current.get()
+    otel_span = _tracer.start_as_current_span(stage, attributes=attributes) if _tracer else None
+    if otel_span is not None:
+        otel_span.__enter__()
+    started = time.perf_counter()
+    status = "success"
+    try:
+        yield
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        route = trace.route if trace else "background"
+        STAGE_DURATION.labels(stage=stage, route=route, status=status).observe(duration)
+        if trace is not None:
+            trace.add(stage, duration)
+        if otel_span is not None:
+            otel_span.__exit__(None, None, None)
+
+
+# ---------- 경로 템플릿 ----------
+
+_route_index: Dict[int, Tuple[Any, List[Tuple[Any, str]]]] = {}
+
+
+def _build_route_index(app) -> List[Tuple[Any, str]]:
+    entries = []
+    for route in getattr(app, "routes", []):
+        path = getattr(route, "path", None)
+        if path is None:
+            continue
+        endpoint = getattr(route, "endpoint", None)
+        if endpoint is None:
+            # Mount (정적 파일 등) - endpoint 로 하위 앱이 들어옴
+            endpoint = getattr(route, "app", None)
+            path = path.rstrip("/") + "/{path}"
+        entries.append((endpoint, path, getattr(route, "path_regex", None)))
+    return entries
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """scope 의 endpoint -> 등록된 경로 템플릿 (라벨 수를 라우트 수로 제한)"""
+    app = scope.get("app")
+    endpoint = scope.get("endpoint")
+    if app is None or endpoint is None:
+        return UNMATCHED_ROUTE
+    cached = _route_index.get(id(app))
+    if cached is None or cached[0] is not app:
+        entries = _build_route_index(app)
+        by_endpoint: Dict[Any, List[Tuple[Any, str]]] = {}
+        for ep, path, regex in entries:
+            by_endpoint.setdefault(ep, []).append((regex, path))
+        cached = (app, by_endpoint)
+        _route_index[id(app)] = cached
+    candidates = cached[1].get(endpoint)
+    if not candidates:
+        return UNMATCHED_ROUTE
+    if len(candidates) == 1:
+        return candidates[0][1]
+    # 같은 핸들러가 여러 경로에 등록된 경우만 정규식 확인
+    path = scope.get("path", "")
+    for regex, template in candidates:
+        if regex is not None and regex.match(path):
+            return template
+    return candidates[0][1]
+
+
+# ---------- 미들웨어 ----------
+
+def _server_timing(trace: RequestTrace, total: float) -> bytes:
+    parts = [f"{stage};dur={duration * 1000:.1f}" for stage, duration in trace.stages.items()]
+    parts.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(parts).encode("latin-1")
+
+
+class MetricsMiddleware:
+    """HTTP 요청 메트릭 + 요청 단위 스팬 컨텍스트"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = RequestTrace(scope)
+        token = _current.set(trace)
+        task = asyncio.current_task() if _track_tasks else None
+        if task is not None:
+            _task_traces[task] = trace
+        started = time.perf_counter()
+        status_code = 500
+        otel_span = None
+        if _tracer is not None:
+            otel_span = _tracer.start_as_current_span(
+                f"{scope.get('method', 'GET')} {scope.get('path', '')}", kind=otel_trace.SpanKind.SERVER
+            )
+            otel_span.__enter__()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if TRACING_SERVER_TIMING:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", _server_timing(trace, time.perf_counter() - started)))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - started
+            route = route_template(scope)
+            method = scope.get("method", "GET")
+            REQUEST_COUNT.labels(method=method, endpoint=route, status_code=status_code).inc()
+            REQUEST_DURATION.labels(method=method, endpoint=route).observe(duration)
+            if otel_span is not None:
+                current = otel_trace.get_current_span()
+                current.set_attribute("http.route", route)
+                current.set_attribute("http.status_code", status_code)
+                otel_span.__exit__(None, None, None)
+            if task is not None:
+                _task_traces.pop(task, None)
+            _current.reset(token)
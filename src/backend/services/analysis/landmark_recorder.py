@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+랜드마크 세션 레코더
+- /ws/landmarks 로 수신한 프레임을 세션별 컬럼형 .npz 세그먼트(링 버퍼)로 기록
+- 오프라인 재생 및 분석기 벤치마크용 (benchmarks/landmark_replay.py)
+"""
+
+import os
+import re
+import json
+import time
+import uuid
+import base64
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 기록 모드: off(기본) | opt_in(?record=1 요청만) | all(모든 세션)
+LANDMARK_RECORDING = os.getenv("LANDMARK_RECORDING", "off").lower()
+LANDMARK_RECORD_DIR = os.getenv(
+    "LANDMARK_RECORD_DIR",
+    os.path.join(tempfile.gettempdir(), "landmark_recordings")
+)
+LANDMARK_RECORD_CHUNK_FRAMES = int(os.getenv("LANDMARK_RECORD_CHUNK_FRAMES", "300"))
+LANDMARK_RECORD_MAX_SEGMENTS = int(os.getenv("LANDMARK_RECORD_MAX_SEGMENTS", "200"))
+
+RECORDING_FORMAT_VERSION = 1
+FACE_COLUMNS = 3  # x, y, z
+POSE_COLUMNS = 4  # x, y, z, visibility
+
+_EMPTY_FACE = np.zeros((0, FACE_COLUMNS), dtype=np.float32)
+_EMPTY_POSE = np.zeros((0, POSE_COLUMNS), dtype=np.float32)
+
+
+def _points_to_array(points: List[Dict[str, Any]], columns: int) -> np.ndarray:
+    """랜드마크 딕셔너리 목록을 float32 (N, columns) 배열로 변환합니다."""
+    if not points:
+        return _EMPTY_FACE if columns == FACE_COLUMNS else _EMPTY_POSE
+    keys = ("x", "y", "z", "visibility")[:columns]
+    defaults = (0.0, 0.0, 0.0, 1.0)
+    return np.array(
+        [[p.get(k, d) for k, d in zip(keys, defaults)] for p in points],
+        dtype=np.float32
+    )
+
+
+def decode_frame(frame: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    클라이언트 프레임을 (face, pose) 배열로 정규화합니다.
+
+    - `lm`: base64 인코딩된 Float32Array (x, y, z 반복)
+    - `face_landmarks` / `pose_landmarks`: {x, y, z[, visibility]} 딕셔너리 목록
+    """
+    face = _EMPTY_FACE
+    pose = _EMPTY_POSE
+
+    if frame.get("lm"):
+        raw = np.frombuffer(base64.b64decode(frame["lm"]), dtype=np.float32)
+        usable = (raw.size // FACE_COLUMNS) * FACE_COLUMNS
+        face = raw[:usable].reshape(-1, FACE_COLUMNS)
+    elif frame.get("face_landmarks"):
+        face = _points_to_array(frame["face_landmarks"], FACE_COLUMNS)
+
+    if frame.get("pose_landmarks"):
+        pose = _points_to_array(frame["pose_landmarks"], POSE_COLUMNS)
+
+    return face, pose
+
+
+def array_to_landmarks(points: np.ndarray) -> List[Dict[str, float]]:
+    """(N, 3|4) 배열을 MediaPipeAnalyzer 입력 형식(딕셔너리 목록)으로 되돌립니다."""
+    if points.shape[1] == POSE_COLUMNS:
+        return [{"x": x, "y": y, "z": z, "visibility": v} for x, y, z, v in points.tolist()]
+    return [{"x": x, "y": y, "z": z} for x, y, z in points.tolist()]
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", value)[:64]
+
+
+class LandmarkSessionRecorder:
+    """세션 하나의 랜드마크 프레임을 세그먼트 단위 .npz 파일로 기록합니다."""
+
+    def __init__(self,
+                 session_dir: str,
+                 chunk_frames: int = LANDMARK_RECORD_CHUNK_FRAMES,
+                 max_segments: int = LANDMARK_RECORD_MAX_SEGMENTS,
+                 meta: Optional[Dict[str, Any]] = None):
+        self.session_dir = Path(session_dir)
+        self.session_dir.mkdir(parents=True, exist_ok=True)
+        self.chunk_frames = max(1, chunk_frames)
+        self.max_segments = max(1, max_segments)
+        self.meta = dict(meta or {})
+
+        self.frames_recorded = 0
+        self.segments_written = 0
+        self._batch_counter = 0
+        self._reset_buffer()
+
+        logger.info(f"🎥 랜드마크 기록 시작: {self.session_dir}")
+
+    def _reset_buffer(self):
+        self._ts: List[float] = []
+        self._recv_ts: List[float] = []
+        self._batch_ids: List[int] = []
+        self._faces: List[np.ndarray] = []
+        self._poses: List[np.ndarray] = []
+
+    @property
+    def pending_frames(self) -> int:
+        return len(self._ts)
+
+    def append_batch(self, frames: List[Dict[str, Any]], batch_ts: Optional[float] = None) -> bool:
+        """
+        `landmarks_batch` 메시지의 프레임을 버퍼에 추가합니다.
+        세그먼트를 내려써야 하면 True 를 반환합니다.
+        """
+        recv_ts = time.time()
+        batch_id = self._batch_counter
+        self._batch_counter += 1
+
+        for frame in frames:
+            try:
+                face, pose = decode_frame(frame)
+            except Exception as e:
+                logger.warning(f"⚠️ 랜드마크 프레임 디코딩 실패 (건너뜀): {e}")
+                continue
+            self._ts.append(float(frame.get("ts", batch_ts if batch_ts is not None else recv_ts)))
+            self._recv_ts.append(recv_ts)
+            self._batch_ids.append(batch_id)
+            self._faces.append(face)
+            self._poses.append(pose)
+
+        return self.pending_frames >= self.chunk_frames
+
+    def _take_segment(self) -> Optional[Dict[str, np.ndarray]]:
+        """버퍼를 컬럼 배열로 묶어 꺼냅니다 (루프 스레드에서 호출)."""
+        if not self._ts:
+            return None
+
+        face_offsets = np.zeros(len(self._faces) + 1, dtype=np.int64)
+        face_offsets[1:] = np.cumsum([f.shape[0] for f in self._faces])
+        pose_offsets = np.zeros(len(self._poses) + 1, dtype=np.int64)
+        pose_offsets[1:] = np.cumsum([p.shape[0] for p in self._poses])
+
+        segment = {
+            "ts": np.asarray(self._ts, dtype=np.float64),
+            "recv_ts": np.asarray(self._recv_ts, dtype=np.float64),
+            "batch_id": np.asarray(self._batch_ids, dtype=np.int32),
+            "face": np.concatenate(self._faces) if self._faces else _EMPTY_FACE,
+            "face_offsets": face_offsets,
+            "pose": np.concatenate(self._poses) if self._poses else _EMPTY_POSE,
+            "pose_offsets": pose_offsets,
+        }
+        self._reset_buffer()
+        return segment
+
+    def _write_segment(self, segment: Dict[str, np.ndarray], index: int):
+        """세그먼트를 디스크에 쓰고 링 크기를 넘는 오래된 세그먼트를 삭제합니다."""
+        path = self.session_dir / f"segment_{index:06d}.npz"
+        tmp_path = path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, **segment)
+        os.replace(tmp_path, path)
+
+        expired = index - self.max_segments
+        if expired >= 0:
+            old = self.session_dir / f"segment_{expired:06d}.npz"
+            try:
+                old.unlink()
+            except FileNotFoundError:
+                pass
+
+    def _write_meta(self):
+        meta = {
+            "format_version": RECORDING_FORMAT_VERSION,
+            "frames_recorded": self.frames_recorded,
+            "segments_written": self.segments_written,
+            "chunk_frames": self.chunk_frames,
+            "max_segments": self.max_segments,
+            "updated_at": time.time(),
+            **self.meta,
+        }
+        with open(self.session_dir / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    def flush(self):
+        """버퍼에 남은 프레임을 동기적으로 내려씁니다."""
+        segment = self._take_segment()
+        if segment is None:
+            return
+        index = self.segments_written
+        self.segments_written += 1
+        self.frames_recorded += len(segment["ts"])
+        self._write_segment(segment, index)
+        self._write_meta()
+
+    async def flush_async(self):
+        """디스크 쓰기를 워커 스레드로 넘겨 이벤트 루프를 막지 않습니다."""
+        segment = self._take_segment()
+        if segment is None:
+            return
+        index = self.segments_written
+        self.segments_written += 1
+        self.frames_recorded += len(segment["ts"])
+        await asyncio.to_thread(self._write_segment, segment, index)
+        await asyncio.to_thread(self._write_meta)
+
+    async def close(self):
+        """남은 프레임을 기록하고 세션을 닫습니다."""
+        try:
+            await self.flush_async()
+            logger.info(f"🎥 랜드마크 기록 종료: {self.frames_recorded}개 프레임 ({self.session_dir})")
+        except Exception as e:
+            logger.error(f"❌ 랜드마크 기록 종료 실패: {e}")
+
+
+def open_session_recorder(client_host: Optional[str],
+                          query_params: Optional[Dict[str, str]] = None) -> Optional[LandmarkSessionRecorder]:
+    """
+    설정과 요청 파라미터에 따라 세션 레코더를 엽니다.
+    기록 대상이 아니면 None 을 반환합니다.
+    """
+    params = query_params or {}
+    if LANDMARK_RECORDING == "all":
+        enabled = True
+    elif LANDMARK_RECORDING == "opt_in":
+        enabled = str(params.get("record", "")).lower() in ("1", "true", "yes")
+    else:
+        enabled = False
+
+    if not enabled:
+        return None
+
+    session_key = params.get("session_id") or uuid.uuid4().hex[:12]
+    started = time.strftime("%Y%m%d-%H%M%S")
+    session_dir = os.path.join(LANDMARK_RECORD_DIR, f"{started}_{_safe_name(session_key)}")
+
+    try:
+        return LandmarkSessionRecorder(
+            session_dir,
+            meta={
+                "session_id": session_key,
+                "client_host": client_host,
+                "started_at": time.time(),
+            }
+        )
+    except Exception as e:
+        logger.error(f"❌ 랜드마크 레코더 생성 실패: {e}")
+        return None
+
+
+class LandmarkRecording:
+    """기록된 세션을 읽어 프레임 단위로 돌려주는 리더"""
+
+    def __init__(self, session_dir: str):
+        self.session_dir = Path(session_dir)
+        self.segment_paths = sorted(self.session_dir.glob("segment_*.npz"))
+        meta_path = self.session_dir / "meta.json"
+        self.meta = json.loads(meta_path.read_text(encoding="utf-8")) if meta_path.exists() else {}
+
+    def iter_frames(self) -> Iterator[Tuple[int, float, np.ndarray, np.ndarray]]:
+        """(batch_id, ts, face, pose) 를 기록 순서대로 반환합니다."""
+        for path in self.segment_paths:
+            with np.load(path) as seg:
+                ts = seg["ts"]
+                batch_ids = seg["batch_id"]
+                face, face_offsets = seg["face"], seg["face_offsets"]
+                pose, pose_offsets = seg["pose"], seg["pose_offsets"]
+                for i in range(len(ts)):
+                    yield (
+                        int(batch_ids[i]),
+                        float(ts[i]),
+                        face[face_offsets[i]:face_offsets[i + 1]],
+                        pose[pose_offsets[i]:pose_offsets[i + 1]],
+                    )
+
+    def iter_batches(self) -> Iterator[List[Tuple[float, np.ndarray, np.ndarray]]]:
+        """원래 수신 배치 단위로 프레임을 묶어 반환합니다."""
+        current_id = None
+        batch: List[Tuple[float, np.ndarray, np.ndarray]] = []
+        for batch_id, ts, face, pose in self.iter_frames():
+            if current_id is not None and batch_id != current_id and batch:
+                yield batch
+                batch = []
+            current_id = batch_id
+            batch.append((ts, face, pose))
+        if batch:
+            yield batch
@@ -1,16 +1,24 @@
 """
 캘리브레이션 서비스
-- Supabase 연동
+- Supabase 연동 (PostgREST 비동기 호출 + (user_id, profile_name) 읽기 캐시, 저장 시 무효화)
+  (같은 호스트의 다른 워커에는 사용자별 무효화 스탬프 파일로 전파, 다른 Pod 는 짧은 TTL 로 수렴)
 - 캘리브레이션 데이터 관리
 - 실시간 캘리브레이션 처리
 """
 
+import os
+import time
 import asyncio
+import hashlib
+import tempfile
 import logging
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime
 import json
 
+from ..database.postgrest_client import postgrest, PostgRESTClient, PostgRESTError
+from .calibration_session import calibration_sessions
 from ..models.calibration import (
     CalibrationData, CalibrationRequest, CalibrationResponse, 
     CalibrationStatus, validate_calibration_data, fill_missing_calibration_data,
@@ -19,72 +27,201 @@ from ..models.calibration import (
 
 logger = logging.getLogger(__name__)
 
+# 캐시는 "캘리브레이션 있음" 결과만 보관 - 다른 Pod 의 저장은 이 시간 안에 반영
+CALIBRATION_CACHE_TTL_SEC = float(os.getenv("CALIBRATION_CACHE_TTL_SEC", "30"))
+CALIBRATION_CACHE_SIZE = int(os.getenv("CALIBRATION_CACHE_SIZE", "5000"))
+# 같은 호스트 워커 간 무효화 스탬프 디렉터리 (빈 값 = 프로세스 내 무효화만)
+CALIBRATION_INVALIDATION_DIR = os.getenv(
+    "CALIBRATION_INVALIDATION_DIR", os.path.join(tempfile.gettempdir(), "dys_calibration_invalidation")
+)
+
+# 상태 조회용 캐시 키 (프로필 구분 없이 최신 캘리브레이션)
+_LATEST = "*"
+_STATUS_COLUMNS = "cam_calibration,camera_calibrations(profile_name,quality_score,updated_at)"
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+class CalibrationCache:
+    """(user_id, profile_name) -> 조회 결과 (TTL + LRU)
+    - 저장 시 이 워커 항목 삭제 + 사용자별 스탬프 파일 mtime 갱신
+    - 조회 시 스탬프가 항목 조회 시작 시각보다 새로우면 다른 워커가 저장한 것 → 미스 처리
+    """
+
+    def __init__(self, max_entries: int = CALIBRATION_CACHE_SIZE, ttl: float = CALIBRATION_CACHE_TTL_SEC,
+                 shared_dir: str = CALIBRATION_INVALIDATION_DIR):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.shared_dir = shared_dir
+        # key -> (만료 시각, 조회 시작 시각 ns, 값)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, int, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.remote_invalidations = 0
+        # 무효화마다 증가 - 조회 도중 저장이 끼어들면 그 조회 결과는 캐시하지 않음
+        self.generation = 0
+        if self.shared_dir:
+            try:
+                os.makedirs(self.shared_dir, exist_ok=True)
+            except OSError as e:
+                logger.warning(f"⚠️ 캘리브레이션 무효화 디렉터리 생성 실패 - 워커 간 무효화 꺼짐: {e}")
+                self.shared_dir = ""
+
+    def _stamp_path(self, user_id: str) -> str:
+        return os.path.join(self.shared_dir, hashlib.sha1(user_id.encode("utf-8")).hexdigest())
+
+    def _stamp_ns(self, user_id: str) -> int:
+        if not self.shared_dir:
+            return 0
+        try:
+            return os.stat(self._stamp_path(user_id)).st_mtime_ns
+        except OSError:
+            return 0
+
+    def begin(self) -> Tuple[int, int]:
+        """조회 시작 전에 호출 - put 에 넘길 (세대, 시작 시각)"""
+        return self.generation, time.time_ns()
+
+    def get(self, key: Tuple[str, str]) -> Tuple[bool, Any]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] < time.monotonic():
+                entry = None
+            elif self._stamp_ns(key[0]) > entry[1]:
+                self.remote_invalidations += 1
+                entry = None
+            if entry is None:
+                del self._entries[key]
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[2]
+
+    def put(self, key: Tuple[str, str], value: Any, token: Optional[Tuple[int, int]] = None):
+        generation, started_ns = token if token is not None else self.begin()
+        if self.ttl <= 0 or generation != self.generation:
+            return
+        if self._stamp_ns(key[0]) > started_ns:
+            # 조회 도중 다른 워커가 저장
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, started_ns, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: str):
+        self.generation += 1
+        for key in [key for key in self._entries if key[0] == user_id]:
+            del self._entries[key]
+        if self.shared_dir:
+            try:
+                path = self._stamp_path(user_id)
+                with open(path, "a"):
+                    pass
+                os.utime(path, ns=(time.time_ns(), time.time_ns()))
+            except OSError as e:
+                logger.warning(f"⚠️ 캘리브레이션 무효화 스탬프 기록 실패: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses,
+                "remote_invalidations": self.remote_invalidations, "ttl_sec": self.ttl}
+
+
 class CalibrationService:
-    def __init__(self):
-        self.supabase_client = None
-        self._initialize_supabase()
+    def __init__(self, client: PostgRESTClient = postgrest):
+        self.client = client
+        self.cache = CalibrationCache()
+        # camera_calibrations -> users 외래키가 없으면 임베딩 불가 - 두 번 조회로 대체
+        self._embedding_supported = True
+        if self.client.configured:
+            logger.info("✅ Supabase PostgREST 클라이언트 설정 확인")
+        else:
+            logger.warning("⚠️ Supabase 환경변수가 설정되지 않음")
     
-    def _initialize_supabase(self):
-        """Supabase 클라이언트 초기화"""
-        try:
-            from supabase import create_client, Client
-            import os
-            
-            supabase_url = os.getenv("SUPABASE_URL")
-            supabase_key = os.getenv("SUPABASE_ANON_KEY")
-            
-            if supabase_url and supabase_key:
-                self.supabase_client = create_client(supabase_url, supabase_key)
-                logger.info("✅ Supabase 클라이언트 초기화 성공")
-            else:
-                logger.warning("⚠️ Supabase 환경변수가 설정되지 않음")
-                
-        except ImportError:
-            logger.warning("⚠️ Supabase 라이브러리가 설치되지 않음")
-        except Exception as e:
-            logger.error(f"❌ Supabase 초기화 실패: {e}")
+    @property
+    def available(self) -> bool:
+        return self.client.configured
+    
+    async def close(self):
+        await self.client.close()
+    
+    # ---------- 상태 ----------
+    
+    async def _fetch_status_row(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """users.cam_calibration + 최신 camera_calibrations 1건을 한 번의 요청으로 (리소스 임베딩)"""
+        if self._embedding_supported:
+            try:
+                rows = await self.client.select(
+                    "users", _STATUS_COLUMNS, filters={"id": user_id},
+                    params={"camera_calibrations.order": "updated_at.desc", "camera_calibrations.limit": "1"}
+                )
+                if not rows:
+                    return None
+                latest = rows[0].get("camera_calibrations") or []
+                return {"cam_calibration": rows[0].get("cam_calibration", False), "latest": latest[0] if latest else None}
+            except PostgRESTError as e:
+                # PGRST200: 테이블 간 관계를 찾을 수 없음
+                if e.code != "PGRST200":
+                    raise
+                logger.warning("⚠️ camera_calibrations 임베딩 불가 (외래키 없음) - 개별 조회로 전환")
+                self._embedding_supported = False
+        
+        users = await self.client.select("users", "cam_calibration", filters={"id": user_id})
+        if not users:
+            return None
+        latest = None
+        if users[0].get("cam_calibration"):
+            calibrations = await self.client.select(
+                "camera_calibrations", "profile_name,quality_score,updated_at",
+                filters={"user_id": user_id}, order="updated_at.desc", limit=1
+            )
+            latest = calibrations[0] if calibrations else None
+        return {"cam_calibration": users[0].get("cam_calibration", False), "latest": latest}
     
     async def check_user_calibration_status(self, user_id: str) -> CalibrationStatus:
         """사용자의 캘리브레이션 상태 확인"""
         try:
-            if not self.supabase_client:
+            if not self.available:
                 return CalibrationStatus(
                     has_calibration=False,
                     user_id=user_id,
                     message="Supabase 연결 불가"
                 )
             
-            # users 테이블에서 cam_calibration 상태 확인
-            user_response = self.supabase_client.table("users").select("cam_calibration").eq("id", user_id).execute()
+            found, row = self.cache.get((user_id, _LATEST))
+            if not found:
+                token = self.cache.begin()
+                row = await self._fetch_status_row(user_id)
+                # "캘리브레이션 필요" 결과는 캐시하지 않음 (방금 캘리브레이션한 사용자가 다시 요청받지 않도록)
+                if row is not None and row["cam_calibration"] and row["latest"]:
+                    self.cache.put((user_id, _LATEST), row, token)
             
-            if not user_response.data:
+            if row is None:
                 return CalibrationStatus(
                     has_calibration=False,
                     user_id=user_id,
                     message="사용자를 찾을 수 없음"
                 )
             
-            user_data = user_response.data[0]
-            has_calibration = user_data.get("cam_calibration", False)
-            
-            if not has_calibration:
+            if not row["cam_calibration"]:
                 return CalibrationStatus(
                     has_calibration=False,
                     user_id=user_id,
                     message="캘리브레이션이 필요함"
                 )
             
-            # camera_calibrations 테이블에서 최신 캘리브레이션 데이터 확인
-            calib_response = self.supabase_client.table("camera_calibrations").select("*").eq("user_id", user_id).order("updated_at", desc=True).limit(1).execute()
-            
-            if calib_response.data:
-                calib_data = calib_response.data[0]
+            calib_data = row["latest"]
+            if calib_data:
                 return CalibrationStatus(
                     has_calibration=True,
                     user_id=user_id,
                     profile_name=calib_data.get("profile_name"),
                     quality_score=calib_data.get("quality_score"),
-                    last_updated=datetime.fromisoformat(calib_data.get("updated_at").replace("Z", "+00:00")) if calib_data.get("updated_at") else None
+                    last_updated=_parse_timestamp(calib_data.get("updated_at"))
                 )
             else:
                 return CalibrationStatus(
@@ -101,35 +238,61 @@ class CalibrationService:
                 message=f"오류 발생: {str(e)}"
             )
     
+    # ---------- 데이터 ----------
+    
     async def get_user_calibration(self, user_id: str, profile_name: str = "default") -> Optional[CalibrationData]:
-        """사용자의 캘리브레이션 데이터 조회"""
+        """사용자의 캘리브레이션 데이터 조회 (TTL 캐시 우선)"""
         try:
-            if not self.supabase_client:
+            if not self.available:
                 logger.error("❌ Supabase 클라이언트가 초기화되지 않음")
                 return None
             
-            response = self.supabase_client.table("camera_calibrations").select("*").eq("user_id", user_id).eq("profile_name", profile_name).order("updated_at", desc=True).limit(1).execute()
+            key = (user_id, profile_name)
+            found, calibration = self.cache.get(key)
+            if not found:
+                token = self.cache.begin()
+                rows = await self.client.select(
+                    "camera_calibrations", "*",
+                    filters={"user_id": user_id, "profile_name": profile_name},
+                    order="updated_at.desc", limit=1
+                )
+                calibration = CalibrationData(**rows[0]) if rows else None
+                if calibration is not None:
+                    self.cache.put(key, calibration, token)
             
-            if response.data:
-                calib_data = response.data[0]
-                return CalibrationData(**calib_data)
-            else:
-                logger.warning(f"⚠️ 사용자 {user_id}의 캘리브레이션 데이터가 없음")
-                return None
+            if calibration is not None:
+                # 호출자가 수정해도 캐시에 영향 없도록 복사본 반환
+                return calibration.model_copy()
+            logger.warning(f"⚠️ 사용자 {user_id}의 캘리브레이션 데이터가 없음")
+            return None
                 
         except Exception as e:
             logger.error(f"❌ 캘리브레이션 데이터 조회 실패: {e}")
             return None
     
-    async def save_calibration_data(self, calibration_data: CalibrationData) -> bool:
-        """캘리브레이션 데이터 저장"""
+    async def set_user_calibration_flag(self, user_id: str, cam_calibration: bool = True,
+                                        returning: bool = False) -> List[Dict[str, Any]]:
+        """users.cam_calibration 갱신 (상태 캐시 무효화)"""
         try:
-            if not self.supabase_client:
+            return await self.client.update(
+                "users",
+                {"cam_calibration": cam_calibration, "updated_at": datetime.utcnow().isoformat()},
+                filters={"id": user_id},
+                returning=returning
+            )
+        finally:
+            self.cache.invalidate_user(user_id)
+    
+    async def save_calibration_data(self, calibration_data: CalibrationData,
+                                    quality_score: Optional[float] = None) -> bool:
+        """캘리브레이션 데이터 저장 (quality_score 를 주면 필드 기준 점수와 둘 중 낮은 값)"""
+        try:
+            if not self.available:
                 logger.error("❌ Supabase 클라이언트가 초기화되지 않음")
                 return False
             
             # 데이터 유효성 검사
-            is_valid, missing_fields, quality_score = validate_calibration_data(calibration_data)
+            is_valid, missing_fields, field_score = validate_calibration_data(calibration_data)
             
             # 누락된 필드를 기본값으로 채움
             if missing_fields:
@@ -137,17 +300,21 @@ class CalibrationService:
                 calibration_data = fill_missing_calibration_data(calibration_data)
             
             # 품질 점수 업데이트
-            calibration_data.quality_score = quality_score
+            calibration_data.quality_score = field_score if quality_score is None else min(field_score, quality_score)
             calibration_data.updated_at = datetime.utcnow()
             
             # Supabase에 저장
-            response = self.supabase_client.table("camera_calibrations").upsert(calibration_data.dict()).execute()
+            try:
+                rows = await self.client.upsert("camera_calibrations", calibration_data.model_dump(mode="json"))
+            finally:
+                # 실패해도 부분 반영 가능성이 있으므로 항상 무효화
+                self.cache.invalidate_user(calibration_data.user_id)
             
-            if response.data:
+            if rows:
                 logger.info(f"✅ 캘리브레이션 데이터 저장 성공: {calibration_data.user_id}")
                 
                 # users 테이블의 cam_calibration 상태 업데이트
-                self.supabase_client.table("users").update({"cam_calibration": True}).eq("id", calibration_data.user_id).execute()
+                await self.set_user_calibration_flag(calibration_data.user_id, True)
                 
                 return True
             else:
@@ -158,6 +325,9 @@ class CalibrationService:
             logger.error(f"❌ 캘리브레이션 데이터 저장 중 오류: {e}")
             return False
     
+    def stats(self) -> Dict[str, Any]:
+        return {**self.client.stats(), "cache": self.cache.stats()}
+    
     async def process_calibration_session(self, user_id: str, session_data: Dict[str, Any]) -> CalibrationResponse:
         """캘리브레이션 세션 처리 (5초간 데이터 수집)"""
         try:
@@ -287,22 +457,63 @@ class CalibrationService:
         
         return calibration_values
     
-    async def start_calibration_session(self, user_id: str, duration_seconds: int = 5) -> str:
-        """캘리브레이션 세션 시작"""
+    async def start_calibration_session(self, user_id: str, duration_seconds: int = 5,
+                                        profile_name: str = "default") -> str:
+        """캘리브레이션 세션 시작 (서버 측 스트리밍 집계)"""
         session_id = f"calib_{user_id}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        await calibration_sessions.create(session_id, user_id, profile_name)
         logger.info(f"🎯 캘리브레이션 세션 시작: {session_id} ({duration_seconds}초)")
         return session_id
     
-    async def collect_calibration_data(self, session_id: str, frame_data: Dict[str, Any]) -> bool:
-        """캘리브레이션 프레임 데이터 수집"""
-        try:
-            # 여기서 실제 프레임 데이터를 처리하고 저장
-            # 현재는 로그만 출력
-            logger.debug(f"📊 캘리브레이션 프레임 수집: {session_id}")
-            return True
-        except Exception as e:
-            logger.error(f"❌ 캘리브레이션 데이터 수집 실패: {e}")
-            return False
+    async def collect_calibration_data(self, session_id: str, frame_data: Any) -> Optional[int]:
+        """
+        캘리브레이션 프레임 수집 - 압축 배열(FRAME_FIELDS 순서) 하나/여러 개 또는 dict
+        반환: 세션 누적 프레임 수 (세션이 없거나 만료되면 None)
+        """
+        if isinstance(frame_data, dict) and "frames" in frame_data:
+            frames = frame_data["frames"]
+        elif isinstance(frame_data, list) and frame_data and isinstance(frame_data[0], (list, dict)):
+            frames = frame_data
+        else:
+            frames = [frame_data]
+        session = await calibration_sessions.ingest(session_id, frames)
+        if session is None:
+            logger.warning(f"⚠️ 캘리브레이션 세션 없음/만료: {session_id}")
+            return None
+        logger.debug(f"📊 캘리브레이션 프레임 수집: {session_id} (+{len(frames)}, 누적 {session.frames})")
+        return session.frames
+    
+    async def finalize_calibration_session(self, session_id: str, save: bool = True) -> CalibrationResponse:
+        """누적 통계로 CalibrationData 생성 후 저장 (세션 종료)"""
+        session = await calibration_sessions.pop(session_id)
+        if session is None:
+            return CalibrationResponse(success=False, message="캘리브레이션 세션이 없거나 만료되었습니다.")
+        if not session.frames:
+            return CalibrationResponse(success=False, message="수집된 프레임이 없습니다.")
+        
+        calibration_data = session.finalize()
+        coverage = calibration_data.statistics["coverage"]
+        _, missing_fields, field_score = validate_calibration_data(calibration_data)
+        quality_score = min(field_score, coverage)
+        logger.info(f"✅ 캘리브레이션 세션 완료: {session_id} (프레임 {session.frames}개, 품질 {quality_score:.2f})")
+        
+        if save and not await self.save_calibration_data(calibration_data, quality_score=quality_score):
+            return CalibrationResponse(
+                success=False,
+                message="캘리브레이션 데이터 저장에 실패했습니다.",
+                quality_score=quality_score,
+                missing_fields=missing_fields or None
+            )
+        if not save:
+            calibration_data = fill_missing_calibration_data(calibration_data)
+            calibration_data.quality_score = quality_score
+        return CalibrationResponse(
+            success=True,
+            message="캘리브레이션이 성공적으로 완료되었습니다.",
+            calibration_data=calibration_data,
+            quality_score=quality_score,
+            missing_fields=missing_fields or None
+        )
 
 # 전역 캘리브레이션 서비스 인스턴스
 calibration_service = CalibrationService()
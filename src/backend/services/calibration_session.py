@@ -0,0 +1,557 @@
+"""
+서버 측 캘리브레이션 세션
+- 프레임이 도착할 때마다 누적 통계만 갱신 (프레임 원본은 보관하지 않음 → 세션당 O(1) 메모리)
+  · Welford 평균/분산 + 최소/최대
+  · P² 스트리밍 분위수 (Jain & Chlamtac) - EAR, 시선 중심, 자세 기준선의 중앙값/분포 폭
+- 프레임 형식: FRAME_FIELDS 순서의 압축 배열 (없는 값은 null) 또는 이름 -> 값 dict
+- 완료 시 CalibrationData 로 변환 (통계는 statistics 필드에 보관)
+- 마지막 프레임 이후 CALIBRATION_SESSION_IDLE_SEC 동안 입력이 없으면 만료
+- 멀티 워커/Pod: 누적 통계를 공유 컬렉션(Mongo calibration_sessions)에 버전과 함께 저장
+  · 수집 요청은 어느 워커에 도착해도 됨 - 로컬 사본이 없거나 버전이 어긋나면 컬렉션에서 다시 읽고 재적용
+  · 만료는 expires_at TTL 인덱스
+  · 공유 저장소 없이 WEB_CONCURRENCY > 1 이면 세션 시작을 거부 (프레임이 다른 워커에서 조용히 버려지지 않도록)
+"""
+
+import os
+import time
+import bisect
+import random
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..models.calibration import CalibrationData
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_SESSION_IDLE_SEC = float(os.getenv("CALIBRATION_SESSION_IDLE_SEC", "120"))
+CALIBRATION_MAX_SESSIONS = int(os.getenv("CALIBRATION_MAX_SESSIONS", "1000"))
+# 이 프레임 수 이상이면 표본 수 기준 품질 1.0 (5초 x 약 10fps)
+CALIBRATION_MIN_FRAMES = int(os.getenv("CALIBRATION_MIN_FRAMES", "30"))
+CALIBRATION_MAX_FRAMES_PER_REQUEST = int(os.getenv("CALIBRATION_MAX_FRAMES_PER_REQUEST", "300"))
+# 이 프로세스와 같은 앱을 서비스하는 워커 수 (server_manager 가 워커 환경에 설정)
+WORKER_COUNT = int(os.getenv("WEB_CONCURRENCY", "1"))
+# 공유 저장 버전 충돌 시 다시 읽고 재적용하는 최대 횟수 / 재시도 간 최대 대기(초, 시도마다 증가 + 무작위)
+_SAVE_ATTEMPTS = 8
+_SAVE_BACKOFF_SEC = 0.005
+
+# 압축 배열의 값 순서 (클라이언트는 /api/calibration/start 응답의 fields 를 사용)
+FRAME_FIELDS = (
+    "ear",                      # 양안 평균 EAR
+    "gaze_h", "gaze_v",         # 정규화 시선 위치 (0.0 ~ 1.0)
+    "neck_length", "neck_angle", "chin_forward", "neck_tilt",
+    "shoulder_width", "torso_height", "back_curve", "shoulder_blade_position",
+)
+_FIELD_INDEX = {name: i for i, name in enumerate(FRAME_FIELDS)}
+
+# 기존 calibration.js 의 최종값 이름으로 보낸 프레임도 허용
+LEGACY_FIELD_NAMES = {
+    "center_ear": "ear",
+    "center_h": "gaze_h",
+    "center_v": "gaze_v",
+    "neck_length_baseline": "neck_length",
+    "neck_angle_baseline": "neck_angle",
+    "chin_forward_baseline": "chin_forward",
+    "neck_tilt_baseline": "neck_tilt",
+    "shoulder_width_baseline": "shoulder_width",
+    "torso_height_baseline": "torso_height",
+    "back_curve_baseline": "back_curve",
+    "shoulder_blade_position_baseline": "shoulder_blade_position",
+}
+
+# 필드별 추적 분위수
+FIELD_QUANTILES = {
+    "ear": (0.5,),
+    "gaze_h": (0.1, 0.5, 0.9),
+    "gaze_v": (0.1, 0.5, 0.9),
+    "gaze_delta": (0.95,),
+}
+DEFAULT_QUANTILES = (0.5,)
+
+# 최종값 도출 상수 (calibration.js 기본값 비율 기준)
+BLINK_EAR_RATIO = 0.86       # 깜빡임 임계값 = 평상시 EAR 중앙값 x 비율
+BLINK_CLOSED_RATIO = 0.75    # 눈 감음 임계값
+BAND_CENTER_MIN = 0.04       # 중앙 밴드 반폭 하한
+BAND_MID_RATIO = 2.25        # 중간 밴드 = 중앙 밴드 x 비율
+SACCADE_MIN = 0.02
+SACCADE_RATIO = 1.5          # 사카드 임계값 = 프레임 간 시선 이동 p95 x 비율
+
+POSTURE_BASELINES = {
+    "neck_length": "neck_length_baseline",
+    "neck_angle": "neck_angle_baseline",
+    "chin_forward": "chin_forward_baseline",
+    "neck_tilt": "neck_tilt_baseline",
+    "shoulder_width": "shoulder_width_baseline",
+    "torso_height": "torso_height_baseline",
+    "back_curve": "back_curve_baseline",
+    "shoulder_blade_position": "shoulder_blade_position_baseline",
+}
+
+
+class P2Quantile:
+    """P² 스트리밍 분위수 추정 (마커 5개, O(1) 메모리)"""
+    __slots__ = ("p", "q", "n", "desired", "step")
+
+    def __init__(self, p: float):
+        self.p = p
+        self.q: List[float] = []
+        self.n = [0, 1, 2, 3, 4]
+        self.desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self.step = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def to_state(self) -> Dict[str, Any]:
+        return {"p": self.p, "q": list(self.q), "n": list(self.n), "desired": list(self.desired)}
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "P2Quantile":
+        estimator = cls(state["p"])
+        estimator.q = list(state["q"])
+        estimator.n = list(state["n"])
+        estimator.desired = list(state["desired"])
+        return estimator
+
+    def add(self, x: float):
+        q = self.q
+        if len(q) < 5:
+            bisect.insort(q, x)
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+
+        n = self.n
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.step[i]
+
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                sign = 1 if d > 0 else -1
+                candidate = self._parabolic(i, sign)
+                if not q[i - 1] < candidate < q[i + 1]:
+                    candidate = q[i] + sign * (q[i + sign] - q[i]) / (n[i + sign] - n[i])
+                q[i] = candidate
+                n[i] += sign
+
+    def _parabolic(self, i: int, d: int) -> float:
+        q, n = self.q, self.n
+        return q[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        q = self.q
+        if not q:
+            return None
+        if len(q) < 5:
+            # 표본이 5개 미만이면 정확한 선형 보간
+            pos = self.p * (len(q) - 1)
+            lo = int(pos)
+            hi = min(lo + 1, len(q) - 1)
+            return q[lo] + (q[hi] - q[lo]) * (pos - lo)
+        return q[2]
+
+
+class RunningStats:
+    """Welford 평균/분산 + 최소/최대 + P² 분위수"""
+    __slots__ = ("count", "mean", "m2", "min", "max", "quantiles")
+
+    def __init__(self, quantiles: Sequence[float] = DEFAULT_QUANTILES):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.quantiles = {p: P2Quantile(p) for p in quantiles}
+
+    def to_state(self) -> Dict[str, Any]:
+        # 분위수 키(0.5 등)는 Mongo 필드 이름으로 쓰지 않도록 목록으로 저장
+        return {
+            "count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max,
+            "quantiles": [estimator.to_state() for estimator in self.quantiles.values()],
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "RunningStats":
+        stats = cls(())
+        stats.count = state["count"]
+        stats.mean = state["mean"]
+        stats.m2 = state["m2"]
+        stats.min = state["min"]
+        stats.max = state["max"]
+        for estimator_state in state["quantiles"]:
+            estimator = P2Quantile.from_state(estimator_state)
+            stats.quantiles[estimator.p] = estimator
+        return stats
+
+    def add(self, x: float):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        for estimator in self.quantiles.values():
+            estimator.add(x)
+
+    @property
+    def std(self) -> float:
+        return (self.m2 / (self.count - 1)) ** 0.5 if self.count > 1 else 0.0
+
+    def quantile(self, p: float) -> Optional[float]:
+        estimator = self.quantiles.get(p)
+        return estimator.value() if estimator else None
+
+    def summary(self) -> Dict[str, Any]:
+        if not self.count:
+            return {"count": 0}
+        result = {
+            "count": self.count,
+            "mean": round(self.mean, 6),
+            "std": round(self.std, 6),
+            "min": round(self.min, 6),
+            "max": round(self.max, 6),
+        }
+        for p, estimator in self.quantiles.items():
+            result[f"p{int(p * 100)}"] = round(estimator.value(), 6)
+        return result
+
+
+def _number(value: Any) -> Optional[float]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    # NaN/inf 는 통계를 오염시키므로 버림
+    return number if number == number and abs(number) != float("inf") else None
+
+
+def parse_frame(frame: Any) -> List[Optional[float]]:
+    """압축 배열 또는 dict -> FRAME_FIELDS 순서 값 목록"""
+    values: List[Optional[float]] = [None] * len(FRAME_FIELDS)
+    if isinstance(frame, (list, tuple)):
+        for i, value in enumerate(frame[:len(FRAME_FIELDS)]):
+            values[i] = _number(value)
+    elif isinstance(frame, dict):
+        for key, value in frame.items():
+            index = _FIELD_INDEX.get(LEGACY_FIELD_NAMES.get(key, key))
+            if index is not None:
+                values[index] = _number(value)
+    else:
+        raise ValueError("frame must be an array or an object")
+    return values
+
+
+class CalibrationSession:
+    """한 사용자의 캘리브레이션 측정 (프레임 통계만 보관)"""
+
+    def __init__(self, session_id: str, user_id: str, profile_name: str = "default"):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.profile_name = profile_name
+        self.started_at = time.time()
+        self.last_seen = time.monotonic()
+        self.frames = 0
+        # 공유 저장소의 문서 버전 (저장 성공마다 1 증가)
+        self.version = 0
+        self.stats = {name: RunningStats(FIELD_QUANTILES.get(name, DEFAULT_QUANTILES)) for name in FRAME_FIELDS}
+        # 프레임 간 시선 이동량 (사카드 임계값)
+        self.gaze_delta = RunningStats(FIELD_QUANTILES["gaze_delta"])
+        self._last_gaze: Optional[Tuple[float, float]] = None
+
+    def to_state(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "profile_name": self.profile_name,
+            "started_at": self.started_at,
+            "frames": self.frames,
+            "stats": {name: stats.to_state() for name, stats in self.stats.items()},
+            "gaze_delta": self.gaze_delta.to_state(),
+            "last_gaze": list(self._last_gaze) if self._last_gaze is not None else None,
+        }
+
+    @classmethod
+    def from_state(cls, session_id: str, state: Dict[str, Any], version: int = 0) -> "CalibrationSession":
+        session = cls(session_id, state["user_id"], state.get("profile_name", "default"))
+        session.started_at = state["started_at"]
+        session.frames = state["frames"]
+        session.stats.update({name: RunningStats.from_state(value) for name, value in state["stats"].items()})
+        session.gaze_delta = RunningStats.from_state(state["gaze_delta"])
+        session._last_gaze = tuple(state["last_gaze"]) if state.get("last_gaze") else None
+        session.version = version
+        return session
+
+    def copy(self) -> "CalibrationSession":
+        session = CalibrationSession.from_state(self.session_id, self.to_state(), self.version)
+        session.last_seen = self.last_seen
+        return session
+
+    def ingest(self, frames: Iterable[Any]) -> int:
+        added = 0
+        for frame in frames:
+            values = parse_frame(frame)
+            for name, value in zip(FRAME_FIELDS, values):
+                if value is not None:
+                    self.stats[name].add(value)
+            h, v = values[_FIELD_INDEX["gaze_h"]], values[_FIELD_INDEX["gaze_v"]]
+            if h is not None and v is not None:
+                if self._last_gaze is not None:
+                    self.gaze_delta.add(((h - self._last_gaze[0]) ** 2 + (v - self._last_gaze[1]) ** 2) ** 0.5)
+                self._last_gaze = (h, v)
+            added += 1
+        self.frames += added
+        self.last_seen = time.monotonic()
+        return added
+
+    def _median(self, name: str) -> Optional[float]:
+        return self.stats[name].quantile(0.5)
+
+    def finalize(self) -> CalibrationData:
+        """누적 통계 -> CalibrationData (표본이 없는 값은 None - 저장 시 기본값으로 채움)"""
+        values: Dict[str, Any] = {}
+
+        center_ear = self._median("ear")
+        if center_ear is not None:
+            values["center_ear"] = center_ear
+            values["blink_ear_threshold"] = center_ear * BLINK_EAR_RATIO
+            values["blink_closed_threshold"] = center_ear * BLINK_CLOSED_RATIO
+
+        gaze_h, gaze_v = self.stats["gaze_h"], self.stats["gaze_v"]
+        values["center_h"] = gaze_h.quantile(0.5)
+        values["center_v"] = gaze_v.quantile(0.5)
+        if gaze_h.count and gaze_v.count:
+            # 중앙을 볼 때 시선 분포의 10~90% 폭의 절반 = 중앙 밴드
+            spread = max(gaze_h.quantile(0.9) - gaze_h.quantile(0.1), gaze_v.quantile(0.9) - gaze_v.quantile(0.1))
+            band_center = max(BAND_CENTER_MIN, spread / 2)
+            values["band_center_half"] = band_center
+            values["band_mid_half"] = band_center * BAND_MID_RATIO
+        if self.gaze_delta.count:
+            values["saccade_threshold"] = max(SACCADE_MIN, self.gaze_delta.quantile(0.95) * SACCADE_RATIO)
+
+        for name, field in POSTURE_BASELINES.items():
+            values[field] = self._median(name)
+
+        coverage = min(1.0, self.frames / max(1, CALIBRATION_MIN_FRAMES))
+        statistics = {name: stats.summary() for name, stats in self.stats.items()}
+        statistics["gaze_delta"] = self.gaze_delta.summary()
+        statistics["frames"] = self.frames
+        statistics["duration_sec"] = round(time.time() - self.started_at, 3)
+        statistics["coverage"] = round(coverage, 3)
+
+        return CalibrationData(
+            user_id=self.user_id,
+            profile_name=self.profile_name,
+            statistics=statistics,
+            **{key: (round(value, 6) if value is not None else None) for key, value in values.items()}
+        )
+
+    def info(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "user_id": self.user_id,
+            "frames": self.frames,
+            "idle_sec": round(time.monotonic() - self.last_seen, 1),
+        }
+
+
+class CalibrationSessionUnavailable(RuntimeError):
+    """멀티 워커인데 공유 저장소가 없어 다른 워커로 간 프레임을 받을 수 없음"""
+
+
+class CalibrationSessionStore:
+    """session_id -> CalibrationSession (마지막 입력 순서 유지, 유휴 세션 자동 만료)
+    - configure(collection) 이후에는 컬렉션이 기준이고 로컬 dict 는 읽기 캐시
+    - 저장은 {_id, version} 조건부 갱신 - 다른 워커가 먼저 저장했으면 다시 읽어 이번 프레임만 재적용
+    """
+
+    def __init__(self, idle_sec: float = CALIBRATION_SESSION_IDLE_SEC, max_sessions: int = CALIBRATION_MAX_SESSIONS,
+                 workers: int = WORKER_COUNT):
+        self.idle_sec = idle_sec
+        self.max_sessions = max(1, max_sessions)
+        self.workers = max(1, workers)
+        self._sessions: "OrderedDict[str, CalibrationSession]" = OrderedDict()
+        self._collection = None
+        self._sweep_task: Optional[asyncio.Task] = None
+        self.expired = 0
+        self.loaded = 0
+        self.conflicts = 0
+
+    def configure(self, collection):
+        """공유 세션 컬렉션 지정 (Mongo, expires_at TTL 인덱스 필요)"""
+        self._collection = collection
+        logger.info(f"✅ 캘리브레이션 세션 공유 저장소 사용: {getattr(collection, 'name', collection)}")
+
+    @property
+    def shared(self) -> bool:
+        return self._collection is not None
+
+    def _check_routable(self):
+        if self._collection is None and self.workers > 1:
+            raise CalibrationSessionUnavailable(
+                f"워커 {self.workers}개에 공유 세션 저장소(MongoDB)가 없어 캘리브레이션 세션을 이어받을 수 없습니다 "
+                "(MongoDB 연결 또는 WEB_CONCURRENCY=1 필요)"
+            )
+
+    def _expires_at(self) -> datetime:
+        return datetime.utcnow() + timedelta(seconds=self.idle_sec)
+
+    def _remember(self, session: CalibrationSession):
+        current = self._sessions.get(session.session_id)
+        # 동시 요청이 더 새 버전을 이미 올려 두었으면 유지
+        if current is None or current.version <= session.version:
+            self._sessions[session.session_id] = session
+        self._sessions.move_to_end(session.session_id)
+        while len(self._sessions) > self.max_sessions:
+            _, evicted = self._sessions.popitem(last=False)
+            if not self.shared:
+                logger.warning(f"⚠️ 캘리브레이션 세션 수 초과 - 가장 오래된 세션 제거: {evicted.session_id}")
+
+    async def create(self, session_id: str, user_id: str, profile_name: str = "default") -> CalibrationSession:
+        self._check_routable()
+        self.sweep()
+        session = CalibrationSession(session_id, user_id, profile_name)
+        if self._collection is not None:
+            await self._collection.replace_one(
+                {"_id": session_id},
+                {"version": session.version, "state": session.to_state(), "expires_at": self._expires_at()},
+                upsert=True
+            )
+        self._remember(session)
+        return session
+
+    def get(self, session_id: str) -> Optional[CalibrationSession]:
+        """이 워커 메모리의 세션 (공유 모드에서는 최신이 아닐 수 있음)"""
+        session = self._sessions.get(session_id)
+        if session is None:
+            return None
+        if time.monotonic() - session.last_seen > self.idle_sec:
+            self._expire(session_id)
+            return None
+        return session
+
+    async def _load(self, session_id: str) -> Optional[CalibrationSession]:
+        document = await self._collection.find_one({"_id": session_id, "expires_at": {"$gt": datetime.utcnow()}})
+        if document is None:
+            self._sessions.pop(session_id, None)
+            return None
+        self.loaded += 1
+        session = CalibrationSession.from_state(session_id, document["state"], document["version"])
+        self._remember(session)
+        return session
+
+    async def _save(self, session: CalibrationSession) -> bool:
+        result = await self._collection.update_one(
+            {"_id": session.session_id, "version": session.version},
+            {"$set": {"state": session.to_state(), "expires_at": self._expires_at()}, "$inc": {"version": 1}}
+        )
+        if not result.matched_count:
+            return False
+        session.version += 1
+        return True
+
+    async def ingest(self, session_id: str, frames: Sequence[Any]) -> Optional[CalibrationSession]:
+        if len(frames) > CALIBRATION_MAX_FRAMES_PER_REQUEST:
+            raise ValueError(f"too many frames in one request (max {CALIBRATION_MAX_FRAMES_PER_REQUEST})")
+        if self._collection is None:
+            session = self.get(session_id)
+            if session is None:
+                return None
+            session.ingest(frames)
+            self._sessions.move_to_end(session_id)
+            return session
+
+        # 사본에 적용 후 조건부 저장 - 실패한 시도의 프레임이 로컬 사본에 남지 않도록
+        cached = self.get(session_id)
+        for attempt in range(_SAVE_ATTEMPTS):
+            base = cached if cached is not None else await self._load(session_id)
+            if base is None:
+                return None
+            session = base.copy()
+            session.ingest(frames)
+            if await self._save(session):
+                self._remember(session)
+                return session
+            self.conflicts += 1
+            cached = None
+            await asyncio.sleep(random.uniform(0, _SAVE_BACKOFF_SEC * (attempt + 1)))
+        raise RuntimeError(f"calibration session {session_id} is being updated concurrently")
+
+    async def pop(self, session_id: str) -> Optional[CalibrationSession]:
+        if self._collection is None:
+            session = self.get(session_id)
+            if session is not None:
+                del self._sessions[session_id]
+            return session
+
+        # 컬렉션 문서가 기준 - 삭제에 성공한 워커 하나만 완료 처리
+        self._sessions.pop(session_id, None)
+        document = await self._collection.find_one_and_delete({"_id": session_id})
+        if document is None or document["expires_at"] <= datetime.utcnow():
+            return None
+        return CalibrationSession.from_state(session_id, document["state"], document["version"])
+
+    def _expire(self, session_id: str):
+        session = self._sessions.pop(session_id, None)
+        if session is None or self.shared:
+            # 공유 모드의 로컬 사본은 캐시일 뿐 - 실제 만료는 TTL 인덱스
+            return
+        self.expired += 1
+        logger.info(f"⌛ 캘리브레이션 세션 만료: {session_id} (프레임 {session.frames}개)")
+
+    def sweep(self) -> int:
+        """유휴 세션 정리 (앞쪽이 가장 오래 입력이 없던 세션)"""
+        deadline = time.monotonic() - self.idle_sec
+        removed = 0
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_seen > deadline:
+                break
+            self._expire(session_id)
+            removed += 1
+        return removed
+
+    async def _sweep_loop(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+    def start(self):
+        if self._collection is None and self.workers > 1:
+            logger.error(f"❌ 캘리브레이션 세션 공유 저장소 없음 (워커 {self.workers}개) - 세션 시작 요청을 거부합니다")
+        if self._sweep_task is None:
+            self._sweep_task = asyncio.create_task(self._sweep_loop(max(1.0, self.idle_sec / 4)))
+
+    async def stop(self):
+        if self._sweep_task is None:
+            return
+        self._sweep_task.cancel()
+        try:
+            await self._sweep_task
+        except asyncio.CancelledError:
+            pass
+        self._sweep_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {"active": len(self._sessions), "expired": self.expired, "shared": self.shared,
+                "loaded": self.loaded, "conflicts": self.conflicts}
+
+
+# 전역 인스턴스
+calibration_sessions = CalibrationSessionStore()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+대화 컨텍스트 조립기
+- 세션별 최근 대화 링 버퍼 (최초 1회 get_session_messages 로 하이드레이션, 이후 메모리에서 갱신)
+- 멀티 워커: 요청마다 세션 문서의 message_count / last_message_at 만 조회해, 다른 워커가 저장한 턴이 있으면
+  다시 하이드레이션 (이 워커의 아직 저장되지 않은 턴은 뒤에 유지)
+- 벡터 저장소에서 현재 메시지와 관련된 과거 대화 top-k 검색 (최근 창에 이미 있는 턴은 제외)
+- 토큰 예산 안에서 최신 턴부터 채우고, 검색 결과는 별도 예산으로 시스템 노트에 추가
+- 토큰 수는 tiktoken 기준 (미설치 시 est_tokens 추정)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+from .personas.prompt_protocol import count_tokens
+
+logger = logging.getLogger(__name__)
+
+# 메모리에 유지하는 세션당 최근 메시지 수 (사용자+AI 각각 1개)
+CONTEXT_RECENT_MESSAGES = int(os.getenv("CONTEXT_RECENT_MESSAGES", "12"))
+# 워커당 기억하는 세션 수 (LRU)
+CONTEXT_MAX_SESSIONS = int(os.getenv("CONTEXT_MAX_SESSIONS", "2000"))
+# 이전 대화(최근 창 + 검색 결과) 전체 토큰 예산 / 그중 검색 결과 몫
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "1200"))
+CONTEXT_RETRIEVAL_BUDGET = int(os.getenv("CONTEXT_RETRIEVAL_BUDGET", "300"))
+CONTEXT_RETRIEVAL_TOP_K = int(os.getenv("CONTEXT_RETRIEVAL_TOP_K", "4"))
+CONTEXT_RETRIEVAL_MIN_SCORE = float(os.getenv("CONTEXT_RETRIEVAL_MIN_SCORE", "0.35"))
+# 검색이 늦으면 검색 결과 없이 진행 (응답 지연 상한)
+CONTEXT_RETRIEVAL_TIMEOUT_SEC = float(os.getenv("CONTEXT_RETRIEVAL_TIMEOUT_SEC", "1.0"))
+# 요청마다 세션 버전을 확인해 다른 워커의 턴을 반영 (WEB_CONCURRENCY=1 이면 꺼도 됨)
+CONTEXT_RESYNC = os.getenv("CONTEXT_RESYNC", "true").lower() in ("1", "true", "yes")
+
+# 메시지 하나당 채팅 포맷 오버헤드 (role/구분 토큰)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+@dataclass
+class Turn:
+    """대화 메시지 하나 (토큰 수는 한 번만 계산)"""
+    role: str
+    content: str
+    message_id: Optional[str] = None
+    timestamp: Optional[datetime] = None
+    tokens: int = 0
+
+    def __post_init__(self):
+        if not self.tokens:
+            self.tokens = count_tokens(self.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class SessionMemory:
+    turns: Deque[Turn]
+    hydrated: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    last_used: float = field(default_factory=time.time)
+    # 마지막 하이드레이션 시점의 저장된 메시지 수 + 그 뒤 이 워커가 기록한(저장 예정) 턴 수
+    synced_count: int = 0
+    local_since_sync: int = 0
+
+    def ids(self) -> Set[str]:
+        return {turn.message_id for turn in self.turns if turn.message_id}
+
+    def latest_at(self) -> Optional[datetime]:
+        stamps = [turn.timestamp for turn in self.turns if isinstance(turn.timestamp, datetime)]
+        return max(stamps) if stamps else None
+
+    def is_stale(self, version: Dict[str, Any]) -> bool:
+        """세션 문서 버전에 이 워커가 모르는 턴이 있는지"""
+        if int(version.get("message_count") or 0) > self.synced_count + self.local_since_sync:
+            return True
+        last_message_at = version.get("last_message_at")
+        latest = self.latest_at()
+        return isinstance(last_message_at, datetime) and latest is not None and last_message_at > latest
+
+
+class ContextAssembler:
+    """세션 기억 + 검색 컨텍스트 조립"""
+
+    def __init__(self,
+                 loader=None,
+                 retriever=None,
+                 probe=None,
+                 recent_messages: int = CONTEXT_RECENT_MESSAGES,
+                 max_sessions: int = CONTEXT_MAX_SESSIONS,
+                 token_budget: int = CONTEXT_TOKEN_BUDGET,
+                 retrieval_budget: int = CONTEXT_RETRIEVAL_BUDGET):
+        # loader(session_id, limit) -> 시간순 메시지 dict 목록
+        # retriever(query, session_id, top_k) -> [{content_id, text, similarity_score, metadata}]
+        # probe(session_id) -> {message_count, last_message_at} | None (세션 문서 버전)
+        self.loader = loader
+        self.retriever = retriever
+        self.probe = probe
+        self.recent_messages = max(2, recent_messages)
+        self.max_sessions = max(1, max_sessions)
+        self.token_budget = token_budget
+        self.retrieval_budget = min(retrieval_budget, token_budget)
+        self._sessions: "OrderedDict[str, SessionMemory]" = OrderedDict()
+
+        self.hydrations = 0
+        self.resyncs = 0
+        self.retrieval_timeouts = 0
+        self.assembled = 0
+
+    def configure(self, loader=None, retriever=None, probe=None):
+        if loader is not None:
+            self.loader = loader
+        if retriever is not None:
+            self.retriever = retriever
+        if probe is not None:
+            self.probe = probe
+
+    # ---------- 세션 기억 ----------
+
+    def _memory(self, session_id: str) -> SessionMemory:
+        memory = self._sessions.get(session_id)
+        if memory is None:
+            memory = SessionMemory(turns=deque(maxlen=self.recent_messages))
+            self._sessions[session_id] = memory
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        memory.last_used = time.time()
+        return memory
+
+    async def _version(self, session_id: str) -> Optional[Dict[str, Any]]:
+        if self.probe is None or not CONTEXT_RESYNC:
+            return None
+        try:
+            return await self.probe(session_id)
+        except Exception as e:
+            logger.debug(f"세션 버전 조회 실패 ({session_id}): {e}")
+            return None
+
+    async def _hydrate(self, session_id: str, memory: SessionMemory, exclude_ids: Set[str]):
+        """최초 1회, 그리고 다른 워커가 저장한 턴이 있을 때 DB 에서 최근 메시지를 읽어 링 버퍼를 채웁니다."""
+        if self.loader is None:
+            memory.hydrated = True
+            return
+        version = await self._version(session_id)
+        if memory.hydrated and (version is None or not memory.is_stale(version)):
+            return
+        async with memory.lock:
+            if memory.hydrated and (version is None or not memory.is_stale(version)):
+                return
+            try:
+                rows = await self.loader(session_id, self.recent_messages)
+            except Exception as e:
+                logger.warning(f"⚠️ 세션 기억 하이드레이션 실패 ({session_id}): {e}")
+                if memory.hydrated:
+                    return
+                rows = []
+            # DB 순서를 기준으로, 아직 저장되지 않은 이 워커의 턴(이번 요청 등)은 뒤에 붙임
+            row_ids = {str(row.get("_id")) for row in rows}
+            history = [
+                Turn(role=row.get("role", "user"), content=row.get("content", ""),
+                     message_id=str(row.get("_id")), timestamp=row.get("timestamp"))
+                for row in rows
+                if row.get("content") and str(row.get("_id")) not in exclude_ids
+            ]
+            oldest = history[0].timestamp if len(rows) >= self.recent_messages and history else None
+            pending = [
+                turn for turn in memory.turns
+                if (not turn.message_id or turn.message_id not in row_ids)
+                # 창 밖으로 밀려난 (이미 저장된) 오래된 턴은 버림
+                and not (isinstance(oldest, datetime) and isinstance(turn.timestamp, datetime) and turn.timestamp < oldest)
+            ]
+            memory.turns.clear()
+            memory.turns.extend(history + pending)
+            if version is not None:
+                memory.synced_count = int(version.get("message_count") or 0)
+                memory.local_since_sync = len(pending)
+            if memory.hydrated:
+                self.resyncs += 1
+            memory.hydrated = True
+            self.hydrations += 1
+
+    def record(self, session_id: str, role: str, content: str, message_id: Optional[str] = None,
+               timestamp: Optional[datetime] = None):
+        """새 메시지를 세션 기억에 추가 (저장과 별개로 즉시 반영)"""
+        if not content:
+            return
+        memory = self._memory(session_id)
+        if message_id and message_id in memory.ids():
+            return
+        memory.turns.append(Turn(role=role, content=content, message_id=message_id,
+                                 timestamp=timestamp or datetime.utcnow()))
+        memory.local_since_sync += 1
+
+    def forget(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    # ---------- 조립 ----------
+
+    async def build_history(self,
+                            session_id: str,
+                            user_message: str,
+                            exclude_ids: Iterable[str] = ()) -> List[Dict[str, str]]:
+        """
+        시스템 프롬프트와 현재 메시지 사이에 들어갈 메시지 목록을 만듭니다.
+        exclude_ids: 현재 요청의 메시지 ID (이미 저장됐어도 이력에 중복으로 넣지 않음)
+        """
+        exclude = set(exclude_ids)
+        memory = self._memory(session_id)
+        await self._hydrate(session_id, memory, exclude)
+
+        recent = [turn for turn in memory.turns if turn.message_id not in exclude]
+        recent_ids = {turn.message_id for turn in recent if turn.message_id}
+
+        retrieved = await self._retrieve(session_id, user_message, recent_ids | exclude)
+        note, note_tokens = self._retrieval_note(retrieved)
+
+        # 최신 턴부터 예산 안에서 채움 (검색 노트가 쓴 만큼 제외)
+        budget = self.token_budget - note_tokens
+        selected: List[Turn] = []
+        for turn in reversed(recent):
+            if turn.tokens > budget:
+                break
+            selected.append(turn)
+            budget -= turn.tokens
+        selected.reverse()
+
+        messages: List[Dict[str, str]] = []
+        if note:
+            messages.append({"role": "system", "content": note})
+        messages.extend({"role": turn.role, "content": turn.content} for turn in selected)
+        self.assembled += 1
+        return messages
+
+    async def _retrieve(self, session_id: str, query: str, skip_ids: Set[str]) -> List[Dict[str, Any]]:
+        if self.retriever is None or not query.strip():
+            return []
+        try:
+            results = await asyncio.wait_for(
+                self.retriever(query, session_id, CONTEXT_RETRIEVAL_TOP_K + len(skip_ids)),
+                timeout=CONTEXT_RETRIEVAL_TIMEOUT_SEC
+            )
+        except asyncio.TimeoutError:
+            self.retrieval_timeouts += 1
+            logger.warning(f"⚠️ 컨텍스트 검색 시간 초과 ({CONTEXT_RETRIEVAL_TIMEOUT_SEC}s) - 검색 없이 진행")
+            return []
+        except Exception as e:
+            logger.warning(f"⚠️ 컨텍스트 검색 실패: {e}")
+            return []
+
+        picked = []
+        seen_texts = set()
+        for result in results:
+            content_id = result.get("content_id")
+            text = (result.get("text") or "").strip()
+            if not text or content_id in skip_ids or text in seen_texts:
+                continue
+            if result.get("similarity_score", 0.0) < CONTEXT_RETRIEVAL_MIN_SCORE:
+                continue
+            seen_texts.add(text)
+            picked.append(result)
+            if len(picked) >= CONTEXT_RETRIEVAL_TOP_K:
+                break
+        return picked
+
+    def _retrieval_note(self, retrieved: List[Dict[str, Any]]):
+        """검색된 과거 대화를 예산 안에서 시스템 노트 하나로 묶습니다."""
+        if not retrieved:
+            return None, 0
+        header = "이전 대화에서 관련된 내용 (참고용):"
+        lines = []
+        used = count_tokens(header) + MESSAGE_OVERHEAD_TOKENS
+        for result in retrieved:
+            role = (result.get("metadata") or {}).get("role", "user")
+            line = f"- {'상대' if role == 'user' else '나'}: {result['text'].strip()}"
+            tokens = count_tokens(line) + 1
+            if used + tokens > self.retrieval_budget:
+                break
+            lines.append(line)
+            used += tokens
+        if not lines:
+            return None, 0
+        return "\n".join([header, *lines]), used
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "hydrations": self.hydrations,
+            "resyncs": self.resyncs,
+            "assembled": self.assembled,
+            "retrieval_timeouts": self.retrieval_timeouts,
+            "token_budget": self.token_budget,
+            "retrieval_budget": self.retrieval_budget,
+        }
+
+
+# 전역 인스턴스 (main_server 시작 시 loader/retriever 연결)
+context_assembler = ContextAssembler()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+요청 병합기 (coalescing batcher)
+- 짧은 윈도우 동안 들어온 개별 요청을 모아 배치 함수 한 번으로 처리
+- CoalescingEmbedder: 텍스트를 모아 embeddings.create(input=[...]) 1회 (동기 SDK 는 워커 스레드에서)
+- 벡터 저장(Pinecone 업서트 + Mongo bulk_write)도 같은 방식으로 병합
+- 동시에 나가는 배치 수 제한 (API 레이트 리밋 보호)
+"""
+
+import os
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+EMBED_BATCH_WINDOW_MS = float(os.getenv("EMBED_BATCH_WINDOW_MS", "20"))
+EMBED_MAX_BATCH = int(os.getenv("EMBED_MAX_BATCH", "64"))
+EMBED_MAX_CONCURRENT_BATCHES = int(os.getenv("EMBED_MAX_CONCURRENT_BATCHES", "4"))
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# 동기 배치 임베딩 함수: 텍스트 목록 -> 같은 순서의 벡터 목록
+EmbedBatchFn = Callable[[List[str]], List[List[float]]]
+
+
+class CoalescingBatcher(Generic[T, R]):
+    """개별 요청을 윈도우/최대 크기 단위로 모아 비동기 배치 함수에 넘깁니다."""
+
+    def __init__(self,
+                 batch_fn: Callable[[List[T]], Awaitable[List[R]]],
+                 window_ms: float = EMBED_BATCH_WINDOW_MS,
+                 max_batch: int = EMBED_MAX_BATCH,
+                 max_concurrent: int = EMBED_MAX_CONCURRENT_BATCHES,
+                 name: str = "batch"):
+        self.batch_fn = batch_fn
+        self.window = max(0.0, window_ms) / 1000.0
+        self.max_batch = max(1, max_batch)
+        self.name = name
+        self._max_concurrent = max(1, max_concurrent)
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+        self.requests = 0
+        self.batches = 0
+        self.batched_items = 0
+        self.failures = 0
+        self.total_batch_seconds = 0.0
+
+    async def submit(self, item: T) -> R:
+        """요청 하나를 제출하고 배치 결과 중 자기 몫을 기다립니다."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        self.requests += 1
+
+        if len(self._pending) >= self.max_batch:
+            self._flush_now()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self._flush_now)
+        return await future
+
+    async def submit_many(self, items: Sequence[T]) -> List[R]:
+        """여러 요청 제출 - 윈도우 안의 다른 요청과도 병합됨"""
+        return list(await asyncio.gather(*(self.submit(item) for item in items)))
+
+    def _flush_now(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[T, asyncio.Future]]):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrent)
+        items = [item for item, _ in batch]
+        try:
+            async with self._semaphore:
+                started = time.perf_counter()
+                results = await self.batch_fn(items)
+                self.total_batch_seconds += time.perf_counter() - started
+            if len(results) != len(items):
+                raise ValueError(f"배치 결과 개수 불일치: {len(results)} != {len(items)}")
+        except Exception as e:
+            self.failures += 1
+            logger.error(f"❌ {self.name} 배치 처리 실패 ({len(items)}개): {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.batched_items += len(items)
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "failures": self.failures,
+            "avg_batch_size": self.batched_items / self.batches if self.batches else 0.0,
+            "batch_seconds": self.total_batch_seconds,
+            "pending": len(self._pending),
+        }
+
+
+class CoalescingEmbedder(CoalescingBatcher[str, List[float]]):
+    """동시 임베딩 요청을 embeddings.create 배치 호출 하나로 병합"""
+
+    def __init__(self, embed_fn: EmbedBatchFn, **kwargs):
+        kwargs.setdefault("name", "embedding")
+        super().__init__(self._embed_batch, **kwargs)
+        self.embed_fn = embed_fn
+        self.api_inputs = 0
+        self.deduplicated = 0
+
+    async def embed(self, text: str) -> List[float]:
+        """텍스트 하나의 임베딩 (다른 동시 요청과 한 배치로 묶임)"""
+        return await self.submit(text)
+
+    async def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        return await self.submit_many(texts)
+
+    async def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        # 배치 내 중복 텍스트는 한 번만 요청
+        unique: Dict[str, int] = {}
+        for text in texts:
+            unique.setdefault(text, len(unique))
+        self.deduplicated += len(texts) - len(unique)
+        self.api_inputs += len(unique)
+
+        vectors = await asyncio.to_thread(self.embed_fn, list(unique))
+        if len(vectors) != len(unique):
+            raise ValueError(f"임베딩 개수 불일치: {len(vectors)} != {len(unique)}")
+        return [vectors[unique[text]] for text in texts]
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats.update({"api_inputs": self.api_inputs, "deduplicated": self.deduplicated})
+        return stats
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+임베딩 캐시
+- 키: 모델명 + 정규화 텍스트(NFC, 공백 정리)의 SHA-256
+- 1차: 프로세스 내 LRU (float32 벡터)
+- 2차(선택): 영속 저장소 - SQLite 파일 또는 MongoDB 컬렉션 (EMBED_CACHE_BACKEND)
+- 반복되는 인사말/짧은 문장의 OpenAI 임베딩 호출 제거
+"""
+
+import os
+import time
+import hashlib
+import asyncio
+import sqlite3
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+try:
+    from ..monitoring.monitoring import EMBEDDING_CACHE_REQUESTS, EMBEDDING_CACHE_ENTRIES
+    METRICS_AVAILABLE = True
+except ImportError:
+    METRICS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EMBED_CACHE_SIZE = int(os.getenv("EMBED_CACHE_SIZE", "10000"))
+# none | sqlite | mongo
+EMBED_CACHE_BACKEND = os.getenv("EMBED_CACHE_BACKEND", "none").lower()
+EMBED_CACHE_SQLITE_PATH = os.getenv("EMBED_CACHE_SQLITE_PATH", "/tmp/dys_embedding_cache.sqlite3")
+EMBED_CACHE_COLLECTION = os.getenv("EMBED_CACHE_COLLECTION", "embedding_cache")
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 텍스트 정규화 (유니코드 NFC + 앞뒤/연속 공백 정리)"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, normalized_text: str) -> str:
+    return hashlib.sha256(f"{model}\x00{normalized_text}".encode("utf-8")).hexdigest()
+
+
+class SQLiteEmbeddingStore:
+    """로컬 SQLite 영속 캐시 (호출은 워커 스레드에서)"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = EMBED_CACHE_SQLITE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY, model TEXT NOT NULL, dim INTEGER NOT NULL,"
+            " vector BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def _get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+        return {key: np.frombuffer(blob, dtype=np.float32) for key, blob in rows}
+
+    def _put_many(self, model: str, entries: Dict[str, np.ndarray]):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dim, vector, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(key, model, int(vec.shape[0]), vec.tobytes(), now) for key, vec in entries.items()]
+            )
+            self._conn.commit()
+
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        return await asyncio.to_thread(self._get_many, keys)
+
+    async def put_many(self, model: str, entries: Dict[str, np.ndarray]):
+        await asyncio.to_thread(self._put_many, model, entries)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class MongoEmbeddingStore:
+    """MongoDB 영속 캐시 (워커/Pod 간 공유)"""
+
+    name = "mongo"
+
+    def __init__(self, db, collection: str = EMBED_CACHE_COLLECTION):
+        self.collection = db[collection]
+
+    async def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        cursor = self.collection.find({"_id": {"$in": keys}}, {"vector": 1})
+        docs = await cursor.to_list(length=len(keys))
+        return {doc["_id"]: np.frombuffer(bytes(doc["vector"]), dtype=np.float32) for doc in docs}
+
+    async def put_many(self, model: str, entries: Dict[str, np.ndarray]):
+        from pymongo import UpdateOne
+        from bson.binary import Binary
+
+        now = time.time()
+        await self.collection.bulk_write([
+            UpdateOne(
+                {"_id": key},
+                {"$set": {"model": model, "dim": int(vec.shape[0]), "vector": Binary(vec.tobytes()), "created_at": now}},
+                upsert=True
+            )
+            for key, vec in entries.items()
+        ], ordered=False)
+
+    def close(self):
+        pass
+
+
+def create_store(backend: str = EMBED_CACHE_BACKEND, db=None):
+    """EMBED_CACHE_BACKEND 설정에 맞는 영속 저장소 (없으면 None)"""
+    try:
+        if backend == "sqlite":
+            return SQLiteEmbeddingStore()
+        if backend == "mongo" and db is not None:
+            return MongoEmbeddingStore(db)
+    except Exception as e:
+        logger.warning(f"⚠️ 임베딩 영속 캐시({backend}) 초기화 실패 - 메모리 캐시만 사용: {e}")
+    return None
+
+
+class EmbeddingCache:
+    """LRU + 선택적 영속 계층 임베딩 캐시"""
+
+    def __init__(self, max_entries: int = EMBED_CACHE_SIZE, store=None):
+        self.max_entries = max(0, max_entries)
+        self.store = store
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.hits = {"memory": 0, "persistent": 0}
+        self.misses = 0
+
+    def attach_store(self, store):
+        self.store = store
+
+    def _record(self, tier: str, result: str, count: int = 1):
+        if METRICS_AVAILABLE and count:
+            EMBEDDING_CACHE_REQUESTS.labels(tier=tier, result=result).inc(count)
+
+    def _remember(self, key: str, vector: np.ndarray):
+        if not self.max_entries:
+            return
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    async def get_many(self, model: str, texts: Sequence[str]) -> Dict[str, np.ndarray]:
+        """정규화 텍스트 목록 중 캐시에 있는 것만 {텍스트: 벡터} 로 반환"""
+        keys = {text: cache_key(model, text) for text in texts}
+        found: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+        for text, key in keys.items():
+            vector = self._lru.get(key)
+            if vector is not None:
+                self._lru.move_to_end(key)
+                found[text] = vector
+            else:
+                missing[key] = text
+        self.hits["memory"] += len(found)
+        self._record("memory", "hit", len(found))
+        self._record("memory", "miss", len(missing))
+
+        if missing and self.store is not None:
+            try:
+                stored = await self.store.get_many(list(missing))
+            except Exception as e:
+                logger.warning(f"⚠️ 임베딩 영속 캐시 조회 실패: {e}")
+                stored = {}
+            for key, vector in stored.items():
+                found[missing.pop(key)] = vector
+                self._remember(key, vector)
+            self.hits["persistent"] += len(stored)
+            self._record(self.store.name, "hit", len(stored))
+            self._record(self.store.name, "miss", len(missing))
+
+        self.misses += len(missing)
+        self._update_gauge()
+        return found
+
+    async def put_many(self, model: str, vectors: Dict[str, np.ndarray]):
+        """새로 만든 임베딩 저장 (메모리 + 영속 계층)"""
+        entries = {cache_key(model, text): vector for text, vector in vectors.items()}
+        for key, vector in entries.items():
+            self._remember(key, vector)
+        self._update_gauge()
+        if entries and self.store is not None:
+            try:
+                await self.store.put_many(model, entries)
+            except Exception as e:
+                logger.warning(f"⚠️ 임베딩 영속 캐시 저장 실패: {e}")
+
+    def _update_gauge(self):
+        if METRICS_AVAILABLE:
+            EMBEDDING_CACHE_ENTRIES.set(len(self._lru))
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits["memory"] + self.hits["persistent"] + self.misses
+        return {
+            "entries": len(self._lru),
+            "max_entries": self.max_entries,
+            "backend": self.store.name if self.store is not None else "none",
+            "memory_hits": self.hits["memory"],
+            "persistent_hits": self.hits["persistent"],
+            "misses": self.misses,
+            "hit_ratio": (lookups - self.misses) / lookups if lookups else 0.0,
+            "bytes": sum(vec.nbytes for vec in self._lru.values()),
+        }
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
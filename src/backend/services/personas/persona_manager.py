@@ -3,6 +3,8 @@ import os
 from typing import Dict, List, Optional
 from datetime import datetime
 
+from .persona_registry import PersonaRegistry, persona_registry
+
 class PersonaManager:
     """새로운 프로토콜 기반 페르소나 관리 시스템"""
     
@@ -14,6 +16,8 @@ class PersonaManager:
         else:
             self.personas_dir = personas_dir
         self.config_file = os.path.join(self.personas_dir, "personas_config.json")
+        self.registry = persona_registry if self.personas_dir == persona_registry.personas_dir \
+            else PersonaRegistry(self.personas_dir)
         self.ensure_directory()
     
     def ensure_directory(self):
@@ -51,9 +55,10 @@ class PersonaManager:
             return self.load_config()
     
     def save_config(self, config: Dict):
-        """설정 파일 저장"""
+        """설정 파일 저장 (레지스트리 즉시 갱신)"""
         with open(self.config_file, 'w', encoding='utf-8') as f:
             json.dump(config, f, ensure_ascii=False, indent=2)
+        self.registry.reload()
     
     def get_available_personas(self) -> List[str]:
         """사용 가능한 페르소나 목록 반환 (파일 기반)"""
@@ -116,23 +121,9 @@ class PersonaManager:
         return True
     
     def get_active_persona(self) -> Optional[Dict]:
-        """현재 활성 페르소나 반환"""
-        config = self.load_config()
-        active_id = config.get("active_persona", "이서아")
-        
-        # 시스템 파일 존재 확인 (한글 파일명 우선)
-        system_file = os.path.join(self.personas_dir, f"system_{active_id}.txt")
-        if not os.path.exists(system_file):
-            print(f"⚠️ 활성 페르소나 시스템 파일이 없습니다: {system_file}")
-            return None
-        
-        persona_info = config.get("personas", {}).get(active_id, {})
-        return {
-            "id": active_id,
-            "name": persona_info.get("name", active_id),
-            "description": persona_info.get("description", ""),
-            "system_file": f"system_{active_id}.txt"
-        }
+        """현재 활성 페르소나 반환 (메모리 레지스트리 - 파일 I/O 없음)"""
+        active = self.registry.active()
+        return active.info() if active else None
     
     def create_persona(self, persona_id: str, name: str, description: str = "", system_content: str = ""):
         """새로운 페르소나 생성"""
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+persona_registry.py
+- personas_config.json / system_*.txt / message_protocol.json 을 한 번 읽어 불변 스냅샷으로 컴파일
+- 채팅 경로(compile_messages, 활성 페르소나 조회)는 메모리 스냅샷만 사용 (파일 I/O 없음)
+- 디렉토리 파일의 mtime/크기 변화를 주기적으로 확인해 바뀌면 다시 컴파일 후 스냅샷 교체
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .prompt_protocol import count_tokens
+
+logger = logging.getLogger(__name__)
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+
+# 파일 변경 확인 주기 (0 이면 감시 안 함)
+PERSONA_WATCH_INTERVAL_SEC = float(os.getenv("PERSONA_WATCH_INTERVAL_SEC", "2.0"))
+
+DEFAULT_PERSONA_ID = "이서아"
+DEFAULT_SYSTEM_TEXT = "당신은 '이서아'입니다. 처음 뵙는 사람에게 정중하고 따뜻하게 대화하는 마케팅 담당자입니다."
+
+# 한글 이름 <-> 영문 파일 ID (system_iseoa.txt 등 영문 파일명 호환)
+NAME_ALIASES = {
+    "이서아": "iseoa",
+    "김연진": "kimyeonjin",
+    "박민수": "parkminsu"
+}
+
+
+def _freeze(value: Any) -> Any:
+    """dict/list 를 읽기 전용 구조로 변환"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@dataclass(frozen=True)
+class CompiledPersona:
+    """컴파일된 페르소나 (시스템 프롬프트와 토큰 수 미리 계산)"""
+    id: str
+    name: str
+    description: str
+    system_file: str
+    system_text: str
+    system_tokens: int
+
+    def info(self) -> Dict[str, str]:
+        """get_active_persona() 와 같은 형식"""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "description": self.description,
+            "system_file": self.system_file
+        }
+
+    def system_message(self) -> Dict[str, str]:
+        # 호출자가 수정해도 스냅샷에 영향 없도록 매번 새 dict
+        return {"role": "system", "content": self.system_text}
+
+
+DEFAULT_PERSONA = CompiledPersona(
+    id=DEFAULT_PERSONA_ID,
+    name=DEFAULT_PERSONA_ID,
+    description="",
+    system_file="",
+    system_text=DEFAULT_SYSTEM_TEXT,
+    system_tokens=count_tokens(DEFAULT_SYSTEM_TEXT)
+)
+
+
+@dataclass(frozen=True)
+class PersonaSnapshot:
+    """한 시점의 페르소나 전체 (교체만 하고 수정하지 않음)"""
+    personas: Mapping[str, CompiledPersona]
+    aliases: Mapping[str, str]
+    active_id: Optional[str]
+    protocol: Mapping[str, Any]
+    version: int
+    loaded_at: float
+    signature: Tuple = field(default=(), repr=False)
+
+    def get(self, persona_name: Optional[str]) -> CompiledPersona:
+        if persona_name:
+            persona = self.personas.get(persona_name) or self.personas.get(self.aliases.get(persona_name, ""))
+            if persona is not None:
+                return persona
+            logger.warning(f"⚠️ 시스템 파일을 찾을 수 없습니다: {persona_name} - 기본 페르소나 사용")
+        return self.personas.get(DEFAULT_PERSONA_ID) or DEFAULT_PERSONA
+
+    def active(self) -> Optional[CompiledPersona]:
+        if self.active_id is None:
+            return None
+        return self.personas.get(self.active_id)
+
+
+class PersonaRegistry:
+    """페르소나 스냅샷 보관 + 변경 감시"""
+
+    def __init__(self, personas_dir: str = BASE):
+        self.personas_dir = personas_dir
+        self.config_file = os.path.join(personas_dir, "personas_config.json")
+        self.protocol_file = os.path.join(personas_dir, "message_protocol.json")
+        self._snapshot: Optional[PersonaSnapshot] = None
+        self._lock = threading.Lock()
+        self._watch_task: Optional[asyncio.Task] = None
+        self.reloads = 0
+
+    # ---------- 로드 ----------
+
+    def _signature(self) -> Tuple:
+        """감시 대상 파일의 (이름, mtime_ns, 크기) - 하나라도 바뀌면 다시 컴파일"""
+        entries = []
+        try:
+            with os.scandir(self.personas_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if name in ("personas_config.json", "message_protocol.json") or \
+                            (name.startswith("system_") and name.endswith(".txt")):
+                        stat = entry.stat()
+                        entries.append((name, stat.st_mtime_ns, stat.st_size))
+        except FileNotFoundError:
+            pass
+        return tuple(sorted(entries))
+
+    def _read_json(self, path: str) -> Dict[str, Any]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _compile(self, signature: Tuple, version: int) -> PersonaSnapshot:
+        config = self._read_json(self.config_file)
+        protocol = self._read_json(self.protocol_file)
+        config_personas = config.get("personas", {})
+
+        personas: Dict[str, CompiledPersona] = {}
+        for name, _, _ in signature:
+            if not (name.startswith("system_") and name.endswith(".txt")):
+                continue
+            persona_id = name[len("system_"):-len(".txt")]
+            try:
+                with open(os.path.join(self.personas_dir, name), "r", encoding="utf-8") as f:
+                    system_text = f.read()
+            except OSError as e:
+                logger.warning(f"⚠️ 시스템 파일 읽기 실패 ({name}): {e}")
+                continue
+            info = config_personas.get(persona_id, {})
+            personas[persona_id] = CompiledPersona(
+                id=persona_id,
+                name=info.get("name", persona_id),
+                description=info.get("description", ""),
+                system_file=name,
+                system_text=system_text,
+                system_tokens=count_tokens(system_text)
+            )
+
+        aliases = {}
+        for korean, english in NAME_ALIASES.items():
+            if korean in personas:
+                aliases[english] = korean
+            elif english in personas:
+                aliases[korean] = english
+        for persona in personas.values():
+            if persona.name != persona.id:
+                aliases.setdefault(persona.name, persona.id)
+
+        active_id = config.get("active_persona", DEFAULT_PERSONA_ID)
+        if active_id not in personas:
+            if config:
+                logger.warning(f"⚠️ 활성 페르소나 시스템 파일이 없습니다: system_{active_id}.txt")
+            active_id = None
+
+        return PersonaSnapshot(
+            personas=MappingProxyType(personas),
+            aliases=MappingProxyType(aliases),
+            active_id=active_id,
+            protocol=_freeze(protocol),
+            version=version,
+            loaded_at=time.time(),
+            signature=signature
+        )
+
+    def reload(self, force: bool = True) -> bool:
+        """파일에서 다시 컴파일 (force=False 이면 변경이 있을 때만). 교체했으면 True"""
+        with self._lock:
+            signature = self._signature()
+            current = self._snapshot
+            if not force and current is not None and current.signature == signature:
+                return False
+            snapshot = self._compile(signature, (current.version + 1) if current else 1)
+            self._snapshot = snapshot
+            self.reloads += 1
+        logger.info(
+            f"🎭 페르소나 레지스트리 로드 v{snapshot.version} - "
+            f"{len(snapshot.personas)}개, 활성: {snapshot.active_id}"
+        )
+        return True
+
+    @property
+    def snapshot(self) -> PersonaSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            self.reload()
+            snapshot = self._snapshot
+        return snapshot
+
+    # ---------- 조회 (메모리만 사용) ----------
+
+    def get(self, persona_name: Optional[str] = None) -> CompiledPersona:
+        return self.snapshot.get(persona_name)
+
+    def active(self) -> Optional[CompiledPersona]:
+        return self.snapshot.active()
+
+    def active_or_default(self) -> CompiledPersona:
+        return self.snapshot.active() or self.snapshot.get(None)
+
+    @property
+    def protocol(self) -> Mapping[str, Any]:
+        return self.snapshot.protocol
+
+    # ---------- 변경 감시 ----------
+
+    async def _watch(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.reload, False)
+            except Exception as e:
+                logger.warning(f"⚠️ 페르소나 다시 로드 실패: {e}")
+
+    def start_watching(self, interval: float = PERSONA_WATCH_INTERVAL_SEC):
+        if interval <= 0 or self._watch_task is not None:
+            return
+        self._watch_task = asyncio.create_task(self._watch(interval))
+
+    async def stop_watching(self):
+        if self._watch_task is None:
+            return
+        self._watch_task.cancel()
+        try:
+            await self._watch_task
+        except asyncio.CancelledError:
+            pass
+        self._watch_task = None
+
+    def stats(self) -> Dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version if snapshot else 0,
+            "personas": sorted(snapshot.personas) if snapshot else [],
+            "active": snapshot.active_id if snapshot else None,
+            "reloads": self.reloads,
+            "watching": self._watch_task is not None,
+        }
+
+
+# 전역 인스턴스
+persona_registry = PersonaRegistry()
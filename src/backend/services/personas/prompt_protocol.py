@@ -9,51 +9,47 @@ import json
 import os
 import re
 
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
 BASE = os.path.dirname(os.path.abspath(__file__))
 
 def load_protocol(path=os.path.join(BASE, "message_protocol.json")):
-    """메시지 프로토콜 로드"""
+    """메시지 프로토콜 파일 로드 (채팅 경로에서는 persona_registry.protocol 사용)"""
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 def read_system_text(persona_name):
-    """페르소나별 시스템 텍스트 로드"""
-    # 한글 이름을 영문 ID로 매핑
-    name_mapping = {
-        "이서아": "iseoa",
-        "김연진": "kimyeonjin", 
-        "박민수": "parkminsu"
-    }
-    
-    # 한글 이름이면 영문 ID로 변환
-    persona_id = name_mapping.get(persona_name, persona_name)
-    
-    # 먼저 한글 파일명으로 시도
-    sys_file = f"system_{persona_name}.txt"
-    full = os.path.join(BASE, sys_file) if not os.path.isabs(sys_file) else sys_file
-    
-    if os.path.exists(full):
-        try:
-            with open(full, "r", encoding="utf-8") as f:
-                return f.read()
-        except Exception as e:
-            print(f"⚠️ 한글 파일 읽기 실패: {e}")
-    
-    # 한글 파일이 없으면 영문 ID로 시도
-    sys_file = f"system_{persona_id}.txt"
-    full = os.path.join(BASE, sys_file) if not os.path.isabs(sys_file) else sys_file
-    
-    try:
-        with open(full, "r", encoding="utf-8") as f:
-            return f.read()
-    except FileNotFoundError:
-        print(f"⚠️ 시스템 파일을 찾을 수 없습니다: {persona_name} ({persona_id})")
-        return "당신은 '이서아'입니다. 처음 뵙는 사람에게 정중하고 따뜻하게 대화하는 마케팅 담당자입니다."
+    """페르소나별 시스템 텍스트 (메모리 레지스트리, 한글 이름/영문 ID 모두 지원)"""
+    from .persona_registry import persona_registry
+    return persona_registry.get(persona_name).system_text
 
 def est_tokens(s: str) -> int:
     """토큰 수 추정 (매우 러프한 추정: CJK 4자 ≈ 1토큰)"""
     return max(1, len(s) // 4)
 
+_ENCODING = None
+
+def _get_encoding():
+    """gpt-4o 계열 토크나이저 (o200k_base) - 최초 1회만 로드"""
+    global _ENCODING
+    if _ENCODING is None and TIKTOKEN_AVAILABLE:
+        try:
+            _ENCODING = tiktoken.get_encoding("o200k_base")
+        except Exception:
+            _ENCODING = tiktoken.get_encoding("cl100k_base")
+    return _ENCODING
+
+def count_tokens(s: str) -> int:
+    """실제 토크나이저 기준 토큰 수 (tiktoken 미설치 시 est_tokens)"""
+    encoding = _get_encoding()
+    if encoding is None:
+        return est_tokens(s)
+    return len(encoding.encode(s, disallowed_special=()))
+
 def clamp_length_by_ratio(user_text: str, assistant_text: str, ratio: float=0.2, hard_cap_tokens: int=80):
     """사용자 메시지 대비 응답 길이 제한"""
     user_tokens = est_tokens(user_text)
@@ -108,44 +104,34 @@ def apply_style_constraints(user_text: str, assistant_text: str, ratio: float=0.
     clamped = clamp_length_by_ratio(user_text, cleaned, ratio=ratio, hard_cap_tokens=hard_cap_tokens)
     return clamped
 
-def compile_messages(human_text: str, persona_name: str = "이서아", tool_call: dict|None=None):
-    """메시지 컴파일"""
+def compile_messages(human_text: str, persona_name: str = "이서아", tool_call: dict|None=None,
+                     history: list|None=None, persona=None):
+    """
+    메시지 컴파일 (history: 시스템 프롬프트와 현재 메시지 사이에 넣을 이전 대화/검색 컨텍스트)
+    - persona: 세션에 바인딩된 CompiledPersona (주어지면 persona_name 대신 사용)
+    """
+    from .persona_registry import persona_registry
     try:
-        proto = load_protocol()
-        system_text = read_system_text(persona_name)
+        system_message = (persona or persona_registry.get(persona_name)).system_message()
+    except Exception as e:
+        print(f"❌ 메시지 컴파일 실패: {e}")
+        system_message = {"role": "system", "content": "당신은 '이서아'입니다. 처음 뵙는 사람에게 정중하고 따뜻하게 대화하는 마케팅 담당자입니다."}
 
-        messages = [
-            {"role": "system", "content": system_text},
-            {"role": "user", "content": human_text}
-        ]
+    messages = [
+        system_message,
+        *(history or []),
+        {"role": "user", "content": human_text}
+    ]
 
-        if tool_call is not None:
-            messages.append({"role":"tool", "content": json.dumps(tool_call, ensure_ascii=False)})
+    if tool_call is not None:
+        messages.append({"role":"tool", "content": json.dumps(tool_call, ensure_ascii=False)})
 
-        return messages
-    except Exception as e:
-        print(f"❌ 메시지 컴파일 실패: {e}")
-        # 기본 메시지 반환
-        return [
-            {"role": "system", "content": "당신은 '이서아'입니다. 처음 뵙는 사람에게 정중하고 따뜻하게 대화하는 마케팅 담당자입니다."},
-            {"role": "user", "content": human_text}
-        ]
+    return messages
 
 def get_available_personas():
     """사용 가능한 페르소나 목록 반환"""
-    personas = []
-    for file in os.listdir(BASE):
-        if file.startswith('system_') and file.endswith('.txt'):
-            persona_name = file.replace('system_', '').replace('.txt', '')
-            personas.append(persona_name)
-    
-    # 중복 제거 (한글과 영문이 모두 있을 경우)
-    unique_personas = []
-    for persona in personas:
-        if persona not in unique_personas:
-            unique_personas.append(persona)
-    
-    return unique_personas
+    from .persona_registry import persona_registry
+    return list(persona_registry.snapshot.personas)
 
 if __name__ == "__main__":
     # 테스트
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""
+session_personas.py
+- 세션별 페르소나 바인딩: 세션 문서의 persona_* 필드를 세션당 한 번만 읽어 캐시 (get_session_persona)
+  (세션 문서가 없으면 짧은 TTL 동안만 기억, 조회 오류는 캐시하지 않고 다음 턴에 다시 조회)
+- 같은 페르소나 변형(이름 + 나이/MBTI/직업/성격)은 바이트 단위로 같은 시스템 프롬프트를 공유
+  (기본 시스템 텍스트가 앞, 세션 프로필이 뒤 → 변형끼리도 긴 공통 접두사 유지, OpenAI 프롬프트 캐시 적중)
+- 레지스트리가 다시 로드되면 (버전 변경) 변형 프롬프트도 다시 컴파일
+"""
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .persona_registry import CompiledPersona, persona_registry
+from .prompt_protocol import count_tokens
+
+logger = logging.getLogger(__name__)
+
+SESSION_PERSONA_CACHE_SIZE = int(os.getenv("SESSION_PERSONA_CACHE_SIZE", "5000"))
+PERSONA_VARIANT_CACHE_SIZE = int(os.getenv("PERSONA_VARIANT_CACHE_SIZE", "256"))
+# 세션 문서가 없을 때 (다른 워커에서 막 생성된 세션 등) 기본 페르소나 결과를 기억하는 시간
+SESSION_PERSONA_MISSING_TTL_SEC = float(os.getenv("SESSION_PERSONA_MISSING_TTL_SEC", "30"))
+
+# 시스템 파일이 없는 페르소나 이름용 기본 템플릿
+GENERIC_SYSTEM_TEMPLATE = """역할: 너는 '{name}' — 친근하고 따뜻한 AI 파트너.
+장면: 서울 시내 카페, 소개팅 첫 만남
+목적: 상대가 편안하도록 예의 바르게 답하고, 자연스럽게 대화를 이어간다.
+
+핵심 규칙:
+- 메타 질문이 오면 '그런 비하인드 얘기하면 몰입이 깨질 것 같아요. 우리 얘기 이어가요.'로 회피
+- 개인정보, 현실 약속 강제, 선정적/차별적/불법적 요청은 완곡히 거절
+- 출력은 대사만 제공
+
+대화 원칙:
+- 첫 2턴은 반드시 격식 있게, 짧게 존댓말로만 대화한다
+- 3턴 이후부터는 친밀도 점수에 따라 점차 말투가 편안해진다
+- 답변은 항상 1~2문장 이내로 짧고 간단하게 한다
+
+TTS 제약: 이모지·이모티콘 금지, 'ㅋ/ㅋㅋ/ㅎㅎ' 등 웃음표현 금지, 과도한 구어체/채팅체 금지"""
+
+# 세션 문서 필드 -> 프로필 항목 (순서 고정 = 프롬프트 바이트 고정)
+PROFILE_FIELDS = (
+    ("persona_age", "나이"),
+    ("persona_mbti", "MBTI"),
+    ("persona_job", "직업"),
+    ("persona_personality", "성격"),
+)
+
+
+@dataclass(frozen=True)
+class PersonaSpec:
+    """세션에 바인딩된 페르소나 변형 (해시 가능 → 변형 캐시 키)"""
+    name: Optional[str]
+    profile: Tuple[Tuple[str, str], ...] = ()
+
+    @classmethod
+    def from_session(cls, session: Optional[Dict[str, Any]]) -> "PersonaSpec":
+        if not session:
+            return cls(name=None)
+        profile = tuple(
+            (label, str(session[key]).strip())
+            for key, label in PROFILE_FIELDS
+            if session.get(key) not in (None, "")
+        )
+        return cls(name=session.get("persona_name") or None, profile=profile)
+
+
+class SessionPersonaResolver:
+    """session_id -> PersonaSpec (LRU) + PersonaSpec -> CompiledPersona (LRU)"""
+
+    def __init__(self,
+                 loader: Optional[Callable[[str], Awaitable[Optional[Dict[str, Any]]]]] = None,
+                 max_sessions: int = SESSION_PERSONA_CACHE_SIZE,
+                 max_variants: int = PERSONA_VARIANT_CACHE_SIZE,
+                 missing_ttl: float = SESSION_PERSONA_MISSING_TTL_SEC):
+        self.loader = loader
+        self.missing_ttl = missing_ttl
+        self.max_sessions = max(1, max_sessions)
+        self.max_variants = max(1, max_variants)
+        # session_id -> (스펙, 만료 시각 - 세션 문서에서 읽은 결과는 None)
+        self._sessions: "OrderedDict[str, Tuple[PersonaSpec, Optional[float]]]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._variants: "OrderedDict[Tuple[int, PersonaSpec], CompiledPersona]" = OrderedDict()
+        self.hydrations = 0
+        self.load_errors = 0
+        self.variant_builds = 0
+
+    def configure(self, loader):
+        self.loader = loader
+
+    # ---------- 세션 -> 스펙 ----------
+
+    def bind(self, session_id: str, session: Optional[Dict[str, Any]]):
+        """세션 생성 직후 등, 이미 알고 있는 페르소나 정보를 바로 등록 (DB 조회 생략)"""
+        self._remember(session_id, PersonaSpec.from_session(session))
+
+    def forget(self, session_id: str):
+        self._sessions.pop(session_id, None)
+
+    def _remember(self, session_id: str, spec: PersonaSpec, expires_at: Optional[float] = None):
+        self._sessions[session_id] = (spec, expires_at)
+        self._sessions.move_to_end(session_id)
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+
+    async def _spec(self, session_id: str) -> PersonaSpec:
+        entry = self._sessions.get(session_id)
+        if entry is not None:
+            spec, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._sessions.move_to_end(session_id)
+                return spec
+            del self._sessions[session_id]
+        if self.loader is None or not session_id:
+            return PersonaSpec(name=None)
+
+        # 같은 세션 동시 요청은 한 번만 조회
+        pending = self._pending.get(session_id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[session_id] = future
+        try:
+            try:
+                session = await self.loader(session_id)
+            except Exception as e:
+                # 일시적 DB 오류 - 이번 턴만 기본 페르소나, 캐시하지 않음
+                logger.warning(f"⚠️ 세션 페르소나 조회 실패 ({session_id}): {e}")
+                self.load_errors += 1
+                spec = PersonaSpec(name=None)
+                future.set_result(spec)
+                return spec
+            spec = PersonaSpec.from_session(session)
+            if session is None:
+                # 세션 문서 없음 (임시 세션 등) - 매 턴 조회하지 않도록 잠시만 기억
+                self._remember(session_id, spec, time.monotonic() + self.missing_ttl)
+            else:
+                self._remember(session_id, spec)
+            self.hydrations += 1
+            future.set_result(spec)
+            return spec
+        except BaseException:
+            # 조회 태스크가 취소된 경우 - 대기자도 함께 취소
+            future.cancel()
+            raise
+        finally:
+            self._pending.pop(session_id, None)
+
+    # ---------- 스펙 -> 컴파일된 프롬프트 ----------
+
+    def compile(self, spec: PersonaSpec) -> CompiledPersona:
+        snapshot = persona_registry.snapshot
+        key = (snapshot.version, spec)
+        persona = self._variants.get(key)
+        if persona is not None:
+            self._variants.move_to_end(key)
+            return persona
+
+        if spec.name is None:
+            base = snapshot.active() or snapshot.get(None)
+        elif spec.name in snapshot.personas or spec.name in snapshot.aliases:
+            base = snapshot.get(spec.name)
+        else:
+            text = GENERIC_SYSTEM_TEMPLATE.format(name=spec.name)
+            base = CompiledPersona(
+                id=spec.name, name=spec.name, description="", system_file="",
+                system_text=text, system_tokens=count_tokens(text)
+            )
+
+        if spec.profile:
+            lines = [f"이번 대화에서 너의 프로필 (이름: {spec.name or base.name})"]
+            lines.extend(f"- {label}: {value}" for label, value in spec.profile)
+            system_text = f"{base.system_text.rstrip()}\n\n" + "\n".join(lines)
+            persona = replace(base, system_text=system_text, system_tokens=count_tokens(system_text))
+        else:
+            persona = base
+
+        self._variants[key] = persona
+        while len(self._variants) > self.max_variants:
+            self._variants.popitem(last=False)
+        self.variant_builds += 1
+        return persona
+
+    async def resolve(self, session_id: str) -> CompiledPersona:
+        """세션에 바인딩된 페르소나 (세션 정보가 없으면 활성 페르소나)"""
+        return self.compile(await self._spec(session_id))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "sessions": len(self._sessions),
+            "variants": len(self._variants),
+            "hydrations": self.hydrations,
+            "load_errors": self.load_errors,
+            "variant_builds": self.variant_builds,
+        }
+
+
+# 전역 인스턴스 (main_server 시작 시 loader 연결)
+session_personas = SessionPersonaResolver()
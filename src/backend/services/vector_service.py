@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 벡터 데이터 관리 서비스
-- MongoDB와 Pinecone 연동
+- MongoDB와 벡터 백엔드(Pinecone 또는 로컬 인덱스) 연동
 - 텍스트 임베딩 생성 및 저장
 - 벡터 검색 및 메타데이터 관리
 """
@@ -11,12 +11,23 @@ import logging
 import asyncio
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from openai import OpenAI
 import math
 
+import numpy as np
+
+try:
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+from pymongo import UpdateOne
+
 # 로컬 모듈 import
-from ..database.pinecone_client import pinecone_client
+from ..database.vector_backend import get_vector_backend
 from ..database.database import get_database
+from .embedding_batcher import CoalescingBatcher, CoalescingEmbedder
+from .embedding_cache import EmbeddingCache, create_store, normalize_text
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -27,12 +38,22 @@ class VectorService:
     
     def __init__(self):
         self.openai_client = None
+        # 벡터 저장소 (VECTOR_BACKEND: pinecone | local | auto)
+        self.backend = get_vector_backend()
         self.db = None
         self.is_initialized = False
         
         # OpenAI 설정
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
         self.embedding_model = "text-embedding-3-small"  # 1536 차원
+        self.embedding_dimension = 1536
+        
+        # 반복 텍스트 임베딩 캐시 (LRU + 선택적 영속 계층)
+        self.embedding_cache = EmbeddingCache()
+        # 동시 임베딩 요청을 배치 하나로 병합 (SDK 호출은 워커 스레드에서)
+        self.embedder = CoalescingEmbedder(self._embed_batch_sync)
+        # 동시 벡터 저장도 병합 (벡터 백엔드 배치 업서트 + Mongo bulk_write)
+        self.vector_writer = CoalescingBatcher(self._write_vector_batch, name="vector_write")
         
         logger.info("🔗 벡터 서비스 초기화됨")
     
@@ -40,6 +61,10 @@ class VectorService:
         """서비스 초기화"""
         try:
             # OpenAI 클라이언트 초기화
+            if not OPENAI_AVAILABLE:
+                logger.warning("⚠️ openai 패키지가 설치되지 않았습니다. 벡터 서비스가 비활성화됩니다.")
+                return False
+            
             if not self.openai_api_key:
                 logger.warning("⚠️ OPENAI_API_KEY가 설정되지 않았습니다. 벡터 서비스가 제한적으로 동작합니다.")
                 return False
@@ -68,13 +93,15 @@ class VectorService:
                 for var, value in original_env.items():
                     os.environ[var] = value
             
-            # Pinecone 클라이언트 초기화
-            if not pinecone_client.initialize():
-                logger.error("❌ Pinecone 클라이언트 초기화 실패")
+            # 벡터 백엔드 초기화
+            if not self.backend.initialize():
+                logger.error(f"❌ 벡터 백엔드 초기화 실패: {self.backend.index_name}")
                 return False
             
             # MongoDB 연결
             self.db = await get_database()
+            if self.embedding_cache.store is None:
+                self.embedding_cache.attach_store(create_store(db=self.db))
             
             self.is_initialized = True
             logger.info("✅ 벡터 서비스 초기화 완료")
@@ -84,8 +111,45 @@ class VectorService:
             logger.error(f"❌ 벡터 서비스 초기화 실패: {e}")
             return False
     
+    def _embed_batch_sync(self, texts: List[str]) -> List[List[float]]:
+        """embeddings.create 배치 호출 (워커 스레드에서 실행)"""
+        response = self.openai_client.embeddings.create(
+            model=self.embedding_model,
+            input=texts
+        )
+        data = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in data]
+    
+    def _validate_embedding(self, embedding: Optional[List[float]]) -> bool:
+        if not embedding:
+            return False
+        # 벡터 데이터 검증
+        if len(embedding) != self.embedding_dimension:  # text-embedding-3-small 모델 차원
+            logger.error(f"❌ 임베딩 차원 불일치: {len(embedding)} != {self.embedding_dimension}")
+            return False
+        if not all(math.isfinite(x) for x in embedding):
+            logger.error("❌ 임베딩에 무한값이 포함되어 있습니다")
+            return False
+        return True
+    
+    async def _embed_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """캐시 조회 후 없는 텍스트만 병합 임베딩 요청 (검증 실패 항목은 None)"""
+        normalized = [normalize_text(text) for text in texts]
+        cached = await self.embedding_cache.get_many(self.embedding_model, set(normalized))
+        
+        missing = [text for text in dict.fromkeys(normalized) if text not in cached]
+        if missing:
+            fresh = {}
+            for text, embedding in zip(missing, await self.embedder.embed_many(missing)):
+                if self._validate_embedding(embedding):
+                    fresh[text] = np.asarray(embedding, dtype=np.float32)
+            await self.embedding_cache.put_many(self.embedding_model, fresh)
+            cached.update(fresh)
+        
+        return [cached[text].tolist() if text in cached else None for text in normalized]
+    
     async def create_embedding(self, text: str) -> Optional[List[float]]:
-        """텍스트 임베딩 생성"""
+        """텍스트 임베딩 생성 (동시 요청과 배치로 병합됨)"""
         try:
             if not self.is_initialized:
                 logger.error("❌ 벡터 서비스가 초기화되지 않았습니다")
@@ -95,25 +159,7 @@ class VectorService:
                 logger.warning("⚠️ 빈 텍스트입니다")
                 return None
             
-            # OpenAI 임베딩 생성
-            response = self.openai_client.embeddings.create(
-                model=self.embedding_model,
-                input=text.strip()
-            )
-            
-            embedding = response.data[0].embedding
-            
-            # 벡터 데이터 검증
-            if len(embedding) != 1536:  # text-embedding-3-small 모델 차원
-                logger.error(f"❌ 임베딩 차원 불일치: {len(embedding)} != 1536")
-                return None
-            
-            if not all(math.isfinite(x) for x in embedding):
-                logger.error("❌ 임베딩에 무한값이 포함되어 있습니다")
-                return None
-            
-            logger.info(f"✅ 임베딩 생성 완료 (차원: {len(embedding)})")
-            return embedding
+            return (await self._embed_texts([text]))[0]
             
         except Exception as e:
             logger.error(f"❌ 임베딩 생성 실패: {e}")
@@ -125,77 +171,98 @@ class VectorService:
                                       content_id: str,
                                       metadata: Optional[Dict[str, Any]] = None) -> bool:
         """텍스트와 임베딩을 저장"""
+        stored = await self.store_texts_with_embeddings([{
+            "text": text,
+            "content_type": content_type,
+            "content_id": content_id,
+            "metadata": metadata,
+        }])
+        return stored == 1
+    
+    async def store_texts_with_embeddings(self, items: List[Dict[str, Any]]) -> int:
+        """
+        여러 텍스트를 한 번에 임베딩/저장합니다. 저장된 개수를 반환합니다.
+        - item: text, content_type, content_id, metadata(선택), created_at(선택, 벡터 ID 고정용)
+        - 임베딩: 배치 요청 1회 (다른 동시 요청과도 병합)
+        - 저장: 동시 저장 요청과 병합해 벡터 백엔드 배치 업서트(워커 스레드) + Mongo bulk_write
+        """
         try:
             if not self.is_initialized:
                 logger.error("❌ 벡터 서비스가 초기화되지 않았습니다")
-                return False
-            
-            # 임베딩 생성
-            logger.info(f"🔄 [VECTOR_STORE] 임베딩 생성 시작 - 텍스트: '{text[:50]}...'")
-            embedding = await self.create_embedding(text)
-            if not embedding:
-                logger.error("❌ [VECTOR_STORE] 임베딩 생성 실패")
-                return False
-            logger.info(f"✅ [VECTOR_STORE] 임베딩 생성 완료 - 차원: {len(embedding)}")
-            
-            # 메타데이터 준비
-            if not metadata:
-                metadata = {}
-            
-            metadata.update({
-                "text": text,
-                "content_type": content_type,
-                "content_id": content_id,
-                "created_at": datetime.now().isoformat(),
-                "embedding_model": self.embedding_model
-            })
-            
-            # 벡터 ID 생성
-            vector_id = pinecone_client.create_embedding_id(content_type, content_id)
-            
-            # Pinecone에 벡터 저장
-            vector_data = {
-                "id": vector_id,
-                "values": embedding,
-                "metadata": metadata
-            }
-            
-            logger.info(f"💾 [VECTOR_STORE] Pinecone 저장 시작 - ID: {vector_id}")
-            if not pinecone_client.upsert_vectors([vector_data]):
-                logger.error("❌ [VECTOR_STORE] Pinecone 벡터 저장 실패")
-                return False
-            logger.info(f"✅ [VECTOR_STORE] Pinecone 저장 완료 - ID: {vector_id}")
-            
-            # MongoDB에 메타데이터 저장
-            collection = self.db.vector_embeddings
-            document = {
-                "vector_id": vector_id,
-                "text": text,
-                "content_type": content_type,
-                "content_id": content_id,
-                "metadata": metadata,
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
-            }
-            
-            await collection.update_one(
-                {"vector_id": vector_id},
-                {"$set": document},
-                upsert=True
-            )
-            
-            logger.info(f"✅ 텍스트 및 임베딩 저장 완료: {vector_id}")
-            return True
+                return 0
+            
+            items = [item for item in items if item.get("text") and item["text"].strip()]
+            if not items:
+                return 0
+            
+            logger.info(f"🔄 [VECTOR_STORE] {len(items)}개 텍스트 임베딩 생성 시작")
+            embeddings = await self._embed_texts([item["text"] for item in items])
+            
+            now = datetime.now()
+            vectors = []
+            documents = []
+            for item, embedding in zip(items, embeddings):
+                if embedding is None:
+                    continue
+                created_at = item.get("created_at") or now.isoformat()
+                metadata = dict(item.get("metadata") or {})
+                metadata.update({
+                    "text": item["text"],
+                    "content_type": item["content_type"],
+                    "content_id": item["content_id"],
+                    "created_at": created_at,
+                    "embedding_model": self.embedding_model
+                })
+                # 벡터 ID 생성 (created_at 이 주어지면 재시도해도 같은 ID)
+                vector_id = self.backend.create_embedding_id(item["content_type"], item["content_id"], created_at)
+                vectors.append({"id": vector_id, "values": embedding, "metadata": metadata})
+                documents.append({
+                    "vector_id": vector_id,
+                    "text": item["text"],
+                    "content_type": item["content_type"],
+                    "content_id": item["content_id"],
+                    "metadata": metadata,
+                    "created_at": now,
+                    "updated_at": now
+                })
+            
+            if not vectors:
+                logger.error("❌ [VECTOR_STORE] 유효한 임베딩이 없습니다")
+                return 0
+            
+            logger.info(f"💾 [VECTOR_STORE] 벡터 저장 시작 - {len(vectors)}개")
+            results = await self.vector_writer.submit_many(list(zip(vectors, documents)))
+            if not all(results):
+                logger.error("❌ [VECTOR_STORE] 벡터 백엔드 저장 실패")
+                return 0
+            
+            logger.info(f"✅ 텍스트 및 임베딩 저장 완료: {len(documents)}개")
+            return len(documents)
             
         except Exception as e:
             logger.error(f"❌ 텍스트 및 임베딩 저장 실패: {e}")
-            return False
+            return 0
+    
+    async def _write_vector_batch(self, entries: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> List[bool]:
+        """병합된 (벡터, 메타데이터 문서) 배치 저장"""
+        vectors = [vector for vector, _ in entries]
+        # 백엔드 업서트는 동기 호출 → 워커 스레드
+        if not await asyncio.to_thread(self.backend.upsert_vectors, vectors):
+            return [False] * len(entries)
+        
+        # MongoDB 메타데이터는 bulk_write 한 번으로 저장
+        await self.db.vector_embeddings.bulk_write(
+            [UpdateOne({"vector_id": doc["vector_id"]}, {"$set": doc}, upsert=True) for _, doc in entries],
+            ordered=False
+        )
+        return [True] * len(entries)
     
     async def search_similar_texts(self, 
                                  query_text: str, 
                                  content_type: Optional[str] = None,
-                                 top_k: int = 10) -> List[Dict[str, Any]]:
-        """유사한 텍스트 검색"""
+                                 top_k: int = 10,
+                                 session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """유사한 텍스트 검색 (content_type / session_id 필터 선택)"""
         try:
             if not self.is_initialized:
                 logger.error("❌ 벡터 서비스가 초기화되지 않았습니다")
@@ -207,15 +274,18 @@ class VectorService:
                 return []
             
             # 필터 설정
-            filter_dict = None
+            filter_dict = {}
             if content_type:
-                filter_dict = {"content_type": content_type}
+                filter_dict["content_type"] = content_type
+            if session_id:
+                filter_dict["session_id"] = session_id
             
-            # Pinecone에서 유사한 벡터 검색
-            search_results = pinecone_client.query_vectors(
+            # 벡터 백엔드에서 유사한 벡터 검색 (동기 호출 → 워커 스레드)
+            search_results = await asyncio.to_thread(
+                self.backend.query_vectors,
                 query_vector=query_embedding,
                 top_k=top_k,
-                filter_dict=filter_dict,
+                filter_dict=filter_dict or None,
                 include_metadata=True
             )
             
@@ -275,9 +345,9 @@ class VectorService:
                 logger.error("❌ 벡터 서비스가 초기화되지 않았습니다")
                 return False
             
-            # Pinecone에서 벡터 삭제
-            if not pinecone_client.delete_vectors([vector_id]):
-                logger.error("❌ Pinecone 벡터 삭제 실패")
+            # 벡터 백엔드에서 삭제
+            if not self.backend.delete_vectors([vector_id]):
+                logger.error("❌ 벡터 백엔드 삭제 실패")
                 return False
             
             # MongoDB에서 메타데이터 삭제
@@ -323,8 +393,8 @@ class VectorService:
             if not self.is_initialized:
                 return {"error": "서비스가 초기화되지 않았습니다"}
             
-            # Pinecone 통계
-            pinecone_stats = pinecone_client.get_index_stats()
+            # 벡터 백엔드 통계 (응답 키는 호환을 위해 유지)
+            pinecone_stats = self.backend.get_index_stats()
             
             # MongoDB 통계
             collection = self.db.vector_embeddings
@@ -344,7 +414,9 @@ class VectorService:
                     "content_type_distribution": type_stats
                 },
                 "embedding_model": self.embedding_model,
-                "index_name": pinecone_client.index_name
+                "embedding_cache": self.embedding_cache.stats(),
+                "embedding_batches": self.embedder.stats(),
+                "index_name": self.backend.index_name
             }
             
         except Exception as e:
@@ -360,8 +432,8 @@ class VectorService:
                     "message": "벡터 서비스가 초기화되지 않았습니다"
                 }
             
-            # Pinecone 헬스 체크
-            pinecone_health = pinecone_client.health_check()
+            # 벡터 백엔드 헬스 체크
+            pinecone_health = self.backend.health_check()
             
             # MongoDB 연결 체크
             try:
@@ -386,7 +458,8 @@ class VectorService:
     async def cleanup(self):
         """리소스 정리"""
         try:
-            pinecone_client.cleanup()
+            self.backend.cleanup()
+            self.embedding_cache.close()
             self.is_initialized = False
             logger.info("🧹 벡터 서비스 정리 완료")
         except Exception as e:
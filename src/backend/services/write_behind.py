@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Write-behind 영속화 큐
+- 채팅 메시지/벡터 저장을 응답 경로 밖에서 처리 (응답 먼저 반환, 저장은 백그라운드)
+- 세션별 레인: 같은 세션의 작업은 큐잉 순서대로 처리, 세션끼리는 병렬 처리
+- 같은 종류의 연속 작업은 배치로 묶어 핸들러 한 번 호출
+- 실패 시 지수 백오프 재시도, 최대 횟수 초과 시 dead-letter 파일로 이동
+- 로컬 저널(JSONL)에 먼저 기록 후 처리 → 재시작 시 미완료 작업 재생 (유실 방지)
+"""
+
+import os
+import time
+import uuid
+import asyncio
+import logging
+import tempfile
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+from ..common.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+WRITE_BEHIND_DIR = os.getenv("WRITE_BEHIND_DIR", os.path.join(tempfile.gettempdir(), "dys_write_behind"))
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "32"))
+WRITE_BEHIND_CONCURRENCY = int(os.getenv("WRITE_BEHIND_CONCURRENCY", "8"))
+WRITE_BEHIND_MAX_ATTEMPTS = int(os.getenv("WRITE_BEHIND_MAX_ATTEMPTS", "8"))
+WRITE_BEHIND_RETRY_BASE_SEC = float(os.getenv("WRITE_BEHIND_RETRY_BASE_SEC", "0.5"))
+WRITE_BEHIND_RETRY_MAX_SEC = float(os.getenv("WRITE_BEHIND_RETRY_MAX_SEC", "30.0"))
+# 확인(ack)된 기록이 이 수를 넘으면 저널을 미완료 작업만으로 다시 씀
+WRITE_BEHIND_COMPACT_EVERY = int(os.getenv("WRITE_BEHIND_COMPACT_EVERY", "1000"))
+WRITE_BEHIND_FSYNC = os.getenv("WRITE_BEHIND_FSYNC", "false").lower() == "true"
+
+# 배치 핸들러: 같은 종류 payload 목록을 받아 저장, 실패 시 예외 발생
+BatchHandler = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+
+@dataclass(eq=False)
+class WriteJob:
+    """저널에 기록되는 작업 하나"""
+    kind: str
+    session_id: str
+    payload: Dict[str, Any]
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    attempts: int = 0
+    created_at: float = field(default_factory=time.time)
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "session_id": self.session_id,
+            "payload": self.payload,
+            "created_at": self.created_at,
+        }
+
+
+class WriteBehindQueue:
+    """세션별 순서 보장 write-behind 큐 (워커 프로세스 단위)"""
+
+    def __init__(self,
+                 directory: str = WRITE_BEHIND_DIR,
+                 batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+                 concurrency: int = WRITE_BEHIND_CONCURRENCY,
+                 max_attempts: int = WRITE_BEHIND_MAX_ATTEMPTS):
+        self.directory = directory
+        self.batch_size = max(1, batch_size)
+        self.max_attempts = max(1, max_attempts)
+        self._concurrency = max(1, concurrency)
+        self._handlers: Dict[str, BatchHandler] = {}
+        self._lanes: Dict[str, Deque[WriteJob]] = {}
+        self._lane_tasks: Dict[str, asyncio.Task] = {}
+        self._in_flight: Dict[str, WriteJob] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._journal = None
+        self._journal_path = os.path.join(directory, f"journal-{os.getpid()}.jsonl")
+        self._dead_letter_path = os.path.join(directory, "dead-letter.jsonl")
+        self._acked_since_compact = 0
+        self.started = False
+
+        self.enqueued = 0
+        self.completed = 0
+        self.retries = 0
+        self.dead_lettered = 0
+        self.replayed = 0
+        self.batches = 0
+
+    def register(self, kind: str, handler: BatchHandler):
+        """작업 종류별 배치 핸들러 등록"""
+        self._handlers[kind] = handler
+
+    # ---------- 시작 / 종료 ----------
+
+    async def start(self):
+        """저널을 열고 이전 프로세스가 남긴 미완료 작업을 재생합니다."""
+        if self.started:
+            return
+        self._semaphore = asyncio.Semaphore(self._concurrency)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        os.makedirs(self.directory, exist_ok=True)
+
+        pending = self._claim_orphaned_journals()
+        self._journal = open(self._journal_path, "ab")
+        self.started = True
+
+        for job in pending:
+            self._append(job.to_record())
+            self._schedule(job)
+        if pending:
+            self._flush()
+            self.replayed += len(pending)
+            logger.info(f"♻️ write-behind 미완료 작업 {len(pending)}개 재생")
+
+    @staticmethod
+    def _journal_owner(name: str) -> Optional[int]:
+        """journal-<pid>.jsonl / journal-<pid>.jsonl.replay-<pid> → 지금 그 파일을 쓰는(쓸 수 있는) pid"""
+        if not name.startswith("journal-"):
+            return None
+        base, _, replaying = name.partition(".replay-")
+        if not base.endswith(".jsonl"):
+            return None
+        try:
+            return int(replaying or base[len("journal-"):-len(".jsonl")])
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _pid_alive(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            # 다른 사용자의 살아 있는 프로세스
+            return True
+        return True
+
+    def _claim_orphaned_journals(self) -> List[WriteJob]:
+        """종료된 프로세스의 저널만 rename 으로 선점한 뒤 ack 되지 않은 작업을 읽어옵니다.
+        (실행 중인 형제 워커의 저널은 건드리지 않음 - 같은 pid 로 재시작한 경우는 자기 저널로 간주)"""
+        pending: List[WriteJob] = []
+        me = os.getpid()
+        for name in sorted(os.listdir(self.directory)):
+            owner = self._journal_owner(name)
+            if owner is None or (owner != me and self._pid_alive(owner)):
+                continue
+            path = os.path.join(self.directory, name)
+            claimed = f"{path.split('.replay-', 1)[0]}.replay-{me}"
+            try:
+                # 멀티 워커가 동시에 시작해도 rename 은 한 프로세스만 성공
+                os.rename(path, claimed)
+            except OSError:
+                continue
+            pending.extend(self._read_pending(claimed))
+            os.remove(claimed)
+        pending.sort(key=lambda job: job.created_at)
+        return pending
+
+    @staticmethod
+    def _read_pending(path: str) -> List[WriteJob]:
+        jobs: Dict[str, WriteJob] = {}
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = loads(line)
+                except Exception:
+                    # 비정상 종료로 잘린 마지막 줄
+                    continue
+                if "ack" in record:
+                    jobs.pop(record["ack"], None)
+                    continue
+                jobs[record["id"]] = WriteJob(
+                    kind=record["kind"],
+                    session_id=record["session_id"],
+                    payload=record["payload"],
+                    id=record["id"],
+                    created_at=record.get("created_at", 0.0),
+                )
+        return list(jobs.values())
+
+    async def drain(self, timeout: float = 10.0) -> bool:
+        """큐가 빌 때까지 대기합니다. 남은 작업은 저널에 있으므로 다음 시작 시 재생됩니다."""
+        if not self.started:
+            return True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️ write-behind 종료 대기 시간 초과 - 미완료 {self.pending()}개는 저널에 보존")
+            return False
+
+    async def stop(self, timeout: float = 10.0):
+        if not self.started:
+            return
+        drained = await self.drain(timeout)
+        for task in list(self._lane_tasks.values()):
+            task.cancel()
+        self._lane_tasks.clear()
+        self._lanes.clear()
+        self._in_flight.clear()
+        self._flush()
+        self._journal.close()
+        self._journal = None
+        if drained:
+            # 모든 작업이 ack 됐으면 저널 불필요
+            try:
+                os.remove(self._journal_path)
+            except OSError:
+                pass
+        self.started = False
+
+    # ---------- 큐잉 ----------
+
+    def enqueue(self, kind: str, session_id: str, payload: Dict[str, Any]) -> str:
+        """작업을 저널에 기록하고 세션 레인에 넣습니다 (대기 없음). 작업 ID 반환."""
+        if kind not in self._handlers:
+            raise ValueError(f"등록되지 않은 write-behind 작업 종류: {kind}")
+        if not self.started:
+            raise RuntimeError("write-behind 큐가 시작되지 않았습니다")
+        job = WriteJob(kind=kind, session_id=session_id, payload=payload)
+        self._append(job.to_record())
+        self._flush()
+        self._schedule(job)
+        self.enqueued += 1
+        return job.id
+
+    def _schedule(self, job: WriteJob):
+        lane = self._lanes.setdefault(job.session_id, deque())
+        lane.append(job)
+        self._idle.clear()
+        if job.session_id not in self._lane_tasks:
+            self._lane_tasks[job.session_id] = asyncio.create_task(self._run_lane(job.session_id))
+
+    async def _run_lane(self, session_id: str):
+        """세션 레인 하나를 순서대로 비웁니다. 레인이 비면 태스크 종료."""
+        lane = self._lanes[session_id]
+        try:
+            while lane:
+                batch = self._take_batch(lane)
+                for job in batch:
+                    self._in_flight[job.id] = job
+                async with self._semaphore:
+                    await self._process(batch)
+        except asyncio.CancelledError:
+            return
+        finally:
+            if not lane:
+                self._lanes.pop(session_id, None)
+            self._lane_tasks.pop(session_id, None)
+            if not self._lane_tasks:
+                self._idle.set()
+
+    def _take_batch(self, lane: Deque[WriteJob]) -> List[WriteJob]:
+        """레인 앞쪽에서 같은 종류의 연속 작업을 최대 batch_size 만큼 꺼냅니다 (순서 유지)."""
+        kind = lane[0].kind
+        batch: List[WriteJob] = []
+        while lane and lane[0].kind == kind and len(batch) < self.batch_size:
+            batch.append(lane.popleft())
+        return batch
+
+    async def _process(self, batch: List[WriteJob]):
+        handler = self._handlers.get(batch[0].kind)
+        if handler is None:
+            # 재생된 작업의 핸들러가 이번 프로세스에 등록되지 않은 경우
+            self._dead_letter(batch, KeyError(f"no handler for {batch[0].kind}"))
+            return
+        while True:
+            try:
+                await handler([job.payload for job in batch])
+                self.batches += 1
+                self.completed += len(batch)
+                for job in batch:
+                    self._in_flight.pop(job.id, None)
+                    self._append({"ack": job.id})
+                self._flush()
+                self._maybe_compact(len(batch))
+                return
+            except Exception as e:
+                attempts = max(job.attempts for job in batch) + 1
+                for job in batch:
+                    job.attempts = attempts
+                if attempts >= self.max_attempts:
+                    self._dead_letter(batch, e)
+                    return
+                delay = min(WRITE_BEHIND_RETRY_MAX_SEC, WRITE_BEHIND_RETRY_BASE_SEC * (2 ** (attempts - 1)))
+                self.retries += 1
+                logger.warning(
+                    f"⚠️ write-behind {batch[0].kind} 배치({len(batch)}) 실패, "
+                    f"{delay:.1f}s 후 재시도 ({attempts}/{self.max_attempts}): {e}"
+                )
+                # 같은 세션의 뒤 작업은 이 배치가 끝날 때까지 대기 (순서 보장)
+                await asyncio.sleep(delay)
+
+    def _dead_letter(self, batch: List[WriteJob], error: Exception):
+        logger.error(f"❌ write-behind {batch[0].kind} 배치({len(batch)}) 최종 실패 - dead-letter 로 이동: {error}")
+        try:
+            with open(self._dead_letter_path, "ab") as f:
+                for job in batch:
+                    record = job.to_record()
+                    record["error"] = str(error)
+                    record["attempts"] = job.attempts
+                    f.write(dumps(record) + b"\n")
+        except OSError as e:
+            logger.error(f"❌ dead-letter 기록 실패: {e}")
+        self.dead_lettered += len(batch)
+        for job in batch:
+            self._in_flight.pop(job.id, None)
+            self._append({"ack": job.id})
+        self._flush()
+
+    # ---------- 저널 ----------
+
+    def _append(self, record: Dict[str, Any]):
+        self._journal.write(dumps(record) + b"\n")
+
+    def _flush(self):
+        if self._journal is None:
+            return
+        self._journal.flush()
+        if WRITE_BEHIND_FSYNC:
+            os.fsync(self._journal.fileno())
+
+    def _maybe_compact(self, acked: int):
+        """ack 가 쌓이면 대기/처리 중 작업만 남겨 저널을 다시 씁니다."""
+        self._acked_since_compact += acked
+        if self._acked_since_compact < WRITE_BEHIND_COMPACT_EVERY:
+            return
+        self._acked_since_compact = 0
+        tmp_path = f"{self._journal_path}.compact"
+        with open(tmp_path, "wb") as f:
+            for job in self._in_flight.values():
+                f.write(dumps(job.to_record()) + b"\n")
+            for lane in self._lanes.values():
+                for job in lane:
+                    f.write(dumps(job.to_record()) + b"\n")
+        self._journal.close()
+        os.replace(tmp_path, self._journal_path)
+        self._journal = open(self._journal_path, "ab")
+
+    # ---------- 조회 ----------
+
+    def pending(self) -> int:
+        return len(self._in_flight) + sum(len(lane) for lane in self._lanes.values())
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "pending": self.pending(),
+            "active_sessions": len(self._lane_tasks),
+            "enqueued": self.enqueued,
+            "completed": self.completed,
+            "batches": self.batches,
+            "retries": self.retries,
+            "dead_lettered": self.dead_lettered,
+            "replayed": self.replayed,
+            "journal": self._journal_path,
+        }
+
+
+# 전역 write-behind 큐 (워커 프로세스마다 하나)
+write_behind = WriteBehindQueue()
@@ -78,7 +78,7 @@ class MediaPipeAnalyzer {
         console.log("🔗 ws-proxy 서비스 연결 시도");
         
         // ws-proxy가 실패하면 GKE 직접 연결로 폴백
-        this.fallbackUrl = 'ws://34.64.136.237:8001/ws';
+        this.fallbackUrl = 'ws://34.64.136.237/ws';  // HTTP 와 같은 단일 포트
     }
     
     /**